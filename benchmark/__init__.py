@@ -0,0 +1 @@
+# Benchmark package - Servidor SOAP local, dados sintéticos e medições de desempenho
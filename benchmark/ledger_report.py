@@ -0,0 +1,195 @@
+"""
+Ledger Report - Tendência do histórico de execuções (APP_LEDGER_FILE)
+Compara a última execução com a mediana das anteriores do mesmo tipo e
+modo e aponta:
+- regressão de vazão: taxa (cadastros/s, registros/s, MB/s...) abaixo da
+  mediana além do limite
+- crescimento anormal de volume: cadastros, registros por módulo, bytes
+  recebidos ou bytes por cadastro acima da mediana além do limite
+- aumento de erros: taxa de falhas acima da mediana além do limite
+
+Uso:
+    python -m benchmark.ledger_report
+    python -m benchmark.ledger_report data/json/historico_execucoes.jsonl --tipo carga --janela 20
+    python -m benchmark.ledger_report --limite-vazao 0.2 --limite-volume 0.5 --json tendencia.json
+"""
+
+from typing import List, Dict, Any, Optional
+import argparse
+import json
+import statistics
+import sys
+
+from interface.styles.colors import Colors
+from service.ledger_service import carregar_historico
+
+# Seção da entrada -> categoria de alerta (na ordem do relatório)
+SECOES = {
+    "taxas": "vazao",
+    "volume": "volume",
+    "erros": "erros",
+}
+
+# Taxas de erro abaixo disso não são sinalizadas (0 → 1 falha não é tendência)
+PISO_TAXA_ERRO = 0.01
+
+
+def _achatar(dados: Dict[str, Any], prefixo: str = "") -> Dict[str, float]:
+    """{"a": {"b": 1}} -> {"a.b": 1.0}, só valores numéricos"""
+    saida: Dict[str, float] = {}
+    for chave, valor in dados.items():
+        nome = f"{prefixo}{chave}"
+        if isinstance(valor, dict):
+            saida.update(_achatar(valor, f"{nome}."))
+        elif isinstance(valor, (int, float)) and not isinstance(valor, bool):
+            saida[nome] = float(valor)
+    return saida
+
+
+def _metricas(entrada: Dict[str, Any]) -> Dict[str, float]:
+    metricas = {}
+    for secao in SECOES:
+        metricas.update(_achatar(entrada.get(secao) or {}, f"{secao}."))
+    return metricas
+
+
+def comparar_com_historico(entradas: List[Dict[str, Any]], tipo: Optional[str] = None,
+                           modo: Optional[str] = None, janela: int = 10,
+                           limite_vazao: float = 0.2, limite_volume: float = 0.5) -> Dict[str, Any]:
+    """
+    Compara a última execução com a mediana das anteriores comparáveis
+
+    Args:
+        entradas: Histórico na ordem de gravação
+        tipo: 'extracao' ou 'carga' (padrão: o da última entrada)
+        modo: Modo da execução (padrão: o da última entrada do tipo)
+        janela: Quantas execuções anteriores bem-sucedidas entram na mediana
+        limite_vazao: Queda relativa tolerada nas taxas (0.2 = 20%)
+        limite_volume: Crescimento relativo tolerado em volume e erros (0.5 = 50%)
+
+    Returns:
+        {"atual", "historico", "linhas", "alertas"}; linhas trazem
+        mediana, valor atual, variação e se foram sinalizadas
+    """
+    candidatas = [e for e in entradas if tipo is None or e.get("tipo") == tipo]
+    if not candidatas:
+        return {"atual": None, "historico": [], "linhas": [], "alertas": 0}
+    atual = candidatas[-1]
+    modo = modo or atual.get("modo")
+    candidatas = [e for e in candidatas if e.get("modo") == modo]
+    if not candidatas:
+        return {"atual": None, "historico": [], "linhas": [], "alertas": 0}
+    atual = candidatas[-1]
+    historico = [e for e in candidatas[:-1] if e.get("status") == "sucesso"][-janela:]
+
+    valores_atuais = _metricas(atual)
+    anteriores = [_metricas(e) for e in historico]
+    linhas = []
+    for nome, valor in valores_atuais.items():
+        serie = [m[nome] for m in anteriores if nome in m]
+        if not serie:
+            continue
+        mediana = statistics.median(serie)
+        categoria = SECOES[nome.split(".", 1)[0]]
+        variacao = (valor - mediana) / mediana if mediana else (0.0 if not valor else None)
+        if categoria == "vazao":
+            alerta = variacao is not None and -variacao > limite_vazao
+        elif categoria == "erros" and nome.startswith("erros.taxa"):
+            alerta = valor >= PISO_TAXA_ERRO and (variacao is None or variacao > limite_volume)
+        elif categoria == "erros":
+            # Contagens absolutas acompanham o volume; a taxa é que decide
+            alerta = False
+        else:
+            alerta = variacao is not None and variacao > limite_volume
+        linhas.append({
+            "metrica": nome,
+            "categoria": categoria,
+            "mediana": mediana,
+            "atual": valor,
+            "variacao": round(variacao, 4) if variacao is not None else None,
+            "amostras": len(serie),
+            "alerta": alerta,
+        })
+    ordem = list(SECOES)
+    linhas.sort(key=lambda l: (ordem.index(l["metrica"].split(".", 1)[0]), l["metrica"]))
+    return {
+        "atual": atual,
+        "historico": historico,
+        "linhas": linhas,
+        "alertas": sum(1 for l in linhas if l["alerta"]),
+    }
+
+
+def _numero(valor: float) -> str:
+    return f"{valor:,.0f}" if abs(valor) >= 1000 or float(valor).is_integer() else f"{valor:,.3f}"
+
+
+def _imprimir(resultado: Dict[str, Any], limite_vazao: float, limite_volume: float):
+    atual = resultado["atual"]
+    historico = resultado["historico"]
+    print(Colors.header(
+        f"Histórico de {atual['tipo']} ({atual['modo']}): {len(historico)} execução(ões) anteriores"
+    ))
+    chave_taxa = "cadastros_por_s" if atual["tipo"] == "extracao" else "registros_por_s"
+    for entrada in historico + [atual]:
+        fases = ", ".join(f"{nome} {segundos:.1f}s" for nome, segundos in entrada.get("fases", {}).items())
+        texto = (f"  {entrada['iniciado_em']}  {entrada['duracao_s']:>9.1f}s  "
+                 f"{entrada.get('taxas', {}).get(chave_taxa, 0):>10,.2f} {chave_taxa:<16} "
+                 f"{entrada.get('status', '?'):<8} {fases}")
+        print(Colors.info(texto + "  ← atual") if entrada is atual else texto)
+
+    if not resultado["linhas"]:
+        print(Colors.warning("⚠️ Histórico insuficiente para comparar (nenhuma execução anterior bem-sucedida)"))
+        return
+
+    print(Colors.header(
+        f"\nÚltima execução vs. mediana (vazão -{limite_vazao:.0%}, volume/erros +{limite_volume:.0%})"
+    ))
+    for linha in resultado["linhas"]:
+        variacao = f"{linha['variacao']:+8.1%}" if linha["variacao"] is not None else "    novo"
+        texto = (f"  {linha['metrica']:<42} {_numero(linha['mediana']):>14} → "
+                 f"{_numero(linha['atual']):>14} {variacao}")
+        if linha["alerta"]:
+            rotulo = {"vazao": "REGRESSÃO", "volume": "VOLUME ANORMAL", "erros": "ERROS"}[linha["categoria"]]
+            print(Colors.error(f"{texto}  {rotulo}"))
+        else:
+            print(texto)
+    if resultado["alertas"]:
+        print(Colors.error(f"❌ {resultado['alertas']} métrica(s) fora da tendência"))
+    else:
+        print(Colors.success(f"✅ Última execução dentro da tendência ({len(resultado['linhas'])} métricas)"))
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compara a última execução com o histórico de desempenho")
+    parser.add_argument("arquivo", nargs="?", default=None, help="Histórico JSONL (padrão: APP_LEDGER_FILE)")
+    parser.add_argument("--tipo", choices=["extracao", "carga"], default=None,
+                        help="Tipo de execução (padrão: o da última entrada)")
+    parser.add_argument("--modo", default=None, help="Modo (padrão: o da última entrada do tipo)")
+    parser.add_argument("--janela", type=int, default=10, help="Execuções anteriores na mediana")
+    parser.add_argument("--limite-vazao", type=float, default=0.2, help="Queda tolerada nas taxas (0.2 = 20%%)")
+    parser.add_argument("--limite-volume", type=float, default=0.5,
+                        help="Crescimento tolerado em volume e taxa de erros (0.5 = 50%%)")
+    parser.add_argument("--json", default=None, help="Grava a comparação em JSON")
+    args = parser.parse_args(argumentos)
+
+    entradas = carregar_historico(args.arquivo)
+    if not entradas:
+        print(Colors.warning("⚠️ Histórico vazio ou inexistente"))
+        return 0
+    resultado = comparar_com_historico(
+        entradas, args.tipo, args.modo, args.janela, args.limite_vazao, args.limite_volume
+    )
+    if resultado["atual"] is None:
+        filtro = ", ".join(f for f in (args.tipo and f"tipo {args.tipo}", args.modo and f"modo {args.modo}") if f)
+        print(Colors.warning(f"⚠️ Nenhuma execução no histórico com {filtro}"))
+        return 0
+    _imprimir(resultado, args.limite_vazao, args.limite_volume)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+    return 1 if resultado["alertas"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+"""
+Mock SOAP Server - Servidor local que emula o WSDL de Clevelândia
+Responde todas as operações busca* com dados sintéticos determinísticos
+(benchmark.synthetic_data), com latência configurável, injeção de falhas
+e limite de taxa, para medir concorrência e retentativas sem tocar no
+endpoint da prefeitura.
+
+Uso:
+    python -m benchmark.mock_soap_server --cadastros 100000 --porta 8085
+    SOAP_ENDPOINT=http://127.0.0.1:8085/ SOAP_WSDL_PATH=http://127.0.0.1:8085/?wsdl python main.py
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, asdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import Counter
+from xml.sax.saxutils import escape
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+
+from lxml import etree as ET
+
+from benchmark.synthetic_data import EsquemaWSDL, GeradorSintetico, NS_SOAP_ENV
+
+
+DISTRIBUICOES = ("fixa", "uniforme", "lognormal", "exponencial")
+
+NS_SOAP_ENC = "http://schemas.xmlsoap.org/soap/encoding/"
+
+# Subconjunto do schema SOAP-ENC usado pelo WSDL (Array e arrayType). O zeep
+# baixa esse schema de schemas.xmlsoap.org; servido pelo mock, o benchmark
+# funciona sem rede (SOAP_WSDL_PATH=<url do mock>?wsdl)
+ESQUEMA_SOAP_ENC = f"""<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="{NS_SOAP_ENC}">
+  <xs:attribute name="arrayType" type="xs:string"/>
+  <xs:attribute name="offset" type="xs:string"/>
+  <xs:complexType name="Array">
+    <xs:sequence>
+      <xs:any namespace="##any" minOccurs="0" maxOccurs="unbounded" processContents="lax"/>
+    </xs:sequence>
+    <xs:anyAttribute namespace="##other" processContents="lax"/>
+  </xs:complexType>
+</xs:schema>
+""".encode("utf-8")
+
+
+@dataclass
+class ConfiguracaoMock:
+    """
+    Comportamento do servidor mock
+
+    Attributes:
+        latencia: Distribuição da latência (fixa, uniforme, lognormal, exponencial)
+        latencia_media_ms: Média da latência em ms
+        latencia_desvio_ms: Desvio (uniforme: meia largura; lognormal: desvio padrão)
+        taxa_fault: Fração das requisições respondidas com SOAP Fault
+        taxa_5xx: Fração respondida com HTTP 500/502/503
+        taxa_timeout: Fração que não responde antes de timeout_s
+        timeout_s: Tempo que uma requisição "travada" segura a conexão
+        taxa_corpo_lento: Fração cujo corpo é enviado em pedaços espaçados
+        corpo_lento_s: Duração total do envio de um corpo lento
+        limite_rps: Requisições por segundo aceitas (0 = sem limite); excedentes recebem 429
+        rajada: Tamanho do balde de fichas do limite de taxa
+        limite_listagem: Máximo de cadastros devolvidos pela listagem geral (0 = todos)
+        ignorar_faixa: Listagem geral ignora o filtro "inicio-fim" de codigo_cadastro
+        semente: Semente das falhas e latências
+    """
+    latencia: str = "fixa"
+    latencia_media_ms: float = 0.0
+    latencia_desvio_ms: float = 0.0
+    taxa_fault: float = 0.0
+    taxa_5xx: float = 0.0
+    taxa_timeout: float = 0.0
+    timeout_s: float = 35.0
+    taxa_corpo_lento: float = 0.0
+    corpo_lento_s: float = 2.0
+    limite_rps: float = 0.0
+    rajada: int = 10
+    limite_listagem: int = 0
+    ignorar_faixa: bool = False
+    semente: int = 42
+
+
+class BaldeFichas:
+    """Limite de taxa por balde de fichas (compartilhado entre as threads)"""
+
+    def __init__(self, taxa: float, capacidade: int):
+        self.taxa = taxa
+        self.capacidade = max(capacidade, 1)
+        self.fichas = float(self.capacidade)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consumir(self) -> Tuple[bool, float]:
+        """
+        Tenta consumir uma ficha
+
+        Returns:
+            (aceita, segundos até haver ficha)
+        """
+        with self.lock:
+            agora = time.monotonic()
+            self.fichas = min(self.capacidade, self.fichas + (agora - self.ultimo) * self.taxa)
+            self.ultimo = agora
+            if self.fichas >= 1:
+                self.fichas -= 1
+                return True, 0.0
+            return False, (1 - self.fichas) / self.taxa
+
+
+class ServidorMockHTTP(ThreadingHTTPServer):
+    """ThreadingHTTPServer com o gerador, a configuração e os contadores"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, endereco, gerador: GeradorSintetico, config: ConfiguracaoMock, wsdl: bytes):
+        super().__init__(endereco, ManipuladorSOAP)
+        self.gerador = gerador
+        self.config = config
+        self.wsdl = wsdl
+        self.balde = BaldeFichas(config.limite_rps, config.rajada) if config.limite_rps > 0 else None
+        self.rng = random.Random(config.semente)
+        self.rng_lock = threading.Lock()
+        self.contadores: Counter = Counter()
+        self.contadores_lock = threading.Lock()
+
+    def contar(self, *chaves: str):
+        with self.contadores_lock:
+            for chave in chaves:
+                self.contadores[chave] += 1
+
+    def sortear(self) -> Tuple[float, float]:
+        """(sorteio de falha em [0,1), latência em segundos) da próxima requisição"""
+        c = self.config
+        with self.rng_lock:
+            sorteio = self.rng.random()
+            media, desvio = c.latencia_media_ms, c.latencia_desvio_ms
+            if media <= 0:
+                latencia = 0.0
+            elif c.latencia == "uniforme":
+                latencia = self.rng.uniform(max(media - desvio, 0), media + desvio)
+            elif c.latencia == "lognormal":
+                # Parâmetros da normal subjacente a partir da média/desvio desejados
+                sigma2 = math.log(1 + (desvio / media) ** 2)
+                mu = math.log(media) - sigma2 / 2
+                latencia = self.rng.lognormvariate(mu, sigma2 ** 0.5)
+            elif c.latencia == "exponencial":
+                latencia = self.rng.expovariate(1 / media)
+            else:
+                latencia = media
+        return sorteio, latencia / 1000
+
+
+class ManipuladorSOAP(BaseHTTPRequestHandler):
+    """Atende GET ?wsdl, GET /_esquemas/soap-encoding.xsd, GET /_status (contadores) e POST SOAP"""
+
+    protocol_version = "HTTP/1.1"
+    # Cabeçalho e corpo saem em escritas separadas: sem TCP_NODELAY o
+    # keep-alive esbarra no ACK atrasado (~40 ms por requisição)
+    disable_nagle_algorithm = True
+    server: ServidorMockHTTP
+
+    def log_message(self, formato, *args):
+        logging.getLogger(__name__).debug(formato, *args)
+
+    # ------------------- GET -------------------
+    def do_GET(self):
+        if self.path.startswith("/_status"):
+            corpo = json.dumps({
+                "config": asdict(self.server.config),
+                "total_cadastros": self.server.gerador.total_cadastros,
+                "contadores": dict(self.server.contadores),
+            }, ensure_ascii=False).encode("utf-8")
+            self._responder(200, corpo, "application/json")
+        elif self.path.startswith("/_esquemas/soap-encoding"):
+            self._responder(200, ESQUEMA_SOAP_ENC, "text/xml; charset=utf-8")
+        else:
+            self._responder(200, self.server.wsdl, "text/xml; charset=utf-8")
+
+    # ------------------- POST -------------------
+    def do_POST(self):
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        requisicao = self.rfile.read(tamanho)
+        servidor = self.server
+        config = servidor.config
+
+        if servidor.balde is not None:
+            aceita, espera = servidor.balde.consumir()
+            if not aceita:
+                servidor.contar("limite_taxa")
+                self._responder(429, b"Too Many Requests", "text/plain",
+                                {"Retry-After": f"{max(espera, 0.001):.3f}"})
+                return
+
+        try:
+            operacao, entrada = self._ler_requisicao(requisicao)
+        except ValueError as e:
+            servidor.contar("requisicao_invalida")
+            self._responder(500, self._fault("SOAP-ENV:Client", str(e)), "text/xml; charset=utf-8")
+            return
+        servidor.contar("requisicoes", f"op:{operacao}")
+
+        sorteio, latencia = servidor.sortear()
+        if latencia:
+            time.sleep(latencia)
+
+        # Falhas em faixas disjuntas do mesmo sorteio: as taxas somam
+        limite = config.taxa_timeout
+        if sorteio < limite:
+            servidor.contar("falha:timeout")
+            time.sleep(config.timeout_s)
+            self.close_connection = True
+            return
+        limite += config.taxa_5xx
+        if sorteio < limite:
+            servidor.contar("falha:5xx")
+            status = (500, 502, 503)[int(sorteio * 1000) % 3]
+            self._responder(status, b"<html><body>Erro interno</body></html>", "text/html")
+            return
+        limite += config.taxa_fault
+        if sorteio < limite:
+            servidor.contar("falha:fault")
+            self._responder(500, self._fault("SOAP-ENV:Server", "Erro simulado no servidor"),
+                            "text/xml; charset=utf-8")
+            return
+        lento = sorteio < limite + config.taxa_corpo_lento
+        if lento:
+            servidor.contar("falha:corpo_lento")
+
+        gerador = servidor.gerador
+        if operacao == "buscaCadastroImobiliarioGeral":
+            if config.ignorar_faixa:
+                entrada = {k: v for k, v in entrada.items() if k != "codigo_cadastro"}
+            pedacos = gerador.corpo_listagem(entrada, config.limite_listagem or None)
+            self._responder_em_pedacos(pedacos, config.corpo_lento_s if lento else 0.0)
+        elif operacao in gerador.esquema.operacoes:
+            corpo = gerador.corpo_resposta(operacao, entrada)
+            if lento:
+                self._responder_em_pedacos(iter([corpo]), config.corpo_lento_s)
+            else:
+                self._responder(200, corpo, "text/xml; charset=utf-8")
+        else:
+            servidor.contar("operacao_desconhecida")
+            self._responder(500, self._fault("SOAP-ENV:Client", f"Operação {operacao} não suportada"),
+                            "text/xml; charset=utf-8")
+
+    # ------------------- Auxiliares -------------------
+    @staticmethod
+    def _ler_requisicao(requisicao: bytes) -> Tuple[str, Dict[str, Any]]:
+        """Operação (primeiro filho do Body) e campos simples da entrada"""
+        try:
+            raiz = ET.fromstring(requisicao)
+        except ET.XMLSyntaxError as e:
+            raise ValueError(f"XML inválido: {e}")
+        corpo = raiz.find(f"{{{NS_SOAP_ENV}}}Body")
+        if corpo is None or len(corpo) == 0:
+            raise ValueError("Envelope sem Body")
+        chamada = corpo[0]
+        operacao = ET.QName(chamada).localname
+        entrada: Dict[str, Any] = {}
+        for parte in chamada:
+            for campo in parte:
+                entrada[ET.QName(campo).localname] = (campo.text or "").strip()
+        return operacao, entrada
+
+    @staticmethod
+    def _fault(codigo: str, mensagem: str) -> bytes:
+        return (
+            f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<SOAP-ENV:Envelope xmlns:SOAP-ENV="{NS_SOAP_ENV}"><SOAP-ENV:Body><SOAP-ENV:Fault>'
+            f'<faultcode>{codigo}</faultcode><faultstring>{escape(mensagem)}</faultstring>'
+            f'</SOAP-ENV:Fault></SOAP-ENV:Body></SOAP-ENV:Envelope>'
+        ).encode("utf-8")
+
+    def _responder(self, status: int, corpo: bytes, tipo: str, cabecalhos: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _responder_em_pedacos(self, pedacos, duracao: float = 0.0):
+        """Transfer-Encoding: chunked; com duracao > 0 o envio é espaçado (corpo lento)"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for pedaco in pedacos:
+            if duracao > 0:
+                # Quebra em ~10 fatias e espalha a duração entre elas
+                passo = max(len(pedaco) // 10, 1)
+                for i in range(0, len(pedaco), passo):
+                    fatia = pedaco[i:i + passo]
+                    self.wfile.write(f"{len(fatia):X}\r\n".encode() + fatia + b"\r\n")
+                    self.wfile.flush()
+                    time.sleep(duracao / 10)
+            elif pedaco:
+                self.wfile.write(f"{len(pedaco):X}\r\n".encode() + pedaco + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class ServidorMock:
+    """
+    Servidor mock em thread, para uso programático (benchmarks)
+
+    Exemplo:
+        with ServidorMock(total_cadastros=10000) as mock:
+            os.environ["SOAP_ENDPOINT"] = mock.url
+    """
+
+    def __init__(
+        self,
+        total_cadastros: int = 10000,
+        config: Optional[ConfiguracaoMock] = None,
+        host: str = "127.0.0.1",
+        porta: int = 0,
+        caminho_wsdl: str = "./wsdl/clevelandia.wsdl",
+        densidade: float = 0.92,
+    ):
+        """
+        Inicializa o servidor (ainda parado)
+
+        Args:
+            total_cadastros: Maior código de cadastro emulado
+            config: Latência, falhas e limites (padrão: sem nenhum)
+            host: Interface de escuta
+            porta: Porta TCP (0 = escolhida pelo sistema)
+            caminho_wsdl: WSDL que define tipos e operações
+            densidade: Fração dos códigos que existem
+        """
+        self.config = config or ConfiguracaoMock()
+        esquema = EsquemaWSDL(caminho_wsdl)
+        gerador = GeradorSintetico(total_cadastros, densidade, self.config.semente, esquema)
+        self.httpd = ServidorMockHTTP((host, porta), gerador, self.config, b"")
+        self.httpd.wsdl = self._wsdl_local(caminho_wsdl)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Endereço para SOAP_ENDPOINT"""
+        host, porta = self.httpd.server_address[:2]
+        return f"http://{host}:{porta}/"
+
+    @property
+    def url_wsdl(self) -> str:
+        """Endereço para SOAP_WSDL_PATH (WSDL servido sem depender de rede)"""
+        return f"{self.url}?wsdl"
+
+    @property
+    def contadores(self) -> Dict[str, int]:
+        return dict(self.httpd.contadores)
+
+    def _wsdl_local(self, caminho_wsdl: str) -> bytes:
+        """WSDL com o soap:address e o schema SOAP-ENC apontando para este servidor"""
+        arvore = ET.parse(caminho_wsdl)
+        for endereco in arvore.iter("{http://schemas.xmlsoap.org/wsdl/soap/}address"):
+            endereco.set("location", self.url)
+        for importacao in arvore.iter("{http://www.w3.org/2001/XMLSchema}import"):
+            if importacao.get("namespace") == NS_SOAP_ENC:
+                importacao.set("schemaLocation", f"{self.url}_esquemas/soap-encoding.xsd")
+        return ET.tostring(arvore, xml_declaration=True, encoding="UTF-8")
+
+    def iniciar(self) -> "ServidorMock":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-soap", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "ServidorMock":
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor SOAP local que emula o WSDL de Clevelândia")
+    parser.add_argument("--cadastros", type=int, default=10000, help="Maior código de cadastro emulado")
+    parser.add_argument("--densidade", type=float, default=0.92, help="Fração dos códigos que existem")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8085)
+    parser.add_argument("--wsdl", default="./wsdl/clevelandia.wsdl")
+    parser.add_argument("--latencia", choices=DISTRIBUICOES, default="fixa")
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latência média em ms")
+    parser.add_argument("--desvio-ms", type=float, default=0.0, help="Desvio da latência em ms")
+    parser.add_argument("--fault", type=float, default=0.0, help="Fração de SOAP Faults")
+    parser.add_argument("--erro-5xx", type=float, default=0.0, help="Fração de HTTP 5xx")
+    parser.add_argument("--timeout", type=float, default=0.0, help="Fração de requisições que travam")
+    parser.add_argument("--timeout-s", type=float, default=35.0, help="Quanto tempo uma requisição trava")
+    parser.add_argument("--corpo-lento", type=float, default=0.0, help="Fração de corpos enviados devagar")
+    parser.add_argument("--corpo-lento-s", type=float, default=2.0, help="Duração do envio lento")
+    parser.add_argument("--rps", type=float, default=0.0, help="Limite de requisições/s (0 = sem limite)")
+    parser.add_argument("--rajada", type=int, default=10, help="Rajada aceita pelo limite de taxa")
+    parser.add_argument("--limite-listagem", type=int, default=0, help="Teto de cadastros por listagem")
+    parser.add_argument("--ignorar-faixa", action="store_true",
+                        help="Listagem geral ignora o filtro de faixa de códigos")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    config = ConfiguracaoMock(
+        latencia=args.latencia, latencia_media_ms=args.latencia_ms, latencia_desvio_ms=args.desvio_ms,
+        taxa_fault=args.fault, taxa_5xx=args.erro_5xx, taxa_timeout=args.timeout,
+        timeout_s=args.timeout_s, taxa_corpo_lento=args.corpo_lento, corpo_lento_s=args.corpo_lento_s,
+        limite_rps=args.rps, rajada=args.rajada, limite_listagem=args.limite_listagem,
+        ignorar_faixa=args.ignorar_faixa, semente=args.semente,
+    )
+    mock = ServidorMock(args.cadastros, config, args.host, args.porta, args.wsdl, args.densidade)
+    print(f"Servidor mock em {mock.url} ({args.cadastros} cadastros)")
+    print(f"  SOAP_ENDPOINT={mock.url} SOAP_WSDL_PATH={mock.url_wsdl}")
+    try:
+        mock.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+Benchmark Suite - Medições de desempenho dos caminhos críticos
+Casos:
+- parse: _parse_soap_response / _elem_to_obj / _normalize_obj em corpos sintéticos
+- extracao: CadastroService.extrair_completo (serial e pipeline) contra o servidor mock
+- arquivos: escrita e leitura de datasets do FileStorageService
+- estatisticas: AcumuladorEstatisticas e AnalyticsService (1M registros na escala padrão)
+- banco: carga do DatabaseService no PostgreSQL local (só com --banco: TRUNCA as tabelas)
+
+Resultados em JSON; "comparar" aponta regressões acima de um limite
+em relação a um baseline salvo em benchmark/baselines/.
+
+Uso:
+    python -m benchmark.suite executar --saida resultado.json
+    python -m benchmark.suite executar --salvar-baseline
+    python -m benchmark.suite comparar resultado.json --limite 0.15
+"""
+
+from typing import List, Dict, Any, Optional, Callable
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from lxml import etree as ET
+
+from benchmark.synthetic_data import GeradorSintetico
+from interface.styles.colors import Colors
+
+
+DIRETORIO_BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+BASELINE_PADRAO = os.path.join(DIRETORIO_BASELINES, "baseline.json")
+
+# Tamanho de cada caso por escala
+ESCALAS: Dict[str, Dict[str, int]] = {
+    "rapida": {
+        "documentos_parse": 200,
+        "cadastros_extracao": 100,
+        "registros_arquivo": 20000,
+        "registros_estatisticas": 100000,
+        "registros_banco": 2000,
+    },
+    "padrao": {
+        "documentos_parse": 1000,
+        "cadastros_extracao": 500,
+        "registros_arquivo": 100000,
+        "registros_estatisticas": 1000000,
+        "registros_banco": 20000,
+    },
+}
+
+
+def metrica(valor: float, unidade: str, maior_melhor: bool = True) -> Dict[str, Any]:
+    """Entrada de métrica no formato do JSON de resultados"""
+    return {"valor": round(valor, 3), "unidade": unidade, "maior_melhor": maior_melhor}
+
+
+@contextmanager
+def _silencioso():
+    """Suprime a saída de terminal dos serviços (barras de progresso, avisos)"""
+    nivel = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        with redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(nivel)
+
+
+@contextmanager
+def _sem_historico():
+    """Execuções de benchmark não entram no histórico de execuções nem desenham progresso"""
+    from config.settings import settings
+
+    original = (settings.app.ledger_file, settings.app.progress_mode)
+    settings.app.ledger_file, settings.app.progress_mode = "", "silencioso"
+    try:
+        yield
+    finally:
+        settings.app.ledger_file, settings.app.progress_mode = original
+
+
+def _vazao(quantidade: float, segundos: float) -> float:
+    return quantidade / segundos if segundos > 0 else 0.0
+
+
+# ------------------- Casos -------------------
+def caso_parse(tamanhos: Dict[str, int], gerador: GeradorSintetico) -> Dict[str, Dict[str, Any]]:
+    """Parse e normalização das respostas SOAP"""
+    from service.soap_client import _parse_soap_response, _elem_to_obj, _normalize_obj
+
+    # Mistura de operações com o peso do bloco de itens (a maior resposta por cadastro)
+    operacoes = ["buscaBlocoItens", "buscaProprietarios", "buscaEnderecoImovel",
+                 "buscaTestadas", "buscaHistorico", "buscaItbiCadastroImobiliario"]
+    documentos = []
+    for codigo in itertools.islice(gerador.codigos(), tamanhos["documentos_parse"]):
+        operacao = operacoes[codigo % len(operacoes)]
+        documentos.append(gerador.corpo_resposta(operacao, {"codigo_cadastro": str(codigo)}))
+    megabytes = sum(len(d) for d in documentos) / 1e6
+
+    inicio = time.perf_counter()
+    objetos = [_parse_soap_response(d) for d in documentos]
+    t_parse = time.perf_counter() - inicio
+
+    corpos = [ET.fromstring(d).find(".//{*}Body")[0] for d in documentos]
+    inicio = time.perf_counter()
+    for corpo in corpos:
+        _elem_to_obj(corpo)
+    t_elem = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for objeto in objetos:
+        _normalize_obj(objeto)
+    t_normalizar = time.perf_counter() - inicio
+
+    return {
+        "parse_mb_s": metrica(_vazao(megabytes, t_parse), "MB/s"),
+        "parse_documentos_s": metrica(_vazao(len(documentos), t_parse), "docs/s"),
+        "elem_to_obj_documentos_s": metrica(_vazao(len(documentos), t_elem), "docs/s"),
+        "normalizar_documentos_s": metrica(_vazao(len(documentos), t_normalizar), "docs/s"),
+    }
+
+
+def caso_extracao(tamanhos: Dict[str, int], gerador: GeradorSintetico) -> Dict[str, Dict[str, Any]]:
+    """extrair_completo serial e pipeline contra o servidor mock (latência zero: custo do cliente)"""
+    from benchmark.mock_soap_server import ServidorMock, ConfiguracaoMock
+    from config.settings import settings
+    from service.cadastro_service import CadastroService
+    from service.storage_service import FileStorageService
+
+    resultado = {}
+    total = tamanhos["cadastros_extracao"]
+    soap_original = (settings.soap.endpoint_url, settings.soap.wsdl_path)
+    app_original = (settings.app.extraction_mode, settings.app.request_delay, settings.app.listing_mode)
+    diretorio = tempfile.mkdtemp(prefix="bench_extracao_")
+    mock = ServidorMock(total, ConfiguracaoMock(semente=gerador.semente), densidade=gerador.densidade)
+    try:
+        mock.iniciar()
+        settings.soap.endpoint_url, settings.soap.wsdl_path = mock.url, mock.url_wsdl
+        settings.app.request_delay, settings.app.listing_mode = 0.0, "unico"
+        for modo in ("serial", "pipeline"):
+            settings.app.extraction_mode = modo
+            with _silencioso():
+                servico = CadastroService()
+                servico.file_storage_service = FileStorageService(os.path.join(diretorio, modo))
+                requisicoes_antes = mock.contadores.get("requisicoes", 0)
+                inicio = time.perf_counter()
+                arquivos = servico.extrair_completo()
+                duracao = time.perf_counter() - inicio
+            with open(arquivos["cadastros"], encoding="utf-8") as f:
+                extraidos = len(json.load(f))
+            requisicoes = mock.contadores.get("requisicoes", 0) - requisicoes_antes
+            resultado[f"{modo}_cadastros_s"] = metrica(_vazao(extraidos, duracao), "cadastros/s")
+            resultado[f"{modo}_requisicoes_s"] = metrica(_vazao(requisicoes, duracao), "req/s")
+    finally:
+        mock.parar()
+        settings.soap.endpoint_url, settings.soap.wsdl_path = soap_original
+        settings.app.extraction_mode, settings.app.request_delay, settings.app.listing_mode = app_original
+        shutil.rmtree(diretorio, ignore_errors=True)
+    return resultado
+
+
+def caso_arquivos(tamanhos: Dict[str, int], gerador: GeradorSintetico) -> Dict[str, Dict[str, Any]]:
+    """Escrita (DatasetWriter json/jsonl) e leitura (iterar_dataset) de datasets"""
+    from service.storage_service import FileStorageService
+
+    total = tamanhos["registros_arquivo"]
+    amostra = [gerador.cadastro(codigo) for codigo in itertools.islice(gerador.codigos(), 1000)]
+    diretorio = tempfile.mkdtemp(prefix="bench_arquivos_")
+    resultado = {}
+    try:
+        servico = FileStorageService(diretorio)
+        for formato in ("json", "jsonl"):
+            nome = f"cadastros_{formato}"
+            inicio = time.perf_counter()
+            with servico.abrir_dataset_stream(nome, formato) as escritor:
+                for registro in itertools.islice(itertools.cycle(amostra), total):
+                    escritor.escrever(registro)
+            t_escrita = time.perf_counter() - inicio
+            megabytes = os.path.getsize(escritor.caminho) / 1e6
+
+            inicio = time.perf_counter()
+            lidos = sum(1 for _ in servico.iterar_dataset(nome))
+            t_leitura = time.perf_counter() - inicio
+            if lidos != total:
+                raise RuntimeError(f"{nome}: {lidos} registros lidos de {total} escritos")
+
+            resultado[f"escrita_{formato}_registros_s"] = metrica(_vazao(total, t_escrita), "registros/s")
+            resultado[f"escrita_{formato}_mb_s"] = metrica(_vazao(megabytes, t_escrita), "MB/s")
+            resultado[f"leitura_{formato}_registros_s"] = metrica(_vazao(total, t_leitura), "registros/s")
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+    return resultado
+
+
+def caso_estatisticas(tamanhos: Dict[str, int], gerador: GeradorSintetico) -> Dict[str, Dict[str, Any]]:
+    """
+    Estatísticas sobre cadastros completos (amostra distinta repetida até o
+    total): acumulador de passada única e, com NumPy, o AnalyticsService
+    """
+    from service.soap_client import _normalize_obj
+    from service.statistics_service import AcumuladorEstatisticas
+
+    total = tamanhos["registros_estatisticas"]
+    amostra = [_normalize_obj(gerador.cadastro_completo(codigo))
+               for codigo in itertools.islice(gerador.codigos(), 5000)]
+
+    inicio = time.perf_counter()
+    AcumuladorEstatisticas().update_many(itertools.islice(itertools.cycle(amostra), total)).resultado()
+    duracao = time.perf_counter() - inicio
+    resultado = {
+        "registros_s": metrica(_vazao(total, duracao), "registros/s"),
+        "duracao_s": metrica(duracao, "s", maior_melhor=False),
+    }
+
+    try:
+        from service.analytics_service import AnalyticsService
+    except ImportError:
+        return resultado
+    inicio = time.perf_counter()
+    AnalyticsService().gerar_estatisticas(itertools.islice(itertools.cycle(amostra), total))
+    duracao = time.perf_counter() - inicio
+    resultado["vetorizado_registros_s"] = metrica(_vazao(total, duracao), "registros/s")
+    resultado["vetorizado_duracao_s"] = metrica(duracao, "s", maior_melhor=False)
+    return resultado
+
+
+def caso_banco(tamanhos: Dict[str, int], gerador: GeradorSintetico) -> Dict[str, Dict[str, Any]]:
+    """
+    Carga assíncrona (carregar_cadastros_async) no PostgreSQL configurado:
+    primeira passada com tabelas vazias (inserção) e segunda com os mesmos
+    dados (hash inalterado). As tabelas são TRUNCADAS antes.
+    """
+    from service.soap_client import _normalize_obj
+    from service.database_service import DatabaseService
+
+    total = tamanhos["registros_banco"]
+    cadastros = [_normalize_obj(gerador.cadastro_completo(codigo))
+                 for codigo in itertools.islice(gerador.codigos(), total)]
+    filhos = sum(len(c["proprietariosbci"]) + len(c["enderecos"]) + len(c["zoneamentos"])
+                 for c in cadastros)
+
+    resultado = {}
+    with _silencioso():
+        servico = DatabaseService()
+        if not servico.criar_schema_banco() or not servico.limpar_dados(confirmar=True):
+            raise RuntimeError("Banco indisponível para o benchmark")
+    for passada in ("insercao", "inalterados"):
+        inicio = time.perf_counter()
+        with _silencioso():
+            carga = asyncio.run(servico.carregar_cadastros_async(cadastros, arquivo_origem="benchmark"))
+        duracao = time.perf_counter() - inicio
+        if carga.get("erros"):
+            raise RuntimeError(f"Carga com {carga['erros']} erros: {carga.get('erros_detalhes', [])[:3]}")
+        resultado[f"{passada}_cadastros_s"] = metrica(_vazao(total, duracao), "cadastros/s")
+        resultado[f"{passada}_linhas_s"] = metrica(_vazao(total + filhos, duracao), "linhas/s")
+    return resultado
+
+
+CASOS: Dict[str, Callable[[Dict[str, int], GeradorSintetico], Dict[str, Dict[str, Any]]]] = {
+    "parse": caso_parse,
+    "extracao": caso_extracao,
+    "arquivos": caso_arquivos,
+    "estatisticas": caso_estatisticas,
+    "banco": caso_banco,
+}
+
+
+# ------------------- Execução -------------------
+def _ambiente() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def executar(casos: List[str], escala: str = "padrao", repeticoes: int = 3,
+             semente: int = 42) -> Dict[str, Any]:
+    """
+    Executa os casos e devolve o documento de resultados
+
+    Cada métrica é a mediana das repetições; um caso que falha fica com
+    "erro" e não interrompe os demais.
+
+    Args:
+        casos: Nomes em CASOS
+        escala: Chave de ESCALAS
+        repeticoes: Execuções por caso
+        semente: Semente dos dados sintéticos
+
+    Returns:
+        Documento JSON de resultados
+    """
+    tamanhos = ESCALAS[escala]
+    gerador = GeradorSintetico(
+        max(tamanhos.values()) * 2, semente=semente
+    )
+    documento = {
+        "versao": 1,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "escala": escala,
+        "tamanhos": tamanhos,
+        "repeticoes": repeticoes,
+        "ambiente": _ambiente(),
+        "casos": {},
+    }
+    with _sem_historico():
+        for nome in casos:
+            print(Colors.info(f"▶ {nome}..."), file=sys.stderr)
+            inicio = time.perf_counter()
+            try:
+                rodadas = [CASOS[nome](tamanhos, gerador) for _ in range(repeticoes)]
+            except Exception as e:
+                documento["casos"][nome] = {"erro": f"{type(e).__name__}: {e}"}
+                print(Colors.error(f"  {nome} falhou: {e}"), file=sys.stderr)
+                continue
+            metricas = {}
+            for chave, primeira in rodadas[0].items():
+                metricas[chave] = dict(primeira, valor=round(statistics.median(r[chave]["valor"] for r in rodadas), 3))
+            documento["casos"][nome] = {
+                "metricas": metricas,
+                "duracao_s": round(time.perf_counter() - inicio, 2),
+            }
+    return documento
+
+
+def comparar(atual: Dict[str, Any], baseline: Dict[str, Any], limite: float = 0.15) -> List[Dict[str, Any]]:
+    """
+    Compara métricas com o baseline
+
+    Args:
+        atual: Documento de resultados
+        baseline: Documento de resultados de referência
+        limite: Piora relativa tolerada (0.15 = 15%)
+
+    Returns:
+        Uma linha por métrica presente nos dois documentos, com "regressao";
+        caso com erro e métrica do baseline ausente na execução viram linhas
+        com "falha" (também contam como regressão)
+    """
+    linhas = []
+    for caso, dados in atual.get("casos", {}).items():
+        referencia = baseline.get("casos", {}).get(caso, {}).get("metricas", {})
+        if "erro" in dados:
+            linhas.append({"caso": caso, "metrica": "-", "falha": dados["erro"], "regressao": True})
+            continue
+        for chave in referencia:
+            if chave not in dados.get("metricas", {}):
+                linhas.append({"caso": caso, "metrica": chave, "falha": "métrica ausente na execução",
+                               "regressao": True})
+        for chave, medida in dados.get("metricas", {}).items():
+            anterior = referencia.get(chave)
+            if not anterior or not anterior["valor"]:
+                continue
+            variacao = (medida["valor"] - anterior["valor"]) / anterior["valor"]
+            piora = -variacao if medida.get("maior_melhor", True) else variacao
+            linhas.append({
+                "caso": caso,
+                "metrica": chave,
+                "baseline": anterior["valor"],
+                "atual": medida["valor"],
+                "unidade": medida["unidade"],
+                "variacao": round(variacao, 4),
+                "regressao": piora > limite,
+            })
+    return linhas
+
+
+def _imprimir_comparacao(linhas: List[Dict[str, Any]], limite: float):
+    print(Colors.header(f"Comparação com o baseline (limite {limite:.0%})"))
+    for linha in linhas:
+        if "falha" in linha:
+            print(Colors.error(f"{linha['caso']:<13} {linha['metrica']:<28} FALHA: {linha['falha']}"))
+            continue
+        texto = (f"{linha['caso']:<13} {linha['metrica']:<28} {linha['baseline']:>14,.1f} → "
+                 f"{linha['atual']:>14,.1f} {linha['unidade']:<12} {linha['variacao']:+7.1%}")
+        print(Colors.error(texto + "  REGRESSÃO") if linha["regressao"] else texto)
+    regressoes = sum(1 for linha in linhas if linha["regressao"])
+    if regressoes:
+        print(Colors.error(f"❌ {regressoes} métrica(s) pioraram além do limite ou falharam"))
+    else:
+        print(Colors.success(f"✅ Nenhuma regressão em {len(linhas)} métrica(s)"))
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de extração, parse, arquivos, estatísticas e banco")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_exec = sub.add_parser("executar", help="Executa os benchmarks e grava o JSON de resultados")
+    p_exec.add_argument("--casos", nargs="+", choices=list(CASOS), default=None,
+                        help="Casos a executar (padrão: todos exceto banco)")
+    p_exec.add_argument("--banco", action="store_true",
+                        help="Inclui a carga no PostgreSQL configurado (TRUNCA as tabelas!)")
+    p_exec.add_argument("--escala", choices=list(ESCALAS), default="padrao")
+    p_exec.add_argument("--repeticoes", type=int, default=3)
+    p_exec.add_argument("--semente", type=int, default=42)
+    p_exec.add_argument("--saida", default=None, help="Arquivo JSON de resultados (padrão: stdout)")
+    p_exec.add_argument("--salvar-baseline", action="store_true", help=f"Grava também em {BASELINE_PADRAO}")
+    p_exec.add_argument("--comparar", action="store_true", help="Compara com o baseline ao final")
+    p_exec.add_argument("--limite", type=float, default=0.15)
+
+    p_comp = sub.add_parser("comparar", help="Compara um JSON de resultados com o baseline")
+    p_comp.add_argument("resultado")
+    p_comp.add_argument("--baseline", default=BASELINE_PADRAO)
+    p_comp.add_argument("--limite", type=float, default=0.15, help="Piora relativa tolerada (0.15 = 15%%)")
+    args = parser.parse_args(argumentos)
+
+    if args.comando == "comparar":
+        with open(args.resultado, encoding="utf-8") as f:
+            atual = json.load(f)
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        linhas = comparar(atual, baseline, args.limite)
+        _imprimir_comparacao(linhas, args.limite)
+        return 1 if any(linha["regressao"] for linha in linhas) else 0
+
+    casos = args.casos or [nome for nome in CASOS if nome != "banco"]
+    if args.banco and "banco" not in casos:
+        casos.append("banco")
+    elif "banco" in casos and not args.banco:
+        parser.error("o caso banco trunca as tabelas; confirme com --banco")
+
+    documento = executar(casos, args.escala, args.repeticoes, args.semente)
+    texto = json.dumps(documento, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+    falhas = [nome for nome, caso in documento["casos"].items() if "erro" in caso]
+    if args.salvar_baseline and falhas:
+        print(Colors.error(f"Baseline não gravado: caso(s) com erro ({', '.join(falhas)})"), file=sys.stderr)
+        return 1
+    if args.salvar_baseline:
+        os.makedirs(DIRETORIO_BASELINES, exist_ok=True)
+        with open(BASELINE_PADRAO, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+
+    if args.comparar and os.path.exists(BASELINE_PADRAO):
+        with open(BASELINE_PADRAO, encoding="utf-8") as f:
+            baseline = json.load(f)
+        linhas = comparar(documento, baseline, args.limite)
+        _imprimir_comparacao(linhas, args.limite)
+        if any(linha["regressao"] for linha in linhas):
+            return 1
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
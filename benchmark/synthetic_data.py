@@ -0,0 +1,690 @@
+"""
+Synthetic Data - Dados sintéticos determinísticos guiados pelo WSDL
+Lê os complexTypes e as mensagens busca* de wsdl/clevelandia.wsdl (e os
+tipos dos campos em model/data_models.py) e gera, para qualquer código de
+cadastro, a mesma resposta a cada execução: como corpo SOAP (rpc/encoded)
+igual ao do servidor municipal ou como registros dos datasets de data/json.
+
+A geração é em fluxo (um cadastro por vez, memória constante), então
+escala para dezenas de milhões de registros:
+    python -m benchmark.synthetic_data datasets --cadastros 10000000 --saida /tmp/sintetico
+    python -m benchmark.synthetic_data soap --cadastros 100000 --saida /tmp/corpos --gzip
+"""
+
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable
+from dataclasses import dataclass, field, fields, is_dataclass
+from datetime import date, datetime, timedelta
+from xml.sax.saxutils import escape
+import argparse
+import base64
+import bisect
+import gzip
+import hashlib
+import itertools
+import math
+import os
+import random
+import sys
+import time
+import typing
+
+from lxml import etree as ET
+
+from model import data_models
+from model.data_models import SituacaoCadastral, TipoCadastro, TipoEndereco, TipoProprietario
+
+
+NS_XSD = "http://www.w3.org/2001/XMLSchema"
+NS_WSDL = "http://schemas.xmlsoap.org/wsdl/"
+NS_SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+NS_SOAP_ENC = "http://schemas.xmlsoap.org/soap/encoding/"
+NS_XSI = "http://www.w3.org/2001/XMLSchema-instance"
+
+
+@dataclass
+class TipoComplexo:
+    """complexType do WSDL: campos (nome, tipo) ou array de item_tipo"""
+    nome: str
+    campos: List[Tuple[str, str]]
+    item_tipo: Optional[str] = None
+
+    @property
+    def array(self) -> bool:
+        return self.item_tipo is not None
+
+
+class EsquemaWSDL:
+    """
+    Tipos e operações de consulta lidos do WSDL
+
+    Attributes:
+        tipos: complexTypes por nome (sem prefixo)
+        operacoes: operação busca* -> (tipo da entrada, tipo do retorno)
+        namespace: targetNamespace do serviço
+    """
+
+    def __init__(self, caminho_wsdl: str = "./wsdl/clevelandia.wsdl"):
+        self.caminho_wsdl = caminho_wsdl
+        arvore = ET.parse(caminho_wsdl)
+        raiz = arvore.getroot()
+        self.namespace = raiz.get("targetNamespace")
+        ns = {"x": NS_XSD, "w": NS_WSDL}
+
+        self.tipos: Dict[str, TipoComplexo] = {}
+        for tipo in raiz.iterfind(".//x:complexType", ns):
+            nome = tipo.get("name")
+            atributo = tipo.find(".//x:attribute", ns)
+            if atributo is not None:
+                tipo_array = next(v for k, v in atributo.attrib.items() if k.endswith("arrayType"))
+                self.tipos[nome] = TipoComplexo(nome, [], self._sem_prefixo(tipo_array).rstrip("[]"))
+                continue
+            campos = [
+                (elemento.get("name"), elemento.get("type"))
+                for elemento in tipo.iterfind(".//x:element", ns)
+            ]
+            self.tipos[nome] = TipoComplexo(nome, campos)
+
+        partes = {
+            mensagem.get("name"): self._sem_prefixo(mensagem.find("w:part", ns).get("type"))
+            for mensagem in raiz.iterfind("w:message", ns)
+            if mensagem.find("w:part", ns) is not None
+        }
+        self.operacoes: Dict[str, Tuple[str, str]] = {
+            nome[:-len("Request")]: (tipo, partes.get(f"{nome[:-len('Request')]}Response"))
+            for nome, tipo in partes.items()
+            if nome.startswith("busca") and nome.endswith("Request")
+        }
+
+    @staticmethod
+    def _sem_prefixo(tipo: str) -> str:
+        return tipo.split(":", 1)[1] if ":" in tipo else tipo
+
+
+# Faixa de itens por tipo de array (o restante usa FAIXA_PADRAO)
+FAIXAS_ITENS: Dict[str, Tuple[int, int]] = {
+    "proprietariosbci": (1, 3),
+    "proprietarioscadbci": (1, 3),
+    "subtipoproprietario": (0, 1),
+    "enderecoImov": (1, 2),
+    "endereco": (1, 2),
+    "testadasbci": (0, 3),
+    "testada": (0, 3),
+    "blocoItensBci": (40, 120),
+    "blocoItem": (40, 120),
+    "historico": (0, 35),
+    "subReceitasBci": (0, 2),
+    "subreceitabuscacadbci": (0, 2),
+    "zoneamentobci": (0, 2),
+    "anexo": (0, 1),
+    "itbis": (0, 2),
+}
+FAIXA_PADRAO = (0, 2)
+
+# Operação por cadastro -> módulo/dataset (mesmos nomes de CadastroService.MODULOS)
+MODULO_POR_OPERACAO: Dict[str, str] = {
+    "buscaEnderecoImovel": "enderecos",
+    "buscaProprietarios": "proprietarios",
+    "buscaTestadas": "testadas",
+    "buscaSubReceitas": "subreceitas",
+    "buscaZoneamento": "zoneamento",
+    "buscaAnexos": "anexos",
+    "buscaHistorico": "historico",
+    "buscaBlocoItens": "bci",
+    "buscaItbiCadastroImobiliario": "itbi",
+}
+
+
+def _tipos_modelo() -> Dict[str, type]:
+    """Campo -> tipo Python declarado nas dataclasses de model/data_models.py"""
+    tipos: Dict[str, type] = {}
+    for classe in vars(data_models).values():
+        if not (isinstance(classe, type) and is_dataclass(classe)):
+            continue
+        anotacoes = typing.get_type_hints(classe)
+        for campo in fields(classe):
+            argumentos = [a for a in typing.get_args(anotacoes[campo.name]) if a is not type(None)]
+            tipo = argumentos[0] if argumentos else anotacoes[campo.name]
+            if tipo in (int, float, str, date, datetime):
+                tipos.setdefault(campo.name, tipo)
+    return tipos
+
+
+TIPOS_MODELO = _tipos_modelo()
+
+
+@dataclass
+class DistribuicaoSintetica:
+    """
+    Distribuições dos dados sintéticos
+
+    Attributes:
+        modulos_vazios: Fração de cadastros sem registros, por módulo
+            (enderecos, proprietarios, ..., chaves de MODULO_POR_OPERACAO)
+        itens: Faixa (mínimo, máximo) de itens por tipo de array do WSDL,
+            sobrepondo FAIXAS_ITENS
+        campos_vazios: Fração dos campos opcionais (texto livre, áreas) vazios
+        anexo_kb_media: Tamanho médio do conteúdo de um anexo (KB, lognormal)
+        anexo_kb_desvio: Desvio do tamanho dos anexos (KB)
+        logradouros: Quantidade de logradouros distintos
+        repeticao_logradouros: Expoente Zipf da escolha do logradouro
+            (0 = uniforme; maior = poucos nomes concentram os cadastros)
+    """
+    modulos_vazios: Dict[str, float] = field(default_factory=lambda: {
+        "enderecos": 0.05, "proprietarios": 0.02, "testadas": 0.3, "subreceitas": 0.6,
+        "zoneamento": 0.5, "anexos": 0.85, "historico": 0.2, "bci": 0.05, "itbi": 0.7,
+    })
+    itens: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    campos_vazios: float = 0.5
+    anexo_kb_media: float = 200.0
+    anexo_kb_desvio: float = 300.0
+    logradouros: int = 120
+    repeticao_logradouros: float = 1.0
+
+LOGRADOUROS_BASE = [
+    "RUA JUIZ ABRANCHES", "RUA XV DE NOVEMBRO", "AVENIDA BRASIL", "RUA SETE DE SETEMBRO",
+    "RUA MARECHAL DEODORO", "RUA RUI BARBOSA", "AVENIDA GETULIO VARGAS", "RUA SANTOS DUMONT",
+    "RUA TIRADENTES", "RUA DOM PEDRO II", "RUA PARANA", "RUA BARAO DO RIO BRANCO",
+]
+NOMES_LOGRADOURO = [
+    "DAS FLORES", "DOS PINHEIROS", "DAS ARAUCARIAS", "SAO PAULO", "SANTA CATARINA", "DOS IMIGRANTES",
+    "PRESIDENTE VARGAS", "DAS PALMEIRAS", "DO COMERCIO", "DOS ESTUDANTES", "JOAO PESSOA", "DA LIBERDADE",
+]
+TIPOS_LOGRADOURO = ["RUA", "AVENIDA", "TRAVESSA", "ALAMEDA", "ESTRADA"]
+BAIRROS = ["CENTRO", "SAO MIGUEL", "ALVORADA", "SANTA CRUZ", "SAO JOSE", "INDUSTRIAL", "JARDIM"]
+OPERACOES_HISTORICO = ["1- Inclusão", "2- Alteração", "3- Exclusão"]
+USUARIOS = ["55 - ROBERTO PONCIO", "12 - MARIA SOUZA", "98 - INTEGRACAO GEO", "7 - JOAO SILVA"]
+
+
+class GeradorSintetico:
+    """
+    Gerador determinístico de respostas das operações busca*
+
+    Cada (operação, código) usa uma semente própria, então a resposta não
+    depende da ordem das requisições nem de quantas threads as fazem.
+    """
+
+    def __init__(
+        self,
+        total_cadastros: int = 10000,
+        densidade: float = 0.92,
+        semente: int = 42,
+        esquema: Optional[EsquemaWSDL] = None,
+        listagem_com_filhos: bool = False,
+        distribuicao: Optional[DistribuicaoSintetica] = None,
+        formato_datas: str = "br",
+    ):
+        """
+        Inicializa o gerador
+
+        Args:
+            total_cadastros: Maior código de cadastro gerado
+            densidade: Fração dos códigos 1..total que existem (o resto são lacunas)
+            semente: Semente global dos dados
+            esquema: Esquema do WSDL (padrão: wsdl/clevelandia.wsdl)
+            listagem_com_filhos: Preenche os arrays filhos na listagem geral
+                (o servidor real os devolve vazios)
+            distribuicao: Distribuições dos dados (padrão: DistribuicaoSintetica())
+            formato_datas: "br" (DD/MM/AAAA, como o servidor envia) ou "iso"
+                (como ficam nos datasets depois da normalização do cliente)
+        """
+        if formato_datas not in ("br", "iso"):
+            raise ValueError(f"Formato de datas inválido: {formato_datas}")
+        self.total_cadastros = total_cadastros
+        self.densidade = densidade
+        self.semente = semente
+        self.esquema = esquema or EsquemaWSDL()
+        self.listagem_com_filhos = listagem_com_filhos
+        self.distribuicao = distribuicao or DistribuicaoSintetica()
+        self.formato_datas = formato_datas
+        self._formato_data, self._formato_data_hora = (
+            ("%d/%m/%Y", "%d/%m/%Y %H:%M:%S") if formato_datas == "br" else ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S")
+        )
+        self._faixas_itens = {**FAIXAS_ITENS, **self.distribuicao.itens}
+        self._logradouros, self._pesos_logradouros = self._montar_logradouros()
+        # Conteúdo dos anexos: recortes de um bloco base64 fixo (gerar bytes
+        # aleatórios por anexo custaria mais que todo o resto do cadastro)
+        self._bloco_anexo = base64.b64encode(random.Random(semente).randbytes(48 * 1024)).decode("ascii")
+
+    def _montar_logradouros(self) -> Tuple[List[str], List[float]]:
+        """Nomes distintos e pesos acumulados (Zipf) para a escolha do logradouro"""
+        quantidade = max(self.distribuicao.logradouros, 1)
+        nomes = list(LOGRADOUROS_BASE[:quantidade])
+        for indice in itertools.count():
+            if len(nomes) >= quantidade:
+                break
+            tipo = TIPOS_LOGRADOURO[indice % len(TIPOS_LOGRADOURO)]
+            nome = NOMES_LOGRADOURO[(indice // len(TIPOS_LOGRADOURO)) % len(NOMES_LOGRADOURO)]
+            sufixo = indice // (len(TIPOS_LOGRADOURO) * len(NOMES_LOGRADOURO))
+            nomes.append(f"{tipo} {nome}" + (f" {sufixo + 1}" if sufixo else ""))
+        expoente = self.distribuicao.repeticao_logradouros
+        pesos = list(itertools.accumulate(1 / (posicao ** expoente) for posicao in range(1, quantidade + 1)))
+        return nomes, pesos
+
+    # ------------------- Sementes e existência -------------------
+    def _rng(self, *chave: Any) -> random.Random:
+        texto = ":".join(str(parte) for parte in (self.semente,) + chave)
+        return random.Random(int.from_bytes(hashlib.blake2b(texto.encode(), digest_size=8).digest(), "big"))
+
+    def existe(self, codigo: int) -> bool:
+        """Se o código corresponde a um cadastro (lacunas são determinísticas)"""
+        if not 1 <= codigo <= self.total_cadastros:
+            return False
+        return self._rng("existe", codigo).random() < self.densidade
+
+    def codigos(self, inicio: int = 1, fim: Optional[int] = None) -> Iterator[int]:
+        """Códigos existentes na faixa, em ordem"""
+        fim = self.total_cadastros if fim is None else min(fim, self.total_cadastros)
+        for codigo in range(max(1, inicio), fim + 1):
+            if self.existe(codigo):
+                yield codigo
+
+    # ------------------- Valores -------------------
+    @staticmethod
+    def _data(rng: random.Random, inicio_ano: int = 1990) -> date:
+        return date(inicio_ano, 1, 1) + timedelta(days=rng.randint(0, 365 * (2024 - inicio_ano)))
+
+    def _conteudo_anexo(self, rng: random.Random) -> str:
+        d = self.distribuicao
+        if d.anexo_kb_media <= 0:
+            return ""
+        sigma2 = math.log(1 + (d.anexo_kb_desvio / d.anexo_kb_media) ** 2)
+        tamanho = int(rng.lognormvariate(math.log(d.anexo_kb_media) - sigma2 / 2, sigma2 ** 0.5) * 1024)
+        tamanho -= tamanho % 4
+        deslocamento = rng.randrange(0, len(self._bloco_anexo), 4)
+        repeticoes = (deslocamento + tamanho) // len(self._bloco_anexo) + 1
+        return (self._bloco_anexo * repeticoes)[deslocamento:deslocamento + tamanho]
+
+    def _valor(self, campo: str, tipo: str, rng: random.Random, codigo: int) -> str:
+        """Valor textual de um campo simples (tipo do WSDL refinado pelo de model/data_models.py)"""
+        if campo == "codigo_cadastro":
+            return str(codigo)
+        if campo == "inscricao_imobiliaria":
+            return f"{codigo % 97:02d}.{codigo % 13:02d}.{codigo % 997:03d}.{codigo % 9973:04d}.001"
+        tipo_modelo = TIPOS_MODELO.get(campo)
+        if tipo == "xsd:dateTime" or campo == "data_hora" or tipo_modelo is datetime:
+            momento = datetime.combine(self._data(rng, 2000), datetime.min.time()) + timedelta(
+                seconds=rng.randint(0, 86399))
+            return momento.strftime(self._formato_data_hora)
+        if tipo == "xsd:date" or tipo_modelo is date or campo.startswith("data_") or campo == "data":
+            return self._data(rng).strftime(self._formato_data)
+        if campo == "situacao_cadastral" or campo == "situacao":
+            return str(rng.choice([s.value for s in SituacaoCadastral]))
+        if campo.startswith("ano_"):
+            return str(rng.randint(1990, 2024))
+        if campo == "tipo_cadastro":
+            return str(rng.choice([t.value for t in TipoCadastro]))
+        if campo == "tipo_endereco":
+            return str(rng.choice([t.value for t in TipoEndereco]))
+        if campo == "tipo_proprietario":
+            return str(rng.choice([t.value for t in TipoProprietario]))
+        if campo == "descricao_logradouro":
+            posicao = bisect.bisect(self._pesos_logradouros, rng.random() * self._pesos_logradouros[-1])
+            return self._logradouros[min(posicao, len(self._logradouros) - 1)]
+        if campo == "descricao_bairro":
+            return rng.choice(BAIRROS)
+        if campo == "descricao_cidade":
+            return "CLEVELANDIA"
+        if campo == "cep":
+            return "85530000"
+        if campo in ("codigo_pessoa", "codigo"):
+            return str(rng.randint(1, self.total_cadastros * 2))
+        if campo == "percentual":
+            return "100.0000"
+        if campo.startswith("coordenada_lat"):
+            return f"{-26.40 + rng.uniform(-0.05, 0.05):.6f}"
+        if campo.startswith("coordenada_long"):
+            return f"{-52.35 + rng.uniform(-0.05, 0.05):.6f}"
+        if campo == "operacao":
+            return rng.choice(OPERACOES_HISTORICO)
+        if campo == "usuario":
+            return rng.choice(USUARIOS)
+        if campo == "conteudo":
+            return self._conteudo_anexo(rng)
+        if campo in ("nome", "nome_download"):
+            return f"documento_{codigo}_{rng.randint(1, 999)}.pdf"
+        if campo == "tipo":
+            return "application/pdf"
+        vazio = rng.random() < self.distribuicao.campos_vazios
+        if campo.startswith("area_") or tipo == "xsd:float" or tipo_modelo is float:
+            return "" if vazio else f"{rng.lognormvariate(5.5, 0.8):.2f}"
+        if campo in ("metragem", "profundidade") or campo.startswith(("vvt_", "vvp_", "total_")):
+            return f"{rng.uniform(5, 50000):.4f}"
+        if tipo == "xsd:int" or tipo_modelo is int:
+            return str(rng.randint(1, 999))
+        return "" if vazio else f"TEXTO {rng.randint(1, 9999)}"
+
+    # ------------------- Estruturas -------------------
+    def _montar(self, tipo: str, rng: random.Random, codigo: int, filhos: bool = True) -> Any:
+        """Valor (dict/list/str) de um tipo do WSDL"""
+        nome = tipo.split(":", 1)[-1]
+        complexo = self.esquema.tipos.get(nome)
+        if complexo is None:
+            return None
+        if complexo.array:
+            if not filhos:
+                return []
+            minimo, maximo = self._faixas_itens.get(complexo.item_tipo, FAIXA_PADRAO)
+            return [self._montar(complexo.item_tipo, rng, codigo) for _ in range(rng.randint(minimo, maximo))]
+
+        registro = {}
+        for campo, tipo_campo in complexo.campos:
+            if tipo_campo.startswith("tns:"):
+                registro[campo] = self._montar(tipo_campo, rng, codigo, filhos)
+            else:
+                registro[campo] = self._valor(campo, tipo_campo, rng, codigo)
+        return registro
+
+    def cadastro(self, codigo: int) -> Dict[str, Any]:
+        """Registro da listagem geral (tipo cadastros)"""
+        return self._montar("cadastros", self._rng("cadastro", codigo), codigo, self.listagem_com_filhos)
+
+    def cadastro_completo(self, codigo: int) -> Dict[str, Any]:
+        """
+        Cadastro da listagem com os filhos que a carga no banco consome
+        (mesmos campos de DestinoBanco.CAMPOS_FILHOS)
+        """
+        cadastro = self.cadastro(codigo)
+        entrada = {"codigo_cadastro": str(codigo)}
+        cadastro["proprietariosbci"] = self.resposta("buscaProprietarios", entrada).get("proprietarios") or []
+        cadastro["enderecos"] = self.resposta("buscaEnderecoImovel", entrada).get("enderecoImoveis") or []
+        cadastro["zoneamentos"] = self.resposta("buscaZoneamento", entrada).get("zoneamentos") or []
+        return cadastro
+
+    def resposta(self, operacao: str, entrada: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Conteúdo do retorno de uma operação busca* (exceto a listagem geral)
+
+        Args:
+            operacao: Nome da operação no WSDL
+            entrada: Parâmetros recebidos (codigo_cadastro etc.)
+
+        Returns:
+            dict no formato do tipo de retorno da operação
+        """
+        _, tipo_retorno = self.esquema.operacoes[operacao]
+        try:
+            codigo = int(str(entrada.get("codigo_cadastro", "")).strip())
+        except ValueError:
+            codigo = 0
+        if not self.existe(codigo):
+            return {campo: ("" if not tipo.startswith("tns:") else [])
+                    for campo, tipo in self.esquema.tipos[tipo_retorno].campos}
+        rng = self._rng(operacao, codigo)
+        vazio = rng.random() < self.distribuicao.modulos_vazios.get(MODULO_POR_OPERACAO.get(operacao), 0.0)
+        return self._montar(tipo_retorno, rng, codigo, filhos=not vazio)
+
+    def registros_modulo(self, operacao: str, codigo: int) -> List[Dict[str, Any]]:
+        """
+        Registros do dataset do módulo para um cadastro: os itens da resposta
+        com o codigo_cadastro de vínculo (como CadastroService._tag)
+        """
+        resposta = self.resposta(operacao, {"codigo_cadastro": str(codigo)})
+        itens = next((v for v in resposta.values() if isinstance(v, list)), [])
+        registros = []
+        for item in itens:
+            item.setdefault("codigo_cadastro", str(codigo))
+            registros.append(item)
+        return registros
+
+    # ------------------- Serialização SOAP -------------------
+    def _xml(self, nome: str, valor: Any, tipo: str) -> str:
+        """Elemento rpc/encoded (arrays como <item>, tipos em xsi:type)"""
+        complexo = self.esquema.tipos.get(tipo.split(":", 1)[-1])
+        if complexo is None:
+            return f"<{nome}>{escape(str(valor))}</{nome}>"
+        if complexo.array:
+            itens = valor or []
+            corpo = "".join(self._xml("item", item, f"ns1:{complexo.item_tipo}") for item in itens)
+            return (f'<{nome} xsi:type="ns1:{complexo.nome}" '
+                    f'SOAP-ENC:arrayType="ns1:{complexo.item_tipo}[{len(itens)}]">{corpo}</{nome}>')
+        campos = dict(complexo.campos)
+        corpo = "".join(self._xml(campo, v, campos.get(campo, "xsd:string")) for campo, v in valor.items())
+        return f'<{nome} xsi:type="ns1:{complexo.nome}">{corpo}</{nome}>'
+
+    def _envelope(self, operacao: str) -> Tuple[str, str]:
+        abertura = (
+            f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<SOAP-ENV:Envelope xmlns:SOAP-ENV="{NS_SOAP_ENV}" xmlns:ns1="{self.esquema.namespace}" '
+            f'xmlns:xsd="{NS_XSD}" xmlns:xsi="{NS_XSI}" xmlns:SOAP-ENC="{NS_SOAP_ENC}" '
+            f'SOAP-ENV:encodingStyle="{NS_SOAP_ENC}"><SOAP-ENV:Body><ns1:{operacao}Response>'
+        )
+        return abertura, f"</ns1:{operacao}Response></SOAP-ENV:Body></SOAP-ENV:Envelope>"
+
+    def corpo_resposta(self, operacao: str, entrada: Dict[str, Any]) -> bytes:
+        """Corpo SOAP completo da resposta de uma operação por cadastro"""
+        abertura, fechamento = self._envelope(operacao)
+        _, tipo_retorno = self.esquema.operacoes[operacao]
+        retorno = self._xml("return", self.resposta(operacao, entrada), f"ns1:{tipo_retorno}")
+        return (abertura + retorno + fechamento).encode("utf-8")
+
+    def faixa_listagem(self, entrada: Dict[str, Any]) -> Tuple[int, int]:
+        """Faixa de códigos pedida em codigo_cadastro ("inicio-fim", código único ou vazio)"""
+        filtro = str(entrada.get("codigo_cadastro") or "").strip()
+        if not filtro:
+            return 1, self.total_cadastros
+        if "-" in filtro:
+            inicio, fim = filtro.split("-", 1)
+            return int(inicio), int(fim)
+        return int(filtro), int(filtro)
+
+    def corpo_listagem(self, entrada: Dict[str, Any], limite: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Corpo da buscaCadastroImobiliarioGeral em pedaços (listagens de
+        milhões de cadastros não são montadas em memória)
+
+        Args:
+            entrada: Parâmetros recebidos (codigo_cadastro "inicio-fim" opcional)
+            limite: Máximo de cadastros devolvidos (emula o teto do servidor)
+        """
+        operacao = "buscaCadastroImobiliarioGeral"
+        abertura, fechamento = self._envelope(operacao)
+        inicio, fim = self.faixa_listagem(entrada)
+
+        # A quantidade vai no arrayType: uma passada só de contagem, sem
+        # guardar os códigos (milhões de ints não cabem à toa na memória)
+        quantidade = sum(1 for _ in itertools.islice(self.codigos(inicio, fim), limite))
+
+        yield (abertura + '<return xsi:type="ns1:retornoBuscaCadbciGeral">'
+               f'<cadastros xsi:type="ns1:listaCadastros" '
+               f'SOAP-ENC:arrayType="ns1:cadastros[{quantidade}]">').encode("utf-8")
+        pedaco = []
+        for codigo in itertools.islice(self.codigos(inicio, fim), limite):
+            pedaco.append(self._xml("item", self.cadastro(codigo), "ns1:cadastros"))
+            if len(pedaco) >= 200:
+                yield "".join(pedaco).encode("utf-8")
+                pedaco = []
+        if pedaco:
+            yield "".join(pedaco).encode("utf-8")
+        agora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        yield (f"</cadastros><data_hora_ultima_alteracao>{agora}</data_hora_ultima_alteracao>"
+               f"</return>{fechamento}").encode("utf-8")
+
+
+# ------------------- Saída em fluxo -------------------
+def gerar_datasets(
+    gerador: GeradorSintetico,
+    base_dir: str,
+    formato: str = "jsonl",
+    inicio: int = 1,
+    fim: Optional[int] = None,
+    ao_progredir: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, str]:
+    """
+    Grava os datasets de data/json (cadastros + um por módulo) em fluxo
+
+    Um cadastro por vez é gerado e distribuído entre os DatasetWriter
+    abertos; a memória não depende do total de cadastros.
+
+    Args:
+        gerador: Gerador (use formato_datas="iso" para datasets iguais aos extraídos)
+        base_dir: Diretório base do FileStorageService (os arquivos vão em base_dir/json)
+        formato: "json" ou "jsonl"
+        inicio: Primeiro código
+        fim: Último código (padrão: total do gerador)
+        ao_progredir: Chamado a cada 10 mil cadastros com (cadastros, registros)
+
+    Returns:
+        { dataset: caminho }
+    """
+    from service.storage_service import FileStorageService
+
+    armazenamento = FileStorageService(base_dir)
+    escritores = {"cadastros": armazenamento.abrir_dataset_stream("cadastros", formato)}
+    for operacao, modulo in MODULO_POR_OPERACAO.items():
+        escritores[modulo] = armazenamento.abrir_dataset_stream(modulo, formato)
+    cadastros = registros = 0
+    try:
+        for codigo in gerador.codigos(inicio, fim):
+            escritores["cadastros"].escrever(gerador.cadastro(codigo))
+            registros += 1
+            for operacao, modulo in MODULO_POR_OPERACAO.items():
+                for registro in gerador.registros_modulo(operacao, codigo):
+                    escritores[modulo].escrever(registro)
+                    registros += 1
+            cadastros += 1
+            if ao_progredir and cadastros % 10000 == 0:
+                ao_progredir(cadastros, registros)
+    except BaseException:
+        for escritor in escritores.values():
+            escritor.descartar()
+        raise
+    if ao_progredir:
+        ao_progredir(cadastros, registros)
+    return {nome: escritor.fechar() for nome, escritor in escritores.items()}
+
+
+def gerar_corpos_soap(
+    gerador: GeradorSintetico,
+    diretorio: str,
+    operacoes: Optional[List[str]] = None,
+    inicio: int = 1,
+    fim: Optional[int] = None,
+    comprimir: bool = False,
+    ao_progredir: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, str]:
+    """
+    Grava corpos SOAP brutos de resposta, em fluxo
+
+    A listagem geral vira um único documento; cada operação por cadastro
+    vira um arquivo com um envelope por linha (os corpos gerados não têm
+    quebras de linha), pronto para alimentar benchmarks de parse.
+
+    Args:
+        gerador: Gerador (formato_datas="br", como o servidor envia)
+        diretorio: Diretório de saída
+        operacoes: Operações busca* (padrão: todas)
+        inicio: Primeiro código
+        fim: Último código (padrão: total do gerador)
+        comprimir: Grava .gz
+        ao_progredir: Chamado a cada 10 mil cadastros com (cadastros, bytes)
+
+    Returns:
+        { operação: caminho }
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    operacoes = operacoes or list(gerador.esquema.operacoes)
+    extensao = ".xml.gz" if comprimir else ".xml"
+
+    def abrir(nome: str):
+        caminho = os.path.join(diretorio, nome + extensao)
+        return caminho, (gzip.open(caminho, "wb", compresslevel=3) if comprimir else open(caminho, "wb"))
+
+    caminhos: Dict[str, str] = {}
+    fim = gerador.total_cadastros if fim is None else fim
+    total_bytes = 0
+    if "buscaCadastroImobiliarioGeral" in operacoes:
+        caminho, arquivo = abrir("buscaCadastroImobiliarioGeral")
+        with arquivo:
+            for pedaco in gerador.corpo_listagem({"codigo_cadastro": f"{inicio}-{fim}"}):
+                arquivo.write(pedaco)
+                total_bytes += len(pedaco)
+        caminhos["buscaCadastroImobiliarioGeral"] = caminho
+
+    por_cadastro = [op for op in operacoes if op != "buscaCadastroImobiliarioGeral"]
+    arquivos = {}
+    try:
+        for operacao in por_cadastro:
+            caminhos[operacao], arquivos[operacao] = abrir(operacao)
+        cadastros = 0
+        for codigo in gerador.codigos(inicio, fim):
+            entrada = {"codigo_cadastro": str(codigo)}
+            for operacao in por_cadastro:
+                corpo = gerador.corpo_resposta(operacao, entrada)
+                arquivos[operacao].write(corpo + b"\n")
+                total_bytes += len(corpo) + 1
+            cadastros += 1
+            if ao_progredir and cadastros % 10000 == 0:
+                ao_progredir(cadastros, total_bytes)
+    finally:
+        for arquivo in arquivos.values():
+            arquivo.close()
+    if ao_progredir:
+        ao_progredir(cadastros, total_bytes)
+    return caminhos
+
+
+def _ler_fracoes(pares: List[str]) -> Dict[str, float]:
+    """["anexos=0.9", "itbi=0.5"] -> {"anexos": 0.9, "itbi": 0.5}"""
+    fracoes = {}
+    for par in pares or []:
+        modulo, _, valor = par.partition("=")
+        if modulo not in MODULO_POR_OPERACAO.values():
+            raise argparse.ArgumentTypeError(f"Módulo desconhecido: {modulo}")
+        fracoes[modulo] = float(valor)
+    return fracoes
+
+
+def main(argumentos: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Gerador de dados sintéticos a partir do WSDL de Clevelândia")
+    parser.add_argument("saida_tipo", choices=["datasets", "soap"],
+                        help="datasets: data/json (cadastros + módulos); soap: corpos de resposta brutos")
+    parser.add_argument("--saida", required=True, help="Diretório base de saída")
+    parser.add_argument("--cadastros", type=int, default=10000, help="Maior código de cadastro")
+    parser.add_argument("--densidade", type=float, default=0.92)
+    parser.add_argument("--inicio", type=int, default=1)
+    parser.add_argument("--fim", type=int, default=None)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--wsdl", default="./wsdl/clevelandia.wsdl")
+    parser.add_argument("--formato", choices=["json", "jsonl"], default="jsonl", help="Formato dos datasets")
+    parser.add_argument("--operacoes", nargs="+", default=None, help="Operações busca* (soap)")
+    parser.add_argument("--gzip", action="store_true", help="Comprime os corpos SOAP")
+    parser.add_argument("--vazio", nargs="*", default=[], metavar="MODULO=FRACAO",
+                        help="Fração de cadastros sem registros no módulo (ex.: anexos=0.9)")
+    parser.add_argument("--campos-vazios", type=float, default=None)
+    parser.add_argument("--anexo-kb", type=float, default=None, help="Tamanho médio dos anexos (KB)")
+    parser.add_argument("--anexo-desvio-kb", type=float, default=None)
+    parser.add_argument("--logradouros", type=int, default=None, help="Logradouros distintos")
+    parser.add_argument("--repeticao-logradouros", type=float, default=None, help="Expoente Zipf dos logradouros")
+    args = parser.parse_args(argumentos)
+
+    distribuicao = DistribuicaoSintetica()
+    distribuicao.modulos_vazios.update(_ler_fracoes(args.vazio))
+    for atributo, valor in (("campos_vazios", args.campos_vazios), ("anexo_kb_media", args.anexo_kb),
+                            ("anexo_kb_desvio", args.anexo_desvio_kb), ("logradouros", args.logradouros),
+                            ("repeticao_logradouros", args.repeticao_logradouros)):
+        if valor is not None:
+            setattr(distribuicao, atributo, valor)
+
+    gerador = GeradorSintetico(
+        args.cadastros, args.densidade, args.semente, EsquemaWSDL(args.wsdl),
+        distribuicao=distribuicao, formato_datas="iso" if args.saida_tipo == "datasets" else "br",
+    )
+    inicio_tempo = time.perf_counter()
+
+    def progresso(cadastros: int, quantidade: int):
+        decorrido = time.perf_counter() - inicio_tempo
+        unidade = "registros" if args.saida_tipo == "datasets" else "bytes"
+        print(f"{cadastros:,} cadastros, {quantidade:,} {unidade} "
+              f"({cadastros / decorrido if decorrido else 0:,.0f} cadastros/s)", file=sys.stderr)
+
+    if args.saida_tipo == "datasets":
+        caminhos = gerar_datasets(gerador, args.saida, args.formato, args.inicio, args.fim, progresso)
+    else:
+        caminhos = gerar_corpos_soap(gerador, args.saida, args.operacoes, args.inicio, args.fim,
+                                     args.gzip, progresso)
+    for nome, caminho in caminhos.items():
+        print(f"{nome}: {caminho}")
+
+
+if __name__ == "__main__":
+    main()
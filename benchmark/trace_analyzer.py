@@ -0,0 +1,357 @@
+"""
+Trace Analyzer - Análise offline do rastreamento JSON Lines (APP_TRACE_FILE)
+Relatórios:
+- caminho crítico: a cadeia de spans que determinou a duração da execução,
+  com o tempo atribuído a cada tipo/módulo
+- cauda: p50/p95/p99 por módulo e os spans mais lentos acima do p95
+- trabalhadores: utilização de cada thread de E/S e os intervalos ociosos
+  entre unidades de trabalho
+
+Uso:
+    APP_TRACE_FILE=data/json/rastreamento.jsonl python main.py
+    python -m benchmark.trace_analyzer data/json/rastreamento.jsonl
+    python -m benchmark.trace_analyzer rastreamento.jsonl --execucao 3f2a... --json analise.json
+    python -m benchmark.trace_analyzer rastreamento.jsonl --execucao-distribuida noite-01
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import argparse
+import json
+import sys
+
+from interface.styles.colors import Colors
+
+
+def carregar_spans(caminho: str, execucao: Optional[str] = None,
+                   execucao_distribuida: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Lê os spans de uma execução do arquivo
+
+    Args:
+        caminho: Arquivo .jsonl gravado pelo RastreadorExecucao
+        execucao: Id da execução (padrão: a última finalizada no arquivo)
+        execucao_distribuida: Nome da extração distribuída; junta as execuções
+            de todos os workers dela (ver mesclar_execucoes)
+
+    Returns:
+        Spans da execução, na ordem do arquivo
+    """
+    por_execucao: Dict[str, List[Dict[str, Any]]] = {}
+    ultima = None
+    workers = []
+    with open(caminho, encoding="utf-8") as f:
+        for linha in f:
+            linha = linha.strip()
+            if not linha:
+                continue
+            try:
+                span = json.loads(linha)
+            except json.JSONDecodeError:
+                # Linha truncada (execução interrompida no meio da escrita)
+                continue
+            por_execucao.setdefault(span["execucao"], []).append(span)
+            if span["tipo"] == "execucao":
+                ultima = span["execucao"]
+                if execucao_distribuida and span.get("execucao_distribuida") == execucao_distribuida:
+                    workers.append(span["execucao"])
+    if execucao_distribuida:
+        if not workers:
+            raise ValueError(f"Execução distribuída {execucao_distribuida!r} não encontrada em {caminho}")
+        return mesclar_execucoes([por_execucao[w] for w in workers], execucao_distribuida)
+    escolhida = execucao or ultima or next(reversed(por_execucao), None)
+    if escolhida not in por_execucao:
+        raise ValueError(f"Execução {escolhida!r} não encontrada em {caminho}")
+    return por_execucao[escolhida]
+
+
+def mesclar_execucoes(execucoes: List[List[Dict[str, Any]]], nome: str) -> List[Dict[str, Any]]:
+    """
+    Junta as execuções dos workers de uma extração distribuída em uma só
+
+    Os ids dos spans só são únicos dentro de cada execução: passam a
+    "execucao:id". A raiz de cada worker vira um span "worker" filho de uma
+    raiz sintética que cobre todas; trabalhadores ganham o nome do worker
+    como prefixo (pids podem se repetir entre máquinas).
+
+    Args:
+        execucoes: Spans de cada execução de worker (com o span raiz)
+        nome: Nome da extração distribuída (id da raiz sintética)
+
+    Returns:
+        Spans mesclados, começando pela raiz sintética
+    """
+    raiz = {
+        "execucao": nome, "id": nome, "pai": None, "tipo": "execucao",
+        "nome": "extracao", "modo": "distribuida", "execucao_distribuida": nome,
+        "inicio": min(s["inicio"] for spans in execucoes for s in spans),
+        "fim": max(s["fim"] for spans in execucoes for s in spans),
+        "resultado": "ok",
+    }
+    raiz["duracao_ms"] = round((raiz["fim"] - raiz["inicio"]) * 1000, 3)
+    mesclados = [raiz]
+    for spans in execucoes:
+        worker = next((s.get("worker") for s in spans if s["tipo"] == "execucao"), None)
+        for span in spans:
+            novo = dict(span, id=f"{span['execucao']}:{span['id']}")
+            if span["tipo"] == "execucao":
+                novo.update(tipo="worker", pai=nome)
+            elif span.get("pai") is not None:
+                novo["pai"] = f"{span['execucao']}:{span['pai']}"
+            if worker and span.get("trabalhador"):
+                novo["trabalhador"] = f"{worker}/{span['trabalhador']}"
+            mesclados.append(novo)
+    return mesclados
+
+
+def _percentil(valores: List[float], fracao: float) -> float:
+    """Percentil por posição (valores já ordenados)"""
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(fracao * len(valores)))]
+
+
+def _rotulo(span: Dict[str, Any]) -> str:
+    return f"{span['tipo']}:{span['modulo']}" if span.get("modulo") else span["tipo"]
+
+
+def _raiz(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Span da execução; sem ele (execução interrompida), uma raiz sintética cobrindo tudo"""
+    for span in spans:
+        if span["tipo"] == "execucao":
+            return span
+    return {
+        "id": None, "tipo": "execucao",
+        "inicio": min(s["inicio"] for s in spans), "fim": max(s["fim"] for s in spans),
+    }
+
+
+def caminho_critico(spans: List[Dict[str, Any]], top: int = 10) -> Dict[str, Any]:
+    """
+    Caminho crítico da execução
+
+    Partindo do fim da raiz, desce no filho que terminou por último antes do
+    cursor, atribui ao pai o tempo em que nenhum filho do caminho estava
+    ativo e recua o cursor para o início do filho; o processo se repete em
+    cada nível. O resultado diz onde o tempo de parede foi de fato gasto.
+
+    Returns:
+        Duração, tempo por rótulo (tipo ou tipo:modulo) e os maiores trechos
+    """
+    raiz = _raiz(spans)
+    ids = {span["id"] for span in spans}
+    filhos: Dict[Any, List[Dict[str, Any]]] = {}
+    for span in spans:
+        if span is not raiz:
+            # Pai ausente (execução interrompida): pendura na raiz
+            pai = span.get("pai") if span.get("pai") in ids else raiz["id"]
+            filhos.setdefault(pai, []).append(span)
+    for lista in filhos.values():
+        lista.sort(key=lambda s: s["fim"], reverse=True)
+
+    trechos: List[Tuple[Dict[str, Any], float, float]] = []
+
+    def percorrer(span: Dict[str, Any], inicio: float, fim: float):
+        cursor = fim
+        for filho in filhos.get(span["id"], []):
+            if filho["inicio"] >= cursor or filho["fim"] <= inicio:
+                continue
+            fim_filho = min(filho["fim"], cursor)
+            if fim_filho < cursor:
+                trechos.append((span, fim_filho, cursor))
+            inicio_filho = max(filho["inicio"], inicio)
+            percorrer(filho, inicio_filho, fim_filho)
+            cursor = inicio_filho
+            if cursor <= inicio:
+                break
+        if cursor > inicio:
+            trechos.append((span, inicio, cursor))
+
+    percorrer(raiz, raiz["inicio"], raiz["fim"])
+
+    duracao = raiz["fim"] - raiz["inicio"]
+    por_rotulo: Dict[str, float] = {}
+    for span, inicio, fim in trechos:
+        rotulo = _rotulo(span) + ("" if span["tipo"] == "modulo" else " (próprio)")
+        por_rotulo[rotulo] = por_rotulo.get(rotulo, 0.0) + (fim - inicio)
+    maiores = sorted(trechos, key=lambda t: t[2] - t[1], reverse=True)[:top]
+    return {
+        "duracao_s": round(duracao, 3),
+        "spans_no_caminho": len({id(t[0]) for t in trechos}),
+        "por_rotulo": {
+            rotulo: {"segundos": round(segundos, 3), "participacao": round(segundos / duracao, 4) if duracao else 0.0}
+            for rotulo, segundos in sorted(por_rotulo.items(), key=lambda item: item[1], reverse=True)
+        },
+        "maiores_trechos": [
+            {
+                "rotulo": _rotulo(span),
+                "codigo_cadastro": span.get("codigo_cadastro"),
+                "trabalhador": span.get("trabalhador"),
+                "desde_inicio_s": round(inicio - raiz["inicio"], 3),
+                "segundos": round(fim - inicio, 3),
+            }
+            for span, inicio, fim in maiores
+        ],
+    }
+
+
+def cauda_latencia(spans: List[Dict[str, Any]], top: int = 10) -> Dict[str, Any]:
+    """
+    Latência por módulo e os spans de módulo mais lentos acima do p95 do módulo
+
+    Returns:
+        {"modulos": {modulo: quantis}, "outliers": [spans]}
+    """
+    por_modulo: Dict[str, List[Dict[str, Any]]] = {}
+    for span in spans:
+        if span["tipo"] == "modulo":
+            por_modulo.setdefault(span.get("modulo") or "?", []).append(span)
+
+    modulos = {}
+    outliers = []
+    for modulo, lista in por_modulo.items():
+        duracoes = sorted(s["duracao_ms"] for s in lista)
+        p50, p95, p99 = (_percentil(duracoes, q) for q in (0.5, 0.95, 0.99))
+        modulos[modulo] = {
+            "spans": len(lista),
+            "erros": sum(1 for s in lista if s.get("resultado") == "erro"),
+            "com_retentativa": sum(1 for s in lista if s.get("tentativas", 1) > 1),
+            "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": duracoes[-1],
+            "cauda_p99_p50": round(p99 / p50, 2) if p50 else None,
+        }
+        outliers += [s for s in lista if s["duracao_ms"] > p95]
+
+    outliers.sort(key=lambda s: s["duracao_ms"], reverse=True)
+    campos = ("modulo", "codigo_cadastro", "duracao_ms", "trabalhador", "operacao",
+              "tentativas", "status", "bytes_resposta", "resultado", "erro")
+    return {
+        "modulos": dict(sorted(modulos.items(), key=lambda item: item[1]["p99_ms"], reverse=True)),
+        "outliers": [{c: s.get(c) for c in campos if s.get(c) is not None} for s in outliers[:top]],
+    }
+
+
+def utilizacao_trabalhadores(spans: List[Dict[str, Any]], top: int = 10) -> Dict[str, Any]:
+    """
+    Utilização de cada trabalhador (unidades de trabalho = spans de módulo)
+
+    Ocupado é a soma das durações (uma thread faz uma unidade por vez); os
+    intervalos ociosos vão do início da execução ao primeiro span, entre
+    spans consecutivos e do último span ao fim.
+
+    Returns:
+        {"trabalhadores": {...}, "maiores_intervalos": [...]}
+    """
+    raiz = _raiz(spans)
+    janela = raiz["fim"] - raiz["inicio"]
+    por_trabalhador: Dict[str, List[Dict[str, Any]]] = {}
+    for span in spans:
+        if span["tipo"] == "modulo":
+            por_trabalhador.setdefault(span.get("trabalhador") or "?", []).append(span)
+
+    trabalhadores = {}
+    intervalos: List[Dict[str, Any]] = []
+    for trabalhador, lista in sorted(por_trabalhador.items()):
+        lista.sort(key=lambda s: s["inicio"])
+        ocupado = sum(s["fim"] - s["inicio"] for s in lista)
+        lacunas = []
+        anterior_fim = raiz["inicio"]
+        for span in lista:
+            lacunas.append((anterior_fim, span["inicio"]))
+            anterior_fim = max(anterior_fim, span["fim"])
+        lacunas.append((anterior_fim, raiz["fim"]))
+        lacunas = [(a, b) for a, b in lacunas if b - a > 0]
+        duracoes = sorted(b - a for a, b in lacunas)
+        trabalhadores[trabalhador] = {
+            "spans": len(lista),
+            "ocupado_s": round(ocupado, 3),
+            "utilizacao": round(ocupado / janela, 4) if janela else 0.0,
+            "ocioso_s": round(sum(duracoes), 3),
+            "intervalos": len(duracoes),
+            "intervalo_p95_ms": round(_percentil(duracoes, 0.95) * 1000, 2),
+            "intervalo_max_ms": round(duracoes[-1] * 1000, 2) if duracoes else 0.0,
+        }
+        intervalos += [
+            {"trabalhador": trabalhador, "desde_inicio_s": round(a - raiz["inicio"], 3),
+             "ms": round((b - a) * 1000, 2)}
+            for a, b in lacunas
+        ]
+
+    utilizacoes = [t["utilizacao"] for t in trabalhadores.values()]
+    return {
+        "janela_s": round(janela, 3),
+        "utilizacao_media": round(sum(utilizacoes) / len(utilizacoes), 4) if utilizacoes else 0.0,
+        "trabalhadores": trabalhadores,
+        "maiores_intervalos": sorted(intervalos, key=lambda i: i["ms"], reverse=True)[:top],
+    }
+
+
+def analisar(spans: List[Dict[str, Any]], top: int = 10) -> Dict[str, Any]:
+    """Relatório completo de uma execução"""
+    raiz = _raiz(spans)
+    return {
+        "execucao": spans[0]["execucao"] if spans else None,
+        "nome": raiz.get("nome"),
+        "modo": raiz.get("modo"),
+        "spans": len(spans),
+        "caminho_critico": caminho_critico(spans, top),
+        "cauda": cauda_latencia(spans, top),
+        "trabalhadores": utilizacao_trabalhadores(spans, top),
+    }
+
+
+def _imprimir(relatorio: Dict[str, Any]):
+    critico = relatorio["caminho_critico"]
+    print(Colors.header(
+        f"Execução {relatorio['execucao']} ({relatorio.get('modo') or relatorio.get('nome')}) "
+        f"— {relatorio['spans']} spans, {critico['duracao_s']:.2f}s"
+    ))
+
+    print(Colors.stats("\nCaminho crítico"))
+    for rotulo, dados in list(critico["por_rotulo"].items())[:12]:
+        print(f"  {rotulo:<28} {dados['segundos']:>9.3f}s {dados['participacao']:>7.1%}")
+
+    print(Colors.stats("\nCauda por módulo (ms)"))
+    print(f"  {'modulo':<16} {'spans':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>9} {'p99/p50':>8} {'erros':>6}")
+    for modulo, q in relatorio["cauda"]["modulos"].items():
+        print(f"  {modulo:<16} {q['spans']:>6} {q['p50_ms']:>8.1f} {q['p95_ms']:>8.1f} {q['p99_ms']:>8.1f} "
+              f"{q['max_ms']:>9.1f} {q['cauda_p99_p50'] or 0:>8.1f} {q['erros']:>6}")
+    for s in relatorio["cauda"]["outliers"]:
+        print(Colors.warning(
+            f"  ↳ {s.get('modulo')} {s.get('codigo_cadastro')}: {s['duracao_ms']:.1f}ms "
+            f"({s.get('tentativas', 1)} tentativa(s), {s.get('operacao', '?')}, {s.get('trabalhador')})"
+        ))
+
+    trabalhadores = relatorio["trabalhadores"]
+    print(Colors.stats(f"\nTrabalhadores (utilização média {trabalhadores['utilizacao_media']:.1%})"))
+    for nome, t in trabalhadores["trabalhadores"].items():
+        print(f"  {nome:<28} {t['spans']:>6} spans {t['utilizacao']:>7.1%} ocupado "
+              f"| ocioso {t['ocioso_s']:.2f}s, p95 {t['intervalo_p95_ms']:.1f}ms, max {t['intervalo_max_ms']:.1f}ms")
+    for i in trabalhadores["maiores_intervalos"][:5]:
+        print(f"  ↳ {i['trabalhador']} parado {i['ms']:.1f}ms a partir de {i['desde_inicio_s']:.2f}s")
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Análise offline do rastreamento de spans (APP_TRACE_FILE)")
+    parser.add_argument("arquivo", help="Arquivo .jsonl do rastreamento")
+    parser.add_argument("--execucao", default=None, help="Id da execução (padrão: a última do arquivo)")
+    parser.add_argument("--execucao-distribuida", default=None,
+                        help="Nome da extração distribuída: analisa os workers juntos")
+    parser.add_argument("--top", type=int, default=10, help="Itens nas listas de outliers e intervalos")
+    parser.add_argument("--json", default=None, help="Grava o relatório completo neste arquivo")
+    args = parser.parse_args(argumentos)
+
+    try:
+        spans = carregar_spans(args.arquivo, args.execucao, args.execucao_distribuida)
+    except (OSError, ValueError) as e:
+        print(Colors.error(f"❌ {e}"))
+        return 1
+
+    relatorio = analisar(spans, args.top)
+    _imprimir(relatorio)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
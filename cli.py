@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+CLI headless - Sistema de Extração de Cadastros Imobiliários
+Ponto de entrada não interativo para cron e orquestração: sem menu, pausas
+ou animações. Cada subcomando importa só os serviços que usa (zeep/lxml na
+extração, SQLAlchemy no banco) e termina com um resumo JSON na saída
+padrão; as mensagens dos serviços vão para stderr.
+
+Subcomandos:
+    extract  Extração completa para os datasets JSON (serial, pipeline ou distribuída)
+    sync     Extração em pipeline gravando direto no banco
+    load     Carga de um arquivo JSON no banco (incremental ou recarga completa)
+    stats    Estatísticas do banco
+    export   Regenera os datasets JSON/JSONL a partir do banco
+
+Uso:
+    python cli.py extract --modo pipeline
+    python cli.py sync
+    python cli.py load data/json/cadastros_completo_20250101_120000.json --recarga
+    python cli.py stats --modo estimado
+    python cli.py export --formato jsonl --resumo /var/log/cadastros/export.json
+
+Código de saída: 0 sucesso, 1 falha, 2 uso incorreto, 130 interrompido.
+"""
+
+import time
+
+_INICIO = time.perf_counter()
+
+from typing import Any, Callable, Dict, List, Optional
+from contextlib import redirect_stdout
+from datetime import datetime
+import argparse
+import json
+import sys
+
+from config.settings import settings
+
+
+# ---------------- Subcomandos ----------------
+# Cada função importa e monta o que o subcomando precisa e devolve a ação a
+# executar; o tempo até ela ficar pronta é o cold start do subcomando.
+
+def preparar_extract(args: argparse.Namespace) -> Callable[[], Dict[str, Any]]:
+    from service.metrics_service import instalar_exportacao_por_sinal
+    instalar_exportacao_por_sinal()
+
+    if args.distribuida:
+        from service.shard_service import ExtracaoDistribuida
+        extracao = ExtracaoDistribuida(args.distribuida)
+
+        def executar():
+            arquivos = extracao.executar_local(args.processos, formato=args.formato)
+            return {"sucesso": bool(arquivos), "arquivos": arquivos}
+        return executar
+
+    from service.cadastro_service import CadastroService
+    if args.modo:
+        settings.app.extraction_mode = args.modo
+    servico = CadastroService()
+
+    def executar():
+        arquivos = servico.extrair_completo()
+        return {"sucesso": bool(arquivos), "arquivos": arquivos}
+    return executar
+
+
+def preparar_sync(args: argparse.Namespace) -> Callable[[], Dict[str, Any]]:
+    from service.metrics_service import instalar_exportacao_por_sinal
+    from service.cadastro_service import CadastroService
+    instalar_exportacao_por_sinal()
+    servico = CadastroService()
+
+    def executar():
+        arquivos = servico.extrair_pipeline(destino="banco")
+        carga = servico.resultado_carga or {}
+        return {
+            "sucesso": bool(carga.get("sucesso")),
+            "arquivos": arquivos,
+            "carga": _resumir_carga(carga),
+        }
+    return executar
+
+
+def preparar_load(args: argparse.Namespace) -> Callable[[], Dict[str, Any]]:
+    from controller.database_controller import DatabaseController
+    controlador = DatabaseController()
+
+    def executar():
+        resultado = controlador.processar_arquivo_json_para_banco(
+            args.arquivo, recarga_completa=args.recarga
+        )
+        return _resumir_carga(resultado)
+    return executar
+
+
+def preparar_stats(args: argparse.Namespace) -> Callable[[], Dict[str, Any]]:
+    from controller.database_controller import DatabaseController
+    controlador = DatabaseController()
+
+    def executar():
+        estatisticas = controlador.obter_estatisticas_banco(args.modo)
+        return {"sucesso": bool(estatisticas), "estatisticas": estatisticas}
+    return executar
+
+
+def preparar_export(args: argparse.Namespace) -> Callable[[], Dict[str, Any]]:
+    from controller.database_controller import DatabaseController
+    controlador = DatabaseController()
+
+    def executar():
+        return controlador.exportar_banco_para_json(args.formato)
+    return executar
+
+
+def _resumir_carga(resultado: Dict[str, Any]) -> Dict[str, Any]:
+    """Resultado de carga sem a lista completa de erros (só as 10 primeiras)"""
+    resumo = dict(resultado)
+    if "erros_detalhes" in resumo:
+        resumo["erros_detalhes"] = list(resumo["erros_detalhes"])[:10]
+    return resumo
+
+
+SUBCOMANDOS = {
+    "extract": preparar_extract,
+    "sync": preparar_sync,
+    "load": preparar_load,
+    "stats": preparar_stats,
+    "export": preparar_export,
+}
+
+
+# ---------------- Execução ----------------
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Extração e carga de cadastros imobiliários sem interação (cron/orquestração)",
+    )
+    parser.add_argument("--progresso", choices=["auto", "barra", "log", "silencioso"], default=None,
+                        help="Exibição do progresso em stderr (padrão: APP_PROGRESS_MODE)")
+    parser.add_argument("--resumo", default=None,
+                        help="Grava também o resumo JSON neste arquivo")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_extract = sub.add_parser("extract", help="Extração completa para os datasets JSON")
+    p_extract.add_argument("--modo", choices=["serial", "pipeline"], default=None,
+                           help="Padrão: APP_EXTRACTION_MODE")
+    p_extract.add_argument("--distribuida", metavar="EXECUCAO", default=None,
+                           help="Extração em shards com processos locais (identificador da execução)")
+    p_extract.add_argument("--processos", type=int, default=None,
+                           help="Processos da extração distribuída (padrão: APP_SHARD_WORKERS)")
+    p_extract.add_argument("--formato", choices=["json", "jsonl"], default="json",
+                           help="Formato dos datasets mesclados da extração distribuída")
+
+    sub.add_parser("sync", help="Extração em pipeline gravando direto no banco")
+
+    p_load = sub.add_parser("load", help="Carga de um arquivo JSON no banco")
+    p_load.add_argument("arquivo", nargs="?", default=None,
+                        help="Arquivo com {'cadastros': [...]} (padrão: cadastros_completo_* mais recente)")
+    p_load.add_argument("--recarga", action="store_true",
+                        help="Recarga completa via tabelas sombra em vez de incremental")
+
+    p_stats = sub.add_parser("stats", help="Estatísticas do banco")
+    p_stats.add_argument("--modo", choices=["agregado", "estimado", "exato"], default="agregado")
+
+    p_export = sub.add_parser("export", help="Regenera os datasets a partir do banco")
+    p_export.add_argument("--formato", choices=["json", "jsonl"], default="json")
+    return parser
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argumentos)
+    if args.progresso:
+        settings.app.progress_mode = args.progresso
+
+    resumo: Dict[str, Any] = {
+        "comando": args.comando,
+        "iniciado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    codigo = 1
+    # Mensagens, barras e avisos dos serviços em stderr; stdout só com o resumo
+    with redirect_stdout(sys.stderr):
+        try:
+            executar = SUBCOMANDOS[args.comando](args)
+            resumo["inicializacao_s"] = round(time.perf_counter() - _INICIO, 3)
+            resultado = executar()
+            resumo["sucesso"] = bool(resultado.get("sucesso"))
+            resumo["resultado"] = resultado
+            codigo = 0 if resumo["sucesso"] else 1
+        except KeyboardInterrupt:
+            resumo.update(sucesso=False, erro="interrompido")
+            codigo = 130
+        except Exception as e:
+            resumo.update(sucesso=False, erro=f"{type(e).__name__}: {e}")
+            codigo = 1
+
+    from service.ledger_service import livro
+    if livro.ultima is not None:
+        resumo["execucao"] = livro.ultima
+    resumo["duracao_s"] = round(time.perf_counter() - _INICIO, 3)
+    resumo["codigo_saida"] = codigo
+
+    texto = json.dumps(resumo, ensure_ascii=False, default=str)
+    print(texto)
+    if args.resumo:
+        with open(args.resumo, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,6 +27,27 @@ class AppConfig:
     save_interval: int
     max_interval_size: int
     request_delay: float
+    listing_mode: str = "unico"
+    listing_workers: int = 4
+    listing_max_records: int = 500
+    listing_max_code: int = 10000
+    shard_size: int = 500
+    shard_workers: int = 4
+    lease_url: str = ""
+    lease_ttl: int = 120
+    extraction_mode: str = "serial"
+    pipeline_io_workers: int = 8
+    pipeline_processes: int = -1  # -1: um por núcleo; 0: parse na thread de E/S
+    pipeline_queue_size: int = 256
+    pipeline_sink: str = "arquivos"
+    metrics_port: int = 0
+    metrics_host: str = "127.0.0.1"
+    profile: bool = False
+    trace_file: str = ""
+    ledger_file: str = "./data/json/historico_execucoes.jsonl"
+    progress_mode: str = "auto"
+    progress_interval: float = 0.0
+    statistics_backend: str = "auto"  # auto: numpy se instalado; numpy; acumulador
 
 
 class Settings:
@@ -55,7 +76,31 @@ class Settings:
             log_level=os.getenv('APP_LOG_LEVEL', 'INFO'),
             save_interval=int(os.getenv('APP_SAVE_INTERVAL', '1000')),
             max_interval_size=int(os.getenv('APP_MAX_INTERVAL_SIZE', '100')),
-            request_delay=float(os.getenv('APP_REQUEST_DELAY', '0.15'))
+            request_delay=float(os.getenv('APP_REQUEST_DELAY', '0.15')),
+            listing_mode=os.getenv('APP_LISTING_MODE', 'unico'),
+            listing_workers=int(os.getenv('APP_LISTING_WORKERS', '4')),
+            listing_max_records=int(os.getenv('APP_LISTING_MAX_RECORDS', '500')),
+            listing_max_code=int(os.getenv('APP_LISTING_MAX_CODE', '10000')),
+            shard_size=int(os.getenv('APP_SHARD_SIZE', '500')),
+            shard_workers=int(os.getenv('APP_SHARD_WORKERS', '4')),
+            lease_url=os.getenv('APP_LEASE_URL', ''),
+            lease_ttl=int(os.getenv('APP_LEASE_TTL', '120')),
+            extraction_mode=os.getenv('APP_EXTRACTION_MODE', 'serial'),
+            pipeline_io_workers=int(os.getenv('APP_PIPELINE_IO_WORKERS', '8')),
+            pipeline_processes=int(os.getenv('APP_PIPELINE_PROCESSES', '-1')),
+            pipeline_queue_size=int(os.getenv('APP_PIPELINE_QUEUE_SIZE', '256')),
+            pipeline_sink=os.getenv('APP_PIPELINE_SINK', 'arquivos'),
+            metrics_port=int(os.getenv('APP_METRICS_PORT', '0')),
+            metrics_host=os.getenv('APP_METRICS_HOST', '127.0.0.1'),
+            profile=os.getenv('APP_PROFILE', '0').lower() in ('1', 'true', 'sim'),
+            trace_file=os.getenv('APP_TRACE_FILE', ''),
+            ledger_file=os.getenv(
+                'APP_LEDGER_FILE',
+                os.path.join(os.getenv('APP_DATA_DIR', './data'), 'json', 'historico_execucoes.jsonl')
+            ),
+            progress_mode=os.getenv('APP_PROGRESS_MODE', 'auto'),
+            progress_interval=float(os.getenv('APP_PROGRESS_INTERVAL', '0')),
+            statistics_backend=os.getenv('APP_STATISTICS_BACKEND', 'auto')
         )
         
         # CPF de monitoração
@@ -48,12 +48,14 @@ class DatabaseController:
             CLIInterface.mostrar_erro(f"Erro na inicialização: {e}")
             return False
 
-    def processar_arquivo_json_para_banco(self, caminho_arquivo: Optional[str] = None) -> Dict[str, Any]:
+    def processar_arquivo_json_para_banco(self, caminho_arquivo: Optional[str] = None,
+                                          recarga_completa: bool = False) -> Dict[str, Any]:
         """
         Processa arquivo JSON mais recente ou especificado para o banco
 
         Args:
             caminho_arquivo: Caminho específico ou None para usar o mais recente
+            recarga_completa: Substitui todos os dados via tabelas sombra
 
         Returns:
             Resultado do processamento
@@ -68,7 +70,7 @@ class DatabaseController:
                 arquivos = self.file_service.listar_arquivos_salvos("completo")
                 if not arquivos:
                     return {'sucesso': False, 'erro': 'Nenhum arquivo encontrado'}
-                caminho_arquivo = arquivos[0]  # Mais recente
+                caminho_arquivo = arquivos[-1]  # Mais recente (nomes com timestamp, ordem crescente)
 
             # Garantir que caminho_arquivo não é None
             if not caminho_arquivo:
@@ -82,7 +84,9 @@ class DatabaseController:
 
             # Processar arquivo (garantir que database_service existe)
             if self.database_service:
-                resultado = self.database_service.processar_arquivo_json(caminho_arquivo)
+                resultado = self.database_service.processar_arquivo_json(
+                    caminho_arquivo, recarga_completa=recarga_completa
+                )
 
                 # Exibir resultado
                 self._exibir_resultado_processamento(resultado)
@@ -95,10 +99,13 @@ class DatabaseController:
             CLIInterface.mostrar_erro(f"Erro no processamento: {e}")
             return {'sucesso': False, 'erro': str(e)}
 
-    def obter_estatisticas_banco(self) -> Dict[str, Any]:
+    def obter_estatisticas_banco(self, modo: str = "agregado") -> Dict[str, Any]:
         """
         Obtém e exibe estatísticas do banco de dados
 
+        Args:
+            modo: 'agregado', 'estimado' ou 'exato'
+
         Returns:
             Estatísticas do banco
         """
@@ -108,7 +115,7 @@ class DatabaseController:
 
         try:
             if self.database_service:
-                stats = self.database_service.obter_estatisticas_completas()
+                stats = self.database_service.obter_estatisticas_completas(modo)
 
                 if stats:
                     self._exibir_estatisticas_banco(stats)
@@ -121,6 +128,39 @@ class DatabaseController:
             CLIInterface.mostrar_erro(f"Erro ao obter estatísticas: {e}")
             return {}
 
+    def exportar_banco_para_json(self, formato: str = "json") -> Dict[str, Any]:
+        """
+        Regenera os datasets (cadastros, proprietários, endereços, zoneamento)
+        a partir do banco de dados
+
+        Args:
+            formato: 'json' ou 'jsonl'
+
+        Returns:
+            Resultado da exportação
+        """
+        if not self.database_service:
+            if not self.inicializar_banco():
+                return {'sucesso': False, 'erro': 'Falha na inicialização do banco'}
+
+        try:
+            print(Colors.info(f"📤 Exportando dados do banco ({formato})..."))
+            resultado = self.database_service.exportar_datasets(
+                formato=formato, file_service=self.file_service
+            )
+
+            if resultado.get('sucesso'):
+                print(Colors.success("✅ Exportação concluída"))
+                for nome, info in resultado['arquivos'].items():
+                    print(f"  • {nome}: {info['registros']} registros → {info['arquivo']}")
+                print(f"  • Tempo: {resultado.get('tempo_processamento', 0):.2f} segundos")
+
+            return resultado
+
+        except Exception as e:
+            CLIInterface.mostrar_erro(f"Erro na exportação: {e}")
+            return {'sucesso': False, 'erro': str(e)}
+
     def testar_conexao_banco(self) -> bool:
         """
         Testa conexão com o banco de dados
@@ -188,6 +228,7 @@ class DatabaseController:
             print(f"  • Total de registros: {resultado.get('total_registros', 0)}")
             print(f"  • Inseridos: {resultado.get('inseridos', 0)}")
             print(f"  • Atualizados: {resultado.get('atualizados', 0)}")
+            print(f"  • Inalterados: {resultado.get('inalterados', 0)}")
             print(f"  • Erros: {resultado.get('erros', 0)}")
 
             tempo = resultado.get('tempo_processamento', 0)
@@ -212,6 +253,27 @@ class DatabaseController:
         print(f"  📍 Endereços: {stats.get('total_enderecos', 0)}")
         print(f"  🗺️ Zoneamentos: {stats.get('total_zoneamentos', 0)}")
 
+        if stats.get('estimado'):
+            print(Colors.info("  (contagens estimadas pelo catálogo do PostgreSQL)"))
+
+        if stats.get('tipos_situacao'):
+            print("\n📈 Situações cadastrais:")
+            for situacao, total in stats['tipos_situacao'].items():
+                print(f"  • Situação {situacao}: {total}")
+
+        if stats.get('tipos_categoria'):
+            print("\n🏷️ Categorias:")
+            for categoria, total in stats['tipos_categoria'].items():
+                print(f"  • {categoria}: {total}")
+
+        terreno = stats.get('distribuicao_areas', {}).get('terreno', {})
+        if terreno.get('count'):
+            print(f"\n🏞️ Área de terreno: média {terreno['media']:.2f} m² | "
+                  f"mediana {terreno['mediana']:.2f} m² ({terreno['count']} cadastros)")
+
+        if stats.get('atualizado_em'):
+            print(Colors.info(f"\n  Atualizado em: {stats['atualizado_em']}"))
+
     def executar_workflow_completo(self) -> Dict[str, Any]:
         """
         Executa workflow completo: inicializar banco + processar arquivo mais recente
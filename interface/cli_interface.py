@@ -3,6 +3,8 @@ CLI Interface - Interface de linha de comando estilizada
 Responsável por toda a apresentação visual e interação com usuário
 """
 
+import json
+import threading
 import time
 import sys
 from datetime import datetime
@@ -72,11 +74,13 @@ class CLIInterface:
                     return "extrair"
                 elif escolha == "2":
                     return "banco"
+                elif escolha == "3":
+                    return "distribuida"
                 elif escolha == "0":
                     print(Colors.warning("👋 Saindo do sistema..."))
                     return "sair"
                 else:
-                    print(Colors.error("❌ Opção inválida! Digite 1, 2 ou 0."))
+                    print(Colors.error("❌ Opção inválida! Digite 1, 2, 3 ou 0."))
             except KeyboardInterrupt:
                 print(Colors.warning("\n👋 Saindo do sistema..."))
                 return "sair"
@@ -195,6 +199,59 @@ class CLIInterface:
                     f"  • Situação {Colors.info(str(situacao))}: {Colors.success(str(count))} cadastros"
                 )
 
+        for nome, distribuicao in stats.get("distribuicao_areas", {}).items():
+            if distribuicao.get("count") and distribuicao.get("quantis"):
+                print(f"\n📐 Área {nome} ({distribuicao['count']} cadastros):")
+                quantis = " | ".join(
+                    f"{rotulo}: {valor:.2f}" for rotulo, valor in distribuicao["quantis"].items()
+                )
+                print(f"  • {Colors.info(quantis)} m²")
+
+    @staticmethod
+    def mostrar_metricas_soap(operacoes):
+        """Exibe as operações SOAP que mais consumiram tempo (ver RegistroMetricas.resumo)"""
+        if not operacoes:
+            return
+        print(f"\n{Colors.stats('⏱️ OPERAÇÕES SOAP POR TEMPO CONSUMIDO')}")
+        print(Colors.stats(SEPARATOR_THIN))
+
+        for op in operacoes:
+            latencia = op["latencia_ms"] if op["chamadas"] else op["rede_ms"]
+            quantis = " | ".join(
+                f"{rotulo}: {valor:.0f}ms" for rotulo, valor in latencia.items() if valor is not None
+            )
+            participacao = f"{op['participacao'] * 100:.1f}%"
+            print(
+                f"  • {Colors.info(op['operacao'])}: {Colors.warning(participacao)}"
+                f" | {op['requisicoes']} req | {quantis}"
+                f" | {op['bytes_resposta_medio'] / 1024:.1f} KB/resp"
+            )
+            if op["retentativas"] or op["fallbacks"] or op["requisicoes_com_falha"]:
+                falhas = ", ".join(f"{nome}: {qtd}" for nome, qtd in op["falhas"].items())
+                print(
+                    f"    {Colors.error(str(op['requisicoes_com_falha']))} falhas"
+                    f" | {op['retentativas']} retentativas | {op['fallbacks']} fallbacks"
+                    + (f" ({falhas})" if falhas else "")
+                )
+
+    @staticmethod
+    def mostrar_perfil(relatorio, caminho=None, funcoes=3):
+        """Exibe o resumo do perfil por fase (ver PerfilExecucao.relatorio)"""
+        print(f"\n{Colors.stats('🔬 PERFIL POR FASE')}")
+        print(Colors.stats(SEPARATOR_THIN))
+
+        for nome, fase in relatorio.get("fases", {}).items():
+            pico = f"{fase['pico_memoria_bytes'] / 1024 / 1024:.1f} MB"
+            print(
+                f"  • {Colors.info(nome)}: {Colors.warning(str(fase['tempo_s']) + 's')}"
+                f" | {fase['entradas']} entradas | pico {pico}"
+            )
+            for funcao in fase["top_funcoes"][:funcoes]:
+                print(f"      {funcao['tempo_proprio_s']:.3f}s  {funcao['funcao']} ({funcao['local']})")
+
+        if caminho:
+            print(f"  📁 Relatório completo: {Colors.info(caminho)}")
+
     @staticmethod
     def mostrar_amostra_dados(cadastros, limite=3):
         """Exibe amostra dos dados extraídos"""
@@ -250,14 +307,48 @@ class CLIInterface:
         print(f"\r{' ' * 50}\r", end="")
 
 
+def _duracao(segundos: float) -> str:
+    """Segundos em H:MM:SS (ou M:SS abaixo de uma hora)"""
+    minutos, segundos = divmod(int(round(segundos)), 60)
+    horas, minutos = divmod(minutos, 60)
+    return f"{horas}:{minutos:02d}:{segundos:02d}" if horas else f"{minutos}:{segundos:02d}"
+
+
 class ProgressTracker:
     """Classe para tracking de progresso detalhado
     Compatível com dois modos:
     - Modo novo: ProgressTracker(total=...)
     - Modo antigo: ProgressTracker(total_intervalos)
+
+    atualizar() só guarda a posição (sem formatar nem escrever); uma thread
+    daemon desenha a linha em intervalo fixo com vazão (requisições,
+    cadastros e bytes por segundo, suavizados por média móvel exponencial),
+    taxa de falhas e ETA. Modos de exibição:
+    - 'barra': linha colorida reescrita no terminal
+    - 'log': uma linha JSON por intervalo (execuções sem TTY, coletores de log)
+    - 'silencioso': nada
+    - 'auto': 'barra' em terminal, 'log' caso contrário
     """
 
-    def __init__(self, total: int = 0, total_intervalos: int = None):
+    MODOS = ("auto", "barra", "log", "silencioso")
+    # Intervalo padrão entre desenhos, por modo (segundos)
+    INTERVALOS = {"barra": 0.5, "log": 10.0}
+    # Peso do intervalo mais recente na média móvel das taxas
+    SUAVIZACAO = 0.3
+
+    def __init__(self, total: int = 0, total_intervalos: int = None, modo: str = "auto",
+                 intervalo: float = 0.0, fonte=None, detalhe=None, saida=None):
+        """
+        Args:
+            total: Quantidade de itens (posição final de atualizar)
+            total_intervalos: Compat com o modo antigo
+            modo: 'auto', 'barra', 'log' ou 'silencioso'
+            intervalo: Segundos entre desenhos (0 = padrão do modo)
+            fonte: Função sem argumentos que devolve os totais correntes
+                {"requisicoes", "bytes", "falhas"} (ex.: RegistroMetricas.totais)
+            detalhe: Função que devolve um texto extra, avaliada só ao desenhar
+            saida: Stream de escrita (padrão: sys.stdout)
+        """
         # Compat: se chamarem com total_intervalos, usa-o; senão usa total
         self.total = (
             int(total_intervalos) if total_intervalos is not None else int(total)
@@ -267,32 +358,164 @@ class ProgressTracker:
 
         # Estado de progresso
         self.atual = 0
+        self.extra = ""
         self.intervalos_processados = 0
         self.cadastros_totais = 0
         self.inicio_tempo = datetime.now()
         self.requisicoes_realizadas = 0
 
+        # Exibição
+        self.saida = saida or sys.stdout
+        if modo not in self.MODOS:
+            modo = "auto"
+        if modo == "auto":
+            modo = "barra" if getattr(self.saida, "isatty", lambda: False)() else "log"
+        self.modo = modo
+        self.intervalo = intervalo if intervalo and intervalo > 0 else self.INTERVALOS.get(modo, 0.5)
+        self.fonte = fonte
+        self.detalhe = detalhe
+
+        # Ticker (iniciado no primeiro atualizar)
+        self._thread = None
+        self._parar = None
+        self._encerrado = False
+        self._inicio = time.perf_counter()
+        self._anterior = None
+        self._taxas = {}
+
     # ===== API NOVA (usada pelo CadastroService) =====
     def atualizar(self, atual: int, extra: str = ""):
-        """Atualiza a posição atual (1..total) e imprime uma linha de status."""
+        """Registra a posição atual (1..total); o desenho fica com o ticker."""
         self.atual = max(0, int(atual))
-        porcentagem = (self.atual / self.total) * 100 if self.total else 0.0
+        self.extra = extra
+        if self._thread is None and not self._encerrado and self.modo != "silencioso":
+            self._iniciar_ticker()
+
+    def finalizar(self):
+        """Para o ticker e desenha o estado final (idempotente)."""
+        if self._thread is None:
+            self._encerrado = True
+            return
+        self._parar.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        if not self._encerrado:
+            self._encerrado = True
+            self._desenhar(final=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.finalizar()
+
+    def _iniciar_ticker(self):
+        self._parar = threading.Event()
+        self._anterior = (time.perf_counter(), 0, self._totais_fonte())
+        self._thread = threading.Thread(target=self._tick, name="progresso", daemon=True)
+        self._thread.start()
+
+    def _tick(self):
+        no_fim = False
+        while not self._parar.wait(self.intervalo):
+            # Para quem não chama finalizar(): encerra quando a posição fica
+            # no total por um intervalo inteiro
+            if no_fim and self.atual >= self.total:
+                self._encerrado = True
+                self._desenhar(final=True)
+                return
+            self._desenhar()
+            no_fim = bool(self.total) and self.atual >= self.total
+
+    def _totais_fonte(self) -> dict:
+        if self.fonte is None:
+            return {}
+        try:
+            return self.fonte() or {}
+        except Exception:
+            return {}
+
+    def _medir(self) -> dict:
+        """Taxas suavizadas desde o desenho anterior, falhas e ETA"""
+        agora = time.perf_counter()
+        totais = self._totais_fonte()
+        atual = self.atual
+        instante, posicao, totais_anteriores = self._anterior
+        decorrido = agora - instante
+        if decorrido > 0:
+            amostras = {"cadastros": (atual - posicao) / decorrido}
+            for chave in ("requisicoes", "bytes"):
+                if chave in totais:
+                    amostras[chave] = (totais[chave] - totais_anteriores.get(chave, 0)) / decorrido
+            for chave, valor in amostras.items():
+                media = self._taxas.get(chave)
+                self._taxas[chave] = valor if media is None else (
+                    self.SUAVIZACAO * valor + (1 - self.SUAVIZACAO) * media
+                )
+            self._anterior = (agora, atual, totais)
+
+        requisicoes = totais.get("requisicoes", 0)
+        vazao = self._taxas.get("cadastros", 0.0)
+        restante = max(self.total - atual, 0)
+        return {
+            "atual": atual,
+            "total": self.total,
+            "percentual": round(atual / self.total * 100, 2) if self.total else 0.0,
+            "decorrido_s": round(agora - self._inicio, 1),
+            "cadastros_por_s": round(vazao, 2),
+            "requisicoes_por_s": round(self._taxas["requisicoes"], 2) if "requisicoes" in self._taxas else None,
+            "bytes_por_s": round(self._taxas["bytes"]) if "bytes" in self._taxas else None,
+            "taxa_falha": round(totais.get("falhas", 0) / requisicoes, 4) if requisicoes else None,
+            "eta_s": round(restante / vazao, 1) if vazao > 0 and restante else (0.0 if not restante else None),
+        }
+
+    def _texto_detalhe(self) -> str:
+        if self.detalhe is None:
+            return ""
+        try:
+            return self.detalhe()
+        except Exception:
+            # Leitura concorrente de estruturas em atualização: pula este desenho
+            return ""
+
+    def _desenhar(self, final: bool = False):
+        medida = self._medir()
+        detalhe = self._texto_detalhe()
+        if self.modo == "log":
+            linha = {"evento": "progresso_final" if final else "progresso", **medida}
+            if self.extra:
+                linha["extra"] = self.extra
+            if detalhe:
+                linha["detalhe"] = detalhe
+            self.saida.write(json.dumps(linha, ensure_ascii=False) + "\n")
+            self.saida.flush()
+            return
 
         # Barra de 40 chars
-        cheio = int(porcentagem // 2.5)
-        if cheio > 40:
-            cheio = 40
+        cheio = min(int(medida["percentual"] // 2.5), 40)
         barra = Colors.success(PROGRESS_BAR_FULL * cheio) + Colors.warning(
             PROGRESS_BAR_EMPTY * (40 - cheio)
         )
-
-        sufixo = f" — {extra}" if extra else ""
-        print(
-            f"\r[{barra}] {Colors.stats(f'{porcentagem:5.1f}%')}  "
-            f"{Colors.info(f'{self.atual}/{self.total}')}{sufixo}",
-            end="",
-            flush=True,
-        )
+        partes = [f"{medida['cadastros_por_s']:.1f} cad/s"]
+        if medida["requisicoes_por_s"] is not None:
+            partes.append(f"{medida['requisicoes_por_s']:.1f} req/s")
+        if medida["bytes_por_s"] is not None:
+            partes.append(f"{medida['bytes_por_s'] / 1_000_000:.2f} MB/s")
+        if medida["taxa_falha"]:
+            partes.append(Colors.warning(f"falhas {medida['taxa_falha']:.1%}"))
+        if medida["eta_s"] is not None and not final:
+            partes.append(Colors.colorize(f"ETA {_duracao(medida['eta_s'])}", Colors.TIME))
+        if final:
+            partes.append(Colors.colorize(f"em {_duracao(medida['decorrido_s'])}", Colors.TIME))
+        if detalhe:
+            partes.append(detalhe)
+        sufixo = f" — {self.extra}" if self.extra and not final else ""
+        percentual = Colors.stats(f"{medida['percentual']:5.1f}%")
+        posicao = Colors.info(f"{medida['atual']}/{self.total}")
+        fim_linha = "\n" if final else ""
+        # \033[K limpa o resto da linha anterior (que pode ter sido mais longa)
+        self.saida.write(f"\r[{barra}] {percentual}  {posicao}{sufixo} | {' | '.join(partes)}\033[K{fim_linha}")
+        self.saida.flush()
 
     # ===== API ANTIGA (mantida por compatibilidade) =====
     def atualizar_intervalo(self, cadastros_encontrados):
@@ -36,6 +36,7 @@ MENU_ASCII = """
 │                                                 │
 │  1️⃣  ➤ Extrair cadastros (SOAP API)              │
 │  2️⃣  ➤ Operações de banco de dados               │
+│  3️⃣  ➤ Extração distribuída (shards)             │
 │  0️⃣  ➤ Sair do Sistema                           │
 │                                                 │
 ╰─────────────────────────────────────────────────╯
@@ -54,6 +55,9 @@ DATABASE_MENU_ASCII = """
 │  4️⃣  ➤ Workflow completo                         │
 │  5️⃣  ➤ Ver estatísticas                          │
 │  6️⃣  ➤ Listar arquivos                           │
+│  7️⃣  ➤ Recarga completa (tabelas sombra)         │
+│  8️⃣  ➤ Estatísticas estimadas (instantâneas)     │
+│  9️⃣  ➤ Exportar banco para JSON                  │
 │  0️⃣  ➤ Voltar ao menu principal                  │
 ╰─────────────────────────────────────────────────╯
 """
@@ -5,16 +5,22 @@ Clevelandia Municipal - Sistema Completo
 """
 
 from service.cadastro_service import CadastroService
+from service.shard_service import ExtracaoDistribuida
+from service.metrics_service import instalar_exportacao_por_sinal
 from controller.database_controller import DatabaseController
 from interface.cli_interface import CLIInterface
 from interface.styles.colors import Colors
 from interface.styles.ascii_art import *
 import time
+from datetime import datetime
 
 
 def main():
     """Função principal com interface estilizada completa"""
 
+    # kill -USR1 <pid> grava data/json/metricas_soap.json durante a extração
+    instalar_exportacao_por_sinal()
+
     # Animação de abertura estilizada
     CLIInterface.animacao_inicio()
 
@@ -29,6 +35,8 @@ def main():
             executar_extracao()
         elif escolha == "banco":
             executar_operacoes_banco()
+        elif escolha == "distribuida":
+            executar_extracao_distribuida()
 
 
 def executar_operacoes_banco():
@@ -58,6 +66,12 @@ def executar_operacoes_banco():
                 db_controller.obter_estatisticas_banco()
             elif escolha == "6":
                 db_controller.listar_arquivos_disponiveis()
+            elif escolha == "7":
+                db_controller.processar_arquivo_json_para_banco(recarga_completa=True)
+            elif escolha == "8":
+                db_controller.obter_estatisticas_banco(modo="estimado")
+            elif escolha == "9":
+                db_controller.exportar_banco_para_json()
             else:
                 print(Colors.error("❌ Opção inválida!"))
 
@@ -114,6 +128,31 @@ def executar_extracao():
     input(Colors.menu("🔹 Pressione ENTER para voltar ao menu principal..."))
 
 
+def executar_extracao_distribuida():
+    """Executa a extração em shards com processos worker locais"""
+
+    try:
+        execucao = input(
+            Colors.info(f"🔹 Identificador da execução [{datetime.now():%Y%m%d}]: ")
+        ).strip() or f"{datetime.now():%Y%m%d}"
+
+        extracao = ExtracaoDistribuida(execucao)
+        resultados = extracao.executar_local()
+
+        if resultados:
+            mostrar_resultado_sucesso(resultados)
+        else:
+            mostrar_resultado_erro({"erro": "Falha desconhecida"})
+
+    except KeyboardInterrupt:
+        print(f"\n{Colors.warning('⚠️  Extração interrompida pelo usuário')}")
+    except Exception as e:
+        CLIInterface.mostrar_erro(f"Erro inesperado: {str(e)}")
+
+    print(f"\n{Colors.info(SEPARATOR_THIN)}")
+    input(Colors.menu("🔹 Pressione ENTER para voltar ao menu principal..."))
+
+
 def mostrar_resultado_sucesso(resultados):
     """Exibe resultado de sucesso com animações"""
 
@@ -0,0 +1,216 @@
+"""
+Cobertura de códigos - Conjunto de inteiros representado por intervalos
+Guarda os códigos de cadastro vistos como faixas contíguas [inicio, fim]
+(run-length), permitindo enumerar lacunas e combinar coberturas de execuções
+"""
+
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from bisect import bisect_right
+import json
+import os
+
+
+Intervalo = Tuple[int, int]
+
+
+class ConjuntoIntervalos:
+    """
+    Conjunto de códigos inteiros armazenado como intervalos disjuntos e ordenados
+
+    Memória proporcional ao número de faixas, não ao de códigos: uma extração
+    com ~92% de densidade em 10000 códigos cabe em poucas centenas de pares.
+    Adições em ordem crescente (o caso da extração) estendem a última faixa
+    em O(1); adições fora de ordem custam uma busca binária.
+    """
+
+    def __init__(self, intervalos: Optional[Iterable[Intervalo]] = None):
+        """
+        Inicializa o conjunto
+
+        Args:
+            intervalos: Faixas iniciais (inicio, fim), inclusivas
+        """
+        self._inicios: List[int] = []
+        self._fins: List[int] = []
+        self._total = 0
+        for inicio, fim in intervalos or []:
+            self.adicionar_intervalo(inicio, fim)
+
+    @classmethod
+    def de_codigos(cls, codigos: Iterable[int]) -> "ConjuntoIntervalos":
+        """Cria o conjunto a partir de códigos avulsos"""
+        conjunto = cls()
+        for codigo in codigos:
+            conjunto.adicionar(codigo)
+        return conjunto
+
+    # ------------------- Inserção -------------------
+    def adicionar(self, codigo: int):
+        """Adiciona um código"""
+        if self._fins:
+            fim = self._fins[-1]
+            # Caminho rápido: código igual ou logo após a última faixa
+            if codigo == fim + 1:
+                self._fins[-1] = codigo
+                self._total += 1
+                return
+            if self._inicios[-1] <= codigo <= fim:
+                return
+        self.adicionar_intervalo(codigo, codigo)
+
+    def adicionar_intervalo(self, inicio: int, fim: int):
+        """Adiciona todos os códigos de inicio a fim (inclusive)"""
+        if fim < inicio:
+            return
+
+        # Faixas que tocam ou se sobrepõem a [inicio, fim] são fundidas
+        esquerda = bisect_right(self._fins, inicio - 2)
+        direita = bisect_right(self._inicios, fim + 1)
+
+        if esquerda < direita:
+            inicio = min(inicio, self._inicios[esquerda])
+            fim = max(fim, self._fins[direita - 1])
+            removidos = sum(
+                self._fins[i] - self._inicios[i] + 1 for i in range(esquerda, direita)
+            )
+        else:
+            removidos = 0
+
+        self._inicios[esquerda:direita] = [inicio]
+        self._fins[esquerda:direita] = [fim]
+        self._total += (fim - inicio + 1) - removidos
+
+    # ------------------- Consulta -------------------
+    def __contains__(self, codigo: int) -> bool:
+        indice = bisect_right(self._inicios, codigo) - 1
+        return indice >= 0 and codigo <= self._fins[indice]
+
+    def __len__(self) -> int:
+        """Quantidade de códigos cobertos"""
+        return self._total
+
+    def __bool__(self) -> bool:
+        return bool(self._inicios)
+
+    def __eq__(self, outro: object) -> bool:
+        if not isinstance(outro, ConjuntoIntervalos):
+            return NotImplemented
+        return self._inicios == outro._inicios and self._fins == outro._fins
+
+    def __repr__(self) -> str:
+        faixas = ", ".join(f"{i}-{f}" if i != f else str(i) for i, f in list(self.intervalos())[:5])
+        mais = ", ..." if len(self._inicios) > 5 else ""
+        return f"ConjuntoIntervalos([{faixas}{mais}], codigos={self._total})"
+
+    @property
+    def menor(self) -> Optional[int]:
+        return self._inicios[0] if self._inicios else None
+
+    @property
+    def maior(self) -> Optional[int]:
+        return self._fins[-1] if self._fins else None
+
+    @property
+    def quantidade_intervalos(self) -> int:
+        return len(self._inicios)
+
+    def intervalos(self) -> Iterator[Intervalo]:
+        """Faixas (inicio, fim) em ordem crescente"""
+        return zip(self._inicios, self._fins)
+
+    def lacunas(self, inicio: Optional[int] = None, fim: Optional[int] = None) -> Iterator[Intervalo]:
+        """
+        Faixas de códigos ausentes
+
+        Args:
+            inicio: Limite inferior (padrão: menor código coberto)
+            fim: Limite superior (padrão: maior código coberto)
+
+        Yields:
+            (inicio, fim) de cada lacuna, em ordem crescente
+        """
+        if inicio is None:
+            inicio = self.menor
+        if fim is None:
+            fim = self.maior
+        if inicio is None or fim is None or fim < inicio:
+            return
+
+        proximo = inicio
+        for faixa_inicio, faixa_fim in self.intervalos():
+            if faixa_fim < proximo:
+                continue
+            if faixa_inicio > fim:
+                break
+            if faixa_inicio > proximo:
+                yield proximo, faixa_inicio - 1
+            proximo = faixa_fim + 1
+        if proximo <= fim:
+            yield proximo, fim
+
+    # ------------------- Álgebra -------------------
+    def copia(self) -> "ConjuntoIntervalos":
+        conjunto = ConjuntoIntervalos()
+        conjunto._inicios = list(self._inicios)
+        conjunto._fins = list(self._fins)
+        conjunto._total = self._total
+        return conjunto
+
+    def uniao(self, outro: "ConjuntoIntervalos") -> "ConjuntoIntervalos":
+        """Códigos presentes em qualquer um dos conjuntos"""
+        resultado = self.copia()
+        for inicio, fim in outro.intervalos():
+            resultado.adicionar_intervalo(inicio, fim)
+        return resultado
+
+    def diferenca(self, outro: "ConjuntoIntervalos") -> "ConjuntoIntervalos":
+        """Códigos deste conjunto ausentes no outro (merge linear das faixas)"""
+        resultado = ConjuntoIntervalos()
+        faixas_outro = list(outro.intervalos())
+        j = 0
+        for inicio, fim in self.intervalos():
+            atual = inicio
+            while j < len(faixas_outro) and faixas_outro[j][1] < atual:
+                j += 1
+            k = j
+            while k < len(faixas_outro) and faixas_outro[k][0] <= fim:
+                outro_inicio, outro_fim = faixas_outro[k]
+                if outro_inicio > atual:
+                    resultado.adicionar_intervalo(atual, outro_inicio - 1)
+                atual = max(atual, outro_fim + 1)
+                if outro_fim >= fim:
+                    break
+                k += 1
+            if atual <= fim:
+                resultado.adicionar_intervalo(atual, fim)
+        return resultado
+
+    __or__ = uniao
+    __sub__ = diferenca
+
+    # ------------------- Persistência -------------------
+    def para_dict(self) -> Dict[str, Any]:
+        return {
+            'total_codigos': self._total,
+            'intervalos': [[inicio, fim] for inicio, fim in self.intervalos()]
+        }
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "ConjuntoIntervalos":
+        return cls((int(inicio), int(fim)) for inicio, fim in dados.get('intervalos', []))
+
+    def salvar(self, caminho: str):
+        """Grava o conjunto em JSON (substituição atômica)"""
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.para_dict(), f, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "ConjuntoIntervalos":
+        """Lê um conjunto salvo; arquivo inexistente resulta em conjunto vazio"""
+        if not os.path.exists(caminho):
+            return cls()
+        with open(caminho, "r", encoding="utf-8") as f:
+            return cls.de_dict(json.load(f))
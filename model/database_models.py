@@ -4,9 +4,10 @@ Define as tabelas e relacionamentos do banco de dados
 """
 
 from sqlalchemy import (
-    Column, Integer, String, Text, Float, DateTime, Boolean,
-    ForeignKey, JSON, Index, UniqueConstraint
+    Column, Integer, String, Text, Float, Date, DateTime, Boolean, Numeric,
+    ForeignKey, Index, UniqueConstraint
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +15,13 @@ from datetime import datetime
 
 Base = declarative_base()
 
+# Categoria derivada do tipo de cadastro
+CATEGORIAS_TIPO_CADASTRO = {
+    1: "terreno",
+    2: "unidade",
+    3: "rural"
+}
+
 
 class CadastroImobiliario(Base):
     """Tabela principal de cadastros imobiliários"""
@@ -22,6 +30,11 @@ class CadastroImobiliario(Base):
         Index('idx_codigo_cadastro', 'codigo_cadastro'),
         Index('idx_situacao', 'situacao'),
         Index('idx_categoria', 'categoria'),
+        Index('idx_hash_conteudo', 'codigo_cadastro', 'hash_conteudo'),
+        Index('idx_dados_originais', 'dados_originais', postgresql_using='gin',
+              postgresql_ops={'dados_originais': 'jsonb_path_ops'}),
+        Index('idx_data_cadastro', 'data_cadastro'),
+        Index('idx_created_at_brin', 'created_at', postgresql_using='brin'),
         {'schema': 'public'}
     )
 
@@ -34,14 +47,17 @@ class CadastroImobiliario(Base):
     area_construida = Column(Float)
     area_construida_averbada = Column(Float)
     area_total_construida = Column(Float)
-    data_cadastro = Column(String(20))
+    data_cadastro = Column(Date)
 
     # Campos de auditoria
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
-    # Dados JSON original para preservar estrutura completa
-    dados_originais = Column(JSON)
+    # Dados JSON original para preservar estrutura completa (JSONB indexado por GIN)
+    dados_originais = Column(JSONB)
+
+    # Hash SHA-256 da forma canônica de dados_originais (detecção de mudanças)
+    hash_conteudo = Column(String(64))
 
     # Relacionamentos
     proprietarios = relationship("Proprietario", back_populates="cadastro", cascade="all, delete-orphan")
@@ -56,12 +72,7 @@ class CadastroImobiliario(Base):
         self.ativo = self.situacao == "1"
 
         # Define o valor de "categoria" com base em "tipo_cadastro"
-        tipo_cadastro_map = {
-            1: "terreno",
-            2: "unidade",
-            3: "rural"
-        }
-        self.categoria = tipo_cadastro_map.get(self.tipo_cadastro, "desconhecido")
+        self.categoria = CATEGORIAS_TIPO_CADASTRO.get(self.tipo_cadastro, "desconhecido")
 
 
 class Proprietario(Base):
@@ -69,6 +80,8 @@ class Proprietario(Base):
     __tablename__ = 'proprietarios'
     __table_args__ = (
         Index('idx_cadastro_proprietario', 'cadastro_id'),
+        Index('idx_percentual_proprietario', 'percentual'),
+        Index('idx_vigencia_proprietario', 'data_ini_vigencia'),
         {'schema': 'public'}
     )
 
@@ -77,7 +90,9 @@ class Proprietario(Base):
     codigo_pessoa = Column(String(50))
     tipo_proprietario = Column(Integer)
     situacao = Column(Integer)
-    percentual = Column(String(20))
+    percentual = Column(Numeric(7, 4))
+    data_ini_vigencia = Column(Date)
+    data_fim_vigencia = Column(Date)
 
     # Relacionamento
     cadastro = relationship("CadastroImobiliario", back_populates="proprietarios")
@@ -97,7 +112,7 @@ class Endereco(Base):
     codigo_cidade = Column(Integer)
     codigo_bairro = Column(Integer)
     codigo_logradouro = Column(Integer)
-    cep = Column(String(10))
+    cep = Column(String(8))  # Só dígitos; inteiro perderia o zero à esquerda (01310-100)
     descricao_cidade = Column(String(100))
     descricao_bairro = Column(String(100))
     descricao_logradouro = Column(String(200))
@@ -136,6 +151,7 @@ class ProcessamentoLog(Base):
     total_registros = Column(Integer)
     registros_inseridos = Column(Integer)
     registros_atualizados = Column(Integer)
+    registros_inalterados = Column(Integer)
     registros_erro = Column(Integer)
     tempo_processamento = Column(Float)  # em segundos
     status = Column(String(50))  # 'sucesso', 'erro', 'parcial'
@@ -144,3 +160,92 @@ class ProcessamentoLog(Base):
     # Auditoria
     processado_em = Column(DateTime, default=func.now())
     processado_por = Column(String(100), default='sistema')
+
+
+class EstatisticaBanco(Base):
+    """Agregados pré-calculados, atualizados ao final de cada carga"""
+    __tablename__ = 'estatisticas_banco'
+    __table_args__ = {'schema': 'public'}
+
+    id = Column(Integer, primary_key=True)
+    total_cadastros = Column(Integer)
+    total_proprietarios = Column(Integer)
+    total_enderecos = Column(Integer)
+    total_zoneamentos = Column(Integer)
+    tipos_situacao = Column(JSONB)
+    tipos_categoria = Column(JSONB)
+    distribuicao_areas = Column(JSONB)
+
+    atualizado_em = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+# Migrações incrementais aplicadas após create_all (que não altera tabelas existentes)
+MIGRACOES_SCHEMA = [
+    "ALTER TABLE public.cadastros_imobiliarios ADD COLUMN IF NOT EXISTS hash_conteudo VARCHAR(64)",
+    "CREATE INDEX IF NOT EXISTS idx_hash_conteudo ON public.cadastros_imobiliarios (codigo_cadastro, hash_conteudo)",
+    "ALTER TABLE public.processamento_logs ADD COLUMN IF NOT EXISTS registros_inalterados INTEGER",
+    """
+    DO $$
+    BEGIN
+        IF (SELECT data_type FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'cadastros_imobiliarios'
+              AND column_name = 'dados_originais') = 'json' THEN
+            ALTER TABLE public.cadastros_imobiliarios
+                ALTER COLUMN dados_originais TYPE JSONB USING dados_originais::jsonb;
+        END IF;
+    END $$
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_dados_originais ON public.cadastros_imobiliarios "
+    "USING gin (dados_originais jsonb_path_ops)",
+    r"""
+    DO $$
+    DECLARE
+        descartados INTEGER;
+    BEGIN
+        IF (SELECT data_type FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'cadastros_imobiliarios'
+              AND column_name = 'data_cadastro') = 'character varying' THEN
+            -- Texto fora dos dois formatos conhecidos vira NULL; o aviso traz a contagem
+            SELECT count(*) INTO descartados FROM public.cadastros_imobiliarios
+            WHERE trim(data_cadastro) <> ''
+              AND data_cadastro !~ '^\d{4}-\d{2}-\d{2}' AND data_cadastro !~ '^\d{2}/\d{2}/\d{4}';
+            IF descartados > 0 THEN
+                RAISE WARNING 'data_cadastro: % registro(s) com data não reconhecida convertidos para NULL', descartados;
+            END IF;
+            ALTER TABLE public.cadastros_imobiliarios ALTER COLUMN data_cadastro TYPE DATE USING (
+                CASE
+                    WHEN data_cadastro ~ '^\d{4}-\d{2}-\d{2}' THEN substr(data_cadastro, 1, 10)::date
+                    WHEN data_cadastro ~ '^\d{2}/\d{2}/\d{4}' THEN to_date(substr(data_cadastro, 1, 10), 'DD/MM/YYYY')
+                END
+            );
+        END IF;
+        IF (SELECT data_type FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'proprietarios'
+              AND column_name = 'percentual') = 'character varying' THEN
+            SELECT count(*) INTO descartados FROM public.proprietarios
+            WHERE trim(percentual) <> '' AND trim(percentual) !~ '^-?\d+([.,]\d+)?$';
+            IF descartados > 0 THEN
+                RAISE WARNING 'percentual: % registro(s) não numéricos convertidos para NULL', descartados;
+            END IF;
+            ALTER TABLE public.proprietarios ALTER COLUMN percentual TYPE NUMERIC(7, 4) USING (
+                CASE
+                    WHEN trim(percentual) ~ '^-?\d+([.,]\d+)?$' THEN replace(trim(percentual), ',', '.')::numeric
+                END
+            );
+        END IF;
+        -- CEP gravado com máscara (VARCHAR(10), "01310-100") passa a só dígitos
+        IF (SELECT character_maximum_length FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'enderecos'
+              AND column_name = 'cep') > 8 THEN
+            ALTER TABLE public.enderecos ALTER COLUMN cep TYPE VARCHAR(8)
+                USING nullif(regexp_replace(cep, '\D', '', 'g'), '');
+        END IF;
+    END $$
+    """,
+    "ALTER TABLE public.proprietarios ADD COLUMN IF NOT EXISTS data_ini_vigencia DATE",
+    "ALTER TABLE public.proprietarios ADD COLUMN IF NOT EXISTS data_fim_vigencia DATE",
+    "CREATE INDEX IF NOT EXISTS idx_data_cadastro ON public.cadastros_imobiliarios (data_cadastro)",
+    "CREATE INDEX IF NOT EXISTS idx_created_at_brin ON public.cadastros_imobiliarios USING brin (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_percentual_proprietario ON public.proprietarios (percentual)",
+    "CREATE INDEX IF NOT EXISTS idx_vigencia_proprietario ON public.proprietarios (data_ini_vigencia)",
+]
@@ -0,0 +1,193 @@
+"""
+Async Load Repository - Gravação assíncrona em lote via asyncpg
+Envia cada lote com copy_records_to_table para tabelas temporárias e aplica
+um upsert que só toca linhas cujo hash de conteúdo mudou
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import json
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql
+
+from model.database_models import (
+    CadastroImobiliario, Proprietario, Endereco, Zoneamento
+)
+from repository.database_repository import montar_campos_cadastro, MONTADORES_FILHOS
+
+
+TABELAS_FILHAS: List[Tuple[Table, str]] = [
+    (Proprietario.__table__, 'proprietariosbci'),
+    (Endereco.__table__, 'enderecos'),
+    (Zoneamento.__table__, 'zoneamentos'),
+]
+
+_DIALETO = postgresql.dialect()
+
+
+class AsyncLoadRepository:
+    """
+    Repository assíncrono sobre uma conexão asyncpg
+    Reaproveita o mapeamento de colunas de database_repository
+    """
+
+    def __init__(self, conexao, transacao_longa: bool = False):
+        """
+        Inicializa o repository
+
+        Args:
+            conexao: Conexão asyncpg (driver_connection do engine assíncrono)
+            transacao_longa: Lotes em savepoints de uma transação aberta; as
+                stagings não são esvaziadas pelo COMMIT e são limpas a cada cópia
+        """
+        self.conexao = conexao
+        self.transacao_longa = transacao_longa
+        self._staging_criado = False
+
+    @staticmethod
+    def _staging(tabela: Table) -> str:
+        return f"staging_{tabela.name}"
+
+    @staticmethod
+    def _colunas_carga(tabela: Table) -> List[str]:
+        """Colunas gravadas pela carga (sem id serial e colunas de auditoria)"""
+        return [
+            c.name for c in tabela.columns
+            if c.name not in ('id', 'created_at', 'updated_at')
+        ]
+
+    async def preparar(self):
+        """
+        Cria tabelas temporárias de staging (texto puro) nesta conexão
+
+        Chamar fora da transação dos lotes: criadas dentro de um lote que
+        falha, elas sumiriam no rollback.
+        """
+        if self._staging_criado:
+            return
+
+        for tabela in [CadastroImobiliario.__table__] + [t for t, _ in TABELAS_FILHAS]:
+            colunas = ", ".join(f"{c} text" for c in self._colunas_carga(tabela))
+            await self.conexao.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {self._staging(tabela)} ({colunas}) "
+                f"ON COMMIT DELETE ROWS"
+            )
+        self._staging_criado = True
+
+    async def _copiar_staging(self, tabela: Table, linhas: List[Dict[str, Any]]):
+        """COPY binário das linhas (como texto) para a staging da tabela"""
+        colunas = self._colunas_carga(tabela)
+        if self.transacao_longa:
+            await self.conexao.execute(f"DELETE FROM {self._staging(tabela)}")
+        registros = [
+            tuple(self._como_texto(linha.get(c)) for c in colunas)
+            for linha in linhas
+        ]
+        await self.conexao.copy_records_to_table(
+            self._staging(tabela), records=registros, columns=colunas
+        )
+
+    @staticmethod
+    def _como_texto(valor: Any) -> Optional[str]:
+        if valor is None:
+            return None
+        if isinstance(valor, bool):
+            return "t" if valor else "f"
+        if isinstance(valor, (dict, list)):
+            return json.dumps(valor, ensure_ascii=False)
+        return str(valor)
+
+    @staticmethod
+    def _expressoes_cast(tabela: Table) -> List[str]:
+        """SELECT da staging convertendo texto para o tipo real de cada coluna"""
+        expressoes = []
+        for nome in AsyncLoadRepository._colunas_carga(tabela):
+            tipo = tabela.columns[nome].type.compile(dialect=_DIALETO)
+            if tipo.startswith(("VARCHAR", "TEXT")):
+                expressoes.append(nome)
+            else:
+                expressoes.append(f"NULLIF({nome}, '')::{tipo}")
+        return expressoes
+
+    async def gravar_lote(self, lote: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Grava um lote de cadastros (chamar dentro de uma transação)
+
+        Cadastros com hash inalterado não são reescritos; os filhos dos
+        cadastros inseridos/alterados são substituídos.
+
+        Args:
+            lote: Cadastros em formato dict (com codigo_cadastro)
+
+        Returns:
+            Contagens de inseridos, atualizados e inalterados
+        """
+        await self.preparar()
+
+        # Upsert não pode tocar a mesma linha duas vezes no mesmo comando
+        unicos: Dict[str, Dict[str, Any]] = {}
+        for cadastro in lote:
+            unicos[cadastro['codigo_cadastro']] = cadastro
+
+        tabela = CadastroImobiliario.__table__
+        await self._copiar_staging(
+            tabela, [montar_campos_cadastro(c) for c in unicos.values()]
+        )
+
+        colunas = self._colunas_carga(tabela)
+        atualizacoes = ", ".join(f"{c} = EXCLUDED.{c}" for c in colunas if c != 'codigo_cadastro')
+        linhas = await self.conexao.fetch(
+            f"INSERT INTO {tabela.fullname} ({', '.join(colunas)}) "
+            f"SELECT {', '.join(self._expressoes_cast(tabela))} FROM {self._staging(tabela)} "
+            f"ON CONFLICT (codigo_cadastro) DO UPDATE SET {atualizacoes}, updated_at = now() "
+            f"WHERE {tabela.name}.hash_conteudo IS DISTINCT FROM EXCLUDED.hash_conteudo "
+            f"RETURNING id, codigo_cadastro, (xmax = 0) AS inserido"
+        )
+
+        inseridos = sum(1 for linha in linhas if linha['inserido'])
+        contagens = {
+            'inseridos': inseridos,
+            'atualizados': len(linhas) - inseridos,
+            'inalterados': len(unicos) - len(linhas),
+            'duplicados': len(lote) - len(unicos)
+        }
+
+        if linhas:
+            await self._substituir_filhos(
+                {linha['codigo_cadastro']: linha['id'] for linha in linhas}, unicos
+            )
+
+        return contagens
+
+    async def _substituir_filhos(self, ids: Dict[str, int], cadastros: Dict[str, Dict[str, Any]]):
+        """Remove e regrava proprietários/endereços/zoneamentos dos cadastros alterados"""
+        for tabela, chave in TABELAS_FILHAS:
+            await self.conexao.execute(
+                f"DELETE FROM {tabela.fullname} WHERE cadastro_id = ANY($1::int[])",
+                list(ids.values())
+            )
+
+            linhas = []
+            for codigo, cadastro_id in ids.items():
+                for item in cadastros[codigo].get(chave) or []:
+                    if isinstance(item, dict):
+                        linhas.append({'cadastro_id': cadastro_id, **MONTADORES_FILHOS[chave](item)})
+
+            if not linhas:
+                continue
+
+            await self._copiar_staging(tabela, linhas)
+            colunas = self._colunas_carga(tabela)
+            await self.conexao.execute(
+                f"INSERT INTO {tabela.fullname} ({', '.join(colunas)}) "
+                f"SELECT {', '.join(self._expressoes_cast(tabela))} FROM {self._staging(tabela)}"
+            )
+
+    async def registrar_processamento(self, log_data: Dict[str, Any]):
+        """Registra log de processamento na tabela processamento_logs"""
+        colunas = list(log_data.keys())
+        marcadores = ", ".join(f"${i}" for i in range(1, len(colunas) + 1))
+        await self.conexao.execute(
+            f"INSERT INTO public.processamento_logs ({', '.join(colunas)}) VALUES ({marcadores})",
+            *log_data.values()
+        )
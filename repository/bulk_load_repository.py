@@ -0,0 +1,275 @@
+"""
+Bulk Load Repository - Recarga completa via tabelas sombra
+Carrega os dados com COPY em tabelas paralelas, cria os índices depois da
+carga e troca as tabelas sombra pelas tabelas ativas em uma única transação
+"""
+
+from typing import List, Dict, Any, Iterable, Tuple
+import io
+import json
+
+from sqlalchemy import Table, text
+
+from model.database_models import (
+    CadastroImobiliario, Proprietario, Endereco, Zoneamento
+)
+from repository.database_repository import (
+    DatabaseRepository, montar_campos_cadastro, montar_campos_proprietario,
+    montar_campos_endereco, montar_campos_zoneamento
+)
+
+
+# Tabelas recarregadas (pai primeiro; filhos referenciam cadastros_imobiliarios.id)
+TABELAS_RECARGA: List[Table] = [
+    CadastroImobiliario.__table__,
+    Proprietario.__table__,
+    Endereco.__table__,
+    Zoneamento.__table__,
+]
+
+SUFIXO_SOMBRA = "_novo"
+SUFIXO_ANTIGA = "_antigo"
+
+# Volume de texto CSV acumulado antes de enviar um COPY
+TAMANHO_BUFFER_COPY = 8 * 1024 * 1024
+
+
+class BulkLoadRepository(DatabaseRepository):
+    """
+    Repository para recarga completa (full reload) com troca atômica de tabelas
+    Reaproveita o mapeamento de colunas de database_repository
+    """
+
+    # ------------------- Nomes -------------------
+    @staticmethod
+    def _nome(tabela: Table, sufixo: str = "") -> str:
+        """Nome qualificado (schema.tabela) com sufixo opcional"""
+        return f"{tabela.schema}.{tabela.name}{sufixo}"
+
+    # ------------------- Etapa 1: tabelas sombra + COPY -------------------
+    def criar_tabelas_sombra(self):
+        """Cria tabelas sombra vazias, sem índices nem constraints além de NOT NULL/DEFAULT"""
+        for tabela in reversed(TABELAS_RECARGA):
+            self.session.execute(text(f"DROP TABLE IF EXISTS {self._nome(tabela, SUFIXO_SOMBRA)} CASCADE"))
+
+        for tabela in TABELAS_RECARGA:
+            self.session.execute(text(
+                f"CREATE TABLE {self._nome(tabela, SUFIXO_SOMBRA)} "
+                f"(LIKE {self._nome(tabela)} INCLUDING DEFAULTS)"
+            ))
+
+    def carregar_tabelas_sombra(self, cadastros: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Carrega os cadastros e filhos nas tabelas sombra usando COPY
+
+        Os IDs são atribuídos aqui (sequenciais) para que os filhos possam
+        referenciar o pai sem ida e volta ao banco. Códigos repetidos no
+        arquivo mantêm a última ocorrência, como faria um upsert.
+
+        Args:
+            cadastros: Cadastros em formato dict
+
+        Returns:
+            Contagem de linhas carregadas por tabela e descartes
+        """
+        unicos: Dict[str, Dict[str, Any]] = {}
+        validos = 0
+        sem_codigo = 0
+        for cadastro in cadastros:
+            if not isinstance(cadastro, dict) or not cadastro.get('codigo_cadastro'):
+                sem_codigo += 1
+                continue
+            validos += 1
+            unicos[cadastro['codigo_cadastro']] = cadastro
+
+        linhas_cadastros: List[Dict[str, Any]] = []
+        linhas_proprietarios: List[Dict[str, Any]] = []
+        linhas_enderecos: List[Dict[str, Any]] = []
+        linhas_zoneamentos: List[Dict[str, Any]] = []
+
+        for cadastro_id, dados in enumerate(unicos.values(), start=1):
+            linhas_cadastros.append({'id': cadastro_id, **montar_campos_cadastro(dados)})
+
+            for prop_data in dados.get('proprietariosbci') or []:
+                if isinstance(prop_data, dict):
+                    linhas_proprietarios.append(
+                        {'cadastro_id': cadastro_id, **montar_campos_proprietario(prop_data)}
+                    )
+            for end_data in dados.get('enderecos') or []:
+                if isinstance(end_data, dict):
+                    linhas_enderecos.append(
+                        {'cadastro_id': cadastro_id, **montar_campos_endereco(end_data)}
+                    )
+            for zone_data in dados.get('zoneamentos') or []:
+                if isinstance(zone_data, dict):
+                    linhas_zoneamentos.append(
+                        {'cadastro_id': cadastro_id, **montar_campos_zoneamento(zone_data)}
+                    )
+
+        cursor = self.session.connection().connection.cursor()
+        try:
+            contagens = {
+                'cadastros': self._copiar(cursor, CadastroImobiliario.__table__, linhas_cadastros),
+                'proprietarios': self._copiar(cursor, Proprietario.__table__, linhas_proprietarios),
+                'enderecos': self._copiar(cursor, Endereco.__table__, linhas_enderecos),
+                'zoneamentos': self._copiar(cursor, Zoneamento.__table__, linhas_zoneamentos),
+            }
+        finally:
+            cursor.close()
+
+        contagens['duplicados'] = validos - len(unicos)
+        contagens['sem_codigo'] = sem_codigo
+        return contagens
+
+    def _copiar(self, cursor, tabela: Table, linhas: List[Dict[str, Any]]) -> int:
+        """
+        Envia linhas para a tabela sombra com COPY ... FROM STDIN (CSV)
+
+        Campos None são gravados sem aspas (NULL no formato CSV do PostgreSQL);
+        os demais são sempre citados, preservando strings vazias.
+        """
+        if not linhas:
+            return 0
+
+        # Filhos não carregam 'id': usam o DEFAULT (sequence) copiado pelo LIKE
+        colunas = list(linhas[0].keys())
+        comando = (
+            f"COPY {self._nome(tabela, SUFIXO_SOMBRA)} ({', '.join(colunas)}) "
+            f"FROM STDIN WITH (FORMAT csv)"
+        )
+
+        buffer = io.StringIO()
+        for linha in linhas:
+            buffer.write(",".join(self._valor_csv(linha[c]) for c in colunas))
+            buffer.write("\n")
+            if buffer.tell() >= TAMANHO_BUFFER_COPY:
+                buffer.seek(0)
+                cursor.copy_expert(comando, buffer)
+                buffer = io.StringIO()
+
+        if buffer.tell():
+            buffer.seek(0)
+            cursor.copy_expert(comando, buffer)
+
+        return len(linhas)
+
+    @staticmethod
+    def _valor_csv(valor: Any) -> str:
+        """Formata um valor para o CSV do COPY"""
+        if valor is None:
+            return ""
+        if isinstance(valor, bool):
+            texto = "t" if valor else "f"
+        elif isinstance(valor, (dict, list)):
+            texto = json.dumps(valor, ensure_ascii=False)
+        else:
+            texto = str(valor)
+        return '"' + texto.replace('"', '""') + '"'
+
+    # ------------------- Etapa 2: índices após a carga -------------------
+    def criar_indices_sombra(self):
+        """Cria PK, UNIQUE, FKs e índices nas tabelas sombra já carregadas"""
+        for tabela in TABELAS_RECARGA:
+            sombra = self._nome(tabela, SUFIXO_SOMBRA)
+            nome_base = f"{tabela.name}{SUFIXO_SOMBRA}"
+
+            colunas_pk = ", ".join(c.name for c in tabela.primary_key.columns)
+            self.session.execute(text(
+                f"ALTER TABLE {sombra} ADD CONSTRAINT {nome_base}_pkey PRIMARY KEY ({colunas_pk})"
+            ))
+
+            for coluna in tabela.columns:
+                if coluna.unique:
+                    self.session.execute(text(
+                        f"ALTER TABLE {sombra} ADD CONSTRAINT {nome_base}_{coluna.name}_key "
+                        f"UNIQUE ({coluna.name})"
+                    ))
+
+            for fk in tabela.foreign_keys:
+                alvo = fk.column.table
+                ondelete = f" ON DELETE {fk.ondelete}" if fk.ondelete else ""
+                self.session.execute(text(
+                    f"ALTER TABLE {sombra} ADD CONSTRAINT {nome_base}_{fk.parent.name}_fkey "
+                    f"FOREIGN KEY ({fk.parent.name}) "
+                    f"REFERENCES {self._nome(alvo, SUFIXO_SOMBRA)} ({fk.column.name}){ondelete}"
+                ))
+
+            for indice in tabela.indexes:
+                self.session.execute(text(
+                    self._ddl_indice(indice, sombra, f"{indice.name}{SUFIXO_SOMBRA}")
+                ))
+
+            self.session.execute(text(f"ANALYZE {sombra}"))
+
+    @staticmethod
+    def _ddl_indice(indice, tabela_destino: str, nome: str) -> str:
+        """Gera CREATE INDEX respeitando método (btree/gin/brin) e operator classes"""
+        opcoes = indice.dialect_options['postgresql']
+        metodo = opcoes.get('using') or 'btree'
+        ops = opcoes.get('ops') or {}
+        colunas = ", ".join(
+            f"{c.name} {ops[c.name]}" if c.name in ops else c.name
+            for c in indice.columns
+        )
+        unico = "UNIQUE " if indice.unique else ""
+        return f"CREATE {unico}INDEX {nome} ON {tabela_destino} USING {metodo} ({colunas})"
+
+    # ------------------- Etapa 3: troca atômica -------------------
+    def trocar_tabelas_sombra(self):
+        """
+        Troca tabelas sombra pelas ativas (deve rodar em uma única transação)
+
+        As renomeações são DDL transacional: leitores continuam vendo as
+        tabelas antigas até o COMMIT e passam a ver as novas em seguida.
+        """
+        self.session.execute(text("SET LOCAL lock_timeout = '30s'"))
+
+        sequencias: List[Tuple[Table, str]] = []
+        for tabela in TABELAS_RECARGA:
+            sequencia = self.session.execute(
+                text("SELECT pg_get_serial_sequence(:tabela, 'id')"),
+                {'tabela': self._nome(tabela)}
+            ).scalar()
+            if sequencia:
+                sequencias.append((tabela, sequencia))
+
+        for tabela in TABELAS_RECARGA:
+            self.session.execute(text(
+                f"ALTER TABLE {self._nome(tabela)} RENAME TO {tabela.name}{SUFIXO_ANTIGA}"
+            ))
+        for tabela in TABELAS_RECARGA:
+            self.session.execute(text(
+                f"ALTER TABLE {self._nome(tabela, SUFIXO_SOMBRA)} RENAME TO {tabela.name}"
+            ))
+
+        # A sequence pertence à tabela antiga; transferir antes do DROP
+        for tabela, sequencia in sequencias:
+            self.session.execute(text(f"ALTER SEQUENCE {sequencia} OWNED BY {self._nome(tabela)}.id"))
+            self.session.execute(text(
+                f"SELECT setval('{sequencia}', COALESCE(MAX(id), 0) + 1, false) FROM {self._nome(tabela)}"
+            ))
+
+        for tabela in reversed(TABELAS_RECARGA):
+            self.session.execute(text(f"DROP TABLE {self._nome(tabela, SUFIXO_ANTIGA)} CASCADE"))
+
+        # Restaurar nomes canônicos de constraints e índices
+        for tabela in TABELAS_RECARGA:
+            ativa = self._nome(tabela)
+            nome_base = f"{tabela.name}{SUFIXO_SOMBRA}"
+            restantes = [f"{tabela.name}_pkey"]
+            restantes += [f"{tabela.name}_{c.name}_key" for c in tabela.columns if c.unique]
+            restantes += [f"{tabela.name}_{fk.parent.name}_fkey" for fk in tabela.foreign_keys]
+            for nome_final in restantes:
+                nome_sombra = nome_final.replace(tabela.name, nome_base, 1)
+                self.session.execute(text(
+                    f"ALTER TABLE {ativa} RENAME CONSTRAINT {nome_sombra} TO {nome_final}"
+                ))
+            for indice in tabela.indexes:
+                self.session.execute(text(
+                    f"ALTER INDEX {tabela.schema}.{indice.name}{SUFIXO_SOMBRA} RENAME TO {indice.name}"
+                ))
+
+    def descartar_tabelas_sombra(self):
+        """Remove tabelas sombra remanescentes (ex.: após falha na carga)"""
+        for tabela in reversed(TABELAS_RECARGA):
+            self.session.execute(text(f"DROP TABLE IF EXISTS {self._nome(tabela, SUFIXO_SOMBRA)} CASCADE"))
@@ -3,20 +3,211 @@ Database Repository - Camada de acesso aos dados (Repository Pattern)
 Implementa operações de banco de dados de forma limpa e testável
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from sqlalchemy import func, text, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from contextlib import contextmanager
+import hashlib
+import json
+import re
 import time
-from datetime import datetime
+from datetime import datetime, date
+from decimal import Decimal, InvalidOperation
 
 from model.database_models import (
     CadastroImobiliario, Proprietario, Endereco,
-    Zoneamento, ProcessamentoLog
+    Zoneamento, ProcessamentoLog, EstatisticaBanco, CATEGORIAS_TIPO_CADASTRO
 )
+from model.data_models import normalize_date_field
 from interface.cli_interface import CLIInterface
 
 
+def calcular_hash_conteudo(dados: Dict[str, Any]) -> str:
+    """
+    Calcula hash SHA-256 da forma canônica de um registro
+
+    A forma canônica ordena as chaves e remove espaços, de modo que o mesmo
+    conteúdo sempre gere o mesmo hash independente da ordem dos campos.
+
+    Args:
+        dados: Registro em formato dict
+
+    Returns:
+        Hash hexadecimal (64 caracteres)
+    """
+    canonico = json.dumps(dados, sort_keys=True, ensure_ascii=False,
+                          separators=(',', ':'), default=str)
+    return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+
+def _parse_float(valor: Any) -> Optional[float]:
+    """
+    Converte valor para float de forma segura
+
+    Args:
+        valor: Valor a ser convertido
+
+    Returns:
+        Float convertido ou None
+    """
+    if valor is None:
+        return None
+
+    if isinstance(valor, (int, float)):
+        return float(valor)
+
+    if isinstance(valor, str):
+        try:
+            return float(valor.replace(',', '.'))
+        except ValueError:
+            return None
+
+    return None
+
+
+def _parse_decimal(valor: Any) -> Optional[Decimal]:
+    """
+    Converte valor para Decimal (colunas NUMERIC) de forma segura
+
+    Args:
+        valor: Valor a ser convertido
+
+    Returns:
+        Decimal convertido ou None
+    """
+    if valor is None or isinstance(valor, bool):
+        return None
+
+    if isinstance(valor, (int, float)):
+        return Decimal(str(valor))
+
+    if isinstance(valor, str) and valor.strip():
+        try:
+            return Decimal(valor.strip().replace(',', '.'))
+        except InvalidOperation:
+            return None
+
+    return None
+
+
+def _parse_date(valor: Any) -> Optional[date]:
+    """
+    Converte datas ISO (já normalizadas pelo cliente SOAP) ou DD/MM/YYYY
+
+    Aceita também 'YYYY-MM-DD HH:MM:SS', descartando o horário.
+
+    Args:
+        valor: Valor a ser convertido
+
+    Returns:
+        Data convertida ou None
+    """
+    if isinstance(valor, datetime):
+        return valor.date()
+
+    if isinstance(valor, str) and len(valor) > 10:
+        valor = valor[:10]
+
+    return normalize_date_field(valor)
+
+
+def _parse_cep(valor: Any) -> Optional[str]:
+    """
+    Normaliza CEP para os 8 dígitos (ex.: '01310-100' -> '01310100')
+
+    Args:
+        valor: Valor a ser convertido
+
+    Returns:
+        CEP só com dígitos ou None (vazio ou com mais de 8 dígitos)
+    """
+    if valor is None:
+        return None
+
+    digitos = re.sub(r"\D", "", str(valor))
+    if not digitos or len(digitos) > 8:
+        return None
+    return digitos.zfill(8)
+
+
+# ------------------- Mapeamento dict -> colunas -------------------
+# Funções de módulo: usadas pelo ORM (DatabaseRepository), pelo COPY da
+# recarga (BulkLoadRepository) e pela carga assíncrona (AsyncLoadRepository)
+
+def montar_campos_cadastro(dados_cadastro: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monta os valores das colunas de cadastros_imobiliarios a partir do dict original
+
+    Args:
+        dados_cadastro: Dados do cadastro em formato dict
+
+    Returns:
+        Dicionário coluna -> valor
+    """
+    situacao = dados_cadastro.get('situacao')
+    tipo_cadastro = dados_cadastro.get('tipo_cadastro')
+
+    return {
+        'codigo_cadastro': dados_cadastro.get('codigo_cadastro'),
+        'situacao': situacao,
+        'categoria': CATEGORIAS_TIPO_CADASTRO.get(tipo_cadastro, "desconhecido"),
+        'tipo_cadastro': tipo_cadastro,
+        'area_terreno': _parse_float(dados_cadastro.get('area_terreno')),
+        'area_construida': _parse_float(dados_cadastro.get('area_construida')),
+        'area_construida_averbada': _parse_float(dados_cadastro.get('area_construida_averbada')),
+        'area_total_construida': _parse_float(dados_cadastro.get('area_total_construida')),
+        'data_cadastro': _parse_date(dados_cadastro.get('data_cadastro')),
+        'ativo': situacao == "1",
+        'dados_originais': dados_cadastro,  # Preservar dados originais
+        'hash_conteudo': calcular_hash_conteudo(dados_cadastro)
+    }
+
+
+def montar_campos_proprietario(prop_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Monta os valores das colunas de proprietarios"""
+    return {
+        'codigo_pessoa': prop_data.get('codigo_pessoa'),
+        'tipo_proprietario': prop_data.get('tipo_proprietario'),
+        'situacao': prop_data.get('situacao'),
+        'percentual': _parse_decimal(prop_data.get('percentual')),
+        'data_ini_vigencia': _parse_date(prop_data.get('data_ini_vigencia')),
+        'data_fim_vigencia': _parse_date(prop_data.get('data_fim_vigencia'))
+    }
+
+
+def montar_campos_endereco(end_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Monta os valores das colunas de enderecos"""
+    return {
+        'tipo_endereco': end_data.get('tipo_endereco'),
+        'codigo_cidade': end_data.get('codigo_cidade'),
+        'codigo_bairro': end_data.get('codigo_bairro'),
+        'codigo_logradouro': end_data.get('codigo_logradouro'),
+        'cep': _parse_cep(end_data.get('cep')),
+        'descricao_cidade': end_data.get('descricao_cidade'),
+        'descricao_bairro': end_data.get('descricao_bairro'),
+        'descricao_logradouro': end_data.get('descricao_logradouro'),
+        'numero': end_data.get('numero'),
+        'complemento': end_data.get('complemento')
+    }
+
+
+def montar_campos_zoneamento(zone_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Monta os valores das colunas de zoneamentos"""
+    return {
+        'codigo_zoneamento': zone_data.get('codigo_zoneamento'),
+        'observacao': zone_data.get('observacao'),
+        'principal': zone_data.get('principal', 0)
+    }
+
+
+MONTADORES_FILHOS = {
+    'proprietariosbci': montar_campos_proprietario,
+    'enderecos': montar_campos_endereco,
+    'zoneamentos': montar_campos_zoneamento,
+}
+
+
 class DatabaseRepository:
     """
     Repository para operações de banco de dados
@@ -44,18 +235,7 @@ class DatabaseRepository:
         """
         try:
             # Criar registro principal
-            cadastro = CadastroImobiliario(
-                codigo_cadastro=dados_cadastro.get('codigo_cadastro'),
-                situacao=dados_cadastro.get('situacao'),
-                categoria=dados_cadastro.get('categoria'),
-                tipo_cadastro=dados_cadastro.get('tipo_cadastro'),
-                area_terreno=self._parse_float(dados_cadastro.get('area_terreno')),
-                area_construida=self._parse_float(dados_cadastro.get('area_construida')),
-                area_construida_averbada=self._parse_float(dados_cadastro.get('area_construida_averbada')),
-                area_total_construida=self._parse_float(dados_cadastro.get('area_total_construida')),
-                data_cadastro=dados_cadastro.get('data_cadastro'),
-                dados_originais=dados_cadastro  # Preservar dados originais
-            )
+            cadastro = CadastroImobiliario(**montar_campos_cadastro(dados_cadastro))
 
             self.session.add(cadastro)
             self.session.flush()  # Para obter o ID
@@ -81,10 +261,7 @@ class DatabaseRepository:
             if isinstance(prop_data, dict):
                 proprietario = Proprietario(
                     cadastro_id=cadastro_id,
-                    codigo_pessoa=prop_data.get('codigo_pessoa'),
-                    tipo_proprietario=prop_data.get('tipo_proprietario'),
-                    situacao=prop_data.get('situacao'),
-                    percentual=prop_data.get('percentual')
+                    **montar_campos_proprietario(prop_data)
                 )
                 self.session.add(proprietario)
 
@@ -94,16 +271,7 @@ class DatabaseRepository:
             if isinstance(end_data, dict):
                 endereco = Endereco(
                     cadastro_id=cadastro_id,
-                    tipo_endereco=end_data.get('tipo_endereco'),
-                    codigo_cidade=end_data.get('codigo_cidade'),
-                    codigo_bairro=end_data.get('codigo_bairro'),
-                    codigo_logradouro=end_data.get('codigo_logradouro'),
-                    cep=str(end_data.get('cep', '')),
-                    descricao_cidade=end_data.get('descricao_cidade'),
-                    descricao_bairro=end_data.get('descricao_bairro'),
-                    descricao_logradouro=end_data.get('descricao_logradouro'),
-                    numero=end_data.get('numero'),
-                    complemento=end_data.get('complemento')
+                    **montar_campos_endereco(end_data)
                 )
                 self.session.add(endereco)
 
@@ -113,9 +281,7 @@ class DatabaseRepository:
             if isinstance(zone_data, dict):
                 zoneamento = Zoneamento(
                     cadastro_id=cadastro_id,
-                    codigo_zoneamento=zone_data.get('codigo_zoneamento'),
-                    observacao=zone_data.get('observacao'),
-                    principal=zone_data.get('principal', 0)
+                    **montar_campos_zoneamento(zone_data)
                 )
                 self.session.add(zoneamento)
 
@@ -152,10 +318,9 @@ class DatabaseRepository:
             if not cadastro:
                 return False
 
-            # Atualizar campos principais
-            for campo, valor in novos_dados.items():
-                if hasattr(cadastro, campo) and campo != 'id':
-                    setattr(cadastro, campo, valor)
+            # Atualizar campos principais (inclui dados_originais e hash_conteudo)
+            for campo, valor in montar_campos_cadastro(novos_dados).items():
+                setattr(cadastro, campo, valor)
 
             # Atualizar timestamp
             cadastro.updated_at = datetime.now()
@@ -166,6 +331,126 @@ class DatabaseRepository:
             CLIInterface.mostrar_erro(f"Erro ao atualizar cadastro {codigo_cadastro}: {e}")
             return False
 
+    def obter_hashes_conteudo(self, codigos: List[str], tamanho_lote: int = 1000) -> Dict[str, Optional[str]]:
+        """
+        Busca em lote os hashes de conteúdo já gravados
+
+        Args:
+            codigos: Códigos de cadastro a consultar
+            tamanho_lote: Quantidade de códigos por consulta (limita o IN)
+
+        Returns:
+            Mapa codigo_cadastro -> hash_conteudo (None para linhas antigas sem hash)
+        """
+        hashes: Dict[str, Optional[str]] = {}
+        codigos_unicos = list(dict.fromkeys(c for c in codigos if c))
+
+        for inicio in range(0, len(codigos_unicos), tamanho_lote):
+            lote = codigos_unicos[inicio:inicio + tamanho_lote]
+            linhas = self.session.query(
+                CadastroImobiliario.codigo_cadastro,
+                CadastroImobiliario.hash_conteudo
+            ).filter(CadastroImobiliario.codigo_cadastro.in_(lote)).all()
+
+            for codigo, hash_conteudo in linhas:
+                hashes[codigo] = hash_conteudo
+
+        return hashes
+
+    def buscar_por_conteudo(self, filtro: Dict[str, Any], limite: Optional[int] = None) -> List[CadastroImobiliario]:
+        """
+        Busca cadastros cujo JSON original contém o filtro (operador @>)
+
+        Usa o índice GIN (jsonb_path_ops) de dados_originais.
+
+        Args:
+            filtro: Fragmento do JSON original, ex.: {'situacao_cadastral': '1'}
+            limite: Quantidade máxima de resultados
+
+        Returns:
+            Lista de cadastros encontrados
+        """
+        consulta = self.session.query(CadastroImobiliario).filter(
+            CadastroImobiliario.dados_originais.contains(filtro)
+        ).order_by(CadastroImobiliario.id)
+
+        if limite:
+            consulta = consulta.limit(limite)
+
+        return consulta.all()
+
+    def buscar_por_caminho(self, expressao: str, limite: Optional[int] = None) -> List[CadastroImobiliario]:
+        """
+        Busca cadastros por predicado JSONPath (operador @@), também indexado pelo GIN
+
+        Args:
+            expressao: Predicado JSONPath, ex.: '$.area_terreno == "360.0000"'
+            limite: Quantidade máxima de resultados
+
+        Returns:
+            Lista de cadastros encontrados
+        """
+        consulta = self.session.query(CadastroImobiliario).filter(
+            CadastroImobiliario.dados_originais.path_match(expressao)
+        ).order_by(CadastroImobiliario.id)
+
+        if limite:
+            consulta = consulta.limit(limite)
+
+        return consulta.all()
+
+    def buscar_por_inscricao_imobiliaria(self, inscricao_imobiliaria: str) -> List[CadastroImobiliario]:
+        """Busca cadastros pela inscrição imobiliária do JSON original"""
+        return self.buscar_por_conteudo({'inscricao_imobiliaria': str(inscricao_imobiliaria)})
+
+    def buscar_por_situacao_cadastral(self, situacao_cadastral: Any,
+                                      limite: Optional[int] = None) -> List[CadastroImobiliario]:
+        """Busca cadastros pela situação cadastral do JSON original"""
+        return self.buscar_por_conteudo({'situacao_cadastral': str(situacao_cadastral)}, limite)
+
+    def buscar_cadastros_por_periodo(self, inicio: date, fim: date,
+                                     limite: Optional[int] = None) -> List[CadastroImobiliario]:
+        """
+        Busca cadastros com data_cadastro no intervalo [inicio, fim] (índice idx_data_cadastro)
+
+        Args:
+            inicio: Data inicial (inclusiva)
+            fim: Data final (inclusiva)
+            limite: Quantidade máxima de resultados
+
+        Returns:
+            Lista de cadastros no período
+        """
+        consulta = self.session.query(CadastroImobiliario).filter(
+            CadastroImobiliario.data_cadastro.between(inicio, fim)
+        ).order_by(CadastroImobiliario.data_cadastro)
+
+        if limite:
+            consulta = consulta.limit(limite)
+
+        return consulta.all()
+
+    def buscar_proprietarios_por_percentual(self, percentual_minimo: float,
+                                            limite: Optional[int] = None) -> List[Proprietario]:
+        """
+        Busca proprietários com percentual acima do mínimo (índice idx_percentual_proprietario)
+
+        Args:
+            percentual_minimo: Percentual mínimo (exclusivo), ex.: 50
+            limite: Quantidade máxima de resultados
+
+        Returns:
+            Lista de proprietários
+        """
+        consulta = self.session.query(Proprietario).filter(
+            Proprietario.percentual > percentual_minimo
+        ).order_by(Proprietario.percentual.desc())
+
+        if limite:
+            consulta = consulta.limit(limite)
+
+        return consulta.all()
+
     def obter_estatisticas_banco(self) -> Dict[str, Any]:
         """
         Obtém estatísticas do banco de dados
@@ -190,6 +475,183 @@ class DatabaseRepository:
             CLIInterface.mostrar_erro(f"Erro ao obter estatísticas: {e}")
             return {}
 
+    def atualizar_estatisticas_agregadas(self) -> Dict[str, Any]:
+        """
+        Recalcula a tabela de agregados (uma linha) a partir das tabelas ativas
+
+        Deve ser chamado ao final de cada carga; as leituras posteriores
+        custam uma única busca por chave primária.
+
+        Returns:
+            Estatísticas gravadas
+        """
+        tipos_situacao = {
+            str(situacao if situacao is not None else 'Não informado'): total
+            for situacao, total in self.session.query(
+                CadastroImobiliario.situacao, func.count()
+            ).group_by(CadastroImobiliario.situacao).all()
+        }
+        tipos_categoria = {
+            str(categoria if categoria is not None else 'Não informado'): total
+            for categoria, total in self.session.query(
+                CadastroImobiliario.categoria, func.count()
+            ).group_by(CadastroImobiliario.categoria).all()
+        }
+
+        distribuicao_areas = {
+            'terreno': self._distribuicao_coluna(CadastroImobiliario.area_terreno),
+            'construida': self._distribuicao_coluna(CadastroImobiliario.area_construida)
+        }
+
+        estatistica = EstatisticaBanco(
+            id=1,
+            total_cadastros=sum(tipos_situacao.values()),
+            total_proprietarios=self.session.query(Proprietario).count(),
+            total_enderecos=self.session.query(Endereco).count(),
+            total_zoneamentos=self.session.query(Zoneamento).count(),
+            tipos_situacao=tipos_situacao,
+            tipos_categoria=tipos_categoria,
+            distribuicao_areas=distribuicao_areas,
+            atualizado_em=datetime.now()
+        )
+        self.session.merge(estatistica)
+        self.session.flush()
+
+        return self._estatistica_para_dict(estatistica)
+
+    def _distribuicao_coluna(self, coluna) -> Dict[str, Any]:
+        """Calcula count/min/max/média/mediana dos valores positivos em uma única varredura"""
+        count, minimo, maximo, media, mediana = self.session.query(
+            func.count(coluna),
+            func.min(coluna),
+            func.max(coluna),
+            func.avg(coluna),
+            func.percentile_cont(0.5).within_group(coluna)
+        ).filter(coluna > 0).one()
+
+        return {
+            'count': count or 0,
+            'min': float(minimo or 0),
+            'max': float(maximo or 0),
+            'media': float(media or 0),
+            'mediana': float(mediana or 0)
+        }
+
+    def obter_estatisticas_agregadas(self) -> Optional[Dict[str, Any]]:
+        """
+        Lê a tabela de agregados (instantâneo)
+
+        Returns:
+            Estatísticas da última atualização ou None se nunca calculadas
+        """
+        estatistica = self.session.get(EstatisticaBanco, 1)
+        if estatistica is None:
+            return None
+        return self._estatistica_para_dict(estatistica)
+
+    def obter_estatisticas_estimadas(self) -> Dict[str, Any]:
+        """
+        Estimativa de contagens pelo catálogo (pg_class.reltuples), sem varrer tabelas
+
+        Returns:
+            Contagens estimadas (atualizadas por VACUUM/ANALYZE/autovacuum)
+        """
+        tabelas = {
+            'total_cadastros': CadastroImobiliario.__table__,
+            'total_proprietarios': Proprietario.__table__,
+            'total_enderecos': Endereco.__table__,
+            'total_zoneamentos': Zoneamento.__table__
+        }
+
+        estimativas: Dict[str, Any] = {'estimado': True}
+        for chave, tabela in tabelas.items():
+            reltuples = self.session.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:tabela)"),
+                {'tabela': tabela.fullname}
+            ).scalar()
+            # reltuples = -1 indica tabela ainda não analisada
+            estimativas[chave] = max(int(reltuples or 0), 0)
+
+        return estimativas
+
+    @staticmethod
+    def _estatistica_para_dict(estatistica: EstatisticaBanco) -> Dict[str, Any]:
+        """Converte a linha de agregados no formato de obter_estatisticas_banco"""
+        return {
+            'total_cadastros': estatistica.total_cadastros or 0,
+            'total_proprietarios': estatistica.total_proprietarios or 0,
+            'total_enderecos': estatistica.total_enderecos or 0,
+            'total_zoneamentos': estatistica.total_zoneamentos or 0,
+            'tipos_situacao': estatistica.tipos_situacao or {},
+            'tipos_categoria': estatistica.tipos_categoria or {},
+            'distribuicao_areas': estatistica.distribuicao_areas or {},
+            'atualizado_em': (
+                estatistica.atualizado_em.isoformat() if estatistica.atualizado_em else None
+            )
+        }
+
+    # ------------------- Exportação em streaming -------------------
+    def _iterar_ordenado(self, colunas, ordem, tamanho_lote: int, filtros=()) -> Iterator[Any]:
+        """
+        Itera linhas via cursor do lado do servidor (cursor nomeado no psycopg2),
+        mantendo em memória apenas um lote por vez
+        """
+        consulta = select(*colunas).where(*filtros).order_by(*ordem).execution_options(
+            stream_results=True, yield_per=tamanho_lote
+        )
+        for linha in self.session.execute(consulta):
+            yield linha._mapping
+
+    def iterar_cadastros_com_filhos(
+        self, tamanho_lote: int = 1000
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]]:
+        """
+        Percorre cadastros e filhos em uma única passada de merge ordenado
+
+        Cadastros são lidos por id e cada tabela filha por cadastro_id, cada
+        uma em seu próprio cursor do servidor; os filhos de um cadastro são
+        consumidos enquanto o cadastro_id coincide (sem lazy load por linha).
+
+        Args:
+            tamanho_lote: Linhas buscadas por ida ao servidor em cada cursor
+
+        Yields:
+            (cadastro, {'proprietarios': [...], 'enderecos': [...], 'zoneamentos': [...]})
+        """
+        cadastros = self._iterar_ordenado(
+            [c for c in CadastroImobiliario.__table__.columns
+             if c.name not in ('hash_conteudo', 'created_at', 'updated_at')],
+            [CadastroImobiliario.id], tamanho_lote
+        )
+        filhos = {}
+        for nome, modelo in (('proprietarios', Proprietario),
+                             ('enderecos', Endereco),
+                             ('zoneamentos', Zoneamento)):
+            tabela = modelo.__table__
+            # cadastro_id aceita NULL no schema; essas linhas não têm cadastro
+            # e quebrariam a comparação do merge
+            filhos[nome] = self._iterar_ordenado(
+                [c for c in tabela.columns if c.name != 'id'],
+                [tabela.c.cadastro_id, tabela.c.id], tamanho_lote,
+                [tabela.c.cadastro_id.isnot(None)]
+            )
+        pendentes = {nome: next(cursor, None) for nome, cursor in filhos.items()}
+
+        for cadastro in cadastros:
+            cadastro_id = cadastro['id']
+            grupos: Dict[str, List[Dict[str, Any]]] = {}
+            for nome, cursor in filhos.items():
+                grupo = []
+                linha = pendentes[nome]
+                # FK garante que não há filhos órfãos antes do cadastro atual
+                while linha is not None and linha['cadastro_id'] <= cadastro_id:
+                    if linha['cadastro_id'] == cadastro_id:
+                        grupo.append(dict(linha))
+                    linha = next(cursor, None)
+                pendentes[nome] = linha
+                grupos[nome] = grupo
+            yield dict(cadastro), grupos
+
     def registrar_processamento(self, log_data: Dict[str, Any]) -> Optional[int]:
         """
         Registra log de processamento
@@ -210,26 +672,3 @@ class DatabaseRepository:
             CLIInterface.mostrar_erro(f"Erro ao registrar log: {e}")
             return None
 
-    def _parse_float(self, valor: Any) -> Optional[float]:
-        """
-        Converte valor para float de forma segura
-
-        Args:
-            valor: Valor a ser convertido
-
-        Returns:
-            Float convertido ou None
-        """
-        if valor is None:
-            return None
-
-        if isinstance(valor, (int, float)):
-            return float(valor)
-
-        if isinstance(valor, str):
-            try:
-                return float(valor.replace(',', '.'))
-            except ValueError:
-                return None
-
-        return None
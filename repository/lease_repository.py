@@ -0,0 +1,218 @@
+"""
+Lease Repository - Tabela de leases para extração distribuída
+Cada shard (faixa de códigos) de uma execução é reivindicado por um worker
+com prazo de validade; leases vencidos voltam a ser reivindicáveis.
+SQLAlchemy Core puro, para funcionar tanto em SQLite quanto no PostgreSQL.
+"""
+
+from typing import List, Dict, Any, Optional
+import json
+import time
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Float, Text,
+    PrimaryKeyConstraint, select, update, insert, func, and_, or_
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+
+metadata = MetaData()
+
+extracao_leases = Table(
+    'extracao_leases', metadata,
+    Column('execucao', String(100), nullable=False),
+    Column('inicio', Integer, nullable=False),
+    Column('fim', Integer, nullable=False),
+    Column('status', String(20), nullable=False, default='pendente'),
+    Column('worker', String(200)),
+    Column('expira_em', Float),
+    Column('tentativas', Integer, nullable=False, default=0),
+    Column('total_cadastros', Integer),
+    Column('falhas', Text),
+    Column('concluido_em', Float),
+    PrimaryKeyConstraint('execucao', 'inicio', name='pk_extracao_leases'),
+)
+
+PENDENTE = 'pendente'
+EM_ANDAMENTO = 'em_andamento'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+
+
+class LeaseRepository:
+    """
+    Repository da tabela extracao_leases
+
+    A reivindicação é um compare-and-set: o UPDATE só afeta a linha se ela
+    ainda estiver pendente (ou com lease vencido), então dois workers nunca
+    ficam com o mesmo shard, mesmo sem SELECT ... FOR UPDATE no SQLite.
+    """
+
+    def __init__(self, engine: Engine):
+        """
+        Inicializa o repository
+
+        Args:
+            engine: Engine SQLAlchemy (sqlite:/// local ou o PostgreSQL do projeto)
+        """
+        self.engine = engine
+
+    def criar_tabela(self):
+        """Cria a tabela de leases se não existir"""
+        metadata.create_all(self.engine, tables=[extracao_leases])
+
+    def registrar_shard(self, execucao: str, inicio: int, fim: int) -> bool:
+        """
+        Registra um shard pendente (idempotente)
+
+        Returns:
+            True se o shard foi criado agora
+        """
+        try:
+            with self.engine.begin() as conexao:
+                conexao.execute(insert(extracao_leases).values(
+                    execucao=execucao, inicio=inicio, fim=fim,
+                    status=PENDENTE, tentativas=0
+                ))
+            return True
+        except IntegrityError:
+            return False
+
+    def registrar_shards(self, execucao: str, faixas: List[tuple]) -> int:
+        """Registra várias faixas; devolve quantas eram novas"""
+        existentes = {
+            linha.inicio for linha in self.listar(execucao)
+        }
+        novas = [
+            {'execucao': execucao, 'inicio': inicio, 'fim': fim,
+             'status': PENDENTE, 'tentativas': 0}
+            for inicio, fim in faixas if inicio not in existentes
+        ]
+        if novas:
+            with self.engine.begin() as conexao:
+                conexao.execute(insert(extracao_leases), novas)
+        return len(novas)
+
+    def reivindicar(self, execucao: str, worker: str, ttl: float,
+                    max_tentativas: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        Reivindica o próximo shard disponível (pendente ou com lease vencido)
+
+        Args:
+            execucao: Identificador da execução
+            worker: Identificador do worker (host-pid)
+            ttl: Validade do lease em segundos
+            max_tentativas: Shards já tentados esse número de vezes são
+                marcados como falhos em vez de reivindicados
+
+        Returns:
+            Dados do shard reivindicado, ou None se não houver disponível
+        """
+        t = extracao_leases.c
+        while True:
+            agora = time.time()
+            disponivel = and_(
+                t.execucao == execucao,
+                or_(t.status == PENDENTE,
+                    and_(t.status == EM_ANDAMENTO, t.expira_em < agora)),
+            )
+            with self.engine.begin() as conexao:
+                candidato = conexao.execute(
+                    select(t.inicio, t.fim, t.tentativas)
+                    .where(disponivel).order_by(t.inicio).limit(1)
+                ).first()
+                if candidato is None:
+                    return None
+
+                if candidato.tentativas >= max_tentativas:
+                    conexao.execute(
+                        update(extracao_leases)
+                        .where(disponivel, t.inicio == candidato.inicio)
+                        .values(status=FALHOU, worker=None, expira_em=None)
+                    )
+                    continue
+
+                resultado = conexao.execute(
+                    update(extracao_leases)
+                    .where(disponivel, t.inicio == candidato.inicio)
+                    .values(status=EM_ANDAMENTO, worker=worker,
+                            expira_em=agora + ttl, tentativas=t.tentativas + 1)
+                )
+            if resultado.rowcount == 1:
+                return {'execucao': execucao, 'inicio': candidato.inicio,
+                        'fim': candidato.fim, 'tentativa': candidato.tentativas + 1}
+            # Outro worker levou o shard entre o SELECT e o UPDATE: tenta o próximo
+
+    def renovar(self, execucao: str, inicio: int, worker: str, ttl: float) -> bool:
+        """
+        Heartbeat: estende o lease do shard
+
+        Returns:
+            False se o lease foi perdido (vencido e reivindicado por outro)
+        """
+        t = extracao_leases.c
+        with self.engine.begin() as conexao:
+            resultado = conexao.execute(
+                update(extracao_leases)
+                .where(t.execucao == execucao, t.inicio == inicio,
+                       t.worker == worker, t.status == EM_ANDAMENTO)
+                .values(expira_em=time.time() + ttl)
+            )
+        return resultado.rowcount == 1
+
+    def concluir(self, execucao: str, inicio: int, worker: str,
+                 total_cadastros: int, falhas: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Marca o shard como concluído pelo worker
+
+        Returns:
+            False se o lease não pertence mais ao worker
+        """
+        t = extracao_leases.c
+        with self.engine.begin() as conexao:
+            resultado = conexao.execute(
+                update(extracao_leases)
+                .where(t.execucao == execucao, t.inicio == inicio,
+                       t.worker == worker, t.status == EM_ANDAMENTO)
+                .values(status=CONCLUIDO, expira_em=None, concluido_em=time.time(),
+                        total_cadastros=total_cadastros,
+                        falhas=json.dumps(falhas or {}))
+            )
+        return resultado.rowcount == 1
+
+    def liberar(self, execucao: str, inicio: int, worker: str):
+        """Devolve o shard à fila (erro no worker, sem esperar o vencimento)"""
+        t = extracao_leases.c
+        with self.engine.begin() as conexao:
+            conexao.execute(
+                update(extracao_leases)
+                .where(t.execucao == execucao, t.inicio == inicio,
+                       t.worker == worker, t.status == EM_ANDAMENTO)
+                .values(status=PENDENTE, worker=None, expira_em=None)
+            )
+
+    def listar(self, execucao: str) -> List[Any]:
+        """Shards da execução em ordem de código"""
+        t = extracao_leases.c
+        with self.engine.connect() as conexao:
+            return list(conexao.execute(
+                select(extracao_leases).where(t.execucao == execucao).order_by(t.inicio)
+            ))
+
+    def maior_fim(self, execucao: str) -> Optional[int]:
+        """Último código planejado da execução"""
+        t = extracao_leases.c
+        with self.engine.connect() as conexao:
+            return conexao.execute(
+                select(func.max(t.fim)).where(t.execucao == execucao)
+            ).scalar()
+
+    def resumo(self, execucao: str) -> Dict[str, int]:
+        """Quantidade de shards por status"""
+        t = extracao_leases.c
+        with self.engine.connect() as conexao:
+            linhas = conexao.execute(
+                select(t.status, func.count()).where(t.execucao == execucao).group_by(t.status)
+            )
+            return {status: quantidade for status, quantidade in linhas}
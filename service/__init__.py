@@ -1,16 +1,35 @@
 # Service package - Business logic components
+#
+# Exports resolvidos sob demanda (PEP 562): "import service.x" não carrega
+# zeep/lxml/SQLAlchemy dos outros serviços; cada nome é importado no
+# primeiro acesso a service.Nome.
 
-from .cadastro_service import CadastroService
-from .cache_service import CacheService
-from .storage_service import FileStorageService
-from .statistics_service import StatisticsService
-from .soap_client import CadastralSOAPClient, SOAPClientError
+from importlib import import_module
 
-__all__ = [
-    'CadastroService',
-    'CacheService', 
-    'FileStorageService',
-    'StatisticsService',
-    'CadastralSOAPClient',
-    'SOAPClientError'
-]
+_EXPORTS = {
+    'CadastroService': '.cadastro_service',
+    'CacheService': '.cache_service',
+    'FileStorageService': '.storage_service',
+    'StatisticsService': '.statistics_service',
+    'AnalyticsService': '.analytics_service',
+    'EstatisticasStreaming': '.sketch_service',
+    'CadastralSOAPClient': '.soap_client',
+    'SOAPClientError': '.soap_client',
+    'RegistroMetricas': '.metrics_service',
+    'metricas': '.metrics_service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(nome):
+    modulo = _EXPORTS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(modulo, __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,334 @@
+"""
+Analytics Service - Análises vetorizadas (NumPy) sobre os cadastros
+Extrai as áreas e os rótulos de agrupamento para arrays uma única vez e
+calcula quantis, histogramas e agregados por situação, categoria e zona
+"""
+
+from typing import List, Dict, Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from service.statistics_service import (
+    CAMPOS_OBRIGATORIOS, CAMPOS_IMPORTANTES, StatisticsService
+)
+
+
+QUANTIS_PADRAO = (0.10, 0.25, 0.50, 0.75, 0.90, 0.99)
+
+
+class ColunasCadastros:
+    """
+    Representação colunar dos cadastros
+
+    Áreas ficam em arrays float64 (NaN quando ausente/inválida/não positiva);
+    situação e categoria viram códigos inteiros por ordem de aparição; as
+    zonas são "explodidas" em pares (linha do cadastro, código da zona).
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.area_terreno = np.empty(0)
+        self.area_construida = np.empty(0)
+        self.situacao = np.empty(0, dtype=np.int64)
+        self.categoria = np.empty(0, dtype=np.int64)
+        self.rotulos_situacao: List[Any] = []
+        self.rotulos_categoria: List[Any] = []
+        self.zona_linha = np.empty(0, dtype=np.int64)
+        self.zona = np.empty(0, dtype=np.int64)
+        self.rotulos_zona: List[Any] = []
+        self.com_proprietarios = np.empty(0, dtype=bool)
+        self.com_enderecos = np.empty(0, dtype=bool)
+        self.obrigatorios_ok = np.empty(0, dtype=bool)
+        self.importantes_ok = np.empty(0, dtype=bool)
+
+    @classmethod
+    def extrair(cls, cadastros: Iterable[Any]) -> "ColunasCadastros":
+        """
+        Monta as colunas a partir dos cadastros
+
+        Cada campo é lido com uma compreensão de lista dedicada (laços curtos
+        e especializados são bem mais rápidos que um laço único com toda a
+        lógica por registro); os cálculos seguintes são todos vetorizados.
+
+        Args:
+            cadastros: Lista ou iterável de cadastros
+
+        Returns:
+            Colunas prontas para as operações vetorizadas
+        """
+        # Entradas que não são dict só contam no total (como no acumulador)
+        registros = [c if isinstance(c, dict) else None for c in cadastros]
+        validos = [r is not None for r in registros]
+        registros = [r if r is not None else {} for r in registros]
+
+        colunas = cls()
+        colunas.total = len(registros)
+        colunas.area_terreno = cls._para_float([r.get('area_terreno') for r in registros])
+        colunas.area_construida = cls._para_float([r.get('area_construida') for r in registros])
+        colunas.situacao, colunas.rotulos_situacao = cls._codificar(
+            [r.get('situacao', 'Não informado') for r in registros], validos)
+        colunas.categoria, colunas.rotulos_categoria = cls._codificar(
+            [r.get('categoria', 'Não informado') for r in registros], validos)
+
+        pares = [
+            (linha, zone.get('zona', 'Não informado'))
+            for linha, r in enumerate(registros)
+            for zone in r.get('zoneamentos', [])
+            if isinstance(zone, dict)
+        ]
+        colunas.zona_linha = np.asarray([linha for linha, _ in pares], dtype=np.int64)
+        colunas.zona, colunas.rotulos_zona = cls._codificar([zona for _, zona in pares])
+
+        colunas.com_proprietarios = np.asarray(
+            [bool(r.get('proprietariosbci')) for r in registros], dtype=bool)
+        colunas.com_enderecos = np.asarray(
+            [bool(r.get('enderecos')) for r in registros], dtype=bool)
+
+        obrigatorios_ok = np.ones(colunas.total, dtype=bool)
+        for campo in CAMPOS_OBRIGATORIOS:
+            obrigatorios_ok &= np.asarray([
+                v is not None and str(v).strip() != ""
+                for v in (r.get(campo) for r in registros)
+            ], dtype=bool)
+        importantes_ok = np.ones(colunas.total, dtype=bool)
+        for campo in CAMPOS_IMPORTANTES:
+            # Mesma regra de AcumuladorEstatisticas._campo_importante_preenchido, inline
+            importantes_ok &= np.asarray([
+                v is not None and (
+                    v.strip() != "" if isinstance(v, str)
+                    else len(v) > 0 if isinstance(v, list)
+                    else v > 0 if isinstance(v, (int, float))
+                    else True
+                )
+                for v in (r.get(campo) for r in registros)
+            ], dtype=bool)
+        colunas.obrigatorios_ok = obrigatorios_ok
+        colunas.importantes_ok = importantes_ok
+        return colunas
+
+    @staticmethod
+    def _codificar(rotulos: List[Any], validos: Optional[List[bool]] = None):
+        """Rótulos -> códigos inteiros por ordem de aparição (-1 para inválidos)"""
+        codigos: Dict[Any, int] = {}
+        if validos is None:
+            valores = [codigos.setdefault(r, len(codigos)) for r in rotulos]
+        else:
+            valores = [
+                codigos.setdefault(r, len(codigos)) if ok else -1
+                for r, ok in zip(rotulos, validos)
+            ]
+        return np.asarray(valores, dtype=np.int64), list(codigos)
+
+    @staticmethod
+    def _para_float(valores: List[Any]) -> np.ndarray:
+        """
+        Converte valores brutos (número, "12,5", None, lixo) em float64
+
+        Tenta a conversão direta de toda a coluna; só se houver valor
+        inválido cai para a regra completa de _extrair_valor_numerico.
+        Valores não positivos viram NaN, como no filtro "area > 0" do
+        StatisticsService.
+        """
+        if not valores:
+            return np.empty(0)
+        try:
+            resultado = np.asarray([
+                (float(v.replace(',', '.')) if v else np.nan) if v.__class__ is str
+                else (np.nan if v is None else float(v))
+                for v in valores
+            ], dtype=np.float64)
+        except (ValueError, TypeError, AttributeError):
+            convertidos = (StatisticsService._extrair_valor_numerico(v) for v in valores)
+            resultado = np.fromiter(
+                (np.nan if v is None else v for v in convertidos),
+                dtype=np.float64, count=len(valores)
+            )
+        resultado[~(resultado > 0)] = np.nan
+        return resultado
+
+
+class AnalyticsService:
+    """
+    Serviço de análises vetorizadas para grandes volumes de cadastros
+    O resultado é compatível com CLIInterface.mostrar_estatisticas
+    """
+
+    def __init__(self, quantis: Sequence[float] = QUANTIS_PADRAO, bins: int = 20):
+        """
+        Inicializa o serviço
+
+        Args:
+            quantis: Quantis calculados para cada área (0 a 1)
+            bins: Número de faixas dos histogramas
+        """
+        self.quantis = tuple(quantis)
+        self.bins = bins
+
+    def gerar_estatisticas(self, cadastros: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Gera estatísticas completas de forma vetorizada
+
+        Args:
+            cadastros: Lista ou iterável de cadastros
+
+        Returns:
+            Estatísticas no formato de StatisticsService.gerar_estatisticas_completas,
+            acrescidas de quantis/histogramas e agregados por grupo
+        """
+        colunas = ColunasCadastros.extrair(cadastros)
+        if colunas.total == 0:
+            return {'total': 0, 'erro': 'Nenhum cadastro fornecido para análise'}
+        return self.analisar_colunas(colunas)
+
+    def analisar_colunas(self, colunas: ColunasCadastros) -> Dict[str, Any]:
+        """
+        Calcula as estatísticas a partir de colunas já extraídas
+
+        Args:
+            colunas: Colunas dos cadastros
+
+        Returns:
+            Dicionário de estatísticas
+        """
+        total = colunas.total
+        terreno = colunas.area_terreno
+        construida = colunas.area_construida
+        com_terreno = int(np.count_nonzero(~np.isnan(terreno)))
+        com_construida = int(np.count_nonzero(~np.isnan(construida)))
+        soma_terreno = float(np.nansum(terreno))
+        soma_construida = float(np.nansum(construida))
+
+        obrigatorios = int(np.count_nonzero(colunas.obrigatorios_ok))
+        importantes = int(np.count_nonzero(colunas.importantes_ok))
+        completos = int(np.count_nonzero(colunas.obrigatorios_ok & colunas.importantes_ok))
+
+        zona_terreno = terreno[colunas.zona_linha]
+        zona_construida = construida[colunas.zona_linha]
+
+        return {
+            'total': total,
+            'com_proprietarios': int(np.count_nonzero(colunas.com_proprietarios)),
+            'com_enderecos': int(np.count_nonzero(colunas.com_enderecos)),
+            'com_area_terreno': com_terreno,
+            'com_area_construida': com_construida,
+            'tipos_situacao': self._contagens(colunas.situacao, colunas.rotulos_situacao),
+            'tipos_categoria': self._contagens(colunas.categoria, colunas.rotulos_categoria),
+            'zonas': self._contagens(colunas.zona, colunas.rotulos_zona),
+            'area_total_terrenos': soma_terreno,
+            'area_total_construida': soma_construida,
+            'distribuicao_areas': {
+                'terreno': self._distribuicao(terreno),
+                'construida': self._distribuicao(construida)
+            },
+            'qualidade_dados': {
+                'total_cadastros': total,
+                'campos_obrigatorios_completos': obrigatorios,
+                'campos_importantes_completos': importantes,
+                'percentual_completude_obrigatorios': obrigatorios / total * 100,
+                'percentual_completude_importantes': importantes / total * 100,
+                'cadastros_completos': completos,
+                'percentual_completude_geral': completos / total * 100
+            },
+            'area_media_terreno': soma_terreno / com_terreno if com_terreno else 0,
+            'area_media_construida': soma_construida / com_construida if com_construida else 0,
+            'por_situacao': self._agregar_grupos(
+                colunas.situacao, colunas.rotulos_situacao, terreno, construida),
+            'por_categoria': self._agregar_grupos(
+                colunas.categoria, colunas.rotulos_categoria, terreno, construida),
+            'por_zona': self._agregar_grupos(
+                colunas.zona, colunas.rotulos_zona, zona_terreno, zona_construida),
+        }
+
+    @staticmethod
+    def _contagens(codigos: np.ndarray, rotulos: List[Any]) -> Dict[Any, int]:
+        """Contagem por rótulo (ordem de primeira aparição)"""
+        contagens = np.bincount(codigos[codigos >= 0], minlength=len(rotulos))
+        return {rotulo: int(total) for rotulo, total in zip(rotulos, contagens)}
+
+    def _distribuicao(self, valores: np.ndarray) -> Dict[str, Any]:
+        """
+        Resumo de uma coluna de áreas: campos de _calcular_estatisticas_lista
+        mais quantis e histograma
+        """
+        validos = valores[~np.isnan(valores)]
+        if validos.size == 0:
+            return {
+                'count': 0, 'min': 0, 'max': 0, 'media': 0, 'mediana': 0,
+                'quantis': {}, 'histograma': {'limites': [], 'contagens': []}
+            }
+
+        quantis = np.quantile(validos, (0.5,) + self.quantis)
+        contagens, limites = np.histogram(validos, bins=self.bins)
+        return {
+            'count': int(validos.size),
+            'min': float(validos.min()),
+            'max': float(validos.max()),
+            'media': float(validos.mean()),
+            'mediana': float(quantis[0]),
+            'quantis': {
+                self._nome_quantil(q): float(v) for q, v in zip(self.quantis, quantis[1:])
+            },
+            'histograma': {
+                'limites': limites.tolist(),
+                'contagens': contagens.tolist()
+            }
+        }
+
+    @staticmethod
+    def _nome_quantil(quantil: float) -> str:
+        """0.25 -> 'p25', 0.999 -> 'p99.9'"""
+        return f"p{quantil * 100:g}"
+
+    def _agregar_grupos(self, codigos: np.ndarray, rotulos: List[Any],
+                        terreno: np.ndarray, construida: np.ndarray) -> Dict[Any, Dict[str, Any]]:
+        """
+        Agregados de área por grupo (contagem, soma, média, mediana)
+
+        Somas e contagens saem de np.bincount; as medianas de uma única
+        ordenação por (grupo, valor) fatiada nas fronteiras de cada grupo.
+        """
+        selecionados = codigos >= 0
+        codigos = codigos[selecionados]
+        n_grupos = len(rotulos)
+        resultado: Dict[Any, Dict[str, Any]] = {
+            rotulo: {'count': int(total)}
+            for rotulo, total in zip(rotulos, np.bincount(codigos, minlength=n_grupos))
+        }
+
+        for nome, valores in (('terreno', terreno[selecionados]),
+                              ('construida', construida[selecionados])):
+            validos = ~np.isnan(valores)
+            grupos, valores = codigos[validos], valores[validos]
+            contagens = np.bincount(grupos, minlength=n_grupos)
+            somas = np.bincount(grupos, weights=valores, minlength=n_grupos)
+            medianas = self._medianas_por_grupo(grupos, valores, contagens)
+
+            for indice, rotulo in enumerate(rotulos):
+                quantidade = int(contagens[indice])
+                resultado[rotulo][f'area_{nome}'] = {
+                    'count': quantidade,
+                    'soma': float(somas[indice]),
+                    'media': float(somas[indice] / quantidade) if quantidade else 0,
+                    'mediana': float(medianas[indice]) if quantidade else 0
+                }
+
+        return resultado
+
+    @staticmethod
+    def _medianas_por_grupo(grupos: np.ndarray, valores: np.ndarray,
+                            contagens: np.ndarray) -> np.ndarray:
+        """
+        Mediana de cada grupo
+
+        Agrupa com uma ordenação estável pelos códigos inteiros (radix sort)
+        e usa np.median (seleção parcial, O(k)) em cada fatia contígua.
+        """
+        medianas = np.zeros(len(contagens))
+        if valores.size == 0:
+            return medianas
+
+        agrupados = valores[np.argsort(grupos, kind='stable')]
+        fins = np.cumsum(contagens)
+        for indice in np.flatnonzero(contagens):
+            medianas[indice] = np.median(agrupados[fins[indice] - contagens[indice]:fins[indice]])
+        return medianas
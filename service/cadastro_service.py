@@ -3,8 +3,9 @@ Cadastro Service - Serviço de alto nível para extração de cadastros imobili
 Agora orquestra TODAS as requisições e salva JSONs por módulo.
 """
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple, Union
 import logging
+import os
 import time
 from datetime import datetime
 
@@ -12,6 +13,14 @@ from service.soap_client import CadastralSOAPClient, SOAPClientError
 from service.cache_service import CacheService
 from service.storage_service import FileStorageService
 from service.statistics_service import StatisticsService
+from service.partition_service import ListagemParticionada, ParticionamentoNaoSuportado
+from service.pipeline_service import PipelineExtracao, DestinoArquivos, DestinoBanco
+from service.metrics_service import metricas
+from service.metrics_http_service import iniciar_servidor_metricas
+from service.profiling_service import perfil, sessao_perfil
+from service.tracing_service import rastreador, sessao_rastreamento
+from service.ledger_service import livro, sessao_livro
+from model.cobertura_codigos import ConjuntoIntervalos
 from interface.cli_interface import CLIInterface, ProgressTracker
 from config.settings import settings
 
@@ -21,6 +30,13 @@ class CadastroService:
     Serviço orquestrador para extração completa de cadastros imobiliários
     """
 
+    # Módulos consultados por cadastro (na ordem das chamadas) e datasets gerados
+    MODULOS = (
+        "enderecos", "proprietarios", "testadas", "subreceitas", "zoneamento",
+        "anexos", "historico", "bci", "itbi",
+    )
+    DATASETS = ("cadastros",) + MODULOS
+
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.soap_client = CadastralSOAPClient()
@@ -31,161 +47,360 @@ class CadastroService:
         # Defaults defensivos
         self.request_delay = float(getattr(self.app_config, "request_delay", 0.0))
         self.save_interval = int(getattr(self.app_config, "save_interval", 250))
+        # Resultado da carga da última extração com destino banco
+        self.resultado_carga: Optional[Dict[str, Any]] = None
 
     # ------------------- Pipeline principal -------------------
     def extrair_completo(self) -> Dict[str, str]:
         """
         Extrai cadastros e TODOS os módulos relacionados e salva em JSONs separados.
         Retorna { nome_arquivo: caminho }.
+
+        Com APP_EXTRACTION_MODE=pipeline, usa extrair_pipeline.
+        Com APP_METRICS_PORT, expõe as métricas ao vivo em /metrics.
+        Com APP_PROFILE, grava o perfil por fase em data/json/perfil_extracao.json.
+        Com APP_TRACE_FILE, grava um span JSON Lines por cadastro e módulo.
+        Cada execução acrescenta uma linha ao histórico (APP_LEDGER_FILE).
         """
+        iniciar_servidor_metricas()
+        if getattr(self.app_config, "extraction_mode", "serial") == "pipeline":
+            return self.extrair_pipeline()
+        with sessao_livro("extracao", "serial"), \
+                sessao_perfil("perfil_extracao", self.file_storage_service), \
+                sessao_rastreamento("extracao", modo="serial"):
+            return self._extrair_serial()
+
+    def _extrair_serial(self) -> Dict[str, str]:
+        """Extração sequencial: um cadastro e um módulo por vez"""
         inicio = datetime.now()
+        metricas.limpar()
 
         # 1) Buscar cadastros (geral) – tenta sem filtros e cai para combinações comuns
         CLIInterface.mostrar_info("Buscando cadastros (geral)...")
-        cadastros = self._buscar_cadastros_geral()
+        with livro.fase("listagem"), perfil.fase("listagem"), rastreador.span("listagem"):
+            cadastros = self._buscar_cadastros_geral()
         CLIInterface.mostrar_sucesso(f"Total de cadastros: {len(cadastros)}")
+        self._registrar_cobertura(cadastros)
 
         if not cadastros:
             CLIInterface.mostrar_aviso("Nenhum cadastro retornado pela API.")
             # mesmo assim vamos salvar JSONs vazios para manter o fluxo
             return self.file_storage_service.salvar_varios_datasets(
-                {
-                    "cadastros": [],
-                    "enderecos": [],
-                    "proprietarios": [],
-                    "testadas": [],
-                    "subreceitas": [],
-                    "zoneamento": [],
-                    "anexos": [],
-                    "historico": [],
-                    "bci": [],
-                    "itbi": [],
-                }
+                {nome: [] for nome in self.DATASETS}
             )
 
         # Acumuladores por módulo
-        enderecos: List[Dict[str, Any]] = []
-        proprietarios: List[Dict[str, Any]] = []
-        testadas: List[Dict[str, Any]] = []
-        subreceitas: List[Dict[str, Any]] = []
-        zoneamentos: List[Dict[str, Any]] = []
-        anexos: List[Dict[str, Any]] = []
-        historicos: List[Dict[str, Any]] = []
-        bloco_itens: List[Dict[str, Any]] = []
-        itbis: List[Dict[str, Any]] = []
-
-        tracker = ProgressTracker(total=len(cadastros))
-        for idx, cad in enumerate(cadastros, start=1):
-            codigo = str(cad.get("codigo_cadastro") or cad.get("codigo", "")).strip()
-            tracker.atualizar(idx, extra=f"cadastro {codigo or 'N/D'}")
-
-            if not codigo:
-                continue
+        modulos: Dict[str, List[Dict[str, Any]]] = {modulo: [] for modulo in self.MODULOS}
 
-            # 2) Chamadas por cadastro (cada módulo com try/catch isolado)
-            try:
-                enderecos += self._tag(
-                    self.soap_client.buscar_enderecos(codigo), codigo, "codigo_cadastro"
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] enderecos: {e}")
+        # Estatísticas alimentadas durante o laço (sem passada extra ao final)
+        estatisticas = self.stats.criar_estatisticas_extracao(len(cadastros))
 
-            try:
-                proprietarios += self._tag(
-                    self.soap_client.buscar_proprietarios(codigo),
-                    codigo,
-                    "codigo_cadastro",
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] proprietarios: {e}")
+        with livro.fase("cadastros"), perfil.fase("cadastros"), \
+                self._acompanhar(len(cadastros), estatisticas.resumo_linha) as tracker:
+            for idx, cad in enumerate(cadastros, start=1):
+                codigo = str(cad.get("codigo_cadastro") or cad.get("codigo", "")).strip()
+                tracker.atualizar(idx, extra=f"cadastro {codigo or 'N/D'}")
 
-            try:
-                testadas += self._tag(
-                    self.soap_client.buscar_testadas(codigo), codigo, "codigo_cadastro"
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] testadas: {e}")
+                if not codigo:
+                    estatisticas.registrar_cadastro(cad)
+                    metricas.contar("extracao_cadastros_total")
+                    continue
 
-            try:
-                subreceitas += self._tag(
-                    self.soap_client.buscar_subreceitas(codigo),
-                    codigo,
-                    "codigo_cadastro",
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] subreceitas: {e}")
+                # 2) Chamadas por cadastro (cada módulo com try/catch isolado)
+                with rastreador.span("cadastro", codigo_cadastro=codigo):
+                    obtidos = self._extrair_modulos_cadastro(codigo, estatisticas)
+                for modulo, itens in obtidos.items():
+                    modulos[modulo] += itens
 
-            try:
-                zoneamentos += self._tag(
-                    self.soap_client.buscar_zoneamentos(codigo),
-                    codigo,
-                    "codigo_cadastro",
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] zoneamento: {e}")
+                with perfil.fase("estatisticas", instantaneo=False):
+                    estatisticas.registrar_cadastro(cad, obtidos)
+                metricas.contar("extracao_cadastros_total")
 
-            # Novos módulos
-            try:
-                anexos += self._tag(
-                    self.soap_client.buscar_anexos(codigo), codigo, "codigo_cadastro"
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] anexos: {e}")
+                # Salvamento parcial (opcional)
+                if self.save_interval and (idx % self.save_interval == 0):
+                    self.file_storage_service.salvar_progresso_parcial(
+                        cadastros[:idx], sufixo="auto"
+                    )
+                    self.file_storage_service.salvar_relatorio(
+                        "estatisticas_extracao_parcial", estatisticas.parcial()
+                    )
 
-            try:
-                historicos += self._tag(
-                    self.soap_client.buscar_historico(codigo), codigo, "codigo_cadastro"
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] historico: {e}")
+                # Pequeno delay entre cadastros (se configurado)
+                if self.request_delay and (idx < len(cadastros)):
+                    time.sleep(self.request_delay)
 
-            try:
-                bloco_itens += self._tag(
-                    self.soap_client.buscar_bloco_itens(codigo),
-                    codigo,
-                    "codigo_cadastro",
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] bloco_itens (BCI): {e}")
+        # 3) Salvar tudo em arquivos separados
+        CLIInterface.mostrar_info("Salvando JSONs por módulo...")
+        with livro.fase("salvamento"), perfil.fase("salvamento"):
+            resultados = self.file_storage_service.salvar_varios_datasets(
+                {"cadastros": cadastros, **modulos}
+            )
+        with livro.fase("estatisticas"), perfil.fase("estatisticas"):
+            resultado_estatisticas = estatisticas.resultado()
+        resultados["estatisticas_extracao"] = self.file_storage_service.salvar_relatorio(
+            "estatisticas_extracao", resultado_estatisticas
+        )
+        resultados["metricas_soap"] = self._salvar_metricas()
 
-            try:
-                itbis += self._tag(
-                    self.soap_client.buscar_itbi(codigo), codigo, "codigo_cadastro"
-                )
-            except Exception as e:
-                self.logger.warning(f"[{codigo}] itbi: {e}")
+        dur = (datetime.now() - inicio).total_seconds()
+        CLIInterface.mostrar_sucesso(f"Extração finalizada em {dur:.1f}s.")
+        return {k: v or "" for k, v in resultados.items()}
+
+    def extrair_pipeline(self, destino: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extração em estágios: threads de E/S buscam os bytes de cada módulo,
+        um pool de processos faz parse/normalização e o destino grava os
+        cadastros assim que ficam completos (ver PipelineExtracao).
+
+        Args:
+            destino: 'arquivos' (datasets JSON em streaming) ou 'banco'
+                (carga assíncrona no PostgreSQL); padrão APP_PIPELINE_SINK
+
+        Returns:
+            { nome_arquivo: caminho }
+        """
+        iniciar_servidor_metricas()
+        with sessao_livro("extracao", "pipeline"), \
+                sessao_perfil("perfil_extracao", self.file_storage_service), \
+                sessao_rastreamento(
+                    "extracao", modo="pipeline",
+                    trabalhadores_io=int(getattr(self.app_config, "pipeline_io_workers", 8)),
+                ):
+            return self._extrair_pipeline(destino)
+
+    def _extrair_pipeline(self, destino: Optional[str]) -> Dict[str, str]:
+        """Corpo de extrair_pipeline (perfil e endpoint de métricas já tratados)"""
+        inicio = datetime.now()
+        destino = destino or getattr(self.app_config, "pipeline_sink", "arquivos")
+        metricas.limpar()
+        livro.registrar(
+            destino=destino,
+            trabalhadores_io=int(getattr(self.app_config, "pipeline_io_workers", 8)),
+        )
+
+        CLIInterface.mostrar_info("Buscando cadastros (geral)...")
+        with livro.fase("listagem"), perfil.fase("listagem"), rastreador.span("listagem"):
+            cadastros = self._buscar_cadastros_geral()
+        CLIInterface.mostrar_sucesso(f"Total de cadastros: {len(cadastros)}")
+        self._registrar_cobertura(cadastros)
+
+        estatisticas = self.stats.criar_estatisticas_extracao(len(cadastros))
+        # APP_PIPELINE_PROCESSES: negativo = um por núcleo, 0 = sem pool
+        processos = int(getattr(self.app_config, "pipeline_processes", -1))
+        pipeline = PipelineExtracao(
+            self.MODULOS,
+            trabalhadores_io=int(getattr(self.app_config, "pipeline_io_workers", 8)),
+            processos=None if processos < 0 else processos,
+            tamanho_fila=int(getattr(self.app_config, "pipeline_queue_size", 256)),
+            request_delay=self.request_delay,
+        )
+        livro.registrar(processos=pipeline.processos)
+        sink = (
+            DestinoBanco() if destino == "banco"
+            else DestinoArquivos(self.DATASETS, file_storage_service=self.file_storage_service)
+        )
 
-            # Salvamento parcial (opcional)
+        tracker = self._acompanhar(len(cadastros), estatisticas.resumo_linha)
+
+        def ao_entregar(idx: int, cad: Dict[str, Any]):
+            tracker.atualizar(idx, extra=f"cadastro {cad.get('codigo_cadastro') or 'N/D'}")
             if self.save_interval and (idx % self.save_interval == 0):
-                self.file_storage_service.salvar_progresso_parcial(
-                    cadastros[:idx], sufixo="auto"
+                self.file_storage_service.salvar_relatorio(
+                    "estatisticas_extracao_parcial", estatisticas.parcial()
                 )
 
-            # Pequeno delay entre cadastros (se configurado)
-            if self.request_delay and (idx < len(cadastros)):
-                time.sleep(self.request_delay)
+        try:
+            with livro.fase("pipeline"), perfil.fase("pipeline"):
+                pipeline.executar(cadastros, sink, estatisticas, ao_entregar)
+        except BaseException:
+            sink.descartar()
+            raise
+        finally:
+            tracker.finalizar()
 
-        # 3) Salvar tudo em arquivos separados
-        CLIInterface.mostrar_info("Salvando JSONs por módulo...")
-        resultados = self.file_storage_service.salvar_varios_datasets(
-            {
-                "cadastros": cadastros,
-                "enderecos": enderecos,
-                "proprietarios": proprietarios,
-                "testadas": testadas,
-                "subreceitas": subreceitas,
-                "zoneamento": zoneamentos,
-                "anexos": anexos,
-                "historico": historicos,
-                "bci": bloco_itens,  # buscaBlocoItens
-                "itbi": itbis,  # buscaItbiCadastroImobiliario
-            }
+        CLIInterface.mostrar_info("Finalizando destino do pipeline...")
+        with livro.fase("salvamento"), perfil.fase("salvamento"):
+            saida = sink.fechar()
+        resultados = saida if destino != "banco" else {}
+        if destino == "banco":
+            self.resultado_carga = saida
+            livro.registrar_carga(saida)
+            if not saida.get("sucesso"):
+                CLIInterface.mostrar_erro(f"Carga no banco falhou: {saida.get('erro')}")
+        with livro.fase("estatisticas"), perfil.fase("estatisticas"):
+            resultado_estatisticas = estatisticas.resultado()
+        resultados["estatisticas_extracao"] = self.file_storage_service.salvar_relatorio(
+            "estatisticas_extracao", resultado_estatisticas
         )
+        resultados["metricas_soap"] = self._salvar_metricas()
 
         dur = (datetime.now() - inicio).total_seconds()
         CLIInterface.mostrar_sucesso(f"Extração finalizada em {dur:.1f}s.")
         return {k: v or "" for k, v in resultados.items()}
 
+    def _consultas_modulos(self) -> List[Tuple[str, Callable[[str], Any], str]]:
+        """Módulo -> (consulta SOAP, rótulo nos logs), na ordem de MODULOS"""
+        return [
+            ("enderecos", self.soap_client.buscar_enderecos, "enderecos"),
+            ("proprietarios", self.soap_client.buscar_proprietarios, "proprietarios"),
+            ("testadas", self.soap_client.buscar_testadas, "testadas"),
+            ("subreceitas", self.soap_client.buscar_subreceitas, "subreceitas"),
+            ("zoneamento", self.soap_client.buscar_zoneamentos, "zoneamento"),
+            # Novos módulos
+            ("anexos", self.soap_client.buscar_anexos, "anexos"),
+            ("historico", self.soap_client.buscar_historico, "historico"),
+            ("bci", self.soap_client.buscar_bloco_itens, "bloco_itens (BCI)"),  # buscaBlocoItens
+            ("itbi", self.soap_client.buscar_itbi, "itbi"),  # buscaItbiCadastroImobiliario
+        ]
+
+    def _extrair_modulos_cadastro(self, codigo: str, estatisticas) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Consulta todos os módulos de um cadastro (cada um com try/catch isolado)
+
+        Args:
+            codigo: Código do cadastro
+            estatisticas: EstatisticasExtracao que contabiliza registros e falhas
+
+        Returns:
+            Registros obtidos por módulo (módulos que falharam ficam de fora)
+        """
+        obtidos: Dict[str, List[Dict[str, Any]]] = {}
+        for modulo, consulta, rotulo in self._consultas_modulos():
+            try:
+                with perfil.fase(f"modulo:{modulo}", instantaneo=False), \
+                        rastreador.span("modulo", codigo_cadastro=codigo, modulo=modulo):
+                    itens = self._tag(consulta(codigo), codigo, "codigo_cadastro")
+            except Exception as e:
+                self.logger.warning(f"[{codigo}] {rotulo}: {e}")
+                estatisticas.registrar_falha(modulo)
+                metricas.contar("extracao_falhas_total", modulo=modulo)
+                continue
+            obtidos[modulo] = itens
+            estatisticas.registrar_modulo(modulo, itens)
+            metricas.contar("extracao_respostas_total", modulo=modulo)
+            metricas.contar("extracao_registros_total", len(itens), modulo=modulo)
+        return obtidos
+
+    # ------------------- Cobertura de códigos -------------------
+    def _acompanhar(self, total: int, detalhe: Optional[Callable[[], str]] = None) -> ProgressTracker:
+        """
+        Linha de progresso com vazão das requisições (APP_PROGRESS_MODE/INTERVAL)
+
+        Args:
+            total: Itens a percorrer
+            detalhe: Texto extra avaliado só quando a linha é desenhada
+        """
+        return ProgressTracker(
+            total=total,
+            modo=getattr(self.app_config, "progress_mode", "auto"),
+            intervalo=float(getattr(self.app_config, "progress_interval", 0.0)),
+            fonte=metricas.totais,
+            detalhe=detalhe,
+        )
+
+    def _salvar_metricas(self) -> Optional[str]:
+        """Grava data/json/metricas_soap.json e mostra as operações que mais consumiram tempo"""
+        CLIInterface.mostrar_metricas_soap(metricas.resumo())
+        return self.file_storage_service.salvar_relatorio("metricas_soap", metricas.exportar())
+
+    def _caminho_cobertura(self) -> str:
+        return os.path.join(self.file_storage_service.data_dir, "cobertura_codigos.json")
+
+    def carregar_cobertura(self) -> ConjuntoIntervalos:
+        """Códigos de cadastro já vistos em extrações anteriores"""
+        return ConjuntoIntervalos.carregar(self._caminho_cobertura())
+
+    def _registrar_cobertura(self, cadastros: Iterable[Dict[str, Any]]) -> ConjuntoIntervalos:
+        """Acrescenta os códigos dos cadastros à cobertura persistida"""
+        cobertura = self.carregar_cobertura()
+        for codigo in self._codigos_inteiros(cadastros):
+            cobertura.adicionar(codigo)
+        try:
+            cobertura.salvar(self._caminho_cobertura())
+        except OSError as e:
+            self.logger.warning(f"Falha ao salvar cobertura de códigos: {e}")
+        return cobertura
+
+    @staticmethod
+    def _codigos_inteiros(cadastros: Iterable[Dict[str, Any]]) -> Iterable[int]:
+        for cadastro in cadastros:
+            if not isinstance(cadastro, dict):
+                continue
+            try:
+                yield int(cadastro.get("codigo_cadastro"))
+            except (ValueError, TypeError):
+                continue
+
+    def reextrair_lacunas(
+        self,
+        cobertura: Optional[ConjuntoIntervalos] = None,
+        inicio: Optional[int] = None,
+        fim: Optional[int] = None,
+        tamanho_intervalo: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        Consulta novamente apenas as faixas de códigos ausentes da cobertura,
+        em intervalos "inicio-fim" (mesma paginação da consulta geral).
+
+        Args:
+            cobertura: Códigos já vistos (padrão: cobertura persistida)
+            inicio: Limite inferior (padrão: menor código visto)
+            fim: Limite superior (padrão: maior código visto)
+            tamanho_intervalo: Códigos por requisição
+
+        Returns:
+            Cadastros novos encontrados, faixas consultadas e lacunas restantes
+        """
+        cobertura = cobertura if cobertura is not None else self.carregar_cobertura()
+        faixas = [
+            (faixa_inicio, min(faixa_inicio + tamanho_intervalo - 1, faixa_fim))
+            for lacuna_inicio, faixa_fim in cobertura.lacunas(inicio, fim)
+            for faixa_inicio in range(lacuna_inicio, faixa_fim + 1, tamanho_intervalo)
+        ]
+        novos: List[Dict[str, Any]] = []
+        falhas = 0
+
+        # O bloco encerra o ticker do progresso também quando a consulta levanta
+        with self._acompanhar(len(faixas)) as tracker:
+            for idx, (faixa_inicio, faixa_fim) in enumerate(faixas, start=1):
+                tracker.atualizar(idx, extra=f"faixa {faixa_inicio}-{faixa_fim}")
+                try:
+                    lista = self.soap_client.buscar_cadastro_geral(
+                        codigo_cadastro=f"{faixa_inicio}-{faixa_fim}"
+                    )
+                except Exception as e:
+                    falhas += 1
+                    self.logger.warning(f"[{faixa_inicio}-{faixa_fim}] reextração: {e}")
+                    continue
+
+                for c in lista:
+                    if not isinstance(c, dict):
+                        continue
+                    c2 = dict(c)
+                    if "codigo" in c2 and "codigo_cadastro" not in c2:
+                        c2["codigo_cadastro"] = c2["codigo"]
+                    try:
+                        codigo = int(c2.get("codigo_cadastro"))
+                    except (ValueError, TypeError):
+                        continue
+                    # Filtro no cliente: o servidor pode ignorar a faixa
+                    if faixa_inicio <= codigo <= faixa_fim and codigo not in cobertura:
+                        cobertura.adicionar(codigo)
+                        novos.append(c2)
+
+                if self.request_delay and idx < len(faixas):
+                    time.sleep(self.request_delay)
+
+        if novos:
+            self._registrar_cobertura(novos)
+
+        return {
+            "cadastros": novos,
+            "faixas_consultadas": len(faixas),
+            "faixas_com_falha": falhas,
+            "lacunas_restantes": list(cobertura.lacunas(inicio, fim)),
+        }
+
     # ------------------- Helpers -------------------
     def _buscar_cadastros_geral(self) -> List[Dict[str, Any]]:
         """
@@ -195,7 +410,15 @@ class CadastroService:
         3) tipo_consulta=2, situacao=1
         4) tipo_consulta=1 (sem situacao)
         5) situacao=1 (sem tipo_consulta)
+
+        Com APP_LISTING_MODE=particionado, tenta antes a listagem por faixas
+        de código (ver _buscar_cadastros_particionado).
         """
+        if getattr(self.app_config, "listing_mode", "unico") == "particionado":
+            cadastros = self._buscar_cadastros_particionado()
+            if cadastros:
+                return cadastros
+
         tentativas = [
             {},  # sem filtros
             {"tipo_consulta": 1, "situacao": 1},
@@ -229,6 +452,25 @@ class CadastroService:
         # se nada retornou, devolve lista vazia
         return []
 
+    def _buscar_cadastros_particionado(self) -> List[Dict[str, Any]]:
+        """
+        Listagem geral em faixas "inicio-fim" consultadas em paralelo.
+        Devolve lista vazia se o servidor não filtrar por faixa.
+        """
+        listagem = ListagemParticionada(
+            tamanho_inicial=int(getattr(self.app_config, "max_interval_size", 100)),
+            limite_registros=int(getattr(self.app_config, "listing_max_records", 500)),
+            codigo_maximo=int(getattr(self.app_config, "listing_max_code", 10000)),
+            trabalhadores=int(getattr(self.app_config, "listing_workers", 4)),
+        )
+        try:
+            return listagem.listar()
+        except ParticionamentoNaoSuportado as e:
+            CLIInterface.mostrar_aviso(f"Listagem por faixas indisponível ({e}); usando consulta única.")
+        except Exception as e:
+            self.logger.warning(f"Falha na listagem particionada: {e}")
+        return []
+
     @staticmethod
     def _tag(
         items: Union[List[Dict[str, Any]], Dict[str, Any], None],
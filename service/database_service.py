@@ -3,16 +3,24 @@ Database Service - Serviço de integração com banco de dados
 Orquestra operações de banco mantendo lógica de negócio
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, AsyncIterable, Union
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress, AsyncExitStack
+import asyncio
 import time
-from datetime import datetime
+from datetime import datetime, date
+from decimal import Decimal
 
 from config.database import db_settings
-from repository.database_repository import DatabaseRepository
-from model.database_models import Base
+from repository.database_repository import DatabaseRepository, calcular_hash_conteudo
+from repository.bulk_load_repository import BulkLoadRepository, TABELAS_RECARGA
+from model.database_models import Base, MIGRACOES_SCHEMA, ProcessamentoLog, EstatisticaBanco
+from service.storage_service import FileStorageService
+from service.metrics_service import metricas
+from service.metrics_http_service import iniciar_servidor_metricas
+from service.profiling_service import perfil, sessao_perfil
+from service.ledger_service import livro, sessao_livro
 from interface.cli_interface import CLIInterface
 from interface.styles.colors import Colors
 
@@ -64,6 +72,9 @@ class DatabaseService:
             # Criar todas as tabelas
             Base.metadata.create_all(self.engine)
 
+            # Aplicar migrações em tabelas já existentes
+            self._aplicar_migracoes()
+
             print(Colors.success(f"✅ Schema '{self.config.schema}' criado com sucesso"))
             return True
 
@@ -71,6 +82,25 @@ class DatabaseService:
             CLIInterface.mostrar_erro(f"Erro ao criar schema: {e}")
             return False
 
+    def _aplicar_migracoes(self):
+        """Aplica alterações incrementais de schema (idempotentes)"""
+        # Conexão DBAPI direta: o dialeto do SQLAlchemy descarta os avisos do
+        # servidor após cada execute, e o RAISE WARNING das migrações informa
+        # quantos valores a conversão de tipo descartou
+        conexao = self.engine.raw_connection()
+        try:
+            with conexao.cursor() as cursor:
+                del cursor.connection.notices[:]
+                for comando in MIGRACOES_SCHEMA:
+                    cursor.execute(comando)
+                # NOTICE de "IF NOT EXISTS ... skipping" não interessa
+                avisos = [aviso for aviso in cursor.connection.notices if aviso.startswith("WARNING")]
+            conexao.commit()
+        finally:
+            conexao.close()
+        for aviso in avisos:
+            CLIInterface.mostrar_aviso(f"Migração: {aviso.split(':', 1)[1].strip()}")
+
     @contextmanager
     def get_db_session(self):
         """
@@ -88,23 +118,35 @@ class DatabaseService:
         finally:
             session.close()
 
-    def processar_arquivo_json(self, caminho_arquivo: str) -> Dict[str, Any]:
+    def processar_arquivo_json(self, caminho_arquivo: str, recarga_completa: bool = False) -> Dict[str, Any]:
         """
         Processa arquivo JSON e insere dados no banco
 
         Args:
             caminho_arquivo: Caminho para arquivo JSON
+            recarga_completa: Substitui todo o conteúdo via tabelas sombra
+                              em vez de inserir/atualizar registro a registro
 
         Returns:
             Resultado do processamento
         """
+        iniciar_servidor_metricas()
+        modo = "recarga" if recarga_completa else "incremental"
+        with sessao_livro("carga", modo, arquivo=caminho_arquivo), sessao_perfil("perfil_carga_banco"):
+            resultado = self._processar_arquivo_json(caminho_arquivo, recarga_completa)
+            livro.registrar_carga(resultado)
+            return resultado
+
+    def _processar_arquivo_json(self, caminho_arquivo: str, recarga_completa: bool) -> Dict[str, Any]:
+        """Corpo de processar_arquivo_json (perfil e endpoint de métricas já tratados)"""
         inicio_tempo = time.time()
 
         try:
             # Carregar dados do arquivo
             from service.storage_service import FileStorageService
             file_service = FileStorageService()
-            dados = file_service.carregar_dados_salvos(caminho_arquivo)
+            with livro.fase("leitura_json"), perfil.fase("leitura_json"):
+                dados = file_service.carregar_dados_salvos(caminho_arquivo)
 
             if not dados or 'cadastros' not in dados:
                 return {'sucesso': False, 'erro': 'Arquivo inválido ou sem cadastros'}
@@ -112,7 +154,11 @@ class DatabaseService:
             cadastros = dados['cadastros']
 
             # Processar dados
-            resultado = self._processar_lote_cadastros(cadastros, caminho_arquivo)
+            with livro.fase("carga_banco"), perfil.fase("carga_banco"):
+                if recarga_completa:
+                    resultado = self._recarregar_via_tabelas_sombra(cadastros, caminho_arquivo)
+                else:
+                    resultado = self._processar_lote_cadastros(cadastros, caminho_arquivo)
 
             # Calcular tempo de processamento
             tempo_total = time.time() - inicio_tempo
@@ -139,9 +185,11 @@ class DatabaseService:
         Returns:
             Resultado do processamento
         """
+        inicio_tempo = time.time()
         total_registros = len(cadastros)
         inseridos = 0
         atualizados = 0
+        inalterados = 0
         erros = 0
         erros_detalhes = []
 
@@ -151,6 +199,11 @@ class DatabaseService:
 
                 print(Colors.info(f"📊 Processando {total_registros} cadastros..."))
 
+                # Hashes já gravados, buscados em lote (evita um SELECT por cadastro)
+                hashes_existentes = repository.obter_hashes_conteudo(
+                    [c.get('codigo_cadastro') for c in cadastros if isinstance(c, dict)]
+                )
+
                 for i, cadastro in enumerate(cadastros):
                     try:
                         codigo_cadastro = cadastro.get('codigo_cadastro')
@@ -160,11 +213,19 @@ class DatabaseService:
                             erros_detalhes.append("Cadastro sem código")
                             continue
 
+                        hash_novo = calcular_hash_conteudo(cadastro)
+
                         # Verificar se já existe
-                        if repository.verificar_cadastro_existe(codigo_cadastro):
-                            # Atualizar existente
-                            if repository.atualizar_cadastro(codigo_cadastro, cadastro):
+                        if codigo_cadastro in hashes_existentes:
+                            if hashes_existentes[codigo_cadastro] == hash_novo:
+                                # Conteúdo idêntico: nenhuma escrita
+                                inalterados += 1
+                                metricas.contar("banco_registros_total", resultado="inalterados")
+                            elif repository.atualizar_cadastro(codigo_cadastro, cadastro):
+                                # Atualizar existente
                                 atualizados += 1
+                                hashes_existentes[codigo_cadastro] = hash_novo
+                                metricas.contar("banco_registros_total", resultado="atualizados")
                             else:
                                 erros += 1
                                 erros_detalhes.append(f"Erro ao atualizar {codigo_cadastro}")
@@ -172,6 +233,8 @@ class DatabaseService:
                             # Inserir novo
                             if repository.inserir_cadastro_completo(cadastro):
                                 inseridos += 1
+                                hashes_existentes[codigo_cadastro] = hash_novo
+                                metricas.contar("banco_registros_total", resultado="inseridos")
                             else:
                                 erros += 1
                                 erros_detalhes.append(f"Erro ao inserir {codigo_cadastro}")
@@ -184,30 +247,38 @@ class DatabaseService:
                         erros += 1
                         erros_detalhes.append(f"Erro no registro {i}: {str(e)}")
 
+                metricas.contar("banco_registros_total", erros, resultado="erros")
+
                 # Registrar log do processamento
                 log_data = {
                     'arquivo_origem': arquivo_origem,
                     'total_registros': total_registros,
                     'registros_inseridos': inseridos,
                     'registros_atualizados': atualizados,
+                    'registros_inalterados': inalterados,
                     'registros_erro': erros,
+                    'tempo_processamento': time.time() - inicio_tempo,
                     'status': 'sucesso' if erros == 0 else ('parcial' if inseridos + atualizados > 0 else 'erro'),
                     'erro_detalhes': '\n'.join(erros_detalhes[:10])  # Limitar erros salvos
                 }
 
                 repository.registrar_processamento(log_data)
 
-                # Quebra de linha após progresso completo
-                print()  # Nova linha após a barra de progresso
+            # Quebra de linha após progresso completo
+            print()  # Nova linha após a barra de progresso
 
-                return {
-                    'sucesso': True,
-                    'total_registros': total_registros,
-                    'inseridos': inseridos,
-                    'atualizados': atualizados,
-                    'erros': erros,
-                    'erros_detalhes': erros_detalhes
-                }
+            # Agregados depois do commit da carga (varreduras fora da transação)
+            self._atualizar_estatisticas_agregadas()
+
+            return {
+                'sucesso': True,
+                'total_registros': total_registros,
+                'inseridos': inseridos,
+                'atualizados': atualizados,
+                'inalterados': inalterados,
+                'erros': erros,
+                'erros_detalhes': erros_detalhes
+            }
 
         except Exception as e:
             CLIInterface.mostrar_erro(f"Erro durante processamento em lote: {e}")
@@ -217,25 +288,416 @@ class DatabaseService:
                 'total_registros': total_registros,
                 'inseridos': inseridos,
                 'atualizados': atualizados,
+                'inalterados': inalterados,
                 'erros': erros + 1
             }
 
-    def obter_estatisticas_completas(self) -> Dict[str, Any]:
+    def _recarregar_via_tabelas_sombra(self, cadastros: List[Dict[str, Any]], arquivo_origem: str) -> Dict[str, Any]:
+        """
+        Recarga completa: COPY em tabelas sombra, índices depois da carga e
+        troca atômica com as tabelas ativas
+
+        Leitores continuam vendo os dados anteriores durante toda a carga e
+        não sobram tuplas mortas, pois as tabelas antigas são descartadas.
+
+        Args:
+            cadastros: Lista de cadastros para carregar
+            arquivo_origem: Nome do arquivo de origem
+
+        Returns:
+            Resultado do processamento
+        """
+        inicio_tempo = time.time()
+        total_registros = len(cadastros)
+
+        try:
+            print(Colors.info(f"📊 Recarga completa de {total_registros} cadastros (tabelas sombra)..."))
+
+            # 1. Carga em tabelas sombra + 2. índices (transação própria)
+            with self.get_db_session() as session:
+                repository = BulkLoadRepository(session)
+                repository.criar_tabelas_sombra()
+                contagens = repository.carregar_tabelas_sombra(cadastros)
+                metricas.contar("banco_registros_total", contagens['cadastros'], resultado="inseridos")
+                print(Colors.info(f"🧱 {contagens['cadastros']} cadastros copiados; criando índices..."))
+                repository.criar_indices_sombra()
+
+            # 3. Troca atômica + log (transação curta)
+            erros = contagens['sem_codigo']
+            with self.get_db_session() as session:
+                repository = BulkLoadRepository(session)
+                repository.trocar_tabelas_sombra()
+                repository.registrar_processamento({
+                    'arquivo_origem': arquivo_origem,
+                    'total_registros': total_registros,
+                    'registros_inseridos': contagens['cadastros'],
+                    'registros_atualizados': 0,
+                    'registros_inalterados': 0,
+                    'registros_erro': erros,
+                    'tempo_processamento': time.time() - inicio_tempo,
+                    'status': 'sucesso' if erros == 0 else 'parcial',
+                    'erro_detalhes': f"{erros} cadastros sem código" if erros else None
+                })
+
+            # Agregados fora da transação da troca (mantém o lock curto)
+            self._atualizar_estatisticas_agregadas()
+
+            print(Colors.success("✅ Tabelas sombra promovidas a tabelas ativas"))
+
+            return {
+                'sucesso': True,
+                'total_registros': total_registros,
+                'inseridos': contagens['cadastros'],
+                'atualizados': 0,
+                'inalterados': 0,
+                'duplicados': contagens['duplicados'],
+                'erros': erros,
+                'erros_detalhes': ["Cadastro sem código"] * erros
+            }
+
+        except Exception as e:
+            CLIInterface.mostrar_erro(f"Erro durante recarga completa: {e}")
+            try:
+                with self.get_db_session() as session:
+                    BulkLoadRepository(session).descartar_tabelas_sombra()
+            except Exception:
+                pass
+            return {
+                'sucesso': False,
+                'erro': str(e),
+                'total_registros': total_registros,
+                'inseridos': 0,
+                'atualizados': 0,
+                'inalterados': 0,
+                'erros': 1
+            }
+
+    async def carregar_cadastros_async(
+        self,
+        fonte: Union[AsyncIterable[Dict[str, Any]], Iterable[Dict[str, Any]]],
+        arquivo_origem: str = "pipeline_async",
+        tamanho_lote: int = 500,
+        conexoes: int = 4,
+        transacao_unica: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Carrega cadastros de forma assíncrona (asyncpg) enquanto a fonte produz
+
+        Usa o engine assíncrono de async_connection_string com um pool de
+        conexões; cada conexão grava lotes com copy_records_to_table + upsert
+        condicionado ao hash. Assim as escritas se sobrepõem à extração no
+        mesmo event loop em vez de formar uma fase serial ao final.
+
+        Args:
+            fonte: Iterável (síncrono ou assíncrono) de cadastros em dict;
+                uma exceção da fonte interrompe a carga
+            arquivo_origem: Origem registrada em processamento_logs
+            tamanho_lote: Cadastros por lote/transação
+            conexoes: Gravadores concorrentes (tamanho do pool)
+            transacao_unica: Cada conexão mantém uma transação até o fim (os
+                lotes viram savepoints) e todas são confirmadas só depois que
+                a fonte termina; falha ou interrupção desfaz a carga inteira
+
+        Returns:
+            Resultado do processamento
+        """
+        iniciar_servidor_metricas()
+        with sessao_livro("carga", "async", arquivo=arquivo_origem, conexoes=conexoes), \
+                sessao_perfil("perfil_carga_banco"):
+            with livro.fase("carga_banco_async"), perfil.fase("carga_banco_async"):
+                resultado = await self._carregar_cadastros_async(
+                    fonte, arquivo_origem, tamanho_lote, conexoes, transacao_unica
+                )
+            livro.registrar_carga(resultado)
+            return resultado
+
+    async def _carregar_cadastros_async(self, fonte, arquivo_origem: str, tamanho_lote: int,
+                                        conexoes: int, transacao_unica: bool = False) -> Dict[str, Any]:
+        """Corpo de carregar_cadastros_async (perfil e endpoint de métricas já tratados)"""
+        # Importação tardia: asyncpg só é necessário neste caminho
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from repository.async_load_repository import AsyncLoadRepository
+        from service.sketch_service import EstatisticasStreaming
+
+        inicio_tempo = time.time()
+        engine = create_async_engine(
+            self.config.async_connection_string,
+            pool_size=conexoes,
+            max_overflow=0
+        )
+
+        fila: asyncio.Queue = asyncio.Queue(maxsize=conexoes * 2)
+        metricas.registrar_medidor("banco_fila_lotes", fila.qsize)
+        resultado = {
+            'total_registros': 0, 'inseridos': 0, 'atualizados': 0,
+            'inalterados': 0, 'duplicados': 0, 'erros': 0, 'erros_detalhes': []
+        }
+        # Quantis e distintos de memória fixa, calculados enquanto a fonte produz
+        estatisticas = EstatisticasStreaming()
+
+        async def produzir():
+            lote: List[Dict[str, Any]] = []
+
+            async def enfileirar(cadastro):
+                nonlocal lote
+                resultado['total_registros'] += 1
+                if not isinstance(cadastro, dict) or not cadastro.get('codigo_cadastro'):
+                    resultado['erros'] += 1
+                    resultado['erros_detalhes'].append("Cadastro sem código")
+                    return
+                estatisticas.update(cadastro)
+                lote.append(cadastro)
+                if len(lote) >= tamanho_lote:
+                    await fila.put(lote)
+                    lote = []
+
+            if hasattr(fonte, '__aiter__'):
+                async for cadastro in fonte:
+                    await enfileirar(cadastro)
+            else:
+                for cadastro in fonte:
+                    await enfileirar(cadastro)
+
+            if lote:
+                await fila.put(lote)
+            for _ in range(conexoes):
+                await fila.put(None)
+
+        async def gravar(repository):
+            while True:
+                lote = await fila.get()
+                if lote is None:
+                    break
+                try:
+                    # Com transacao_unica, savepoint dentro da transação da conexão
+                    async with repository.conexao.transaction():
+                        contagens = await repository.gravar_lote(lote)
+                    for chave in ('inseridos', 'atualizados', 'inalterados'):
+                        resultado[chave] += contagens[chave]
+                        metricas.contar("banco_registros_total", contagens[chave], resultado=chave)
+                    resultado['duplicados'] += contagens['duplicados']
+                except Exception as e:
+                    resultado['erros'] += len(lote)
+                    metricas.contar("banco_registros_total", len(lote), resultado="erros")
+                    resultado['erros_detalhes'].append(f"Erro no lote: {e}")
+
+        try:
+            async with AsyncExitStack() as conexoes_abertas:
+                repositorios = []
+                for _ in range(conexoes):
+                    conn = await conexoes_abertas.enter_async_context(engine.connect())
+                    bruta = await conn.get_raw_connection()
+                    repository = AsyncLoadRepository(bruta.driver_connection, transacao_unica)
+                    await repository.preparar()
+                    repositorios.append(repository)
+
+                transacoes = []
+                for repository in repositorios if transacao_unica else []:
+                    transacao = repository.conexao.transaction()
+                    await transacao.start()
+                    transacoes.append(transacao)
+
+                tarefas = [asyncio.create_task(produzir())]
+                tarefas += [asyncio.create_task(gravar(repository)) for repository in repositorios]
+                try:
+                    try:
+                        await asyncio.gather(*tarefas)
+                    finally:
+                        # Falha de um gravador (ou da fonte) cancela os demais antes do
+                        # dispose do engine, em vez de deixá-los presos na fila
+                        for tarefa in tarefas:
+                            tarefa.cancel()
+                        await asyncio.gather(*tarefas, return_exceptions=True)
+                except BaseException:
+                    for transacao in transacoes:
+                        with suppress(Exception):
+                            await transacao.rollback()
+                    raise
+                for transacao in transacoes:
+                    await transacao.commit()
+
+            tempo_total = time.time() - inicio_tempo
+            erros = resultado['erros']
+            gravados = resultado['inseridos'] + resultado['atualizados'] + resultado['inalterados']
+
+            async with engine.connect() as conn:
+                bruta = await conn.get_raw_connection()
+                await AsyncLoadRepository(bruta.driver_connection).registrar_processamento({
+                    'arquivo_origem': arquivo_origem,
+                    'total_registros': resultado['total_registros'],
+                    'registros_inseridos': resultado['inseridos'],
+                    'registros_atualizados': resultado['atualizados'],
+                    'registros_inalterados': resultado['inalterados'],
+                    'registros_erro': erros,
+                    'tempo_processamento': tempo_total,
+                    'status': 'sucesso' if erros == 0 else ('parcial' if gravados > 0 else 'erro'),
+                    'erro_detalhes': '\n'.join(resultado['erros_detalhes'][:10])
+                })
+
+            # Agregados pelo caminho síncrono, fora do event loop
+            await asyncio.to_thread(self._atualizar_estatisticas_agregadas)
+
+            resultado['sucesso'] = True
+            resultado['tempo_processamento'] = tempo_total
+            resultado['estatisticas'] = estatisticas.resultado()
+            return resultado
+
+        except Exception as e:
+            CLIInterface.mostrar_erro(f"Erro durante carga assíncrona: {e}")
+            resultado.update({
+                'sucesso': False,
+                'erro': str(e),
+                'tempo_processamento': time.time() - inicio_tempo
+            })
+            return resultado
+
+        finally:
+            metricas.remover_medidor("banco_fila_lotes")
+            await engine.dispose()
+
+    def _atualizar_estatisticas_agregadas(self):
+        """Recalcula a tabela de agregados em uma sessão própria"""
+        with self.get_db_session() as session:
+            DatabaseRepository(session).atualizar_estatisticas_agregadas()
+
+    def obter_estatisticas_completas(self, modo: str = "agregado") -> Dict[str, Any]:
         """
         Obtém estatísticas completas do banco de dados
 
+        Args:
+            modo: 'agregado' (tabela atualizada ao fim de cada carga),
+                  'estimado' (pg_class.reltuples, instantâneo) ou
+                  'exato' (COUNT(*) em todas as tabelas)
+
         Returns:
             Estatísticas detalhadas
         """
         try:
             with self.get_db_session() as session:
                 repository = DatabaseRepository(session)
-                return repository.obter_estatisticas_banco()
+
+                if modo == "estimado":
+                    return repository.obter_estatisticas_estimadas()
+                if modo == "exato":
+                    return repository.obter_estatisticas_banco()
+
+                stats = repository.obter_estatisticas_agregadas()
+                if stats is None:
+                    # Banco carregado antes da tabela de agregados existir
+                    stats = repository.atualizar_estatisticas_agregadas()
+                return stats
 
         except Exception as e:
             CLIInterface.mostrar_erro(f"Erro ao obter estatísticas: {e}")
             return {}
 
+    def consultar_dados_originais(self, filtro: Dict[str, Any], limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Consulta cadastros por conteúdo do JSON original (índice GIN)
+
+        Args:
+            filtro: Fragmento do JSON original, ex.: {'inscricao_imobiliaria': '01.03.059.0037.001'}
+            limite: Quantidade máxima de resultados
+
+        Returns:
+            Lista com os JSONs originais encontrados
+        """
+        try:
+            with self.get_db_session() as session:
+                repository = DatabaseRepository(session)
+                return [c.dados_originais for c in repository.buscar_por_conteudo(filtro, limite)]
+
+        except Exception as e:
+            CLIInterface.mostrar_erro(f"Erro ao consultar cadastros: {e}")
+            return []
+
+    def exportar_datasets(self, formato: str = "json", prefixo: str = "banco_",
+                          tamanho_lote: int = 1000,
+                          file_service: Optional[FileStorageService] = None) -> Dict[str, Any]:
+        """
+        Regenera os datasets JSON/JSONL a partir do banco, com memória constante
+
+        Cadastros e filhos são lidos com cursores do servidor e escritos um
+        registro por vez; cada cadastro sai com seu JSON original.
+
+        Args:
+            formato: 'json' (lista, como salvar_dataset) ou 'jsonl'
+            prefixo: Prefixo dos arquivos (evita sobrescrever a extração)
+            tamanho_lote: Linhas buscadas por ida ao servidor
+            file_service: Serviço de arquivos de destino
+
+        Returns:
+            Caminhos e quantidades exportadas por dataset
+        """
+        file_service = file_service or FileStorageService()
+        inicio_tempo = time.time()
+        # Nomes dos datasets produzidos pela extração
+        nomes = {
+            'cadastros': 'cadastros',
+            'proprietarios': 'proprietarios',
+            'enderecos': 'enderecos',
+            'zoneamentos': 'zoneamento',
+        }
+        escritores = {}
+
+        try:
+            for chave, nome in nomes.items():
+                escritores[chave] = file_service.abrir_dataset_stream(f"{prefixo}{nome}", formato)
+
+            with self.get_db_session() as session:
+                repository = DatabaseRepository(session)
+                for cadastro, filhos in repository.iterar_cadastros_com_filhos(tamanho_lote):
+                    codigo = cadastro['codigo_cadastro']
+                    escritores['cadastros'].escrever(
+                        cadastro['dados_originais'] or self._linha_para_dataset(cadastro)
+                    )
+                    for chave, linhas in filhos.items():
+                        for linha in linhas:
+                            registro = self._linha_para_dataset(linha)
+                            registro['codigo_cadastro'] = codigo
+                            escritores[chave].escrever(registro)
+
+            arquivos = {}
+            for chave, escritor in escritores.items():
+                arquivos[nomes[chave]] = {'arquivo': escritor.fechar(), 'registros': escritor.total}
+
+            return {
+                'sucesso': True,
+                'formato': formato,
+                'arquivos': arquivos,
+                'tempo_processamento': time.time() - inicio_tempo
+            }
+
+        except Exception as e:
+            for escritor in escritores.values():
+                escritor.descartar()
+            CLIInterface.mostrar_erro(f"Erro ao exportar dados: {e}")
+            return {'sucesso': False, 'erro': str(e)}
+
+    @staticmethod
+    def _linha_para_dataset(linha: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte uma linha do banco para o formato dos datasets extraídos
+        (valores textuais, vazio no lugar de NULL, sem colunas internas)
+        """
+        registro = {}
+        for coluna, valor in linha.items():
+            if coluna in ('id', 'cadastro_id', 'dados_originais'):
+                continue
+            if valor is None:
+                registro[coluna] = ""
+            elif coluna == 'cep':
+                registro[coluna] = str(valor).zfill(8)
+            elif isinstance(valor, Decimal):
+                registro[coluna] = format(valor.normalize(), 'f')
+            elif isinstance(valor, (date, datetime)):
+                registro[coluna] = valor.isoformat()
+            elif isinstance(valor, bool):
+                registro[coluna] = "true" if valor else "false"
+            else:
+                registro[coluna] = str(valor)
+        return registro
+
     def testar_conexao(self) -> bool:
         """
         Testa conexão com o banco de dados
@@ -268,12 +730,12 @@ class DatabaseService:
 
         try:
             with self.get_db_session() as session:
-                # Limpar tabelas na ordem correta (relacionamentos)
-                session.execute(text("DELETE FROM cadastros.zoneamentos"))
-                session.execute(text("DELETE FROM cadastros.enderecos"))
-                session.execute(text("DELETE FROM cadastros.proprietarios"))
-                session.execute(text("DELETE FROM cadastros.cadastros_imobiliarios"))
-                session.execute(text("DELETE FROM cadastros.processamento_logs"))
+                # TRUNCATE de todas as tabelas de uma vez (sem tuplas mortas)
+                tabelas = [t.fullname for t in TABELAS_RECARGA] + [
+                    ProcessamentoLog.__table__.fullname,
+                    EstatisticaBanco.__table__.fullname
+                ]
+                session.execute(text(f"TRUNCATE {', '.join(tabelas)} RESTART IDENTITY"))
 
                 print(Colors.success("✅ Dados limpos com sucesso"))
                 return True
@@ -0,0 +1,294 @@
+"""
+Ledger Service - Histórico de desempenho das execuções
+Cada extração e cada carga no banco acrescenta uma linha JSON em
+APP_LEDGER_FILE com a duração por fase, requisições, bytes, registros por
+módulo, erros e taxas efetivas. O relatório de tendência que compara a
+última execução com o histórico fica em benchmark/ledger_report.py.
+"""
+
+from typing import Dict, Any, Optional, Iterator, List
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+import threading
+import time
+import uuid
+
+from service.metrics_service import metricas
+from interface.cli_interface import CLIInterface
+from config.settings import settings
+
+
+def _taxa(quantidade: float, segundos: float) -> float:
+    return round(quantidade / segundos, 3) if segundos > 0 else 0.0
+
+
+class ExecucaoRegistrada:
+    """Entrada do histórico em construção (uma extração ou uma carga)"""
+
+    def __init__(self, tipo: str, modo: str, campos: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.tipo = tipo
+        self.modo = modo
+        self.campos = campos
+        self.fases: Dict[str, float] = {}
+        self.iniciado_em = datetime.now()
+        self._relogio = time.perf_counter()
+        self._thread = threading.get_ident()
+
+    def entrada(self, erro: Optional[BaseException] = None) -> Dict[str, Any]:
+        """
+        Monta a linha do histórico
+
+        Extrações leem requisições, bytes e registros do registro de métricas
+        (zerado no início de cada extração); extrações distribuídas, cujas
+        métricas ficam nos processos worker, usam as contagens dos shards
+        informadas no campo contagens; cargas usam o resultado informado com
+        registrar_carga().
+        """
+        duracao = time.perf_counter() - self._relogio
+        entrada = {
+            "id": self.id,
+            "tipo": self.tipo,
+            "modo": self.modo,
+            "iniciado_em": self.iniciado_em.isoformat(timespec="seconds"),
+            "duracao_s": round(duracao, 3),
+            "status": "erro" if erro else self.campos.pop("status", "sucesso"),
+            "fases": {nome: round(segundos, 3) for nome, segundos in self.fases.items()},
+        }
+        if erro is not None:
+            entrada["erro"] = type(erro).__name__
+        if self.tipo == "extracao" and "contagens" in self.campos:
+            entrada.update(self._medidas_contagens(self.campos.pop("contagens"), duracao))
+        elif self.tipo == "extracao":
+            entrada.update(self._medidas_extracao(duracao))
+        else:
+            entrada.update(self._medidas_carga(duracao))
+        entrada.update(self.campos)
+        return entrada
+
+    def _medidas_extracao(self, duracao: float) -> Dict[str, Any]:
+        operacoes = metricas.exportar()["operacoes"].values()
+        requisicoes = sum(op["requisicoes"] for op in operacoes)
+        com_falha = sum(op["requisicoes_com_falha"] for op in operacoes)
+        recebidos = sum(op["bytes_resposta"] for op in operacoes)
+        cadastros = int(metricas.total("extracao_cadastros_total"))
+        por_modulo = {m: int(v) for m, v in sorted(metricas.por_rotulo("extracao_registros_total", "modulo").items())}
+        falhas_modulo = {m: int(v) for m, v in sorted(metricas.por_rotulo("extracao_falhas_total", "modulo").items())}
+        registros = sum(por_modulo.values())
+        return {
+            "requisicoes": {
+                "total": requisicoes,
+                "com_falha": com_falha,
+                "retentativas": sum(op["retentativas"] for op in operacoes),
+                "fallbacks": sum(op["fallbacks"] for op in operacoes),
+                "bytes_enviados": sum(op["bytes_requisicao"] for op in operacoes),
+                "bytes_recebidos": recebidos,
+            },
+            "volume": {
+                "cadastros": cadastros,
+                "registros": registros,
+                "bytes_recebidos": recebidos,
+                "bytes_por_cadastro": round(recebidos / cadastros) if cadastros else 0,
+                "registros_por_modulo": por_modulo,
+            },
+            "erros": {
+                "requisicoes_com_falha": com_falha,
+                "modulos_com_falha": sum(falhas_modulo.values()),
+                "falhas_por_modulo": falhas_modulo,
+                "taxa_falha_requisicoes": round(com_falha / requisicoes, 4) if requisicoes else 0.0,
+            },
+            "taxas": {
+                "cadastros_por_s": _taxa(cadastros, duracao),
+                "registros_por_s": _taxa(registros, duracao),
+                "requisicoes_por_s": _taxa(requisicoes, duracao),
+                "mb_recebidos_por_s": _taxa(recebidos / 1_000_000, duracao),
+            },
+        }
+
+    def _medidas_contagens(self, contagens: Dict[str, Any], duracao: float) -> Dict[str, Any]:
+        """Volume e falhas por módulo informados pela execução (sem requisições nem bytes)"""
+        cadastros = int(contagens.get("cadastros", 0))
+        por_modulo = {m: int(v) for m, v in sorted(contagens.get("registros_por_modulo", {}).items())}
+        falhas_modulo = {m: int(v) for m, v in sorted(contagens.get("falhas_por_modulo", {}).items())}
+        registros = sum(por_modulo.values())
+        return {
+            "volume": {
+                "cadastros": cadastros,
+                "registros": registros,
+                "registros_por_modulo": por_modulo,
+            },
+            "erros": {
+                "modulos_com_falha": sum(falhas_modulo.values()),
+                "falhas_por_modulo": falhas_modulo,
+            },
+            "taxas": {
+                "cadastros_por_s": _taxa(cadastros, duracao),
+                "registros_por_s": _taxa(registros, duracao),
+            },
+        }
+
+    def _medidas_carga(self, duracao: float) -> Dict[str, Any]:
+        resultado = self.campos.pop("resultado_carga", {})
+        total = resultado.get("total_registros", 0)
+        erros = resultado.get("erros", 0)
+        gravados = sum(resultado.get(chave, 0) for chave in ("inseridos", "atualizados", "inalterados"))
+        return {
+            "volume": {
+                "registros": total,
+                "inseridos": resultado.get("inseridos", 0),
+                "atualizados": resultado.get("atualizados", 0),
+                "inalterados": resultado.get("inalterados", 0),
+            },
+            "erros": {
+                "registros_erro": erros,
+                "taxa_erro": round(erros / total, 4) if total else 0.0,
+            },
+            "taxas": {
+                "registros_por_s": _taxa(total, duracao),
+                "gravados_por_s": _taxa(gravados, duracao),
+            },
+        }
+
+
+class LivroExecucoes:
+    """
+    Histórico de execuções em JSON Lines (append-only)
+
+    Uma execução por vez no processo: sessões abertas com outra em andamento
+    (extrair_completo -> extrair_pipeline, carga do pipeline no banco) não
+    geram linha própria, e a carga entra como campo da extração.
+    """
+
+    def __init__(self):
+        """Inicializa o livro sem execução em andamento"""
+        self.atual: Optional[ExecucaoRegistrada] = None
+        # Última entrada gravada (resumo do cli.py)
+        self.ultima: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ativo(self) -> bool:
+        return self.atual is not None
+
+    def iniciar(self, tipo: str, modo: str, **campos) -> ExecucaoRegistrada:
+        """Abre a execução do processo"""
+        self.atual = ExecucaoRegistrada(tipo, modo, campos)
+        return self.atual
+
+    @contextmanager
+    def fase(self, nome: str):
+        """Soma o tempo de parede do bloco na fase nome da execução atual"""
+        execucao = self.atual
+        if execucao is None or threading.get_ident() != execucao._thread:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            execucao.fases[nome] = execucao.fases.get(nome, 0.0) + time.perf_counter() - inicio
+
+    def registrar(self, **campos):
+        """Acrescenta campos à execução atual (sem execução, não faz nada)"""
+        if self.atual is not None:
+            self.atual.campos.update(campos)
+
+    def registrar_carga(self, resultado: Dict[str, Any]):
+        """
+        Informa o resultado de uma carga no banco
+
+        Na execução de carga ele vira volume/erros/taxas; dentro de uma
+        extração (destino banco do pipeline) fica resumido no campo carga.
+        Carga sem sucesso marca a execução com status erro nos dois casos.
+        """
+        execucao = self.atual
+        if execucao is None:
+            return
+        if not resultado.get("sucesso", True):
+            execucao.campos["status"] = "erro"
+        if execucao.tipo == "carga":
+            execucao.campos["resultado_carga"] = resultado
+        else:
+            execucao.campos["carga"] = {
+                chave: resultado.get(chave)
+                for chave in ("sucesso", "total_registros", "inseridos", "atualizados", "inalterados", "erros")
+            }
+
+    def encerrar(self, caminho: str, erro: Optional[BaseException] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fecha a execução atual e acrescenta a linha ao arquivo
+
+        Returns:
+            Entrada gravada, ou None se não havia execução
+        """
+        execucao, self.atual = self.atual, None
+        if execucao is None:
+            return None
+        entrada = execucao.entrada(erro)
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        texto = json.dumps(entrada, ensure_ascii=False, default=str) + "\n"
+        with self._lock, open(caminho, "a", encoding="utf-8") as f:
+            f.write(texto)
+        self.ultima = entrada
+        return entrada
+
+
+# Livro global do processo
+livro = LivroExecucoes()
+
+
+def carregar_historico(caminho: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Lê o histórico na ordem de gravação (linhas truncadas são ignoradas)
+
+    Args:
+        caminho: Arquivo do histórico (padrão: APP_LEDGER_FILE)
+    """
+    caminho = caminho or getattr(settings.app, "ledger_file", "")
+    if not caminho or not os.path.exists(caminho):
+        return []
+    entradas = []
+    with open(caminho, encoding="utf-8") as f:
+        for linha in f:
+            linha = linha.strip()
+            if not linha:
+                continue
+            try:
+                entradas.append(json.loads(linha))
+            except json.JSONDecodeError:
+                continue
+    return entradas
+
+
+@contextmanager
+def sessao_livro(tipo: str, modo: str, **campos) -> Iterator[Optional[ExecucaoRegistrada]]:
+    """
+    Registra o bloco como uma execução no histórico (APP_LEDGER_FILE)
+
+    Args:
+        tipo: 'extracao' ou 'carga'
+        modo: 'serial', 'pipeline', 'distribuida', 'incremental', 'recarga', 'async'
+        **campos: Campos extras da entrada (destino, arquivo...)
+    """
+    caminho = getattr(settings.app, "ledger_file", "")
+    if livro.ativo or not caminho:
+        yield None
+        return
+    execucao = livro.iniciar(tipo, modo, **campos)
+    try:
+        yield execucao
+    except BaseException as e:
+        _encerrar(caminho, e)
+        raise
+    else:
+        _encerrar(caminho)
+
+
+def _encerrar(caminho: str, erro: Optional[BaseException] = None):
+    # Falha ao gravar o histórico não derruba a execução
+    try:
+        livro.encerrar(caminho, erro)
+    except Exception as e:
+        CLIInterface.mostrar_aviso(f"Não foi possível gravar o histórico de execuções: {e}")
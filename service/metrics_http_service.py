@@ -0,0 +1,127 @@
+"""
+Metrics HTTP Service - Endpoint local com as métricas ao vivo
+GET /metrics no formato texto do Prometheus, servido por uma thread daemon.
+Ativado por APP_METRICS_PORT; o texto só é montado quando alguém coleta,
+então fora das coletas o custo é o dos contadores do RegistroMetricas.
+"""
+
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import threading
+
+from service.metrics_service import RegistroMetricas, metricas
+from interface.cli_interface import CLIInterface
+from config.settings import settings
+
+
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ManipuladorMetricas(BaseHTTPRequestHandler):
+    """Atende /metrics (e /) com o snapshot do registro do servidor"""
+
+    def do_GET(self):
+        if urlsplit(self.path).path not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        corpo = self.server.registro.formatar_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_CONTEUDO)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        # Coletas periódicas não poluem a linha de progresso
+        pass
+
+
+class ServidorMetricas:
+    """
+    Servidor HTTP das métricas em uma thread daemon
+
+    Uso:
+        with ServidorMetricas(9108) as servidor:
+            print(servidor.url)
+    """
+
+    def __init__(self, porta: int, host: str = "127.0.0.1",
+                 registro: Optional[RegistroMetricas] = None):
+        """
+        Inicializa o servidor (sem abrir a porta)
+
+        Args:
+            porta: Porta TCP (0 escolhe uma livre)
+            host: Interface de escuta; 0.0.0.0 expõe fora da máquina
+            registro: Registro exposto (padrão: o global do processo)
+        """
+        self.host = host
+        self.porta = porta
+        self.registro = registro or metricas
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.porta}/metrics"
+
+    def iniciar(self) -> "ServidorMetricas":
+        """Abre a porta e começa a atender; OSError se a porta estiver ocupada"""
+        self._http = ThreadingHTTPServer((self.host, self.porta), ManipuladorMetricas)
+        self._http.daemon_threads = True
+        self._http.registro = self.registro
+        self.porta = self._http.server_address[1]
+        self._thread = threading.Thread(
+            target=self._http.serve_forever, name="metricas-http", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def parar(self):
+        """Encerra o servidor e libera a porta"""
+        if self._http:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ServidorMetricas":
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+_servidor: Optional[ServidorMetricas] = None
+_lock = threading.Lock()
+
+
+def iniciar_servidor_metricas() -> Optional[ServidorMetricas]:
+    """
+    Sobe o endpoint uma única vez por processo, se APP_METRICS_PORT estiver definido
+
+    Chamado no início das extrações e cargas; as chamadas seguintes devolvem
+    o servidor já ativo. Com a porta ocupada (ex.: outro processo da extração
+    distribuída) apenas avisa e segue sem endpoint.
+
+    Returns:
+        Servidor ativo, ou None se desativado/indisponível
+    """
+    global _servidor
+    porta = int(getattr(settings.app, "metrics_port", 0) or 0)
+    if porta <= 0:
+        return None
+    with _lock:
+        if _servidor is None:
+            servidor = ServidorMetricas(porta, getattr(settings.app, "metrics_host", "127.0.0.1"))
+            try:
+                servidor.iniciar()
+            except OSError as e:
+                CLIInterface.mostrar_aviso(f"Endpoint de métricas indisponível na porta {porta}: {e}")
+                return None
+            _servidor = servidor
+            CLIInterface.mostrar_info(f"Métricas ao vivo em {servidor.url}")
+        return _servidor
@@ -0,0 +1,427 @@
+"""
+Metrics Service - Registro de métricas por operação SOAP
+Latência (KLL: p50/p95/p99), tempo de rede separado do parse, bytes de
+requisição/resposta, retentativas, fallbacks e classes de falha, com
+acesso thread-safe (threads de E/S do pipeline e listagem particionada
+registram ao mesmo tempo). Exportável em JSON ao final de uma execução
+ou sob demanda (exportar / SIGUSR1), e em formato texto do Prometheus
+para o endpoint ao vivo (ver metrics_http_service).
+"""
+
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from datetime import datetime
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from service.sketch_service import KLLSketch
+
+
+QUANTIS = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+
+class MetricasOperacao:
+    """
+    Métricas acumuladas de uma operação do WSDL
+
+    Chamada = uma invocação de _call/buscar_bytes (com todas as tentativas);
+    requisição = cada ida ao servidor (retentativas e fallbacks incluídos).
+    """
+
+    def __init__(self):
+        """Inicializa contadores e sketches vazios"""
+        self.chamadas = 0
+        self.chamadas_com_erro = 0
+        self.requisicoes = 0
+        self.requisicoes_com_falha = 0
+        self.retentativas = 0
+        self.fallbacks = 0
+        self.falhas: Dict[str, int] = {}
+        self.status_http: Dict[str, int] = {}
+        self.bytes_requisicao = 0
+        self.bytes_resposta = 0
+        self.maior_resposta = 0
+        self.tempo_chamadas = 0.0
+        self.tempo_rede = 0.0
+        self.tempo_parse = 0.0
+        self.parses = 0
+        self.latencia = KLLSketch()
+        self.rede = KLLSketch()
+        self.parse = KLLSketch()
+        self.tamanho_resposta = KLLSketch()
+
+    @staticmethod
+    def _quantis_ms(sketch: KLLSketch) -> Dict[str, Optional[float]]:
+        valores = sketch.quantis(QUANTIS.values())
+        return {
+            rotulo: (round(valor * 1000, 2) if valor is not None else None)
+            for rotulo, valor in zip(QUANTIS, valores)
+        }
+
+    def resultado(self, tempo_total: float) -> Dict[str, Any]:
+        """
+        Monta o dicionário exportado da operação
+
+        Args:
+            tempo_total: Soma do tempo de todas as operações (para a participação)
+        """
+        tamanhos = self.tamanho_resposta.quantis(QUANTIS.values())
+        tempo = self.tempo_chamadas or (self.tempo_rede + self.tempo_parse)
+        return {
+            "chamadas": self.chamadas,
+            "chamadas_com_erro": self.chamadas_com_erro,
+            "requisicoes": self.requisicoes,
+            "requisicoes_com_falha": self.requisicoes_com_falha,
+            "retentativas": self.retentativas,
+            "fallbacks": self.fallbacks,
+            "falhas": dict(self.falhas),
+            "status_http": dict(self.status_http),
+            "latencia_ms": self._quantis_ms(self.latencia),
+            "rede_ms": self._quantis_ms(self.rede),
+            "parse_ms": self._quantis_ms(self.parse),
+            "tempo_total_s": round(tempo, 3),
+            "tempo_rede_s": round(self.tempo_rede, 3),
+            "tempo_parse_s": round(self.tempo_parse, 3),
+            "participacao": round(tempo / tempo_total, 4) if tempo_total else 0.0,
+            "bytes_requisicao": self.bytes_requisicao,
+            "bytes_resposta": self.bytes_resposta,
+            "bytes_resposta_medio": round(self.bytes_resposta / self.requisicoes) if self.requisicoes else 0,
+            "bytes_resposta_quantis": {
+                rotulo: (int(valor) if valor is not None else None)
+                for rotulo, valor in zip(QUANTIS, tamanhos)
+            },
+            "maior_resposta": self.maior_resposta,
+        }
+
+
+class RegistroMetricas:
+    """
+    Registro em processo das métricas de todas as operações
+
+    Todas as atualizações passam por um único lock; o custo é desprezível
+    perto de uma requisição HTTP.
+    """
+
+    def __init__(self):
+        """Inicializa o registro vazio"""
+        self._lock = threading.Lock()
+        self._operacoes: Dict[str, MetricasOperacao] = {}
+        self._em_andamento: Dict[str, int] = {}
+        # (nome, rótulos) -> valor; contadores livres dos serviços (módulos, banco)
+        self._contadores: Dict[Tuple[str, Tuple], float] = {}
+        # (nome, rótulos) -> função lida a cada coleta (profundidade de filas)
+        self._medidores: Dict[Tuple[str, Tuple], Callable[[], float]] = {}
+        self.inicio = time.time()
+
+    def _operacao(self, nome: str) -> MetricasOperacao:
+        metricas = self._operacoes.get(nome)
+        if metricas is None:
+            metricas = self._operacoes[nome] = MetricasOperacao()
+        return metricas
+
+    def iniciar_requisicao(self, operacao: str):
+        """Marca uma requisição em andamento (encerrada por registrar_requisicao)"""
+        with self._lock:
+            self._em_andamento[operacao] = self._em_andamento.get(operacao, 0) + 1
+
+    def registrar_requisicao(self, operacao: str, segundos: float, bytes_requisicao: int = 0,
+                             bytes_resposta: int = 0, status: Optional[int] = None,
+                             falha: Optional[str] = None):
+        """
+        Registra uma ida ao servidor
+
+        Args:
+            operacao: Operação efetivamente chamada (principal ou fallback)
+            segundos: Tempo de rede (envio até o corpo recebido)
+            bytes_requisicao: Tamanho do envelope enviado
+            bytes_resposta: Tamanho do corpo recebido
+            status: Status HTTP, quando disponível
+            falha: Classe da exceção, se a requisição falhou
+        """
+        with self._lock:
+            if self._em_andamento.get(operacao):
+                self._em_andamento[operacao] -= 1
+            m = self._operacao(operacao)
+            m.requisicoes += 1
+            m.tempo_rede += segundos
+            m.rede.update(segundos)
+            m.bytes_requisicao += bytes_requisicao
+            if status is not None:
+                m.status_http[str(status)] = m.status_http.get(str(status), 0) + 1
+            if falha:
+                m.requisicoes_com_falha += 1
+                m.falhas[falha] = m.falhas.get(falha, 0) + 1
+                return
+            m.bytes_resposta += bytes_resposta
+            m.maior_resposta = max(m.maior_resposta, bytes_resposta)
+            m.tamanho_resposta.update(bytes_resposta)
+
+    def registrar_parse(self, operacao: str, segundos: float, falha: Optional[str] = None):
+        """Registra o parse/normalização de uma resposta da operação"""
+        with self._lock:
+            m = self._operacao(operacao)
+            m.parses += 1
+            m.tempo_parse += segundos
+            m.parse.update(segundos)
+            if falha:
+                m.falhas[falha] = m.falhas.get(falha, 0) + 1
+
+    def registrar_chamada(self, operacao: str, segundos: float, sucesso: bool,
+                          retentativas: int = 0, fallbacks: int = 0):
+        """
+        Registra uma chamada completa (todas as tentativas)
+
+        Args:
+            operacao: Operação principal pedida
+            segundos: Duração total, incluindo esperas entre tentativas
+            sucesso: Se alguma tentativa deu certo
+            retentativas: Rodadas extras após a primeira
+            fallbacks: Requisições feitas a operações alternativas
+        """
+        with self._lock:
+            m = self._operacao(operacao)
+            m.chamadas += 1
+            m.tempo_chamadas += segundos
+            m.latencia.update(segundos)
+            m.retentativas += retentativas
+            m.fallbacks += fallbacks
+            if not sucesso:
+                m.chamadas_com_erro += 1
+
+    def contar(self, nome: str, valor: float = 1, **rotulos):
+        """
+        Incrementa um contador livre
+
+        Args:
+            nome: Nome da métrica (ex.: 'extracao_registros_total')
+            valor: Incremento
+            **rotulos: Rótulos da série (ex.: modulo='anexos')
+        """
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def totais(self) -> Dict[str, int]:
+        """Requisições, bytes recebidos e falhas somados em todas as operações (linha de progresso)"""
+        with self._lock:
+            operacoes = list(self._operacoes.values())
+            return {
+                "requisicoes": sum(m.requisicoes for m in operacoes),
+                "bytes": sum(m.bytes_resposta for m in operacoes),
+                "falhas": sum(m.requisicoes_com_falha for m in operacoes),
+            }
+
+    def total(self, nome: str) -> float:
+        """Soma de um contador livre em todas as séries"""
+        with self._lock:
+            return sum(valor for (contador, _), valor in self._contadores.items() if contador == nome)
+
+    def por_rotulo(self, nome: str, rotulo: str) -> Dict[str, float]:
+        """
+        Contador livre agregado pelos valores de um rótulo
+
+        Args:
+            nome: Nome da métrica (ex.: 'extracao_registros_total')
+            rotulo: Rótulo de agrupamento (ex.: 'modulo')
+
+        Returns:
+            {valor_do_rotulo: soma}
+        """
+        saida: Dict[str, float] = {}
+        with self._lock:
+            for (contador, rotulos), valor in self._contadores.items():
+                chave = dict(rotulos).get(rotulo) if contador == nome else None
+                if chave is not None:
+                    saida[chave] = saida.get(chave, 0) + valor
+        return saida
+
+    def registrar_medidor(self, nome: str, funcao: Callable[[], float], **rotulos):
+        """
+        Registra um valor lido só na coleta (ex.: fila.qsize), sem custo no caminho quente
+
+        Args:
+            nome: Nome da métrica
+            funcao: Devolve o valor atual
+            **rotulos: Rótulos da série
+        """
+        with self._lock:
+            self._medidores[(nome, tuple(sorted(rotulos.items())))] = funcao
+
+    def remover_medidor(self, nome: str, **rotulos):
+        """Remove um medidor registrado com registrar_medidor"""
+        with self._lock:
+            self._medidores.pop((nome, tuple(sorted(rotulos.items()))), None)
+
+    def exportar(self) -> Dict[str, Any]:
+        """
+        Snapshot das métricas
+
+        Returns:
+            Dicionário com as operações ordenadas pelo tempo consumido
+        """
+        with self._lock:
+            tempos = {
+                nome: (m.tempo_chamadas or (m.tempo_rede + m.tempo_parse))
+                for nome, m in self._operacoes.items()
+            }
+            tempo_total = sum(tempos.values())
+            operacoes = {
+                nome: self._operacoes[nome].resultado(tempo_total)
+                for nome in sorted(tempos, key=tempos.get, reverse=True)
+            }
+        return {
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "desde": datetime.fromtimestamp(self.inicio).isoformat(timespec="seconds"),
+            "tempo_total_s": round(tempo_total, 3),
+            "operacoes": operacoes,
+        }
+
+    def resumo(self, limite: int = 10) -> List[Dict[str, Any]]:
+        """Operações que mais consumiram tempo (para exibição ao final)"""
+        operacoes = self.exportar()["operacoes"]
+        return [{"operacao": nome, **dados} for nome, dados in list(operacoes.items())[:limite]]
+
+    def salvar_json(self, caminho: str) -> str:
+        """Grava o snapshot em JSON (substituição atômica)"""
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.exportar(), f, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+        return caminho
+
+    def formatar_prometheus(self, prefixo: str = "cadastro") -> str:
+        """
+        Snapshot no formato texto de exposição do Prometheus (versão 0.0.4)
+
+        Latências saem como summary (quantis do KLL + _sum/_count); contadores
+        voltam a zero em limpar(), o que o Prometheus trata como reinício.
+
+        Args:
+            prefixo: Prefixo dos nomes das métricas
+
+        Returns:
+            Corpo da resposta do endpoint /metrics
+        """
+        familias: Dict[str, Tuple[str, List[str]]] = {}
+
+        def serie(nome: str, tipo: str, valor: Optional[float], sufixo: str = "", **rotulos):
+            # sufixo: _sum/_count de um summary, agrupados sob o nome da família
+            if valor is None:
+                return
+            nome = f"{prefixo}_{nome}"
+            linhas = familias.setdefault(nome, (tipo, []))[1]
+            linhas.append(f"{nome}{sufixo}{_rotulos(rotulos)} {_numero(valor)}")
+
+        with self._lock:
+            for operacao, quantidade in self._em_andamento.items():
+                serie("soap_requisicoes_em_andamento", "gauge", quantidade, operacao=operacao)
+            for operacao, m in self._operacoes.items():
+                serie("soap_requisicoes_total", "counter", m.requisicoes, operacao=operacao)
+                serie("soap_requisicoes_falha_total", "counter", m.requisicoes_com_falha, operacao=operacao)
+                serie("soap_chamadas_total", "counter", m.chamadas, operacao=operacao)
+                serie("soap_chamadas_erro_total", "counter", m.chamadas_com_erro, operacao=operacao)
+                serie("soap_retentativas_total", "counter", m.retentativas, operacao=operacao)
+                serie("soap_fallbacks_total", "counter", m.fallbacks, operacao=operacao)
+                for classe, quantidade in m.falhas.items():
+                    serie("soap_falhas_total", "counter", quantidade, operacao=operacao, classe=classe)
+                for status, quantidade in m.status_http.items():
+                    serie("soap_respostas_http_total", "counter", quantidade, operacao=operacao, status=status)
+                serie("soap_bytes_requisicao_total", "counter", m.bytes_requisicao, operacao=operacao)
+                serie("soap_bytes_resposta_total", "counter", m.bytes_resposta, operacao=operacao)
+                for nome, sketch, soma, total in (
+                    ("soap_latencia_segundos", m.latencia, m.tempo_chamadas, m.chamadas),
+                    ("soap_rede_segundos", m.rede, m.tempo_rede, m.requisicoes),
+                    ("soap_parse_segundos", m.parse, m.tempo_parse, m.parses),
+                ):
+                    if not total:
+                        continue
+                    for quantil, valor in zip(QUANTIS.values(), sketch.quantis(QUANTIS.values())):
+                        serie(nome, "summary", valor, operacao=operacao, quantile=quantil)
+                    serie(nome, "summary", soma, "_sum", operacao=operacao)
+                    serie(nome, "summary", total, "_count", operacao=operacao)
+            for (nome, rotulos), valor in self._contadores.items():
+                serie(nome, "counter", valor, **dict(rotulos))
+            medidores = list(self._medidores.items())
+
+        # Medidores lidos fora do lock (qsize de filas de outras threads)
+        for (nome, rotulos), funcao in medidores:
+            try:
+                serie(nome, "gauge", funcao(), **dict(rotulos))
+            except Exception:
+                continue
+        serie("processo_memoria_rss_bytes", "gauge", memoria_rss())
+        serie("processo_inicio_execucao_segundos", "gauge", self.inicio)
+
+        saida = []
+        for nome, (tipo, linhas) in familias.items():
+            saida.append(f"# TYPE {nome} {tipo}")
+            saida.extend(linhas)
+        return "\n".join(saida) + "\n"
+
+    def limpar(self):
+        """Zera o registro (início de uma nova execução); medidores e requisições em andamento continuam"""
+        with self._lock:
+            self._operacoes.clear()
+            self._contadores.clear()
+            self.inicio = time.time()
+
+
+def _escapar(valor: Any) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(rotulos: Dict[str, Any]) -> str:
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{chave}="{_escapar(valor)}"' for chave, valor in rotulos.items()) + "}"
+
+
+def _numero(valor: float) -> str:
+    if isinstance(valor, int):
+        return str(valor)
+    return repr(float(valor))
+
+
+def memoria_rss() -> Optional[int]:
+    """
+    Memória residente atual do processo em bytes
+
+    Lê /proc/self/statm (Linux); em outros sistemas usa o pico de
+    getrusage, e None onde nenhum dos dois existe.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: KB no Linux, bytes no macOS
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+# Registro global do processo
+metricas = RegistroMetricas()
+
+
+def instalar_exportacao_por_sinal(caminho: str = "./data/json/metricas_soap.json") -> bool:
+    """
+    Exporta as métricas em caminho ao receber SIGUSR1 (kill -USR1 <pid>)
+
+    Returns:
+        False onde o sinal não existe (Windows) ou fora da thread principal
+    """
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    try:
+        signal.signal(signal.SIGUSR1, lambda *_: metricas.salvar_json(caminho))
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,246 @@
+"""
+Partition Service - Listagem de cadastros particionada por faixas de código
+Consulta buscaCadastroImobiliarioGeral em intervalos "inicio-fim" (como na
+documentação oficial), com faixas que se dividem quando a resposta é grande
+demais ou falha e crescem quando voltam esparsas; as faixas rodam em
+paralelo e os resultados são intercalados (k-way merge) por código
+"""
+
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import heapq
+import logging
+import threading
+
+from service.soap_client import CadastralSOAPClient
+from interface.cli_interface import CLIInterface
+
+
+Faixa = Tuple[int, int]
+
+
+class ParticionamentoNaoSuportado(Exception):
+    """O servidor ignorou o filtro de faixa de códigos"""
+    pass
+
+
+class ListagemParticionada:
+    """
+    Executor da listagem geral por faixas de código
+
+    As faixas são geradas sob demanda a partir de um cursor; o tamanho das
+    próximas faixas dobra quando as respostas vêm esparsas e cai pela metade
+    quando vêm densas. Uma resposta que atinge o limite de registros (ou que
+    falha) tem a faixa dividida ao meio e reenfileirada. Passado o código
+    máximo previsto, a varredura continua enquanto houver cadastros.
+    """
+
+    def __init__(
+        self,
+        fabrica_cliente: Callable[[], Any] = CadastralSOAPClient,
+        tamanho_inicial: int = 100,
+        tamanho_maximo: int = 3200,
+        limite_registros: int = 500,
+        codigo_maximo: int = 10000,
+        trabalhadores: int = 4,
+        tentativas: int = 3,
+        faixas_vazias_fim: int = 3,
+    ):
+        """
+        Inicializa o executor
+
+        Args:
+            fabrica_cliente: Cria um cliente SOAP (um por thread)
+            tamanho_inicial: Códigos por faixa no início da varredura
+            tamanho_maximo: Maior faixa gerada ao crescer por esparsidade
+            limite_registros: Respostas com esse total ou mais são divididas
+            codigo_maximo: Código máximo previsto para o município
+            trabalhadores: Faixas consultadas em paralelo
+            tentativas: Tentativas por faixa unitária antes de desistir
+            faixas_vazias_fim: Faixas vazias seguidas, após o máximo, para encerrar
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.fabrica_cliente = fabrica_cliente
+        self.tamanho_inicial = max(1, tamanho_inicial)
+        self.tamanho_maximo = max(self.tamanho_inicial, tamanho_maximo)
+        self.limite_registros = limite_registros
+        self.codigo_maximo = codigo_maximo
+        self.trabalhadores = max(1, trabalhadores)
+        self.tentativas = max(1, tentativas)
+        self.faixas_vazias_fim = faixas_vazias_fim
+        self.falhas: List[Faixa] = []
+        self._local = threading.local()
+
+    def _cliente(self):
+        """Cliente SOAP da thread atual (sessões HTTP não são compartilhadas)"""
+        cliente = getattr(self._local, "cliente", None)
+        if cliente is None:
+            cliente = self._local.cliente = self.fabrica_cliente()
+        return cliente
+
+    def _consultar_faixa(self, faixa: Faixa, filtros: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Consulta uma faixa e devolve seus cadastros ordenados por código
+
+        Raises:
+            ParticionamentoNaoSuportado: Se vierem códigos fora da faixa
+        """
+        inicio, fim = faixa
+        lista = self._cliente().buscar_cadastro_geral(
+            codigo_cadastro=f"{inicio}-{fim}", **filtros
+        )
+
+        por_codigo: Dict[int, Dict[str, Any]] = {}
+        fora_da_faixa = 0
+        for c in lista:
+            if not isinstance(c, dict):
+                continue
+            c2 = dict(c)
+            if "codigo" in c2 and "codigo_cadastro" not in c2:
+                c2["codigo_cadastro"] = c2["codigo"]
+            try:
+                codigo = int(c2.get("codigo_cadastro"))
+            except (ValueError, TypeError):
+                continue
+            if inicio <= codigo <= fim:
+                por_codigo[codigo] = c2
+            else:
+                fora_da_faixa += 1
+
+        # Um servidor que filtra não devolve nada fora da faixa; ignorando o
+        # filtro, cada faixa baixaria a lista inteira para aproveitar um pedaço
+        if fora_da_faixa:
+            raise ParticionamentoNaoSuportado(
+                f"Faixa {inicio}-{fim} retornou {fora_da_faixa} cadastros fora do intervalo"
+            )
+        return [por_codigo[codigo] for codigo in sorted(por_codigo)]
+
+    def listar(
+        self,
+        filtros: Optional[Dict[str, Any]] = None,
+        inicio: int = 1,
+        fim: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Executa a listagem completa
+
+        Args:
+            filtros: Filtros adicionais (tipo_consulta, situacao)
+            inicio: Primeiro código da varredura
+            fim: Último código (faixa fechada, sem varrer além do máximo)
+
+        Returns:
+            Cadastros de todas as faixas, ordenados por código e sem repetição
+
+        Raises:
+            ParticionamentoNaoSuportado: Se o servidor não filtrar por faixa
+        """
+        filtros = {k: v for k, v in (filtros or {}).items() if v not in (None, "")}
+        resultados: List[List[Dict[str, Any]]] = []
+        pendentes: List[Faixa] = []
+        tentativas: Dict[Faixa, int] = {}
+        falhas: List[Faixa] = []
+        cursor = inicio
+        tamanho = self.tamanho_inicial
+        vazias_apos_maximo = 0
+        divisoes = 0
+        consultas = 0
+
+        def proxima_faixa() -> Optional[Faixa]:
+            nonlocal cursor
+            if pendentes:
+                return pendentes.pop()
+            if fim is not None:
+                if cursor > fim:
+                    return None
+                faixa = (cursor, min(cursor + tamanho - 1, fim))
+                cursor = faixa[1] + 1
+                return faixa
+            if cursor > self.codigo_maximo and vazias_apos_maximo >= self.faixas_vazias_fim:
+                return None
+            faixa = (cursor, cursor + tamanho - 1)
+            cursor += tamanho
+            return faixa
+
+        def dividir(faixa: Faixa) -> bool:
+            nonlocal divisoes
+            inicio_faixa, fim_faixa = faixa
+            if inicio_faixa >= fim_faixa:
+                return False
+            meio = (inicio_faixa + fim_faixa) // 2
+            pendentes.extend([(meio + 1, fim_faixa), (inicio_faixa, meio)])
+            divisoes += 1
+            return True
+
+        with ThreadPoolExecutor(max_workers=self.trabalhadores) as executor:
+            em_andamento: Dict[Any, Faixa] = {}
+
+            while True:
+                while len(em_andamento) < self.trabalhadores:
+                    faixa = proxima_faixa()
+                    if faixa is None:
+                        break
+                    em_andamento[executor.submit(self._consultar_faixa, faixa, filtros)] = faixa
+                if not em_andamento:
+                    break
+
+                concluidas, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                for futuro in concluidas:
+                    faixa = em_andamento.pop(futuro)
+                    consultas += 1
+                    try:
+                        cadastros = futuro.result()
+                    except ParticionamentoNaoSuportado:
+                        for pendente in em_andamento:
+                            pendente.cancel()
+                        raise
+                    except Exception as e:
+                        # Falha/timeout: faixas menores geram respostas menores
+                        self.logger.warning(f"[faixa {faixa[0]}-{faixa[1]}] {e}")
+                        tamanho = max(1, tamanho // 2)
+                        if not dividir(faixa):
+                            tentativas[faixa] = tentativas.get(faixa, 0) + 1
+                            if tentativas[faixa] < self.tentativas:
+                                pendentes.append(faixa)
+                            else:
+                                falhas.append(faixa)
+                        continue
+
+                    if len(cadastros) >= self.limite_registros and dividir(faixa):
+                        # Resposta no limite pode estar truncada: refazer em metades
+                        tamanho = max(1, tamanho // 2)
+                        continue
+
+                    resultados.append(cadastros)
+                    largura = faixa[1] - faixa[0] + 1
+                    if len(cadastros) < self.limite_registros // 4 and largura >= tamanho:
+                        tamanho = min(self.tamanho_maximo, tamanho * 2)
+                    elif len(cadastros) > self.limite_registros // 2:
+                        tamanho = max(1, tamanho // 2)
+
+                    if faixa[1] >= self.codigo_maximo:
+                        vazias_apos_maximo = 0 if cadastros else vazias_apos_maximo + 1
+
+        if falhas:
+            CLIInterface.mostrar_aviso(
+                f"{len(falhas)} faixa(s) sem resposta: "
+                + ", ".join(f"{i}-{f}" for i, f in falhas[:10])
+            )
+        self.logger.info(
+            f"Listagem particionada: {consultas} consultas, {divisoes} divisões, "
+            f"{len(resultados)} faixas com resposta"
+        )
+        self.falhas = falhas
+        return self._intercalar(resultados)
+
+    @staticmethod
+    def _intercalar(resultados: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """K-way merge das faixas (já ordenadas) por código, sem repetições"""
+        intercalados: List[Dict[str, Any]] = []
+        ultimo = None
+        for cadastro in heapq.merge(*resultados, key=lambda c: int(c["codigo_cadastro"])):
+            codigo = int(cadastro["codigo_cadastro"])
+            if codigo != ultimo:
+                intercalados.append(cadastro)
+                ultimo = codigo
+        return intercalados
@@ -0,0 +1,439 @@
+"""
+Pipeline Service - Extração em estágios com filas limitadas
+E/S (threads que só buscam bytes) -> CPU (pool de processos que faz parse
+e normalização) -> destino (arquivos ou banco), com filas de tamanho fixo
+entre os estágios: rede e CPU se sobrepõem e a contrapressão mantém a
+memória limitada.
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Callable
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+
+from service.soap_client import CadastralSOAPClient, processar_modulo, OPERACOES_MODULOS
+from service.metrics_service import metricas
+from service.tracing_service import rastreador
+from service.storage_service import FileStorageService
+from interface.cli_interface import CLIInterface
+
+
+_FIM = None
+
+
+def _processar_e_marcar(modulo: str, xml_bytes: bytes, codigo: str) -> List[Dict[str, Any]]:
+    """Estágio de CPU: parse + normalização + vínculo com o cadastro (picklable)"""
+    # Importação tardia: cadastro_service importa este módulo
+    from service.cadastro_service import CadastroService
+    return CadastroService._tag(processar_modulo(modulo, xml_bytes), codigo, "codigo_cadastro")
+
+
+def _processar_lote(lote: List[tuple]) -> List[tuple]:
+    """
+    Vários (modulo, bytes, codigo) por tarefa do pool, para diluir o custo de IPC;
+    devolve (ok, itens ou exceção, segundos de parse) por resposta
+    """
+    saida = []
+    for modulo, xml_bytes, codigo in lote:
+        inicio = time.perf_counter()
+        try:
+            itens = _processar_e_marcar(modulo, xml_bytes, codigo)
+        except Exception as e:
+            saida.append((False, e, time.perf_counter() - inicio))
+            continue
+        saida.append((True, itens, time.perf_counter() - inicio))
+    return saida
+
+
+def _registrar_parse(modulo: str, segundos: float, falha: Optional[Exception] = None):
+    """Parse feito fora do cliente (pool do pipeline) entra nas métricas da operação do módulo"""
+    metricas.registrar_parse(
+        OPERACOES_MODULOS[modulo][0], segundos, type(falha).__name__ if falha else None
+    )
+
+
+class DestinoArquivos:
+    """
+    Destino que grava cada dataset em streaming (DatasetWriter), à medida
+    que os cadastros ficam completos, em vez de tudo ao final
+    """
+
+    def __init__(self, datasets: Sequence[str], formato: str = "json",
+                 file_storage_service: Optional[FileStorageService] = None):
+        self.file_storage_service = file_storage_service or FileStorageService()
+        self.escritores = {
+            nome: self.file_storage_service.abrir_dataset_stream(nome, formato)
+            for nome in datasets
+        }
+
+    def escrever(self, cadastro: Dict[str, Any], modulos: Dict[str, List[Dict[str, Any]]]):
+        self.escritores["cadastros"].escrever(cadastro)
+        for modulo, itens in modulos.items():
+            escritor = self.escritores[modulo]
+            for item in itens:
+                escritor.escrever(item)
+
+    def fechar(self) -> Dict[str, str]:
+        resultados = {}
+        for nome, escritor in self.escritores.items():
+            resultados[nome] = escritor.fechar()
+            CLIInterface.mostrar_sucesso(
+                f"{os.path.basename(escritor.caminho)} salvo com {escritor.total} registros."
+            )
+        return resultados
+
+    def descartar(self):
+        for escritor in self.escritores.values():
+            escritor.descartar()
+
+
+class CargaAbortada(Exception):
+    """Extração descartada: a carga em andamento no banco é desfeita"""
+    pass
+
+
+class FalhaCargaBanco(Exception):
+    """A carga no banco parou antes de receber todos os cadastros"""
+    pass
+
+
+class DestinoBanco:
+    """
+    Destino que carrega os cadastros no PostgreSQL durante a extração, via
+    DatabaseService.carregar_cadastros_async rodando em uma thread própria
+    e alimentado por uma fila limitada
+
+    A carga roda em transação única: só é confirmada em fechar(); descartar()
+    ou uma falha no meio desfazem tudo o que já foi enviado.
+    """
+
+    # Módulo de extração -> campo do cadastro completo gravado no banco
+    CAMPOS_FILHOS = {
+        "proprietarios": "proprietariosbci",
+        "enderecos": "enderecos",
+        "zoneamento": "zoneamentos",
+    }
+
+    # Espera máxima em uma operação da fila antes de conferir o outro lado
+    INTERVALO_VERIFICACAO = 0.5
+
+    def __init__(self, database_service=None, tamanho_fila: int = 1000,
+                 tamanho_lote: int = 500, conexoes: int = 4,
+                 arquivo_origem: str = "pipeline_extracao"):
+        if database_service is None:
+            from service.database_service import DatabaseService
+            database_service = DatabaseService()
+        self.database_service = database_service
+        self.resultado: Dict[str, Any] = {}
+        self._erro: Optional[BaseException] = None
+        self._abortar = threading.Event()
+        self._fila: queue.Queue = queue.Queue(maxsize=tamanho_fila)
+        metricas.registrar_medidor("pipeline_fila_profundidade", self._fila.qsize, fila="destino_banco")
+        self._thread = threading.Thread(
+            target=self._carregar, args=(tamanho_lote, conexoes, arquivo_origem), daemon=True
+        )
+        self._thread.start()
+
+    def _carregar(self, tamanho_lote: int, conexoes: int, arquivo_origem: str):
+        async def fonte():
+            while True:
+                if self._abortar.is_set():
+                    raise CargaAbortada("extração descartada")
+                try:
+                    # Espera curta: o pedido de abortar é visto mesmo com a fila vazia
+                    cadastro = await asyncio.to_thread(self._fila.get, True, self.INTERVALO_VERIFICACAO)
+                except queue.Empty:
+                    continue
+                if cadastro is _FIM:
+                    return
+                yield cadastro
+
+        try:
+            self.resultado = asyncio.run(self.database_service.carregar_cadastros_async(
+                fonte(), arquivo_origem=arquivo_origem, tamanho_lote=tamanho_lote,
+                conexoes=conexoes, transacao_unica=True
+            ))
+        except BaseException as e:
+            self._erro = e
+            self.resultado = {"sucesso": False, "erro": str(e)}
+
+    def _falha(self) -> BaseException:
+        """Erro a propagar quando a carga terminou antes da hora"""
+        if self._erro is not None:
+            return self._erro
+        return FalhaCargaBanco(
+            f"Carga no banco interrompida: {self.resultado.get('erro') or 'motivo desconhecido'}"
+        )
+
+    def _enfileirar(self, item: Any):
+        """put com espera limitada: se a carga morrer, a fila cheia não trava a extração"""
+        while True:
+            if not self._thread.is_alive():
+                raise self._falha()
+            try:
+                self._fila.put(item, timeout=self.INTERVALO_VERIFICACAO)
+                return
+            except queue.Full:
+                continue
+
+    def escrever(self, cadastro: Dict[str, Any], modulos: Dict[str, List[Dict[str, Any]]]):
+        completo = dict(cadastro)
+        for modulo, campo in self.CAMPOS_FILHOS.items():
+            if not completo.get(campo) and modulos.get(modulo):
+                completo[campo] = modulos[modulo]
+        self._enfileirar(completo)
+
+    def fechar(self) -> Dict[str, Any]:
+        try:
+            self._enfileirar(_FIM)
+            self._thread.join()
+        finally:
+            metricas.remover_medidor("pipeline_fila_profundidade", fila="destino_banco")
+        return self.resultado
+
+    def descartar(self):
+        """Interrompe a carga e desfaz o que já foi gravado (nada é confirmado)"""
+        self._abortar.set()
+        self._thread.join()
+        metricas.remover_medidor("pipeline_fila_profundidade", fila="destino_banco")
+
+
+class PipelineExtracao:
+    """
+    Extração dos módulos por cadastro em três estágios
+
+    - E/S: threads com cliente SOAP próprio que só buscam os bytes
+    - CPU: ProcessPoolExecutor com parse, normalização e vínculo (processos=0
+      faz o parse na própria thread de E/S)
+    - Destino: thread chamadora, que reordena os cadastros e os entrega ao
+      destino na ordem da listagem
+
+    Uma janela de cadastros em andamento limita tudo o que está em memória:
+    o produtor só despacha um novo cadastro quando o mais antigo é entregue.
+    """
+
+    def __init__(
+        self,
+        modulos: Sequence[str],
+        fabrica_cliente: Callable[[], Any] = CadastralSOAPClient,
+        trabalhadores_io: int = 8,
+        processos: Optional[int] = None,
+        tamanho_fila: int = 256,
+        janela: int = 64,
+        request_delay: float = 0.0,
+        lote_parse: int = 32,
+    ):
+        """
+        Inicializa o pipeline
+
+        Args:
+            modulos: Módulos consultados por cadastro (ver OPERACOES_MODULOS)
+            fabrica_cliente: Cria um cliente SOAP (um por thread de E/S)
+            trabalhadores_io: Requisições simultâneas
+            processos: Processos de parse (None: núcleos da máquina; 0: sem pool)
+            tamanho_fila: Capacidade das filas entre estágios
+            janela: Cadastros em andamento ao mesmo tempo
+            request_delay: Intervalo mínimo entre despachos de cadastros
+            lote_parse: Máximo de respostas enviadas juntas ao pool
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.modulos = list(modulos)
+        self.fabrica_cliente = fabrica_cliente
+        self.trabalhadores_io = max(1, trabalhadores_io)
+        self.processos = (os.cpu_count() or 1) if processos is None else max(0, processos)
+        self.tamanho_fila = max(1, tamanho_fila)
+        self.janela = max(1, janela)
+        self.request_delay = request_delay
+        self.lote_parse = max(1, lote_parse)
+        self._local = threading.local()
+
+    def _cliente(self):
+        """Cliente SOAP da thread atual (sessões HTTP não são compartilhadas)"""
+        cliente = getattr(self._local, "cliente", None)
+        if cliente is None:
+            cliente = self._local.cliente = self.fabrica_cliente()
+        return cliente
+
+    def executar(
+        self,
+        cadastros: Iterable[Dict[str, Any]],
+        destino,
+        estatisticas=None,
+        ao_entregar: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ) -> int:
+        """
+        Executa o pipeline
+
+        Args:
+            cadastros: Cadastros da listagem geral
+            destino: Objeto com escrever(cadastro, modulos)
+            estatisticas: EstatisticasExtracao alimentada na entrega (opcional)
+            ao_entregar: Chamado com (posição, cadastro) após cada entrega
+
+        Returns:
+            Quantidade de cadastros entregues ao destino
+        """
+        resultados: queue.Queue = queue.Queue(maxsize=self.tamanho_fila)
+        bytes_recebidos: queue.Queue = queue.Queue(maxsize=self.tamanho_fila)
+        em_parse: queue.Queue = queue.Queue(maxsize=max(2, self.processos * 2))
+        janela = threading.BoundedSemaphore(self.janela)
+        parar = threading.Event()
+        pendentes: Dict[int, Dict[str, Any]] = {}
+        spans_cadastro: Dict[int, Any] = {}
+        filas = {
+            "resultados": resultados.qsize,
+            "bytes_recebidos": bytes_recebidos.qsize,
+            "em_parse": em_parse.qsize,
+            "cadastros_pendentes": lambda: len(pendentes),
+        }
+        for nome, profundidade in filas.items():
+            metricas.registrar_medidor("pipeline_fila_profundidade", profundidade, fila=nome)
+
+        def colocar(fila: queue.Queue, item):
+            # put que desiste se o pipeline for abortado (sem travar na fila cheia)
+            while not parar.is_set():
+                try:
+                    fila.put(item, timeout=0.2)
+                    return
+                except queue.Full:
+                    continue
+
+        def buscar(indice: int, codigo: str, modulo: str, span_cadastro=None):
+            with rastreador.span("modulo", pai=span_cadastro, codigo_cadastro=codigo, modulo=modulo) as span:
+                try:
+                    xml_bytes = self._cliente().buscar_modulo_bytes(modulo, codigo)
+                except Exception as e:
+                    if span:
+                        span.falhar(e)
+                    colocar(resultados, ("falha", indice, modulo, e))
+                    return
+                if self.processos:
+                    colocar(bytes_recebidos, (indice, codigo, modulo, xml_bytes))
+                    return
+                (ok, valor, segundos), = _processar_lote([(modulo, xml_bytes, codigo)])
+                _registrar_parse(modulo, segundos, None if ok else valor)
+                if span and not ok:
+                    span.falhar(valor)
+            colocar(resultados, ("modulo" if ok else "falha", indice, modulo, valor))
+
+        def produzir(io: ThreadPoolExecutor):
+            total = 0
+            try:
+                for indice, cadastro in enumerate(cadastros):
+                    while not janela.acquire(timeout=0.2):
+                        if parar.is_set():
+                            return
+                    codigo = str(cadastro.get("codigo_cadastro") or cadastro.get("codigo", "")).strip()
+                    modulos = self.modulos if codigo else []
+                    # O span do cadastro vai do despacho à entrega ao destino
+                    span_cadastro = spans_cadastro[indice] = rastreador.iniciar("cadastro", codigo_cadastro=codigo)
+                    colocar(resultados, ("cadastro", indice, cadastro, len(modulos)))
+                    for modulo in modulos:
+                        io.submit(buscar, indice, codigo, modulo, span_cadastro)
+                    total += 1
+                    if self.request_delay:
+                        time.sleep(self.request_delay)
+            except Exception as e:
+                colocar(resultados, ("erro", None, None, e))
+                return
+            colocar(resultados, ("fim", total, None, None))
+
+        def despachar(pool: ProcessPoolExecutor):
+            fim = False
+            while not fim:
+                # Junta o que já chegou (até lote_parse respostas) em uma tarefa
+                lote = [bytes_recebidos.get()]
+                while len(lote) < self.lote_parse:
+                    try:
+                        lote.append(bytes_recebidos.get_nowait())
+                    except queue.Empty:
+                        break
+                if lote[-1] is _FIM:
+                    fim = True
+                    lote.pop()
+                if lote:
+                    futuro = pool.submit(_processar_lote, [(m, b, c) for _, c, m, b in lote])
+                    colocar(em_parse, ([(i, m) for i, _, m, _ in lote], futuro))
+            em_parse.put(_FIM)
+
+        def coletar():
+            while True:
+                item = em_parse.get()
+                if item is _FIM:
+                    return
+                chaves, futuro = item
+                try:
+                    saidas = futuro.result()
+                except Exception as e:
+                    saidas = [(False, e, None)] * len(chaves)
+                for (indice, modulo), (ok, valor, segundos) in zip(chaves, saidas):
+                    if segundos is not None:
+                        _registrar_parse(modulo, segundos, None if ok else valor)
+                    colocar(resultados, ("modulo" if ok else "falha", indice, modulo, valor))
+
+        io = ThreadPoolExecutor(max_workers=self.trabalhadores_io, thread_name_prefix="pipeline-io")
+        pool = ProcessPoolExecutor(max_workers=self.processos) if self.processos else None
+        threads = [threading.Thread(target=produzir, args=(io,), daemon=True)]
+        if pool:
+            threads += [
+                threading.Thread(target=despachar, args=(pool,), daemon=True),
+                threading.Thread(target=coletar, daemon=True),
+            ]
+        for thread in threads:
+            thread.start()
+
+        proximo = 0
+        total: Optional[int] = None
+        try:
+            while total is None or proximo < total:
+                tipo, indice, valor, extra = resultados.get()
+                if tipo == "erro":
+                    raise extra
+                if tipo == "fim":
+                    total = indice
+                elif tipo == "cadastro":
+                    pendentes[indice] = {"cadastro": valor, "modulos": {}, "restantes": extra}
+                elif tipo == "modulo":
+                    pendentes[indice]["modulos"][valor] = extra
+                    pendentes[indice]["restantes"] -= 1
+                    metricas.contar("extracao_respostas_total", modulo=valor)
+                    metricas.contar("extracao_registros_total", len(extra), modulo=valor)
+                    if estatisticas is not None:
+                        estatisticas.registrar_modulo(valor, extra)
+                else:  # falha
+                    codigo = pendentes[indice]["cadastro"].get("codigo_cadastro")
+                    self.logger.warning(f"[{codigo}] {valor}: {extra}")
+                    pendentes[indice]["restantes"] -= 1
+                    metricas.contar("extracao_falhas_total", modulo=valor)
+                    if estatisticas is not None:
+                        estatisticas.registrar_falha(valor)
+
+                # Entrega em ordem os cadastros cujos módulos já chegaram todos
+                while proximo in pendentes and pendentes[proximo]["restantes"] == 0:
+                    entrada = pendentes.pop(proximo)
+                    modulos = {m: entrada["modulos"][m] for m in self.modulos if m in entrada["modulos"]}
+                    destino.escrever(entrada["cadastro"], modulos)
+                    rastreador.finalizar(spans_cadastro.pop(proximo, None))
+                    metricas.contar("extracao_cadastros_total")
+                    if estatisticas is not None:
+                        estatisticas.registrar_cadastro(entrada["cadastro"], modulos)
+                    janela.release()
+                    proximo += 1
+                    if ao_entregar:
+                        ao_entregar(proximo, entrada["cadastro"])
+        finally:
+            parar.set()
+            for nome in filas:
+                metricas.remover_medidor("pipeline_fila_profundidade", fila=nome)
+            io.shutdown(wait=True, cancel_futures=True)
+            if pool:
+                bytes_recebidos.put(_FIM)
+                for thread in threads[1:]:
+                    thread.join()
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        return proximo
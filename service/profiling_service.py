@@ -0,0 +1,259 @@
+"""
+Profiling Service - Modo de profiling por fase (CPU e memória)
+cProfile e tracemalloc em torno das fases de extração e carga (listagem,
+módulos, estatísticas, salvamento, banco) para separar rede, parse,
+normalização, gravação de JSON e ORM sem adivinhação. Desligado por
+padrão (APP_PROFILE); com o modo desligado cada fase custa um if.
+"""
+
+from typing import Dict, Any, Optional, List, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+import cProfile
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+from interface.cli_interface import CLIInterface
+from config.settings import settings
+
+
+def _local(arquivo: str, linha: int) -> str:
+    """arquivo:linha, relativo ao diretório atual quando for caminho absoluto"""
+    if os.path.isabs(arquivo):
+        arquivo = os.path.relpath(arquivo)
+    return f"{arquivo}:{linha}"
+
+
+class EstatisticasFase:
+    """Acumulado de uma fase ao longo de todas as suas entradas"""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.entradas = 0
+        self.tempo = 0.0
+        self.pico_memoria = 0
+        self.memoria_liquida = 0
+        self.perfil = cProfile.Profile()
+        # "arquivo:linha" -> [bytes, blocos] crescidos entre início e fim da fase
+        self.alocacoes: Dict[str, List[int]] = {}
+
+    def top_funcoes(self, limite: int) -> List[Dict[str, Any]]:
+        """Funções com maior tempo próprio na fase"""
+        try:
+            estatisticas = pstats.Stats(self.perfil).stats
+        except TypeError:
+            # Fase que nunca chegou a habilitar o profiler
+            return []
+        ordenadas = sorted(estatisticas.items(), key=lambda item: item[1][2], reverse=True)
+        return [
+            {
+                "funcao": funcao,
+                "local": _local(arquivo, linha),
+                "chamadas": chamadas,
+                "tempo_proprio_s": round(proprio, 4),
+                "tempo_acumulado_s": round(acumulado, 4),
+            }
+            for (arquivo, linha, funcao), (_, chamadas, proprio, acumulado, _) in ordenadas[:limite]
+        ]
+
+    def top_alocacoes(self, limite: int) -> List[Dict[str, Any]]:
+        """Locais de alocação que mais cresceram durante a fase"""
+        ordenadas = sorted(self.alocacoes.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            {"local": local, "bytes": tamanho, "blocos": blocos}
+            for local, (tamanho, blocos) in ordenadas[:limite]
+            if tamanho > 0
+        ]
+
+
+class PerfilExecucao:
+    """
+    Profiling por fase de uma execução
+
+    Fases podem ser aninhadas: ao entrar em uma fase filha o profiler da mãe
+    é pausado, então o tempo de cada função é atribuído à fase mais interna.
+    Só a thread que chamou iniciar() é perfilada (cProfile é por thread);
+    fases abertas em outras threads (E/S do pipeline, carga do DestinoBanco)
+    são ignoradas.
+
+    Uso:
+        perfil.iniciar()
+        with perfil.fase("listagem"):
+            ...
+        relatorio = perfil.encerrar()
+    """
+
+    # Filtros do tracemalloc: o próprio profiling e o import system não interessam
+    FILTROS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self, quadros: int = 1):
+        """
+        Inicializa o perfil (inativo)
+
+        Args:
+            quadros: Profundidade de pilha guardada pelo tracemalloc por alocação
+        """
+        self.quadros = quadros
+        self.ativo = False
+        self.fases: Dict[str, EstatisticasFase] = {}
+        self._pilha: List[Dict[str, Any]] = []
+        self._thread: Optional[int] = None
+        self._inicio = 0.0
+        self._iniciado_em: Optional[datetime] = None
+        self._tracemalloc_proprio = False
+
+    def iniciar(self):
+        """Liga o profiling (descarta fases de uma execução anterior)"""
+        self.fases = {}
+        self._pilha = []
+        self._thread = threading.get_ident()
+        self._inicio = time.perf_counter()
+        self._iniciado_em = datetime.now()
+        self._tracemalloc_proprio = not tracemalloc.is_tracing()
+        if self._tracemalloc_proprio:
+            tracemalloc.start(self.quadros)
+        tracemalloc.reset_peak()
+        self.ativo = True
+
+    @contextmanager
+    def fase(self, nome: str, instantaneo: bool = True):
+        """
+        Perfila o bloco como a fase nome
+
+        Args:
+            nome: Nome da fase (entradas repetidas acumulam)
+            instantaneo: Tira snapshots do tracemalloc na entrada e na saída
+                (locais de alocação); desligue em fases curtas e frequentes,
+                como uma chamada de módulo por cadastro
+        """
+        if not self.ativo or threading.get_ident() != self._thread:
+            yield
+            return
+
+        estatisticas = self.fases.get(nome)
+        if estatisticas is None:
+            estatisticas = self.fases[nome] = EstatisticasFase(nome)
+        mae = self._pilha[-1] if self._pilha else None
+        if mae:
+            mae["estatisticas"].perfil.disable()
+            mae["pico"] = max(mae["pico"], tracemalloc.get_traced_memory()[1])
+
+        quadro = {
+            "estatisticas": estatisticas,
+            "pico": 0,
+            "memoria": tracemalloc.get_traced_memory()[0],
+            "snapshot": self._snapshot() if instantaneo else None,
+        }
+        self._pilha.append(quadro)
+        tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        estatisticas.perfil.enable()
+        try:
+            yield
+        finally:
+            estatisticas.perfil.disable()
+            estatisticas.tempo += time.perf_counter() - inicio
+            estatisticas.entradas += 1
+            atual, pico = tracemalloc.get_traced_memory()
+            estatisticas.pico_memoria = max(estatisticas.pico_memoria, quadro["pico"], pico)
+            estatisticas.memoria_liquida += atual - quadro["memoria"]
+            if quadro["snapshot"] is not None:
+                self._acumular_alocacoes(estatisticas, quadro["snapshot"])
+            self._pilha.pop()
+            if mae:
+                mae["pico"] = max(mae["pico"], pico)
+                tracemalloc.reset_peak()
+                mae["estatisticas"].perfil.enable()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self.FILTROS)
+
+    def _acumular_alocacoes(self, estatisticas: EstatisticasFase, antes: tracemalloc.Snapshot):
+        for diferenca in self._snapshot().compare_to(antes, "lineno"):
+            if diferenca.size_diff <= 0:
+                continue
+            quadro = diferenca.traceback[0]
+            acumulado = estatisticas.alocacoes.setdefault(_local(quadro.filename, quadro.lineno), [0, 0])
+            acumulado[0] += diferenca.size_diff
+            acumulado[1] += max(diferenca.count_diff, 0)
+
+    def relatorio(self, limite: int = 15) -> Dict[str, Any]:
+        """
+        Relatório das fases
+
+        Args:
+            limite: Quantidade de funções e locais de alocação por fase
+
+        Returns:
+            Dicionário com as fases ordenadas pelo tempo gasto
+        """
+        fases = sorted(self.fases.values(), key=lambda f: f.tempo, reverse=True)
+        return {
+            "iniciado_em": self._iniciado_em.isoformat(timespec="seconds") if self._iniciado_em else None,
+            "duracao_s": round(time.perf_counter() - self._inicio, 3),
+            "pico_memoria_bytes": max((f.pico_memoria for f in fases), default=0),
+            "observacao": (
+                "tempo_s inclui fases aninhadas; funções e alocações ficam com a fase mais interna. "
+                "Só a thread que iniciou o perfil é medida; tempos incluem o overhead do profiling."
+            ),
+            "fases": {
+                f.nome: {
+                    "entradas": f.entradas,
+                    "tempo_s": round(f.tempo, 3),
+                    "pico_memoria_bytes": f.pico_memoria,
+                    "memoria_liquida_bytes": f.memoria_liquida,
+                    "top_funcoes": f.top_funcoes(limite),
+                    "top_alocacoes": f.top_alocacoes(limite),
+                }
+                for f in fases
+            },
+        }
+
+    def encerrar(self, limite: int = 15) -> Dict[str, Any]:
+        """Desliga o profiling e devolve o relatório"""
+        relatorio = self.relatorio(limite)
+        self.ativo = False
+        if self._tracemalloc_proprio:
+            tracemalloc.stop()
+        return relatorio
+
+
+# Perfil global do processo (fases são chamadas a partir de vários serviços)
+perfil = PerfilExecucao()
+
+
+@contextmanager
+def sessao_perfil(nome: str, file_storage_service=None) -> Iterator[None]:
+    """
+    Liga o perfil durante o bloco se APP_PROFILE estiver ativo e grava o
+    relatório em data/json/{nome}.json ao final
+
+    Sessões aninhadas (ex.: extrair_completo -> extrair_pipeline) ou abertas
+    com o perfil já ligado não fazem nada: quem abriu primeiro grava.
+
+    Args:
+        nome: Nome do relatório
+        file_storage_service: Onde gravar (padrão: FileStorageService())
+    """
+    if perfil.ativo or not getattr(settings.app, "profile", False):
+        yield
+        return
+    perfil.iniciar()
+    try:
+        yield
+    finally:
+        relatorio = perfil.encerrar()
+        if file_storage_service is None:
+            from service.storage_service import FileStorageService
+            file_storage_service = FileStorageService()
+        caminho = file_storage_service.salvar_relatorio(nome, relatorio)
+        CLIInterface.mostrar_perfil(relatorio, caminho)
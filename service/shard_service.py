@@ -0,0 +1,476 @@
+"""
+Shard Service - Extração distribuída em shards de códigos com leases
+Vários processos (no mesmo host ou em hosts com o diretório de dados
+compartilhado) reivindicam faixas de códigos de uma tabela de leases,
+gravam seus próprios arquivos de shard e uma etapa final de mesclagem
+produz os {nome}.json de sempre.
+
+Uso em vários hosts (mesma execução, mesmo APP_LEASE_URL e data/ compartilhado):
+    python -m service.shard_service preparar --execucao 20250101
+    python -m service.shard_service worker --execucao 20250101     (em cada host)
+    python -m service.shard_service mesclar --execucao 20250101
+"""
+
+from typing import List, Dict, Any, Optional, Iterator
+from collections import defaultdict
+import argparse
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+
+from config.settings import settings
+from config.database import db_settings
+from repository.lease_repository import LeaseRepository, EM_ANDAMENTO, CONCLUIDO, FALHOU
+from service.storage_service import FileStorageService, DatasetWriter
+from service.statistics_service import StatisticsService
+from service.partition_service import ListagemParticionada
+from service.tracing_service import rastreador, sessao_rastreamento
+from service.ledger_service import livro, sessao_livro
+from interface.cli_interface import CLIInterface
+
+
+class LeasePerdido(Exception):
+    """O lease do shard venceu e foi reivindicado por outro worker"""
+    pass
+
+
+class Heartbeat(threading.Thread):
+    """Renova o lease do shard em andamento a cada ttl/3 segundos"""
+
+    def __init__(self, repositorio: LeaseRepository, execucao: str, worker: str, ttl: float):
+        super().__init__(daemon=True)
+        self.repositorio = repositorio
+        self.execucao = execucao
+        self.worker = worker
+        self.ttl = ttl
+        self.inicio_shard: Optional[int] = None
+        self.perdido = threading.Event()
+        self._parar = threading.Event()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def acompanhar(self, inicio_shard: Optional[int]):
+        """Passa a renovar o shard informado (None: nenhum)"""
+        self.inicio_shard = inicio_shard
+        self.perdido.clear()
+
+    def run(self):
+        while not self._parar.wait(self.ttl / 3):
+            inicio_shard = self.inicio_shard
+            if inicio_shard is None:
+                continue
+            try:
+                if not self.repositorio.renovar(self.execucao, inicio_shard, self.worker, self.ttl):
+                    self.perdido.set()
+            except Exception as e:
+                # Banco indisponível: o lease pode vencer; a conclusão confirmará
+                self.logger.warning(f"Heartbeat do shard {inicio_shard} falhou: {e}")
+
+    def parar(self):
+        self._parar.set()
+
+
+class ExtracaoDistribuida:
+    """
+    Coordenação de uma execução de extração em shards
+
+    Cada shard é uma faixa [inicio, fim] de códigos. O worker lista os
+    cadastros da faixa, consulta os módulos de cada um e grava um arquivo
+    .jsonl por dataset em data/json/shards/{execucao}/{nome}/, com o nome
+    do worker no arquivo: se um lease vencer e o shard for refeito por outro
+    worker, a mesclagem usa apenas os arquivos de quem o concluiu.
+    """
+
+    def __init__(
+        self,
+        execucao: str,
+        url_leases: Optional[str] = None,
+        tamanho_shard: Optional[int] = None,
+        ttl: Optional[float] = None,
+        codigo_maximo: Optional[int] = None,
+        fabrica_servico=None,
+    ):
+        """
+        Inicializa a coordenação
+
+        Args:
+            execucao: Identificador da execução (compartilhado pelos workers)
+            url_leases: URL SQLAlchemy da tabela de leases; vazio usa SQLite em
+                data/leases.db e "postgres" usa o banco do projeto
+            tamanho_shard: Códigos por shard
+            ttl: Validade do lease em segundos (renovado por heartbeat)
+            codigo_maximo: Último código planejado (shards além são criados
+                enquanto o último shard trouxer cadastros)
+            fabrica_servico: Cria o CadastroService do worker (padrão: CadastroService)
+        """
+        app = settings.app
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.execucao = execucao
+        self.url_leases = self._resolver_url(url_leases if url_leases is not None else app.lease_url)
+        self.tamanho_shard = int(tamanho_shard or app.shard_size)
+        self.ttl = float(ttl or app.lease_ttl)
+        self.codigo_maximo = int(codigo_maximo or app.listing_max_code)
+        self.fabrica_servico = fabrica_servico
+        self.file_storage_service = FileStorageService()
+        self.diretorio_shards = os.path.join(self.file_storage_service.data_dir, "shards", execucao)
+
+        conectar = {"timeout": 30} if self.url_leases.startswith("sqlite") else {}
+        self.engine = create_engine(self.url_leases, connect_args=conectar)
+        self.repositorio = LeaseRepository(self.engine)
+
+    @staticmethod
+    def _resolver_url(url: str) -> str:
+        if not url:
+            caminho = os.path.abspath(os.path.join(settings.app.data_dir, "leases.db"))
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            return f"sqlite:///{caminho}"
+        if url == "postgres":
+            return db_settings.database.connection_string
+        return url
+
+    def _servico(self):
+        if self.fabrica_servico is not None:
+            return self.fabrica_servico()
+        # Importação tardia: cadastro_service cria o cliente SOAP ao instanciar
+        from service.cadastro_service import CadastroService
+        return CadastroService()
+
+    # ------------------- Planejamento -------------------
+    def preparar(self, inicio: int = 1, fim: Optional[int] = None) -> Dict[str, int]:
+        """
+        Cria a tabela de leases e registra os shards da execução (idempotente)
+
+        Returns:
+            Quantidade de shards por status
+        """
+        fim = fim or self.codigo_maximo
+        self.repositorio.criar_tabela()
+        faixas = [
+            (shard_inicio, min(shard_inicio + self.tamanho_shard - 1, fim))
+            for shard_inicio in range(inicio, fim + 1, self.tamanho_shard)
+        ]
+        novos = self.repositorio.registrar_shards(self.execucao, faixas)
+        self.logger.info(f"Execução {self.execucao}: {novos} shards registrados")
+        return self.repositorio.resumo(self.execucao)
+
+    # ------------------- Worker -------------------
+    @staticmethod
+    def identificador_worker() -> str:
+        return f"{socket.gethostname()}-{os.getpid()}"
+
+    def executar_worker(self, worker: Optional[str] = None, max_tentativas: int = 3) -> Dict[str, Any]:
+        """
+        Processa shards até não haver mais nenhum disponível nem em andamento
+
+        Shards de outros workers ainda em andamento são aguardados, para que
+        sejam reivindicados se o lease vencer (worker morto). Com
+        APP_TRACE_FILE, cada worker grava sua própria execução no arquivo
+        compartilhado (execucao_distribuida e worker no span raiz).
+
+        Returns:
+            Shards e cadastros processados por este worker
+        """
+        worker = worker or self.identificador_worker()
+        servico = self._servico()
+        heartbeat = Heartbeat(self.repositorio, self.execucao, worker, self.ttl)
+        heartbeat.start()
+        processados = 0
+        cadastros = 0
+
+        with sessao_rastreamento("extracao", compartilhado=True, modo="distribuida",
+                                 execucao_distribuida=self.execucao, worker=worker):
+            try:
+                while True:
+                    shard = self.repositorio.reivindicar(self.execucao, worker, self.ttl, max_tentativas)
+                    if shard is None:
+                        if not self.repositorio.resumo(self.execucao).get(EM_ANDAMENTO):
+                            break
+                        time.sleep(min(self.ttl / 4, 5))
+                        continue
+
+                    heartbeat.acompanhar(shard["inicio"])
+                    try:
+                        with rastreador.span("shard", inicio=shard["inicio"], fim=shard["fim"]):
+                            total, falhas = self._processar_shard(servico, shard, worker, heartbeat)
+                    except LeasePerdido:
+                        self.logger.warning(f"[{worker}] lease do shard {shard['inicio']}-{shard['fim']} perdido")
+                        continue
+                    except Exception as e:
+                        self.logger.warning(f"[{worker}] shard {shard['inicio']}-{shard['fim']}: {e}")
+                        self.repositorio.liberar(self.execucao, shard["inicio"], worker)
+                        continue
+                    finally:
+                        heartbeat.acompanhar(None)
+
+                    if self.repositorio.concluir(self.execucao, shard["inicio"], worker, total, falhas):
+                        processados += 1
+                        cadastros += total
+                        self._estender_fronteira(shard, total)
+            finally:
+                heartbeat.parar()
+
+        return {"worker": worker, "shards": processados, "cadastros": cadastros}
+
+    def _estender_fronteira(self, shard: Dict[str, Any], total: int):
+        """Cria o shard seguinte quando o último shard planejado ainda tinha cadastros"""
+        if total and shard["fim"] >= (self.repositorio.maior_fim(self.execucao) or 0):
+            inicio = shard["fim"] + 1
+            self.repositorio.registrar_shard(self.execucao, inicio, inicio + self.tamanho_shard - 1)
+
+    def _arquivo_shard(self, nome: str, inicio: int, fim: int, worker: str) -> str:
+        return os.path.join(self.diretorio_shards, nome, f"{inicio:010d}-{fim:010d}.{worker}.jsonl")
+
+    def _processar_shard(self, servico, shard: Dict[str, Any], worker: str,
+                         heartbeat: Heartbeat) -> tuple:
+        """
+        Lista e extrai os cadastros da faixa do shard e grava os arquivos do shard
+
+        Returns:
+            (total de cadastros, falhas por módulo)
+
+        Raises:
+            LeasePerdido: Se o heartbeat não conseguir mais renovar o lease
+        """
+        inicio, fim = shard["inicio"], shard["fim"]
+        listagem = ListagemParticionada(
+            fabrica_cliente=lambda: servico.soap_client,
+            tamanho_inicial=min(self.tamanho_shard, int(settings.app.max_interval_size)),
+            limite_registros=int(settings.app.listing_max_records),
+            trabalhadores=1,
+        )
+        with rastreador.span("listagem"):
+            cadastros = listagem.listar(inicio=inicio, fim=fim)
+        if listagem.falhas:
+            raise RuntimeError(f"{len(listagem.falhas)} faixa(s) sem resposta na listagem")
+
+        estatisticas = StatisticsService().criar_estatisticas_extracao(len(cadastros))
+        escritores = {}
+        try:
+            for nome in servico.DATASETS:
+                caminho = self._arquivo_shard(nome, inicio, fim, worker)
+                os.makedirs(os.path.dirname(caminho), exist_ok=True)
+                escritores[nome] = DatasetWriter(caminho, "jsonl")
+
+            for cad in cadastros:
+                if heartbeat.perdido.is_set():
+                    raise LeasePerdido(f"{inicio}-{fim}")
+                escritores["cadastros"].escrever(cad)
+                codigo = str(cad.get("codigo_cadastro") or "").strip()
+                with rastreador.span("cadastro", codigo_cadastro=codigo):
+                    obtidos = servico._extrair_modulos_cadastro(codigo, estatisticas)
+                for modulo, itens in obtidos.items():
+                    for item in itens:
+                        escritores[modulo].escrever(item)
+                if servico.request_delay:
+                    time.sleep(servico.request_delay)
+        except BaseException:
+            for escritor in escritores.values():
+                escritor.descartar()
+            raise
+
+        for escritor in escritores.values():
+            escritor.fechar()
+        return len(cadastros), estatisticas.falhas_por_modulo
+
+    # ------------------- Mesclagem -------------------
+    def _iterar_shard(self, nome: str, linha) -> Iterator[Dict[str, Any]]:
+        with open(self._arquivo_shard(nome, linha.inicio, linha.fim, linha.worker), "r", encoding="utf-8") as f:
+            for registro in f:
+                if registro.strip():
+                    yield json.loads(registro)
+
+    def mesclar(self, formato: str = "json", forcar: bool = False) -> Dict[str, str]:
+        """
+        Junta os arquivos dos shards concluídos nos datasets padrão {nome}.json
+
+        Os shards são lidos em ordem de código, então cadastros e módulos saem
+        ordenados como na extração de processo único. As estatísticas da
+        extração são recalculadas shard a shard durante a mesclagem.
+
+        Args:
+            formato: 'json' (padrão) ou 'jsonl'
+            forcar: Mescla mesmo com shards pendentes ou falhos
+
+        Returns:
+            { nome_arquivo: caminho }
+        """
+        from service.cadastro_service import CadastroService
+
+        shards = self.repositorio.listar(self.execucao)
+        incompletos = [s for s in shards if s.status != CONCLUIDO]
+        if incompletos and not forcar:
+            raise RuntimeError(
+                f"{len(incompletos)} shard(s) não concluído(s) na execução {self.execucao}: "
+                + ", ".join(f"{s.inicio}-{s.fim} ({s.status})" for s in incompletos[:10])
+            )
+        concluidos = [s for s in shards if s.status == CONCLUIDO]
+
+        estatisticas = StatisticsService().criar_estatisticas_extracao(
+            sum(s.total_cadastros or 0 for s in concluidos)
+        )
+        for shard in concluidos:
+            for modulo, quantidade in json.loads(shard.falhas or "{}").items():
+                estatisticas.registrar_falha(modulo, quantidade)
+
+        resultados: Dict[str, str] = {}
+        escritores = {
+            nome: self.file_storage_service.abrir_dataset_stream(nome, formato)
+            for nome in CadastroService.DATASETS
+        }
+        try:
+            for shard in concluidos:
+                # Filhos do shard agrupados por cadastro, para as estatísticas
+                por_cadastro: Dict[str, Dict[str, List[Dict[str, Any]]]] = defaultdict(dict)
+                for modulo in CadastroService.MODULOS:
+                    itens = list(self._iterar_shard(modulo, shard))
+                    for item in itens:
+                        escritores[modulo].escrever(item)
+                        if modulo in estatisticas.CAMPOS_MODULOS:
+                            por_cadastro[str(item.get("codigo_cadastro"))].setdefault(modulo, []).append(item)
+                    estatisticas.registrar_modulo(modulo, itens)
+                for cad in self._iterar_shard("cadastros", shard):
+                    escritores["cadastros"].escrever(cad)
+                    estatisticas.registrar_cadastro(cad, por_cadastro.get(str(cad.get("codigo_cadastro"))))
+        except BaseException:
+            for escritor in escritores.values():
+                escritor.descartar()
+            raise
+
+        for nome, escritor in escritores.items():
+            resultados[nome] = escritor.fechar()
+            CLIInterface.mostrar_sucesso(f"{os.path.basename(escritor.caminho)} mesclado com {escritor.total} registros.")
+
+        self._registrar_cobertura(estatisticas)
+        # Métricas SOAP ficam nos workers; o histórico usa as contagens dos shards
+        livro.registrar(contagens={
+            "cadastros": estatisticas.acumulador.total,
+            "registros_por_modulo": estatisticas.registros_por_modulo,
+            "falhas_por_modulo": estatisticas.falhas_por_modulo,
+        })
+        resultados["estatisticas_extracao"] = self.file_storage_service.salvar_relatorio(
+            "estatisticas_extracao", {**estatisticas.resultado(), "execucao_distribuida": self.situacao()}
+        )
+        return {k: v or "" for k, v in resultados.items()}
+
+    def _registrar_cobertura(self, estatisticas):
+        """Acrescenta os códigos mesclados à cobertura persistida (cobertura_codigos.json)"""
+        from model.cobertura_codigos import ConjuntoIntervalos
+
+        caminho = os.path.join(self.file_storage_service.data_dir, "cobertura_codigos.json")
+        try:
+            (ConjuntoIntervalos.carregar(caminho) | estatisticas.cobertura).salvar(caminho)
+        except OSError as e:
+            self.logger.warning(f"Falha ao salvar cobertura de códigos: {e}")
+
+    def situacao(self) -> Dict[str, Any]:
+        """Resumo dos shards da execução"""
+        shards = self.repositorio.listar(self.execucao)
+        return {
+            "execucao": self.execucao,
+            "shards": len(shards),
+            "por_status": self.repositorio.resumo(self.execucao),
+            "cadastros": sum(s.total_cadastros or 0 for s in shards if s.status == CONCLUIDO),
+            "workers": sorted({s.worker for s in shards if s.worker}),
+            "falhos": [f"{s.inicio}-{s.fim}" for s in shards if s.status == FALHOU],
+        }
+
+    # ------------------- Execução local -------------------
+    def executar_local(self, processos: Optional[int] = None, formato: str = "json") -> Dict[str, str]:
+        """
+        Prepara os shards, roda N processos worker neste host e mescla
+
+        Args:
+            processos: Quantidade de processos (padrão: APP_SHARD_WORKERS)
+            formato: Formato dos datasets mesclados
+
+        Returns:
+            { nome_arquivo: caminho }
+        """
+        processos = int(processos or settings.app.shard_workers)
+        with sessao_livro("extracao", "distribuida", execucao_distribuida=self.execucao):
+            return self._executar_local(processos, formato)
+
+    def _executar_local(self, processos: int, formato: str) -> Dict[str, str]:
+        """Corpo de executar_local (entrada do histórico já aberta)"""
+        livro.registrar(processos=processos, tamanho_shard=self.tamanho_shard)
+        with livro.fase("preparacao"):
+            self.preparar()
+        CLIInterface.mostrar_info(f"Execução {self.execucao}: iniciando {processos} processos worker...")
+
+        filhos = [
+            multiprocessing.Process(
+                target=_executar_worker_processo,
+                args=(self.execucao, self.url_leases, self.tamanho_shard, self.ttl, self.codigo_maximo),
+                name=f"worker-{indice}",
+            )
+            for indice in range(processos)
+        ]
+        with livro.fase("workers"):
+            for filho in filhos:
+                filho.start()
+
+            try:
+                vivos = list(filhos)
+                while vivos:
+                    resumo = self.repositorio.resumo(self.execucao)
+                    CLIInterface.mostrar_progresso_banco(
+                        resumo.get(CONCLUIDO, 0), max(1, sum(resumo.values())), "Shards concluídos"
+                    )
+                    # Acorda na saída de um processo em vez de dormir o intervalo inteiro
+                    multiprocessing.connection.wait([filho.sentinel for filho in vivos], timeout=2)
+                    vivos = [filho for filho in vivos if filho.is_alive()]
+            finally:
+                for filho in filhos:
+                    filho.join()
+
+        situacao = self.situacao()
+        livro.registrar(shards=situacao["shards"], shards_falhos=len(situacao["falhos"]))
+        if situacao["falhos"]:
+            # Mesclagem parcial: fora da linha de base do relatório de tendência
+            livro.registrar(status="erro")
+            CLIInterface.mostrar_aviso(f"Shards falhos: {', '.join(situacao['falhos'][:10])}")
+        with livro.fase("mesclagem"):
+            return self.mesclar(formato, forcar=bool(situacao["falhos"]))
+
+
+def _executar_worker_processo(execucao: str, url_leases: str, tamanho_shard: int,
+                              ttl: float, codigo_maximo: int):
+    """Ponto de entrada dos processos filhos (engine e cliente SOAP próprios)"""
+    ExtracaoDistribuida(execucao, url_leases, tamanho_shard, ttl, codigo_maximo).executar_worker()
+
+
+def main(argumentos: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Extração distribuída em shards com leases")
+    parser.add_argument("comando", choices=["preparar", "worker", "mesclar", "local", "situacao"])
+    parser.add_argument("--execucao", default=datetime.now().strftime("%Y%m%d"))
+    parser.add_argument("--leases", default=None, help="URL da tabela de leases (ou 'postgres')")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--formato", choices=["json", "jsonl"], default="json")
+    parser.add_argument("--forcar", action="store_true", help="Mesclar mesmo com shards incompletos")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=getattr(logging, settings.app.log_level, logging.INFO))
+    extracao = ExtracaoDistribuida(args.execucao, args.leases)
+
+    if args.comando == "preparar":
+        resultado = extracao.preparar()
+    elif args.comando == "worker":
+        resultado = extracao.executar_worker()
+    elif args.comando == "mesclar":
+        resultado = extracao.mesclar(args.formato, args.forcar)
+    elif args.comando == "local":
+        resultado = extracao.executar_local(args.processos, args.formato)
+    else:
+        resultado = extracao.situacao()
+    print(json.dumps(resultado, ensure_ascii=False, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""
+Sketch Service - Estimadores de memória fixa e combináveis (mergeable)
+KLL para quantis de áreas e HyperLogLog para contagem de distintos,
+alimentados registro a registro durante extrações e cargas em streaming
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+import hashlib
+import math
+import random
+
+from service.statistics_service import StatisticsService
+
+
+class KLLSketch:
+    """
+    Sketch KLL (Karnin, Lang, Liberty) para quantis aproximados
+
+    Mantém uma pilha de compactadores; quando o total de itens passa da
+    capacidade, o nível cheio é ordenado e metade dos itens (pares ou
+    ímpares, ao acaso) sobe para o nível seguinte com peso dobrado.
+    Memória O(k) independente do volume; erro de rank ~ 1.7/k.
+    """
+
+    FATOR_CAPACIDADE = 2 / 3
+
+    def __init__(self, k: int = 200, semente: Optional[int] = None):
+        """
+        Inicializa o sketch
+
+        Args:
+            k: Capacidade do nível mais alto (precisão x memória)
+            semente: Semente do sorteio das compactações (reprodutibilidade)
+        """
+        self.k = k
+        self.n = 0
+        self.minimo: Optional[float] = None
+        self.maximo: Optional[float] = None
+        self.compactadores: List[List[float]] = [[]]
+        self._tamanho = 0
+        self._tamanho_maximo = self._capacidade(0)
+        self._aleatorio = random.Random(semente)
+
+    def _capacidade(self, nivel: int) -> int:
+        """Capacidade do nível (níveis inferiores guardam menos itens)"""
+        profundidade = len(self.compactadores) - nivel - 1
+        return int(math.ceil(self.k * self.FATOR_CAPACIDADE ** profundidade)) + 1
+
+    def _crescer(self):
+        self.compactadores.append([])
+        self._tamanho_maximo = sum(self._capacidade(h) for h in range(len(self.compactadores)))
+
+    def update(self, valor: float):
+        """Acrescenta um valor"""
+        self.compactadores[0].append(valor)
+        self.n += 1
+        self._tamanho += 1
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+        if self._tamanho >= self._tamanho_maximo:
+            self._comprimir()
+
+    def _comprimir(self):
+        """Compacta o primeiro nível acima da capacidade (compactação preguiçosa)"""
+        for nivel in range(len(self.compactadores)):
+            itens = self.compactadores[nivel]
+            if len(itens) < self._capacidade(nivel):
+                continue
+            if nivel + 1 >= len(self.compactadores):
+                self._crescer()
+
+            itens.sort()
+            sobra = [itens.pop()] if len(itens) % 2 else []
+            self.compactadores[nivel + 1].extend(itens[self._aleatorio.randint(0, 1)::2])
+            self.compactadores[nivel] = sobra
+            self._tamanho = sum(len(c) for c in self.compactadores)
+            break
+
+    def merge(self, outro: "KLLSketch") -> "KLLSketch":
+        """
+        Combina outro sketch neste
+
+        Args:
+            outro: Sketch de outra parte dos dados
+
+        Returns:
+            O próprio sketch
+        """
+        while len(self.compactadores) < len(outro.compactadores):
+            self._crescer()
+        for nivel, itens in enumerate(outro.compactadores):
+            self.compactadores[nivel].extend(itens)
+
+        self.n += outro.n
+        if outro.minimo is not None:
+            self.minimo = outro.minimo if self.minimo is None else min(self.minimo, outro.minimo)
+            self.maximo = outro.maximo if self.maximo is None else max(self.maximo, outro.maximo)
+
+        self._tamanho = sum(len(c) for c in self.compactadores)
+        while self._tamanho >= self._tamanho_maximo:
+            self._comprimir()
+        return self
+
+    def _itens_ponderados(self) -> List[Tuple[float, int]]:
+        """Itens ordenados com peso 2^nível"""
+        return sorted(
+            (valor, 1 << nivel)
+            for nivel, itens in enumerate(self.compactadores)
+            for valor in itens
+        )
+
+    def quantis(self, fracoes: Iterable[float]) -> List[Optional[float]]:
+        """
+        Quantis aproximados
+
+        Args:
+            fracoes: Frações entre 0 e 1
+
+        Returns:
+            Um valor por fração (None se o sketch estiver vazio)
+        """
+        fracoes = list(fracoes)
+        if self.n == 0:
+            return [None] * len(fracoes)
+
+        itens = self._itens_ponderados()
+        peso_total = sum(peso for _, peso in itens)
+        acumulados = []
+        acumulado = 0
+        for _, peso in itens:
+            acumulado += peso
+            acumulados.append(acumulado)
+
+        resultado = []
+        for fracao in fracoes:
+            if fracao <= 0:
+                resultado.append(self.minimo)
+                continue
+            if fracao >= 1:
+                resultado.append(self.maximo)
+                continue
+            alvo = fracao * peso_total
+            indice = next(i for i, a in enumerate(acumulados) if a >= alvo)
+            resultado.append(itens[indice][0])
+        return resultado
+
+    def quantil(self, fracao: float) -> Optional[float]:
+        """Quantil aproximado de uma fração"""
+        return self.quantis([fracao])[0]
+
+    @property
+    def itens_retidos(self) -> int:
+        """Quantidade de valores guardados (memória usada)"""
+        return self._tamanho
+
+
+# Constante de correção do HyperLogLog para m < 128 (Flajolet et al.)
+ALFA_HLL = {16: 0.673, 32: 0.697, 64: 0.709}
+
+
+class HyperLogLog:
+    """
+    Contador aproximado de valores distintos (HyperLogLog)
+
+    2^precisao registradores de um byte; erro padrão ~ 1.04/sqrt(2^precisao)
+    (precisão 14: 16 KB e ~0.8%). Combinar dois contadores é o máximo
+    registrador a registrador.
+    """
+
+    def __init__(self, precisao: int = 14):
+        """
+        Inicializa o contador
+
+        Args:
+            precisao: Bits do índice do registrador (4 a 16)
+        """
+        if not 4 <= precisao <= 16:
+            raise ValueError(f"Precisão do HyperLogLog fora do intervalo 4-16: {precisao}")
+        self.precisao = precisao
+        self.m = 1 << precisao
+        self.registradores = bytearray(self.m)
+
+    def update(self, valor: Any):
+        """Registra um valor (comparado pela sua representação textual)"""
+        digest = hashlib.blake2b(str(valor).encode('utf-8'), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        bits_restantes = 64 - self.precisao
+        indice = h >> bits_restantes
+        resto = h & ((1 << bits_restantes) - 1)
+        rank = bits_restantes - resto.bit_length() + 1
+        if rank > self.registradores[indice]:
+            self.registradores[indice] = rank
+
+    def merge(self, outro: "HyperLogLog") -> "HyperLogLog":
+        """
+        Combina outro contador neste
+
+        Args:
+            outro: Contador com a mesma precisão
+
+        Returns:
+            O próprio contador
+        """
+        if outro.precisao != self.precisao:
+            raise ValueError("Não é possível combinar HyperLogLog com precisões diferentes")
+        self.registradores = bytearray(map(max, self.registradores, outro.registradores))
+        return self
+
+    def estimativa(self) -> int:
+        """Número estimado de valores distintos"""
+        # A fórmula fechada de alfa só vale a partir de 128 registradores
+        alfa = ALFA_HLL.get(self.m) or 0.7213 / (1 + 1.079 / self.m)
+        soma = sum(2.0 ** -r for r in self.registradores)
+        estimativa = alfa * self.m * self.m / soma
+
+        # Correção para cardinalidades pequenas (linear counting)
+        zeros = self.registradores.count(0)
+        if estimativa <= 2.5 * self.m and zeros:
+            estimativa = self.m * math.log(self.m / zeros)
+        return int(round(estimativa))
+
+
+class EstatisticasStreaming:
+    """
+    Estatísticas de memória fixa para execuções de qualquer tamanho
+
+    Quantis de áreas (KLL) e distintos de proprietários, logradouros e
+    bairros (HyperLogLog). Alimentado com update(cadastro) e combinável
+    com merge, como o AcumuladorEstatisticas.
+    """
+
+    QUANTIS = (0.10, 0.25, 0.50, 0.75, 0.90, 0.99)
+
+    def __init__(self, k: int = 200, precisao: int = 14):
+        """
+        Inicializa os estimadores
+
+        Args:
+            k: Precisão dos sketches KLL
+            precisao: Precisão dos contadores HyperLogLog
+        """
+        self.total = 0
+        self.areas = {'terreno': KLLSketch(k), 'construida': KLLSketch(k)}
+        self.somas_areas = {'terreno': 0.0, 'construida': 0.0}
+        self.distintos = {
+            'proprietarios': HyperLogLog(precisao),
+            'logradouros': HyperLogLog(precisao),
+            'bairros': HyperLogLog(precisao),
+        }
+
+    def update(self, cadastro: Any) -> "EstatisticasStreaming":
+        """
+        Incorpora um cadastro (com filhos embutidos, se houver)
+
+        Args:
+            cadastro: Dados do cadastro
+
+        Returns:
+            O próprio acumulador
+        """
+        self.total += 1
+        if not isinstance(cadastro, dict):
+            return self
+
+        for nome in ('terreno', 'construida'):
+            area = StatisticsService._extrair_valor_numerico(cadastro.get(f'area_{nome}'))
+            if area and area > 0:
+                self.areas[nome].update(area)
+                self.somas_areas[nome] += area
+
+        for proprietario in cadastro.get('proprietariosbci') or []:
+            if isinstance(proprietario, dict):
+                self._registrar('proprietarios', proprietario.get('codigo_pessoa'))
+
+        for endereco in cadastro.get('enderecos') or []:
+            if isinstance(endereco, dict):
+                self._registrar('logradouros', self._chave(
+                    endereco, 'codigo_logradouro', 'descricao_logradouro'))
+                self._registrar('bairros', self._chave(
+                    endereco, 'codigo_bairro', 'descricao_bairro'))
+        return self
+
+    @staticmethod
+    def _chave(registro: Dict[str, Any], campo_codigo: str, campo_descricao: str) -> Optional[str]:
+        """Identificador do item: código quando houver, senão a descrição normalizada"""
+        codigo = registro.get(campo_codigo)
+        if codigo not in (None, ''):
+            return f"{registro.get('codigo_cidade', '')}:{codigo}"
+        descricao = registro.get(campo_descricao)
+        if descricao:
+            return str(descricao).strip().upper() or None
+        return None
+
+    def _registrar(self, nome: str, valor: Any):
+        if valor is not None and str(valor).strip() != "":
+            self.distintos[nome].update(str(valor).strip())
+
+    def update_many(self, cadastros: Iterable[Any]) -> "EstatisticasStreaming":
+        """Incorpora todos os cadastros de um iterável"""
+        for cadastro in cadastros:
+            self.update(cadastro)
+        return self
+
+    def merge(self, outro: "EstatisticasStreaming") -> "EstatisticasStreaming":
+        """
+        Combina outro acumulador neste
+
+        Args:
+            outro: Estatísticas de outra parte dos dados
+
+        Returns:
+            O próprio acumulador
+        """
+        self.total += outro.total
+        for nome, sketch in self.areas.items():
+            sketch.merge(outro.areas[nome])
+            self.somas_areas[nome] += outro.somas_areas[nome]
+        for nome, contador in self.distintos.items():
+            contador.merge(outro.distintos[nome])
+        return self
+
+    def resultado(self) -> Dict[str, Any]:
+        """
+        Estatísticas estimadas
+
+        Returns:
+            distribuicao_areas no formato de _calcular_estatisticas_lista
+            (mediana aproximada) com quantis, e contagens de distintos
+        """
+        distribuicao = {}
+        for nome, sketch in self.areas.items():
+            if sketch.n == 0:
+                distribuicao[nome] = {
+                    'count': 0, 'min': 0, 'max': 0, 'media': 0, 'mediana': 0, 'quantis': {}
+                }
+                continue
+
+            valores = sketch.quantis((0.5,) + self.QUANTIS)
+            distribuicao[nome] = {
+                'count': sketch.n,
+                'min': sketch.minimo,
+                'max': sketch.maximo,
+                'media': self.somas_areas[nome] / sketch.n,
+                'mediana': valores[0],
+                'quantis': {
+                    f"p{fracao * 100:g}": valor for fracao, valor in zip(self.QUANTIS, valores[1:])
+                }
+            }
+
+        return {
+            'total': self.total,
+            'distribuicao_areas': distribuicao,
+            'distintos': {nome: contador.estimativa() for nome, contador in self.distintos.items()},
+            'estimado': True
+        }
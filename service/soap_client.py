@@ -9,7 +9,7 @@ import logging
 import re
 import time
 from datetime import datetime, date
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from requests import Session
 from requests.auth import HTTPBasicAuth
@@ -19,6 +19,8 @@ from zeep.transports import Transport
 from lxml import etree as ET
 
 from config.settings import settings
+from service.metrics_service import metricas
+from service.tracing_service import rastreador
 
 
 class SOAPClientError(Exception):
@@ -157,6 +159,66 @@ def _extract_first(resp: Dict[str, Any], *keys: str) -> Any:
     return None
 
 
+def _extract_list_by_keys(resp: Any, *keys: str) -> List[Dict]:
+    """Extrai lista por chaves comuns."""
+    if not isinstance(resp, dict):
+        return _to_list(resp)
+    inner = _extract_first(resp, *keys)
+    return _to_list(inner)
+
+
+def _lista_itbi(resp: Any) -> List[Dict]:
+    """Extrai a lista de ITBIs (chaves variam entre WSDLs)."""
+    if isinstance(resp, dict):
+        lst = (
+            resp.get("itbis")
+            or resp.get("listaItbi")
+            or resp.get("itbi")
+            or resp.get("retorno")
+            or resp.get("lista")
+        )
+        if lst is None:
+            # alguns retornam um único objeto
+            return [resp]
+        return lst if isinstance(lst, list) else [lst]
+    return resp or []
+
+
+# ---------------- Processamento da resposta (CPU) ----------------
+# Funções de módulo (picklable) para rodar fora da thread de rede,
+# inclusive em um ProcessPoolExecutor.
+
+# Módulo -> (operação, fallbacks, chaves da lista na resposta)
+OPERACOES_MODULOS: Dict[str, Tuple[str, List[str], Tuple[str, ...]]] = {
+    "enderecos": ("buscaEnderecoImovel", ["buscaEnderecoBCI"], ("enderecos", "endereco")),
+    "proprietarios": ("buscaProprietarios", ["buscaProprietarioBCI"], ("proprietarios", "proprietario")),
+    "testadas": ("buscaTestadas", ["buscaTestadaBCI"], ("testadas", "testada")),
+    "subreceitas": (
+        "buscaSubReceitas", ["buscaSubreceitaBCI", "buscaSubReceitaBCI"], ("subreceitas", "subreceita")
+    ),
+    "zoneamento": ("buscaZoneamento", ["buscaZoneamentoBCI"], ("zoneamentos", "zoneamento")),
+    "anexos": ("buscaAnexos", ["buscaAnexoBCI", "buscaAnexosBCI"], ("anexos", "anexo")),
+    "historico": ("buscaHistorico", ["buscaHistoricoBCI"], ("historicos", "historico")),
+    "bci": ("buscaBlocoItens", ["buscaBlocoItensBCI"], ("blocoItens", "itens", "blocoItem")),
+    "itbi": ("buscaItbiCadastroImobiliario", [], ()),
+}
+
+
+def processar_resposta(xml_bytes: bytes) -> Any:
+    """Bytes da resposta SOAP -> objeto Python normalizado (parse + unwrap + datas)."""
+    parsed = _parse_soap_response(xml_bytes)
+    parsed = _unwrap_return(parsed)
+    return _normalize_obj(parsed)
+
+
+def processar_modulo(modulo: str, xml_bytes: bytes) -> List[Dict]:
+    """Bytes da resposta de um módulo -> lista de registros do módulo."""
+    resp = processar_resposta(xml_bytes)
+    if modulo == "itbi":
+        return _lista_itbi(resp)
+    return _extract_list_by_keys(resp, *OPERACOES_MODULOS[modulo][2])
+
+
 class CadastralSOAPClient:
     """Client SOAP com raw_response=True para contornar datas BR e arrays SOAP."""
 
@@ -196,21 +258,61 @@ class CadastralSOAPClient:
                 for port in service.ports.values():
                     port.binding_options["address"] = settings.soap.endpoint_url
 
+    def _requisitar(self, name: str, **kwargs) -> bytes:
+        """Uma chamada da operação; devolve os bytes da resposta, sem parse."""
+        op = getattr(self.client.service, name)
+        self.logger.debug(f"[SOAP] Chamando {name} kwargs={kwargs}")
+        metricas.iniciar_requisicao(name)
+        inicio = time.perf_counter()
+        try:
+            resp = op(**kwargs)  # raw_response=True => requests.Response-like ou bytes
+        except Exception as e:
+            metricas.registrar_requisicao(name, time.perf_counter() - inicio, falha=type(e).__name__)
+            rastreador.registrar_tentativa(name, falha=type(e).__name__)
+            raise
+        conteudo = getattr(resp, "content", resp)
+        corpo_enviado = getattr(getattr(resp, "request", None), "body", None) or b""
+        status = getattr(resp, "status_code", None)
+        metricas.registrar_requisicao(
+            name, time.perf_counter() - inicio, len(corpo_enviado), len(conteudo or b""), status,
+        )
+        rastreador.registrar_tentativa(name, len(corpo_enviado), len(conteudo or b""), status)
+        return conteudo
+
     def _call(self, op_main: str, op_fallbacks: List[str], **kwargs) -> Any:
+        return self._com_retentativas(op_main, op_fallbacks, processar_resposta, **kwargs)
+
+    def buscar_bytes(self, op_main: str, op_fallbacks: List[str], **kwargs) -> bytes:
+        """
+        Como _call, mas só faz a E/S: devolve os bytes da resposta para que
+        parse e normalização (processar_resposta) rodem em outro estágio.
+        """
+        return self._com_retentativas(op_main, op_fallbacks, None, **kwargs)
+
+    def _com_retentativas(self, op_main: str, op_fallbacks: List[str], processar, **kwargs) -> Any:
         last_err: Optional[Exception] = None
         ops = [op_main] + (op_fallbacks or [])
-        for _ in range(max(self.retry_attempts, 1)):
+        inicio = time.perf_counter()
+        fallbacks = 0
+        for rodada in range(max(self.retry_attempts, 1)):
             for name in ops:
+                # Fallbacks ausentes do WSDL falham no getattr, sem ir ao servidor
+                if name != op_main and hasattr(self.client.service, name):
+                    fallbacks += 1
                 try:
-                    op = getattr(self.client.service, name)
-                    self.logger.debug(f"[SOAP] Chamando {name} kwargs={kwargs}")
-                    resp = op(
-                        **kwargs
-                    )  # raw_response=True => requests.Response-like ou bytes
-                    xml_bytes = getattr(resp, "content", resp)
-                    parsed = _parse_soap_response(xml_bytes)
-                    parsed = _unwrap_return(parsed)
-                    return _normalize_obj(parsed)
+                    xml_bytes = self._requisitar(name, **kwargs)
+                    if processar:
+                        inicio_parse = time.perf_counter()
+                        try:
+                            resultado = processar(xml_bytes)
+                        except Exception as e:
+                            metricas.registrar_parse(name, time.perf_counter() - inicio_parse, type(e).__name__)
+                            raise
+                        metricas.registrar_parse(name, time.perf_counter() - inicio_parse)
+                    else:
+                        resultado = xml_bytes
+                    metricas.registrar_chamada(op_main, time.perf_counter() - inicio, True, rodada, fallbacks)
+                    return resultado
                 except AttributeError as e:
                     last_err = e
                 except SOAPFault as e:
@@ -220,6 +322,9 @@ class CadastralSOAPClient:
                     last_err = e
                     self.logger.warning(f"[SOAP] Erro em {name}: {e}")
             time.sleep(self.retry_delay)
+        metricas.registrar_chamada(
+            op_main, time.perf_counter() - inicio, False, max(self.retry_attempts, 1) - 1, fallbacks
+        )
         raise SOAPClientError(f"Falha ao chamar {op_main}/{op_fallbacks}: {last_err}")
 
     # ---------------- Operações ----------------
@@ -277,92 +382,59 @@ class CadastralSOAPClient:
 
     def _extract_list_by_keys(self, resp: Any, *keys: str) -> List[Dict]:
         """Helper genérico para extrair lista por chaves comuns."""
-        if not isinstance(resp, dict):
-            return _to_list(resp)
-        inner = _extract_first(resp, *keys)
-        return _to_list(inner)
+        return _extract_list_by_keys(resp, *keys)
 
-    def buscar_proprietarios(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
+    def _payload_modulo(self, codigo_cadastro: str) -> Dict[str, Any]:
+        return {
             "entrada": {
                 "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
                 "codigo_cadastro": codigo_cadastro,
             }
         }
-        resp = self._call("buscaProprietarios", ["buscaProprietarioBCI"], **payload)
-        return self._extract_list_by_keys(resp, "proprietarios", "proprietario")
+
+    def _buscar_modulo(self, modulo: str, codigo_cadastro: str) -> List[Dict]:
+        op_main, op_fallbacks, chaves = OPERACOES_MODULOS[modulo]
+        resp = self._call(op_main, op_fallbacks, **self._payload_modulo(codigo_cadastro))
+        return self._extract_list_by_keys(resp, *chaves)
+
+    def buscar_modulo_bytes(self, modulo: str, codigo_cadastro: str) -> bytes:
+        """
+        Resposta bruta de um módulo por cadastro (para processar_modulo).
+        ITBI usa a entrada própria, com e sem wrapper, como em buscar_itbi.
+        """
+        op_main, op_fallbacks, _ = OPERACOES_MODULOS[modulo]
+        if modulo != "itbi":
+            return self.buscar_bytes(op_main, op_fallbacks, **self._payload_modulo(codigo_cadastro))
+
+        entrada = self._entrada_itbi(codigo_cadastro)
+        try:
+            return self.buscar_bytes(op_main, op_fallbacks, entrada=entrada)
+        except SOAPClientError:
+            return self.buscar_bytes(op_main, op_fallbacks, **entrada)
+
+    def buscar_proprietarios(self, codigo_cadastro: str) -> List[Dict]:
+        return self._buscar_modulo("proprietarios", codigo_cadastro)
 
     def buscar_enderecos(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
-            "entrada": {
-                "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
-                "codigo_cadastro": codigo_cadastro,
-            }
-        }
-        resp = self._call("buscaEnderecoImovel", ["buscaEnderecoBCI"], **payload)
-        return self._extract_list_by_keys(resp, "enderecos", "endereco")
+        return self._buscar_modulo("enderecos", codigo_cadastro)
 
     def buscar_testadas(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
-            "entrada": {
-                "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
-                "codigo_cadastro": codigo_cadastro,
-            }
-        }
-        resp = self._call("buscaTestadas", ["buscaTestadaBCI"], **payload)
-        return self._extract_list_by_keys(resp, "testadas", "testada")
+        return self._buscar_modulo("testadas", codigo_cadastro)
 
     def buscar_subreceitas(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
-            "entrada": {
-                "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
-                "codigo_cadastro": codigo_cadastro,
-            }
-        }
-        resp = self._call(
-            "buscaSubReceitas", ["buscaSubreceitaBCI", "buscaSubReceitaBCI"], **payload
-        )
-        return self._extract_list_by_keys(resp, "subreceitas", "subreceita")
+        return self._buscar_modulo("subreceitas", codigo_cadastro)
 
     def buscar_zoneamentos(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
-            "entrada": {
-                "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
-                "codigo_cadastro": codigo_cadastro,
-            }
-        }
-        resp = self._call("buscaZoneamento", ["buscaZoneamentoBCI"], **payload)
-        return self._extract_list_by_keys(resp, "zoneamentos", "zoneamento")
+        return self._buscar_modulo("zoneamento", codigo_cadastro)
 
     def buscar_anexos(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
-            "entrada": {
-                "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
-                "codigo_cadastro": codigo_cadastro,
-            }
-        }
-        resp = self._call("buscaAnexos", ["buscaAnexoBCI", "buscaAnexosBCI"], **payload)
-        return self._extract_list_by_keys(resp, "anexos", "anexo")
+        return self._buscar_modulo("anexos", codigo_cadastro)
 
     def buscar_historico(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
-            "entrada": {
-                "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
-                "codigo_cadastro": codigo_cadastro,
-            }
-        }
-        resp = self._call("buscaHistorico", ["buscaHistoricoBCI"], **payload)
-        return self._extract_list_by_keys(resp, "historicos", "historico")
+        return self._buscar_modulo("historico", codigo_cadastro)
 
     def buscar_bloco_itens(self, codigo_cadastro: str) -> List[Dict]:
-        payload = {
-            "entrada": {
-                "cpf_monitoracao": getattr(settings, "cpf_monitoracao", None),
-                "codigo_cadastro": codigo_cadastro,
-            }
-        }
-        resp = self._call("buscaBlocoItens", ["buscaBlocoItensBCI"], **payload)
-        return self._extract_list_by_keys(resp, "blocoItens", "itens", "blocoItem")
+        return self._buscar_modulo("bci", codigo_cadastro)
 
     def buscar_itbi(
         self,
@@ -378,13 +450,7 @@ class CadastralSOAPClient:
         com os campos: codigo_cadastro, inscricao_imobiliaria, numero_itbi, ano_itbi, data_itbi.
         """
         # monta somente os campos aceitos pela assinatura
-        entrada = {
-            "codigo_cadastro": (
-                int(codigo_cadastro)
-                if str(codigo_cadastro).isdigit()
-                else codigo_cadastro
-            )
-        }
+        entrada = self._entrada_itbi(codigo_cadastro)
         if inscricao_imobiliaria:
             entrada["inscricao_imobiliaria"] = str(inscricao_imobiliaria)
         if numero_itbi is not None:
@@ -403,16 +469,14 @@ class CadastralSOAPClient:
             resp = self._call("buscaItbiCadastroImobiliario", [], **entrada)
 
         # extrai lista por chaves comuns
-        if isinstance(resp, dict):
-            lst = (
-                resp.get("itbis")
-                or resp.get("listaItbi")
-                or resp.get("itbi")
-                or resp.get("retorno")
-                or resp.get("lista")
+        return _lista_itbi(resp)
+
+    @staticmethod
+    def _entrada_itbi(codigo_cadastro: str) -> Dict[str, Any]:
+        return {
+            "codigo_cadastro": (
+                int(codigo_cadastro)
+                if str(codigo_cadastro).isdigit()
+                else codigo_cadastro
             )
-            if lst is None:
-                # alguns retornam um único objeto
-                return [resp]
-            return lst if isinstance(lst, list) else [lst]
-        return resp or []
+        }
@@ -3,8 +3,323 @@ Statistics Service - Serviço especializado em análise e geração de estatíst
 Responsável por processar dados dos cadastros e gerar análises detalhadas
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Union
+from datetime import datetime
+import heapq
+import time
+
+from model.cobertura_codigos import ConjuntoIntervalos
 from interface.cli_interface import CLIInterface
+from config.settings import settings
+
+
+CAMPOS_OBRIGATORIOS = ['codigo_cadastro', 'tipo_cadastro', 'situacao']
+CAMPOS_IMPORTANTES = ['area_terreno', 'area_construida', 'enderecos', 'proprietariosbci']
+
+
+class AcumuladorEstatisticas:
+    """
+    Acumulador de estatísticas de cadastros em passada única
+
+    Cada cadastro é visitado uma vez (update) e as áreas são convertidas uma
+    única vez. Acumuladores de partes distintas do conjunto (ex.: shards
+    processados em paralelo) podem ser combinados com merge; o resultado é
+    o mesmo dicionário de StatisticsService.gerar_estatisticas_completas.
+    """
+
+    def __init__(self):
+        """Inicializa contadores vazios"""
+        self.total = 0
+        self.com_proprietarios = 0
+        self.com_enderecos = 0
+        self.tipos_situacao: Dict[Any, int] = {}
+        self.tipos_categoria: Dict[Any, int] = {}
+        self.zonas: Dict[Any, int] = {}
+        self.areas_terreno: List[float] = []
+        self.areas_construida: List[float] = []
+        self.area_total_terrenos = 0
+        self.area_total_construida = 0
+        self.campos_obrigatorios_completos = 0
+        self.campos_importantes_completos = 0
+        self.cadastros_completos = 0
+
+    def update(self, cadastro: Any) -> "AcumuladorEstatisticas":
+        """
+        Incorpora um cadastro às estatísticas
+
+        Args:
+            cadastro: Dados do cadastro (entradas que não são dict só contam no total)
+
+        Returns:
+            O próprio acumulador
+        """
+        self.total += 1
+        if not isinstance(cadastro, dict):
+            return self
+
+        # Análise de propriedades
+        if cadastro.get('proprietariosbci'):
+            self.com_proprietarios += 1
+
+        if cadastro.get('enderecos'):
+            self.com_enderecos += 1
+
+        # Análise de áreas
+        area_terreno = StatisticsService._extrair_valor_numerico(cadastro.get('area_terreno'))
+        if area_terreno and area_terreno > 0:
+            self.areas_terreno.append(area_terreno)
+            self.area_total_terrenos += area_terreno
+
+        area_construida = StatisticsService._extrair_valor_numerico(cadastro.get('area_construida'))
+        if area_construida and area_construida > 0:
+            self.areas_construida.append(area_construida)
+            self.area_total_construida += area_construida
+
+        # Contagem de situações e categorias
+        situacao = cadastro.get('situacao', 'Não informado')
+        self.tipos_situacao[situacao] = self.tipos_situacao.get(situacao, 0) + 1
+
+        categoria = cadastro.get('categoria', 'Não informado')
+        self.tipos_categoria[categoria] = self.tipos_categoria.get(categoria, 0) + 1
+
+        # Análise de zoneamentos
+        for zone in cadastro.get('zoneamentos', []):
+            if isinstance(zone, dict):
+                zona = zone.get('zona', 'Não informado')
+                self.zonas[zona] = self.zonas.get(zona, 0) + 1
+
+        # Qualidade dos dados
+        campos_obrig_ok = all(
+            cadastro.get(campo) is not None and str(cadastro.get(campo)).strip() != ""
+            for campo in CAMPOS_OBRIGATORIOS
+        )
+        campos_import_ok = all(
+            self._campo_importante_preenchido(cadastro.get(campo))
+            for campo in CAMPOS_IMPORTANTES
+        )
+
+        if campos_obrig_ok:
+            self.campos_obrigatorios_completos += 1
+        if campos_import_ok:
+            self.campos_importantes_completos += 1
+        if campos_obrig_ok and campos_import_ok:
+            self.cadastros_completos += 1
+
+        return self
+
+    def update_many(self, cadastros: Iterable[Any]) -> "AcumuladorEstatisticas":
+        """Incorpora todos os cadastros de um iterável (lista ou stream)"""
+        for cadastro in cadastros:
+            self.update(cadastro)
+        return self
+
+    def merge(self, outro: "AcumuladorEstatisticas") -> "AcumuladorEstatisticas":
+        """
+        Combina outro acumulador neste (o outro deve cobrir cadastros seguintes)
+
+        Args:
+            outro: Acumulador de outra parte do conjunto
+
+        Returns:
+            O próprio acumulador
+        """
+        for atributo in ('total', 'com_proprietarios', 'com_enderecos',
+                         'area_total_terrenos', 'area_total_construida',
+                         'campos_obrigatorios_completos', 'campos_importantes_completos',
+                         'cadastros_completos'):
+            setattr(self, atributo, getattr(self, atributo) + getattr(outro, atributo))
+
+        for contagens, outras in ((self.tipos_situacao, outro.tipos_situacao),
+                                  (self.tipos_categoria, outro.tipos_categoria),
+                                  (self.zonas, outro.zonas)):
+            for chave, total in outras.items():
+                contagens[chave] = contagens.get(chave, 0) + total
+
+        self.areas_terreno.extend(outro.areas_terreno)
+        self.areas_construida.extend(outro.areas_construida)
+        return self
+
+    @staticmethod
+    def _campo_importante_preenchido(valor: Any) -> bool:
+        """Campo importante: não nulo, string/lista não vazia, número positivo"""
+        if valor is None:
+            return False
+        if isinstance(valor, str):
+            return valor.strip() != ""
+        if isinstance(valor, list):
+            return len(valor) > 0
+        if isinstance(valor, (int, float)):
+            return valor > 0
+        return True
+
+    def resultado(self) -> Dict[str, Any]:
+        """
+        Monta o dicionário de estatísticas
+
+        Returns:
+            Dicionário com estatísticas completas
+        """
+        if self.total == 0:
+            return {'total': 0, 'erro': 'Nenhum cadastro fornecido para análise'}
+
+        com_area_terreno = len(self.areas_terreno)
+        com_area_construida = len(self.areas_construida)
+
+        qualidade = {
+            'total_cadastros': self.total,
+            'campos_obrigatorios_completos': self.campos_obrigatorios_completos,
+            'campos_importantes_completos': self.campos_importantes_completos,
+            'percentual_completude_obrigatorios': self.campos_obrigatorios_completos / self.total * 100,
+            'percentual_completude_importantes': self.campos_importantes_completos / self.total * 100,
+            'cadastros_completos': self.cadastros_completos,
+            'percentual_completude_geral': self.cadastros_completos / self.total * 100
+        }
+
+        return {
+            'total': self.total,
+            'com_proprietarios': self.com_proprietarios,
+            'com_enderecos': self.com_enderecos,
+            'com_area_terreno': com_area_terreno,
+            'com_area_construida': com_area_construida,
+            'tipos_situacao': dict(self.tipos_situacao),
+            'tipos_categoria': dict(self.tipos_categoria),
+            'zonas': dict(self.zonas),
+            'area_total_terrenos': self.area_total_terrenos,
+            'area_total_construida': self.area_total_construida,
+            'distribuicao_areas': {
+                'terreno': StatisticsService._calcular_estatisticas_lista(self.areas_terreno),
+                'construida': StatisticsService._calcular_estatisticas_lista(self.areas_construida)
+            },
+            'qualidade_dados': qualidade,
+            'area_media_terreno': (
+                self.area_total_terrenos / com_area_terreno if com_area_terreno > 0 else 0
+            ),
+            'area_media_construida': (
+                self.area_total_construida / com_area_construida if com_area_construida > 0 else 0
+            )
+        }
+
+
+class EstatisticasExtracao:
+    """
+    Estatísticas mantidas durante a extração, registro a registro
+
+    Cada cadastro entra uma única vez, já com os registros de módulos
+    (proprietários, endereços, zoneamentos) obtidos para ele; o relatório
+    final fica pronto quando a última requisição termina, sem passada extra.
+    """
+
+    # Módulo de extração -> campo equivalente no cadastro completo
+    CAMPOS_MODULOS = {
+        'proprietarios': 'proprietariosbci',
+        'enderecos': 'enderecos',
+        'zoneamento': 'zoneamentos',
+    }
+
+    def __init__(self, total_esperado: int = 0):
+        """
+        Inicializa as estatísticas da execução
+
+        Args:
+            total_esperado: Quantidade de cadastros a processar
+        """
+        # Importação tardia: sketch_service depende deste módulo
+        from service.sketch_service import EstatisticasStreaming
+
+        self.total_esperado = total_esperado
+        self.acumulador = AcumuladorEstatisticas()
+        self.estimativas = EstatisticasStreaming()
+        self.cobertura = ConjuntoIntervalos()
+        self.codigos_lidos = 0
+        self.codigos_invalidos = 0
+        self.registros_por_modulo: Dict[str, int] = {}
+        self.falhas_por_modulo: Dict[str, int] = {}
+        self.inicio = time.time()
+
+    def registrar_modulo(self, modulo: str, itens: List[Dict[str, Any]]):
+        """Contabiliza registros recebidos de um módulo"""
+        self.registros_por_modulo[modulo] = self.registros_por_modulo.get(modulo, 0) + len(itens)
+
+    def registrar_falha(self, modulo: str, quantidade: int = 1):
+        """Contabiliza chamadas de módulo que falharam"""
+        self.falhas_por_modulo[modulo] = self.falhas_por_modulo.get(modulo, 0) + quantidade
+
+    def registrar_cadastro(self, cadastro: Dict[str, Any],
+                           modulos: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        """
+        Incorpora um cadastro depois que seus módulos foram consultados
+
+        Args:
+            cadastro: Cadastro da listagem geral
+            modulos: Registros obtidos para este cadastro, por módulo
+        """
+        completo = dict(cadastro) if isinstance(cadastro, dict) else cadastro
+        if isinstance(completo, dict):
+            for modulo, campo in self.CAMPOS_MODULOS.items():
+                if not completo.get(campo) and (modulos or {}).get(modulo):
+                    completo[campo] = modulos[modulo]
+
+        self.acumulador.update(completo)
+        self.estimativas.update(completo)
+
+        try:
+            codigo = int(completo.get('codigo_cadastro'))
+        except (AttributeError, ValueError, TypeError):
+            self.codigos_invalidos += 1
+            return
+        self.cobertura.adicionar(codigo)
+        self.codigos_lidos += 1
+
+    def parcial(self) -> Dict[str, Any]:
+        """
+        Retrato resumido da execução em andamento
+
+        Returns:
+            Totais correntes, vazão e métricas de qualidade
+        """
+        acumulador = self.acumulador
+        processados = acumulador.total
+        decorrido = time.time() - self.inicio
+
+        return {
+            'processados': processados,
+            'total_esperado': self.total_esperado,
+            'percentual': processados / self.total_esperado * 100 if self.total_esperado else 0,
+            'tempo_decorrido': decorrido,
+            'cadastros_por_segundo': processados / decorrido if decorrido > 0 else 0,
+            'com_proprietarios': acumulador.com_proprietarios,
+            'com_enderecos': acumulador.com_enderecos,
+            'cadastros_completos': acumulador.cadastros_completos,
+            'percentual_completude_geral': (
+                acumulador.cadastros_completos / processados * 100 if processados else 0
+            ),
+            'registros_por_modulo': dict(self.registros_por_modulo),
+            'falhas_por_modulo': dict(self.falhas_por_modulo)
+        }
+
+    def resumo_linha(self) -> str:
+        """Resumo curto para a linha de progresso (a vazão fica com o ProgressTracker)"""
+        acumulador = self.acumulador
+        completos = acumulador.cadastros_completos / acumulador.total * 100 if acumulador.total else 0
+        return f"completos {completos:.0f}%"
+
+    def resultado(self) -> Dict[str, Any]:
+        """
+        Relatório final da extração
+
+        Returns:
+            Estatísticas completas, estimativas (quantis/distintos), análise
+            de códigos e contagens por módulo
+        """
+        return {
+            'gerado_em': datetime.now().isoformat(),
+            'execucao': self.parcial(),
+            'estatisticas': self.acumulador.resultado(),
+            'estimativas': self.estimativas.resultado(),
+            'codigos': StatisticsService().analisar_cobertura(
+                self.cobertura, self.codigos_lidos, self.codigos_invalidos
+            )
+        }
 
 
 class StatisticsService:
@@ -17,93 +332,51 @@ class StatisticsService:
         """Inicializa o serviço de estatísticas"""
         pass
     
-    def gerar_estatisticas_completas(self, cadastros: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def gerar_estatisticas_completas(self, cadastros: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Gera estatísticas completas dos cadastros extraídos
         
+        Com NumPy disponível (APP_STATISTICS_BACKEND=auto/numpy) usa o
+        AnalyticsService, que acrescenta quantis, histogramas e agregados por
+        situação/categoria/zona; senão, o acumulador de passada única.
+        
         Args:
-            cadastros: Lista de cadastros para análise
+            cadastros: Lista ou iterável de cadastros para análise
             
         Returns:
             Dicionário com estatísticas completas
         """
-        if not cadastros:
-            return {'total': 0, 'erro': 'Nenhum cadastro fornecido para análise'}
-        
-        # Contadores básicos
-        stats = {
-            'total': len(cadastros),
-            'com_proprietarios': 0,
-            'com_enderecos': 0,
-            'com_area_terreno': 0,
-            'com_area_construida': 0,
-            'tipos_situacao': {},
-            'tipos_categoria': {},
-            'zonas': {},
-            'area_total_terrenos': 0,
-            'area_total_construida': 0,
-            'distribuicao_areas': self._analisar_distribuicao_areas(cadastros),
-            'qualidade_dados': self._analisar_qualidade_dados(cadastros)
-        }
-        
-        # Processar cada cadastro
-        for cadastro in cadastros:
-            if isinstance(cadastro, dict):
-                self._processar_cadastro_individual(cadastro, stats)
-        
-        # Cálculos finais
-        stats['area_media_terreno'] = (
-            stats['area_total_terrenos'] / stats['com_area_terreno'] 
-            if stats['com_area_terreno'] > 0 else 0
-        )
-        
-        stats['area_media_construida'] = (
-            stats['area_total_construida'] / stats['com_area_construida'] 
-            if stats['com_area_construida'] > 0 else 0
-        )
-        
-        return stats
+        analytics = self._analytics()
+        if analytics is not None:
+            return analytics.gerar_estatisticas(cadastros or [])
+        return AcumuladorEstatisticas().update_many(cadastros or []).resultado()
+    
+    @staticmethod
+    def _analytics():
+        """AnalyticsService conforme APP_STATISTICS_BACKEND (None: acumulador)"""
+        backend = getattr(settings.app, "statistics_backend", "auto")
+        if backend == "acumulador":
+            return None
+        try:
+            # Importação tardia: numpy é opcional e analytics_service depende deste módulo
+            from service.analytics_service import AnalyticsService
+        except ImportError:
+            if backend == "numpy":
+                raise
+            return None
+        return AnalyticsService()
     
-    def _processar_cadastro_individual(self, cadastro: Dict[str, Any], stats: Dict[str, Any]):
+    def criar_estatisticas_extracao(self, total_esperado: int = 0) -> EstatisticasExtracao:
         """
-        Processa um cadastro individual e atualiza as estatísticas
+        Cria as estatísticas incrementais de uma execução de extração
         
         Args:
-            cadastro: Dados do cadastro individual
-            stats: Dicionário de estatísticas para atualizar
+            total_esperado: Quantidade de cadastros a processar
+            
+        Returns:
+            Estatísticas a alimentar durante o laço de extração
         """
-        # Análise de propriedades
-        if cadastro.get('proprietariosbci'):
-            stats['com_proprietarios'] += 1
-        
-        if cadastro.get('enderecos'):
-            stats['com_enderecos'] += 1
-        
-        # Análise de áreas
-        area_terreno = self._extrair_valor_numerico(cadastro.get('area_terreno'))
-        if area_terreno and area_terreno > 0:
-            stats['com_area_terreno'] += 1
-            stats['area_total_terrenos'] += area_terreno
-        
-        area_construida = self._extrair_valor_numerico(cadastro.get('area_construida'))
-        if area_construida and area_construida > 0:
-            stats['com_area_construida'] += 1
-            stats['area_total_construida'] += area_construida
-        
-        # Contagem de situações
-        situacao = cadastro.get('situacao', 'Não informado')
-        stats['tipos_situacao'][situacao] = stats['tipos_situacao'].get(situacao, 0) + 1
-        
-        # Contagem de categorias
-        categoria = cadastro.get('categoria', 'Não informado')
-        stats['tipos_categoria'][categoria] = stats['tipos_categoria'].get(categoria, 0) + 1
-        
-        # Análise de zoneamentos
-        zoneamentos = cadastro.get('zoneamentos', [])
-        for zone in zoneamentos:
-            if isinstance(zone, dict):
-                zona = zone.get('zona', 'Não informado')
-                stats['zonas'][zona] = stats['zonas'].get(zona, 0) + 1
+        return EstatisticasExtracao(total_esperado)
     
     def analisar_codigos_cadastro(self, cadastros: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -126,7 +399,8 @@ class StatisticsService:
                 'erro': 'Nenhum cadastro fornecido'
             }
         
-        codigos = []
+        cobertura = ConjuntoIntervalos()
+        total_validos = 0
         codigos_invalidos = 0
         
         # Extrair códigos válidos
@@ -139,12 +413,13 @@ class StatisticsService:
                 
                 try:
                     codigo_int = int(codigo)
-                    codigos.append(codigo_int)
                 except (ValueError, TypeError):
                     codigos_invalidos += 1
                     continue
+                cobertura.adicionar(codigo_int)
+                total_validos += 1
         
-        if not codigos:
+        if not total_validos:
             CLIInterface.mostrar_erro("Nenhum código válido encontrado nos cadastros.")
             return {
                 'total': 0,
@@ -154,105 +429,81 @@ class StatisticsService:
                 'erro': 'Nenhum código válido encontrado'
             }
         
-        try:
-            menor_codigo = min(codigos)
-            maior_codigo = max(codigos)
-            intervalo_cobertura = maior_codigo - menor_codigo + 1
-            densidade_ocupacao = len(codigos) / intervalo_cobertura * 100
-            
-            # Análise de lacunas
-            lacunas = self._analisar_lacunas_codigos(codigos)
-            
-            return {
-                'total': len(codigos),
-                'codigos_invalidos': codigos_invalidos,
-                'menor_codigo': menor_codigo,
-                'maior_codigo': maior_codigo,
-                'intervalo_cobertura': intervalo_cobertura,
-                'densidade_ocupacao': densidade_ocupacao,
-                'codigos_unicos': len(set(codigos)),
-                'duplicados': len(codigos) - len(set(codigos)),
-                'lacunas': lacunas
-            }
-            
-        except ValueError as e:
-            CLIInterface.mostrar_erro(f"Erro ao calcular estatísticas de códigos: {e}")
-            return {
-                'total': len(codigos),
-                'codigos_invalidos': codigos_invalidos,
-                'menor_codigo': None,
-                'maior_codigo': None,
-                'intervalo_cobertura': 0,
-                'densidade_ocupacao': 0,
-                'erro': str(e)
-            }
+        return self.analisar_cobertura(cobertura, total_validos, codigos_invalidos)
     
-    def _analisar_lacunas_codigos(self, codigos: List[int]) -> Dict[str, Any]:
+    def analisar_cobertura(self, cobertura: ConjuntoIntervalos, total: Optional[int] = None,
+                           codigos_invalidos: int = 0) -> Dict[str, Any]:
         """
-        Analisa lacunas na sequência de códigos
+        Analisa uma cobertura de códigos já montada (ex.: carregada de disco),
+        sem reconstruí-la a partir dos cadastros
         
         Args:
-            codigos: Lista de códigos para análise
+            cobertura: Códigos vistos
+            total: Quantidade de códigos lidos, com repetições (padrão: únicos)
+            codigos_invalidos: Quantidade de códigos descartados
             
         Returns:
-            Informações sobre lacunas encontradas
+            Informações sobre códigos, no formato de analisar_codigos_cadastro
         """
-        if not codigos:
-            return {'total_lacunas': 0, 'maiores_lacunas': []}
-        
-        codigos_ordenados = sorted(set(codigos))
-        lacunas = []
-        
-        for i in range(len(codigos_ordenados) - 1):
-            atual = codigos_ordenados[i]
-            proximo = codigos_ordenados[i + 1]
-            
-            if proximo - atual > 1:
-                lacuna = {
-                    'inicio': atual + 1,
-                    'fim': proximo - 1,
-                    'tamanho': proximo - atual - 1
-                }
-                lacunas.append(lacuna)
-        
-        # Ordenar por tamanho (maiores primeiro)
-        lacunas_ordenadas = sorted(lacunas, key=lambda x: x['tamanho'], reverse=True)
+        unicos = len(cobertura)
+        total = unicos if total is None else total
+        menor_codigo = cobertura.menor
+        maior_codigo = cobertura.maior
+        intervalo_cobertura = maior_codigo - menor_codigo + 1 if cobertura else 0
         
         return {
-            'total_lacunas': len(lacunas),
-            'maiores_lacunas': lacunas_ordenadas[:10],  # Top 10 maiores lacunas
-            'lacuna_media': sum(l['tamanho'] for l in lacunas) / len(lacunas) if lacunas else 0
+            'total': total,
+            'codigos_invalidos': codigos_invalidos,
+            'menor_codigo': menor_codigo,
+            'maior_codigo': maior_codigo,
+            'intervalo_cobertura': intervalo_cobertura,
+            'densidade_ocupacao': total / intervalo_cobertura * 100 if intervalo_cobertura else 0,
+            'codigos_unicos': unicos,
+            'duplicados': total - unicos,
+            'lacunas': self._analisar_lacunas_codigos(cobertura)
         }
     
-    def _analisar_distribuicao_areas(self, cadastros: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analisar_lacunas_codigos(self, codigos: Union[List[int], ConjuntoIntervalos]) -> Dict[str, Any]:
         """
-        Analisa distribuição das áreas dos cadastros
+        Analisa lacunas na sequência de códigos
         
         Args:
-            cadastros: Lista de cadastros para análise
+            codigos: Lista de códigos ou cobertura já montada
             
         Returns:
-            Estatísticas de distribuição de áreas
+            Informações sobre lacunas encontradas
         """
-        areas_terreno = []
-        areas_construida = []
+        cobertura = (
+            codigos if isinstance(codigos, ConjuntoIntervalos)
+            else ConjuntoIntervalos.de_codigos(codigos)
+        )
+        if not cobertura:
+            return {'total_lacunas': 0, 'maiores_lacunas': []}
         
-        for cadastro in cadastros:
-            if isinstance(cadastro, dict):
-                area_terreno = self._extrair_valor_numerico(cadastro.get('area_terreno'))
-                if area_terreno and area_terreno > 0:
-                    areas_terreno.append(area_terreno)
-                
-                area_construida = self._extrair_valor_numerico(cadastro.get('area_construida'))
-                if area_construida and area_construida > 0:
-                    areas_construida.append(area_construida)
+        total_lacunas = 0
+        soma_tamanhos = 0
+        
+        def tamanhos():
+            nonlocal total_lacunas, soma_tamanhos
+            for inicio, fim in cobertura.lacunas():
+                total_lacunas += 1
+                soma_tamanhos += fim - inicio + 1
+                yield inicio, fim
+        
+        # Top 10 maiores lacunas (empates na ordem dos códigos, como sorted estável)
+        maiores = heapq.nlargest(10, tamanhos(), key=lambda lacuna: lacuna[1] - lacuna[0])
         
         return {
-            'terreno': self._calcular_estatisticas_lista(areas_terreno),
-            'construida': self._calcular_estatisticas_lista(areas_construida)
+            'total_lacunas': total_lacunas,
+            'maiores_lacunas': [
+                {'inicio': inicio, 'fim': fim, 'tamanho': fim - inicio + 1}
+                for inicio, fim in maiores
+            ],
+            'lacuna_media': soma_tamanhos / total_lacunas if total_lacunas else 0
         }
     
-    def _calcular_estatisticas_lista(self, valores: List[float]) -> Dict[str, Any]:
+    @staticmethod
+    def _calcular_estatisticas_lista(valores: List[float]) -> Dict[str, Any]:
         """
         Calcula estatísticas básicas de uma lista de valores
         
@@ -285,85 +536,8 @@ class StatisticsService:
             )
         }
     
-    def _analisar_qualidade_dados(self, cadastros: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        Analisa qualidade dos dados dos cadastros
-        
-        Args:
-            cadastros: Lista de cadastros para análise
-            
-        Returns:
-            Métricas de qualidade dos dados
-        """
-        total = len(cadastros)
-        campos_obrigatorios = ['codigo_cadastro', 'tipo_cadastro', 'situacao']
-        campos_importantes = ['area_terreno', 'area_construida', 'enderecos', 'proprietariosbci']
-        
-        qualidade = {
-            'total_cadastros': total,
-            'campos_obrigatorios_completos': 0,
-            'campos_importantes_completos': 0,
-            'percentual_completude_obrigatorios': 0.0,
-            'percentual_completude_importantes': 0.0,
-            'cadastros_completos': 0
-        }
-        
-        for cadastro in cadastros:
-            if not isinstance(cadastro, dict):
-                continue
-            
-            # Verificar campos obrigatórios
-            campos_obrig_ok = all(
-                cadastro.get(campo) is not None and str(cadastro.get(campo)).strip() != ""
-                for campo in campos_obrigatorios
-            )
-            
-            if campos_obrig_ok:
-                qualidade['campos_obrigatorios_completos'] += 1
-            
-            # Verificar campos importantes
-            campos_import_ok = True
-            for campo in campos_importantes:
-                valor = cadastro.get(campo)
-                if valor is None:
-                    campos_import_ok = False
-                    break
-                
-                if isinstance(valor, str):
-                    if valor.strip() == "":
-                        campos_import_ok = False
-                        break
-                elif isinstance(valor, list):
-                    if len(valor) == 0:
-                        campos_import_ok = False
-                        break
-                elif isinstance(valor, (int, float)):
-                    if valor <= 0:
-                        campos_import_ok = False
-                        break
-            
-            if campos_import_ok:
-                qualidade['campos_importantes_completos'] += 1
-            
-            # Cadastro considerado completo
-            if campos_obrig_ok and campos_import_ok:
-                qualidade['cadastros_completos'] += 1
-        
-        # Calcular percentuais
-        if total > 0:
-            qualidade['percentual_completude_obrigatorios'] = (
-                qualidade['campos_obrigatorios_completos'] / total * 100
-            )
-            qualidade['percentual_completude_importantes'] = (
-                qualidade['campos_importantes_completos'] / total * 100
-            )
-            qualidade['percentual_completude_geral'] = (
-                qualidade['cadastros_completos'] / total * 100
-            )
-        
-        return qualidade
-    
-    def _extrair_valor_numerico(self, valor: Any) -> Optional[float]:
+    @staticmethod
+    def _extrair_valor_numerico(valor: Any) -> Optional[float]:
         """
         Extrai valor numérico de diferentes tipos de entrada
         
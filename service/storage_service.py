@@ -6,11 +6,70 @@ Responsável por salvar arquivos de progresso, resultados finais e datasets por
 import os
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 
 from interface.cli_interface import CLIInterface
 
 
+class DatasetWriter:
+    """
+    Escrita incremental de um dataset (um registro por vez, memória constante)
+
+    Formatos:
+    - 'json': lista JSON idêntica à de salvar_dataset (indent=2)
+    - 'jsonl': um registro por linha
+
+    Grava em arquivo temporário e renomeia ao fechar, para que leitores
+    nunca vejam um dataset pela metade.
+    """
+
+    def __init__(self, caminho: str, formato: str = "json"):
+        if formato not in ("json", "jsonl"):
+            raise ValueError(f"Formato de dataset inválido: {formato}")
+        self.caminho = caminho
+        self.formato = formato
+        self.total = 0
+        self._temporario = f"{caminho}.tmp"
+        self._arquivo = open(self._temporario, "w", encoding="utf-8")
+        if formato == "json":
+            self._arquivo.write("[")
+
+    def escrever(self, registro: Dict[str, Any]):
+        """Acrescenta um registro ao dataset"""
+        if self.formato == "jsonl":
+            self._arquivo.write(json.dumps(registro, ensure_ascii=False))
+            self._arquivo.write("\n")
+        else:
+            corpo = json.dumps(registro, ensure_ascii=False, indent=2)
+            self._arquivo.write("," if self.total else "")
+            self._arquivo.write("\n  " + corpo.replace("\n", "\n  "))
+        self.total += 1
+
+    def fechar(self) -> str:
+        """Finaliza o arquivo e o publica no caminho definitivo"""
+        if self.formato == "json":
+            self._arquivo.write("\n]" if self.total else "]")
+        self._arquivo.close()
+        os.replace(self._temporario, self.caminho)
+        return self.caminho
+
+    def descartar(self):
+        """Abandona a escrita removendo o temporário"""
+        self._arquivo.close()
+        if os.path.exists(self._temporario):
+            os.remove(self._temporario)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.fechar()
+        else:
+            self.descartar()
+        return False
+
+
 class FileStorageService:
     """
     Serviço especializado de salvamento/leituras de arquivos JSON.
@@ -88,6 +147,45 @@ class FileStorageService:
             resultados[nome] = self.salvar_dataset(nome, dados)
         return resultados
 
+    def salvar_relatorio(self, nome: str, dados: Dict[str, Any]) -> Optional[str]:
+        """
+        Salva um relatório (dict) em data/json/{nome}.json, substituindo o
+        anterior de forma atômica; pensado para gravações frequentes
+        """
+        arquivo = os.path.join(self.data_dir, f"{nome}.json")
+        temporario = f"{arquivo}.tmp"
+        try:
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(dados, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(temporario, arquivo)
+            return arquivo
+        except Exception as e:
+            CLIInterface.mostrar_erro(f"Erro ao salvar {nome}.json: {e}")
+            return None
+
+    def abrir_dataset_stream(self, nome: str, formato: str = "json") -> DatasetWriter:
+        """
+        Abre data/json/{nome}.json (ou .jsonl) para escrita incremental
+        """
+        return DatasetWriter(os.path.join(self.data_dir, f"{nome}.{formato}"), formato)
+
+    def iterar_dataset(self, nome: str) -> Iterator[Dict[str, Any]]:
+        """
+        Itera os registros de um dataset salvo, preferindo a versão .jsonl
+        (leitura em streaming) quando existir
+        """
+        caminho_jsonl = os.path.join(self.data_dir, f"{nome}.jsonl")
+        if os.path.exists(caminho_jsonl):
+            with open(caminho_jsonl, "r", encoding="utf-8") as f:
+                for linha in f:
+                    if linha.strip():
+                        yield json.loads(linha)
+            return
+
+        dados = self.carregar_dados_salvos(os.path.join(self.data_dir, f"{nome}.json"))
+        for registro in dados or []:
+            yield registro
+
     # ---------------- Utilidades ----------------
     def carregar_dados_salvos(self, caminho_arquivo: str) -> Optional[Dict[str, Any]]:
         try:
@@ -0,0 +1,221 @@
+"""
+Tracing Service - Rastreamento estruturado das unidades de trabalho
+Um span JSON Lines por unidade (execução, listagem, cadastro, módulo) com
+início/fim, operação efetivamente usada, tentativas, bytes, status HTTP,
+trabalhador e o span pai. Opcional (APP_TRACE_FILE); desligado, cada ponto
+de instrumentação custa um if. A análise offline fica em
+benchmark/trace_analyzer.py.
+"""
+
+from typing import Dict, Any, Optional, Iterator, List
+from contextlib import contextmanager
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+
+from config.settings import settings
+
+
+class Span:
+    """Unidade de trabalho em andamento; vira uma linha do arquivo ao finalizar"""
+
+    __slots__ = ("id", "pai", "tipo", "inicio", "_relogio", "campos")
+
+    def __init__(self, id: int, pai: Optional[int], tipo: str, campos: Dict[str, Any]):
+        self.id = id
+        self.pai = pai
+        self.tipo = tipo
+        self.inicio = time.time()
+        self._relogio = time.perf_counter()
+        self.campos = campos
+
+    def registrar_tentativa(self, operacao: str, bytes_requisicao: int, bytes_resposta: int,
+                            status: Optional[int], falha: Optional[str]):
+        """Acumula uma ida ao servidor feita dentro do span"""
+        campos = self.campos
+        campos["tentativas"] = campos.get("tentativas", 0) + 1
+        campos["operacao"] = operacao
+        campos["bytes_requisicao"] = campos.get("bytes_requisicao", 0) + bytes_requisicao
+        campos["bytes_resposta"] = campos.get("bytes_resposta", 0) + bytes_resposta
+        if status is not None:
+            campos["status"] = status
+        if falha:
+            campos.setdefault("falhas", []).append(falha)
+
+    def falhar(self, erro: BaseException):
+        """Marca o span como falho quando a exceção é tratada dentro dele"""
+        self.campos["resultado"] = "erro"
+        self.campos["erro"] = type(erro).__name__
+
+
+class RastreadorExecucao:
+    """
+    Emissor de spans em JSON Lines, seguro entre threads
+
+    Spans abertos com span() viram o pai dos spans seguintes da mesma thread;
+    para unidades que começam em uma thread e terminam em outra (cadastros
+    do pipeline) use iniciar()/finalizar() passando o pai explicitamente.
+    O trabalhador de cada span é "pid:nome-da-thread".
+    """
+
+    def __init__(self):
+        """Inicializa o rastreador (inativo)"""
+        self.ativo = False
+        self.execucao: Optional[str] = None
+        self.caminho: Optional[str] = None
+        self._arquivo = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._raiz: Optional[Span] = None
+
+    # ---------------- Ciclo da execução ----------------
+    def abrir(self, caminho: str, nome: str, compartilhado: bool = False, **campos) -> Span:
+        """
+        Abre o arquivo (modo append) e o span raiz da execução
+
+        Args:
+            caminho: Arquivo .jsonl de destino
+            nome: Nome da execução (ex.: 'extracao_serial')
+            compartilhado: Outros processos gravam no mesmo arquivo; cada linha
+                vai em um único write (O_APPEND), sem intercalar com as deles
+            **campos: Campos extras do span raiz
+        """
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        self._arquivo = open(caminho, "a", encoding="utf-8", buffering=1 if compartilhado else -1)
+        self.caminho = caminho
+        self.execucao = uuid.uuid4().hex[:16]
+        self._ids = itertools.count(1)
+        self.ativo = True
+        self._raiz = Span(next(self._ids), None, "execucao", {"nome": nome, **campos})
+        return self._raiz
+
+    def fechar(self, erro: Optional[BaseException] = None, **campos):
+        """Finaliza o span raiz e fecha o arquivo"""
+        if not self.ativo:
+            return
+        self.finalizar(self._raiz, erro=erro, **campos)
+        self.ativo = False
+        with self._lock:
+            self._arquivo.close()
+            self._arquivo = None
+        self._raiz = None
+
+    # ---------------- Spans ----------------
+    def _pilha(self) -> List[Span]:
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    def atual(self) -> Optional[Span]:
+        """Span aberto mais interno da thread atual (ou None)"""
+        if not self.ativo:
+            return None
+        pilha = self._pilha()
+        return pilha[-1] if pilha else None
+
+    def iniciar(self, tipo: str, pai: Optional[Span] = None, **campos) -> Optional[Span]:
+        """
+        Abre um span sem torná-lo o atual da thread
+
+        Args:
+            tipo: 'listagem', 'cadastro', 'modulo'...
+            pai: Span pai (padrão: atual da thread, senão a execução)
+            **campos: codigo_cadastro, modulo etc.
+        """
+        if not self.ativo:
+            return None
+        pai = pai or self.atual() or self._raiz
+        return Span(next(self._ids), pai.id if pai else None, tipo, campos)
+
+    def finalizar(self, span: Optional[Span], erro: Optional[BaseException] = None, **campos):
+        """Fecha o span e grava a linha correspondente"""
+        if span is None or not self.ativo:
+            return
+        duracao = time.perf_counter() - span._relogio
+        thread = threading.current_thread()
+        linha = {
+            "execucao": self.execucao,
+            "id": span.id,
+            "pai": span.pai,
+            "tipo": span.tipo,
+            "inicio": round(span.inicio, 6),
+            "fim": round(span.inicio + duracao, 6),
+            "duracao_ms": round(duracao * 1000, 3),
+            "trabalhador": f"{os.getpid()}:{thread.name}",
+            "resultado": "erro" if erro else "ok",
+            **span.campos,
+            **campos,
+        }
+        if erro is not None:
+            linha["erro"] = type(erro).__name__
+        texto = json.dumps(linha, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._arquivo is not None:
+                self._arquivo.write(texto)
+
+    @contextmanager
+    def span(self, tipo: str, **campos) -> Iterator[Optional[Span]]:
+        """Span da thread atual em torno do bloco (pai dos spans abertos dentro dele)"""
+        if not self.ativo:
+            yield None
+            return
+        span = self.iniciar(tipo, **campos)
+        pilha = self._pilha()
+        pilha.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.finalizar(span, erro=e)
+            raise
+        else:
+            self.finalizar(span)
+        finally:
+            pilha.pop()
+
+    def registrar_tentativa(self, operacao: str, bytes_requisicao: int = 0, bytes_resposta: int = 0,
+                            status: Optional[int] = None, falha: Optional[str] = None):
+        """Anota uma ida ao servidor no span atual da thread (chamado pelo cliente SOAP)"""
+        span = self.atual()
+        if span is not None:
+            span.registrar_tentativa(operacao, bytes_requisicao, bytes_resposta, status, falha)
+
+
+# Rastreador global do processo
+rastreador = RastreadorExecucao()
+
+
+@contextmanager
+def sessao_rastreamento(nome: str, compartilhado: bool = False, **campos) -> Iterator[Optional[Span]]:
+    """
+    Rastreia o bloco como uma execução se APP_TRACE_FILE estiver definido
+
+    Sessões aninhadas (extrair_completo -> extrair_pipeline) não fazem nada;
+    várias execuções no mesmo arquivo se distinguem pelo campo execucao.
+
+    Args:
+        nome: Nome da execução
+        compartilhado: O arquivo recebe spans de outros processos ao mesmo
+            tempo (workers da extração distribuída)
+        **campos: Campos extras do span raiz (modo, trabalhadores...)
+    """
+    caminho = getattr(settings.app, "trace_file", "")
+    if rastreador.ativo or not caminho:
+        yield None
+        return
+    raiz = rastreador.abrir(caminho, nome, compartilhado, **campos)
+    pilha = rastreador._pilha()
+    pilha.append(raiz)
+    try:
+        yield raiz
+    except BaseException as e:
+        pilha.pop()
+        rastreador.fechar(erro=e)
+        raise
+    else:
+        pilha.pop()
+        rastreador.fechar()
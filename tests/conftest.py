@@ -0,0 +1,72 @@
+"""
+Fixtures compartilhadas dos testes
+Os testes de extração rodam contra o servidor mock (benchmark/mock_soap_server)
+em thread, sem rede; os datasets e históricos vão para diretórios temporários.
+"""
+
+from contextlib import contextmanager
+import os
+
+import pytest
+
+from config.settings import settings
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WSDL = os.path.join(RAIZ, "wsdl", "clevelandia.wsdl")
+TOTAL_CADASTROS = 300
+
+
+@contextmanager
+def servidor_mock(total_cadastros: int = TOTAL_CADASTROS, **config):
+    """Sobe o mock com a ConfiguracaoMock informada e aponta settings.soap para ele"""
+    from benchmark.mock_soap_server import ServidorMock, ConfiguracaoMock
+
+    mock = ServidorMock(total_cadastros, ConfiguracaoMock(**config), caminho_wsdl=WSDL).iniciar()
+    original = (settings.soap.endpoint_url, settings.soap.wsdl_path)
+    settings.soap.endpoint_url, settings.soap.wsdl_path = mock.url, mock.url_wsdl
+    try:
+        yield mock
+    finally:
+        settings.soap.endpoint_url, settings.soap.wsdl_path = original
+        mock.parar()
+
+
+@pytest.fixture(scope="module")
+def mock_soap():
+    with servidor_mock() as mock:
+        yield mock
+
+
+@pytest.fixture
+def sem_historico(monkeypatch, tmp_path):
+    """Histórico, rastreamento e progresso fora do caminho (nada em data/json)"""
+    monkeypatch.setattr(settings.app, "ledger_file", str(tmp_path / "historico.jsonl"))
+    monkeypatch.setattr(settings.app, "trace_file", "")
+    monkeypatch.setattr(settings.app, "progress_mode", "silencioso")
+    return tmp_path
+
+
+@pytest.fixture
+def banco(monkeypatch, sem_historico):
+    """
+    DatabaseService sobre um PostgreSQL de teste, com as tabelas vazias
+
+    Só roda com TEST_DATABASE_URL (postgresql://...) definido: as tabelas
+    são truncadas, então nunca aponta para o banco configurado em DB_*.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL não definido")
+
+    from config.database import DatabaseConfig
+    from service.database_service import DatabaseService
+
+    monkeypatch.setattr(DatabaseConfig, "connection_string", property(lambda self: url))
+    monkeypatch.setattr(DatabaseConfig, "async_connection_string", property(
+        lambda self: url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    ))
+    servico = DatabaseService()
+    if not servico.criar_schema_banco() or not servico.limpar_dados(confirmar=True):
+        pytest.skip("PostgreSQL de teste indisponível")
+    yield servico
+    servico.engine.dispose()
@@ -0,0 +1,95 @@
+"""Backend vetorizado (NumPy) das estatísticas"""
+
+import random
+import statistics
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from config.settings import settings
+from interface.cli_interface import CLIInterface
+from service.analytics_service import AnalyticsService
+from service.statistics_service import AcumuladorEstatisticas, StatisticsService
+
+
+def _cadastros(quantidade, semente=3):
+    rng = random.Random(semente)
+    cadastros = []
+    for i in range(1, quantidade + 1):
+        cadastros.append({
+            "codigo_cadastro": str(i),
+            "tipo_cadastro": rng.choice([1, 2, None]),
+            "situacao": rng.choice(["1", "2", "3"]),
+            "categoria": rng.choice(["terreno", "predial"]),
+            "area_terreno": rng.choice(["", "0", "-5", "abc", f"{rng.uniform(100, 900):.2f}".replace(".", ",")]),
+            "area_construida": rng.choice([None, rng.uniform(50, 300), 0]),
+            "zoneamentos": [{"zona": rng.choice(["ZR1", "ZC"])} for _ in range(rng.randrange(3))],
+            "proprietariosbci": [{"codigo_pessoa": "1"}] if rng.random() < 0.7 else [],
+            "enderecos": [{"cep": "85530000"}] if rng.random() < 0.8 else [],
+        })
+    return cadastros + [None]
+
+
+def test_chaves_comuns_iguais_ao_acumulador():
+    cadastros = _cadastros(2000)
+    esperado = AcumuladorEstatisticas().update_many(cadastros).resultado()
+
+    resultado = AnalyticsService().gerar_estatisticas(cadastros)
+
+    for chave in ("total", "com_proprietarios", "com_enderecos", "com_area_terreno", "com_area_construida",
+                  "tipos_situacao", "tipos_categoria", "zonas", "qualidade_dados"):
+        assert resultado[chave] == esperado[chave], chave
+    for chave in ("area_total_terrenos", "area_total_construida", "area_media_terreno", "area_media_construida"):
+        assert resultado[chave] == pytest.approx(esperado[chave]), chave
+    for nome in ("terreno", "construida"):
+        for campo in ("count", "min", "max", "media", "mediana"):
+            assert resultado["distribuicao_areas"][nome][campo] == pytest.approx(
+                esperado["distribuicao_areas"][nome][campo]), (nome, campo)
+
+
+def test_quantis_e_histograma():
+    cadastros = [{"area_terreno": valor} for valor in range(1, 101)]
+
+    distribuicao = AnalyticsService(quantis=(0.1, 0.5, 0.999), bins=4).gerar_estatisticas(
+        cadastros)["distribuicao_areas"]["terreno"]
+
+    assert distribuicao["quantis"] == pytest.approx({"p10": 10.9, "p50": 50.5, "p99.9": 99.901})
+    assert distribuicao["histograma"]["limites"] == pytest.approx([1, 25.75, 50.5, 75.25, 100])
+    assert distribuicao["histograma"]["contagens"] == [25, 25, 25, 25]
+
+
+def test_agregados_por_grupo():
+    cadastros = [
+        {"situacao": "1", "area_terreno": 100, "zoneamentos": [{"zona": "ZC"}, {"zona": "ZR"}]},
+        {"situacao": "1", "area_terreno": 300, "area_construida": 50, "zoneamentos": [{"zona": "ZC"}]},
+        {"situacao": "2", "area_terreno": None},
+        {"situacao": "1", "area_terreno": 200},
+    ]
+
+    resultado = AnalyticsService().gerar_estatisticas(cadastros)
+
+    situacao = resultado["por_situacao"]
+    assert situacao["1"]["count"] == 3
+    assert situacao["1"]["area_terreno"] == {"count": 3, "soma": 600.0, "media": 200.0, "mediana": 200.0}
+    assert situacao["1"]["area_construida"]["count"] == 1
+    assert situacao["2"] == {"count": 1,
+                             "area_terreno": {"count": 0, "soma": 0.0, "media": 0, "mediana": 0},
+                             "area_construida": {"count": 0, "soma": 0.0, "media": 0, "mediana": 0}}
+    zona = resultado["por_zona"]
+    assert zona["ZC"]["area_terreno"]["mediana"] == statistics.median([100, 300])
+    assert zona["ZR"]["area_terreno"]["soma"] == 100.0
+
+
+def test_statistics_service_delega_conforme_configuracao(monkeypatch, capsys):
+    cadastros = _cadastros(100)
+
+    monkeypatch.setattr(settings.app, "statistics_backend", "auto")
+    vetorizado = StatisticsService().gerar_estatisticas_completas(cadastros)
+    monkeypatch.setattr(settings.app, "statistics_backend", "acumulador")
+    acumulado = StatisticsService().gerar_estatisticas_completas(cadastros)
+
+    assert "por_zona" in vetorizado and "quantis" in vetorizado["distribuicao_areas"]["terreno"]
+    assert "por_zona" not in acumulado
+    CLIInterface.mostrar_estatisticas(vetorizado)
+    assert "p90" in capsys.readouterr().out
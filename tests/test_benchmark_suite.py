@@ -0,0 +1,77 @@
+"""Comparação com o baseline e gravação do baseline na suíte de benchmarks"""
+
+import json
+
+import pytest
+
+from benchmark import suite
+from benchmark.suite import comparar, main, metrica
+
+
+def _documento(**casos):
+    return {"versao": 1, "casos": casos}
+
+
+def _caso(**metricas):
+    return {"metricas": metricas, "duracao_s": 1.0}
+
+
+def test_regressao_alem_do_limite():
+    baseline = _documento(parse=_caso(docs_s=metrica(100, "docs/s"), pico_mb=metrica(10, "MB", maior_melhor=False)))
+    atual = _documento(parse=_caso(docs_s=metrica(90, "docs/s"), pico_mb=metrica(13, "MB", maior_melhor=False)))
+
+    linhas = {l["metrica"]: l for l in comparar(atual, baseline, limite=0.15)}
+
+    assert linhas["docs_s"]["regressao"] is False
+    assert linhas["pico_mb"]["regressao"] is True
+
+
+def test_caso_com_erro_e_metrica_ausente_falham(tmp_path, capsys):
+    baseline = _documento(parse=_caso(docs_s=metrica(100, "docs/s"), bytes_s=metrica(5, "MB/s")),
+                          arquivos=_caso(registros_s=metrica(100, "registros/s")))
+    # Métrica nova, sem referência, não conta
+    atual = _documento(parse=_caso(docs_s=metrica(100, "docs/s"), nova=metrica(1, "x")),
+                       arquivos={"erro": "OSError: disco cheio"})
+
+    linhas = comparar(atual, baseline)
+
+    falhas = {(l["caso"], l["metrica"]) for l in linhas if l.get("falha")}
+    assert falhas == {("parse", "bytes_s"), ("arquivos", "-")}
+    assert all(l["regressao"] for l in linhas if l.get("falha"))
+
+    (tmp_path / "atual.json").write_text(json.dumps(atual), encoding="utf-8")
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline), encoding="utf-8")
+    assert main(["comparar", str(tmp_path / "atual.json"), "--baseline", str(tmp_path / "baseline.json")]) == 1
+    assert "disco cheio" in capsys.readouterr().out
+
+
+@pytest.fixture
+def baseline_temporario(tmp_path, monkeypatch):
+    caminho = tmp_path / "baselines" / "baseline.json"
+    monkeypatch.setattr(suite, "DIRETORIO_BASELINES", str(caminho.parent))
+    monkeypatch.setattr(suite, "BASELINE_PADRAO", str(caminho))
+    monkeypatch.setitem(suite.CASOS, "ok", lambda tamanhos, gerador: {"v": metrica(1, "x")})
+    return caminho
+
+
+def test_salvar_baseline_recusa_execucao_com_falha(baseline_temporario, tmp_path, monkeypatch):
+    def quebra(tamanhos, gerador):
+        raise RuntimeError("falhou")
+    monkeypatch.setitem(suite.CASOS, "quebra", quebra)
+    saida = tmp_path / "resultado.json"
+
+    codigo = main(["executar", "--casos", "ok", "quebra", "--escala", "rapida", "--repeticoes", "1",
+                   "--saida", str(saida), "--salvar-baseline"])
+
+    assert codigo == 1
+    assert not baseline_temporario.exists()
+    # O resultado continua disponível para diagnóstico
+    assert "erro" in json.loads(saida.read_text(encoding="utf-8"))["casos"]["quebra"]
+
+
+def test_salvar_baseline_grava_execucao_completa(baseline_temporario, tmp_path):
+    codigo = main(["executar", "--casos", "ok", "--escala", "rapida", "--repeticoes", "1",
+                   "--saida", str(tmp_path / "resultado.json"), "--salvar-baseline"])
+
+    assert codigo == 0
+    assert json.loads(baseline_temporario.read_text(encoding="utf-8"))["casos"]["ok"]["metricas"]["v"]["valor"] == 1
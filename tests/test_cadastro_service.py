@@ -0,0 +1,49 @@
+"""Reextração das lacunas de cobertura contra o servidor mock"""
+
+import pytest
+
+from config.settings import settings
+from model.cobertura_codigos import ConjuntoIntervalos
+from service.cadastro_service import CadastroService
+from service.storage_service import FileStorageService
+
+
+@pytest.fixture
+def servico(mock_soap, sem_historico, monkeypatch):
+    monkeypatch.setattr(settings.app, "request_delay", 0.0)
+    servico = CadastroService()
+    servico.file_storage_service = FileStorageService(str(sem_historico))
+    return servico
+
+
+def test_reextrair_lacunas_encontra_so_os_codigos_ausentes(servico, mock_soap):
+    codigos = list(mock_soap.httpd.gerador.codigos())
+    faltando = set(codigos[10:25]) | set(codigos[100:103])
+    cobertura = ConjuntoIntervalos.de_codigos(c for c in codigos if c not in faltando)
+
+    resultado = servico.reextrair_lacunas(cobertura, tamanho_intervalo=10)
+
+    assert sorted(int(c["codigo_cadastro"]) for c in resultado["cadastros"]) == sorted(faltando)
+    assert resultado["faixas_com_falha"] == 0
+    # Lacunas restantes são só códigos que o servidor não tem
+    assert not any(codigo in faltando for lacuna in resultado["lacunas_restantes"]
+                   for codigo in range(lacuna[0], lacuna[1] + 1))
+
+
+def test_reextrair_lacunas_encerra_o_progresso_ao_interromper(servico, monkeypatch):
+    trackers = []
+    original = servico._acompanhar
+
+    def acompanhar(*args, **kwargs):
+        trackers.append(original(*args, **kwargs))
+        return trackers[-1]
+
+    def interromper(**kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(servico, "_acompanhar", acompanhar)
+    monkeypatch.setattr(servico.soap_client, "buscar_cadastro_geral", interromper)
+
+    with pytest.raises(KeyboardInterrupt):
+        servico.reextrair_lacunas(ConjuntoIntervalos.de_codigos([1, 50]))
+
+    assert trackers and trackers[0]._encerrado
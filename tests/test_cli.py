@@ -0,0 +1,108 @@
+"""CLI headless: resumo JSON na saída padrão, códigos de saída e imports por subcomando"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cli
+from tests.conftest import RAIZ, servidor_mock
+
+# Roda cli.main e grava os módulos pesados carregados no arquivo do primeiro argumento
+EXECUTOR = """
+import json, sys
+import cli
+codigo = cli.main(sys.argv[2:])
+with open(sys.argv[1], "w") as f:
+    json.dump({"codigo": codigo, "zeep": "zeep" in sys.modules, "sqlalchemy": "sqlalchemy" in sys.modules}, f)
+sys.exit(codigo)
+"""
+
+
+def _subcomando(monkeypatch, acao):
+    def preparar(args):
+        print("mensagem do serviço")
+        return acao
+    monkeypatch.setitem(cli.SUBCOMANDOS, "stats", preparar)
+
+
+def _resumo(saida):
+    linhas = saida.splitlines()
+    assert len(linhas) == 1
+    return json.loads(linhas[0])
+
+
+def test_saida_padrao_so_com_o_resumo(monkeypatch, capsys, sem_historico):
+    _subcomando(monkeypatch, lambda: {"sucesso": True, "total": 3})
+
+    codigo = cli.main(["stats"])
+
+    saida = capsys.readouterr()
+    resumo = _resumo(saida.out)
+    assert codigo == 0 == resumo["codigo_saida"]
+    assert (resumo["comando"], resumo["sucesso"], resumo["resultado"]) == ("stats", True, {"sucesso": True, "total": 3})
+    assert "mensagem do serviço" in saida.err
+
+
+def _falhar():
+    raise RuntimeError("sem conexão")
+
+
+def _interromper():
+    raise KeyboardInterrupt
+
+
+@pytest.mark.parametrize("acao, codigo, erro", [
+    (lambda: {"sucesso": False}, 1, None),
+    (_falhar, 1, "RuntimeError: sem conexão"),
+    (_interromper, 130, "interrompido"),
+])
+def test_codigos_de_saida(monkeypatch, capsys, sem_historico, acao, codigo, erro):
+    _subcomando(monkeypatch, acao)
+
+    assert cli.main(["stats"]) == codigo
+
+    resumo = _resumo(capsys.readouterr().out)
+    assert (resumo["sucesso"], resumo["codigo_saida"], resumo.get("erro")) == (False, codigo, erro)
+
+
+def test_resumo_gravado_em_arquivo(monkeypatch, capsys, sem_historico):
+    _subcomando(monkeypatch, lambda: {"sucesso": True})
+    caminho = sem_historico / "resumo.json"
+
+    cli.main(["--resumo", str(caminho), "stats"])
+
+    assert json.loads(caminho.read_text(encoding="utf-8")) == _resumo(capsys.readouterr().out)
+
+
+def _executar(tmp_path, *argumentos, **ambiente):
+    modulos = tmp_path / "modulos.json"
+    env = dict(os.environ, PYTHONPATH=RAIZ, APP_LEDGER_FILE="", APP_TRACE_FILE="", APP_PROGRESS_MODE="log",
+               APP_REQUEST_DELAY="0", DB_HOST="127.0.0.1", DB_PORT="9", **ambiente)
+    processo = subprocess.run([sys.executable, "-c", EXECUTOR, str(modulos), *argumentos], cwd=tmp_path,
+                              env=env, capture_output=True, text=True, timeout=120)
+    return processo, json.loads(modulos.read_text())
+
+
+def test_extract_sem_sqlalchemy(tmp_path):
+    with servidor_mock(30) as mock:
+        processo, modulos = _executar(tmp_path, "extract", "--modo", "pipeline",
+                                      SOAP_ENDPOINT=mock.url, SOAP_WSDL_PATH=mock.url_wsdl)
+
+    assert processo.returncode == 0, processo.stderr
+    assert modulos == {"codigo": 0, "zeep": True, "sqlalchemy": False}
+    resumo = _resumo(processo.stdout)
+    assert resumo["sucesso"] is True
+    assert processo.stderr
+
+
+@pytest.mark.parametrize("argumentos", [["load"], ["stats"], ["export"]])
+def test_comandos_de_banco_sem_zeep(tmp_path, argumentos):
+    # Banco inacessível: o comando falha, mas já passou pelos imports do caminho todo
+    processo, modulos = _executar(tmp_path, *argumentos)
+
+    assert processo.returncode == 1
+    assert modulos == {"codigo": 1, "zeep": False, "sqlalchemy": True}
+    assert _resumo(processo.stdout)["sucesso"] is False
@@ -0,0 +1,87 @@
+"""Conjunto de códigos em intervalos: inserção, lacunas, álgebra e persistência"""
+
+import random
+
+import pytest
+
+from model.cobertura_codigos import ConjuntoIntervalos
+
+
+def _codigos(conjunto):
+    return {codigo for inicio, fim in conjunto.intervalos() for codigo in range(inicio, fim + 1)}
+
+
+def _lacunas_esperadas(codigos, inicio, fim):
+    lacunas, aberta = [], None
+    for codigo in range(inicio, fim + 1):
+        if codigo not in codigos and aberta is None:
+            aberta = codigo
+        elif codigo in codigos and aberta is not None:
+            lacunas.append((aberta, codigo - 1))
+            aberta = None
+    if aberta is not None:
+        lacunas.append((aberta, fim))
+    return lacunas
+
+
+def test_adicionar_funde_faixas_vizinhas():
+    conjunto = ConjuntoIntervalos.de_codigos([1, 2, 3, 7, 8, 5, 3, 4])
+
+    assert list(conjunto.intervalos()) == [(1, 5), (7, 8)]
+    assert len(conjunto) == 7
+    conjunto.adicionar(6)
+    assert list(conjunto.intervalos()) == [(1, 8)]
+    assert (conjunto.menor, conjunto.maior, len(conjunto)) == (1, 8, 8)
+
+
+def test_adicionar_intervalo_sobreposto_conta_cada_codigo_uma_vez():
+    conjunto = ConjuntoIntervalos([(10, 20), (30, 40), (50, 60)])
+
+    conjunto.adicionar_intervalo(15, 52)
+    conjunto.adicionar_intervalo(70, 69)
+
+    assert list(conjunto.intervalos()) == [(10, 60)]
+    assert len(conjunto) == 51
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_operacoes_equivalem_a_set(semente):
+    rng = random.Random(semente)
+    a = {rng.randrange(500) for _ in range(300)}
+    b = {rng.randrange(500) for _ in range(300)}
+    # Fora de ordem e com repetições, misturando códigos e faixas
+    conjunto_a = ConjuntoIntervalos.de_codigos(rng.sample(sorted(a), len(a)) + list(a)[:20])
+    conjunto_b = ConjuntoIntervalos()
+    for codigo in sorted(b, reverse=True):
+        conjunto_b.adicionar_intervalo(codigo, codigo)
+
+    assert _codigos(conjunto_a) == a and len(conjunto_a) == len(a)
+    assert all((codigo in conjunto_a) == (codigo in a) for codigo in range(-1, 502))
+    assert _codigos(conjunto_a | conjunto_b) == a | b
+    assert len(conjunto_a | conjunto_b) == len(a | b)
+    assert _codigos(conjunto_a - conjunto_b) == a - b
+    assert len(conjunto_a - conjunto_b) == len(a - b)
+    assert list(conjunto_a.lacunas(0, 510)) == _lacunas_esperadas(a, 0, 510)
+    # União não altera os operandos
+    assert _codigos(conjunto_a) == a
+
+
+def test_lacunas_respeitam_os_limites():
+    conjunto = ConjuntoIntervalos([(5, 10), (20, 30)])
+
+    assert list(conjunto.lacunas()) == [(11, 19)]
+    assert list(conjunto.lacunas(1, 40)) == [(1, 4), (11, 19), (31, 40)]
+    assert list(conjunto.lacunas(12, 15)) == [(12, 15)]
+    assert list(conjunto.lacunas(22, 28)) == []
+    assert list(ConjuntoIntervalos().lacunas()) == []
+
+
+def test_salvar_e_carregar(tmp_path):
+    caminho = str(tmp_path / "cobertura" / "codigos.json")
+    conjunto = ConjuntoIntervalos([(1, 100), (150, 150), (200, 250)])
+
+    conjunto.salvar(caminho)
+
+    assert ConjuntoIntervalos.carregar(caminho) == conjunto
+    assert len(ConjuntoIntervalos.carregar(caminho)) == 152
+    assert ConjuntoIntervalos.carregar(str(tmp_path / "inexistente.json")) == ConjuntoIntervalos()
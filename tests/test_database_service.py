@@ -0,0 +1,134 @@
+"""Carga assíncrona (asyncpg) e mapeamento de colunas"""
+
+import asyncio
+
+from config.database import DatabaseConfig
+from repository.database_repository import montar_campos_cadastro, montar_campos_endereco
+
+
+def _cadastro(codigo: int, **campos):
+    return {
+        "codigo_cadastro": str(codigo),
+        "situacao": "1",
+        "tipo_cadastro": 1,
+        "area_terreno": "360,50",
+        "data_cadastro": "15/03/2007",
+        "enderecos": [{"tipo_endereco": 1, "cep": "01310-100"}],
+        **campos,
+    }
+
+
+def test_montar_campos_converte_valores():
+    campos = montar_campos_cadastro(_cadastro(7))
+
+    assert campos["area_terreno"] == 360.5
+    assert campos["data_cadastro"].isoformat() == "2007-03-15"
+    assert campos["categoria"] == "terreno"
+    assert campos["ativo"] is True
+
+
+def test_cep_mantem_zero_a_esquerda():
+    assert montar_campos_endereco({"cep": "01310-100"})["cep"] == "01310100"
+    assert montar_campos_endereco({"cep": 1310100})["cep"] == "01310100"
+    assert montar_campos_endereco({"cep": ""})["cep"] is None
+
+
+def test_carga_async_cancela_tarefas_quando_gravador_falha(sem_historico):
+    from service.database_service import DatabaseService
+
+    servico = DatabaseService()
+    # Porta sem servidor: todos os gravadores falham ao conectar
+    servico.config = DatabaseConfig("127.0.0.1", 1, "inexistente", "u", "p")
+
+    async def carregar():
+        resultado = await asyncio.wait_for(servico.carregar_cadastros_async(
+            (_cadastro(codigo) for codigo in range(1, 201)), tamanho_lote=1, conexoes=2
+        ), timeout=30)
+        pendentes = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return resultado, pendentes
+
+    resultado, pendentes = asyncio.run(carregar())
+
+    assert resultado["sucesso"] is False
+    assert pendentes == []
+
+
+def test_carga_async_conta_duplicados(banco):
+    cadastros = [_cadastro(1), _cadastro(2), _cadastro(1, situacao="2")]
+
+    resultado = asyncio.run(banco.carregar_cadastros_async(cadastros, tamanho_lote=10, conexoes=1))
+
+    assert resultado["sucesso"] is True
+    assert resultado["inseridos"] == 2
+    assert resultado["duplicados"] == 1
+    assert banco.obter_estatisticas_completas("exato")["total_cadastros"] == 2
+
+
+def test_exportacao_ignora_filhos_sem_cadastro(banco, tmp_path):
+    from sqlalchemy import text
+    from service.storage_service import FileStorageService
+
+    asyncio.run(banco.carregar_cadastros_async([_cadastro(1), _cadastro(2)], conexoes=1))
+    with banco.get_db_session() as session:
+        session.execute(text("INSERT INTO public.enderecos (cadastro_id, cep) VALUES (NULL, '85530000')"))
+
+    resultado = banco.exportar_datasets("jsonl", file_service=FileStorageService(str(tmp_path)))
+
+    assert resultado["sucesso"] is True
+    assert resultado["arquivos"]["cadastros"]["registros"] == 2
+    assert resultado["arquivos"]["enderecos"]["registros"] == 2
+
+
+def test_carga_incremental_confirma_antes_dos_agregados(banco, monkeypatch):
+    from repository.database_repository import DatabaseRepository
+
+    def falhar(self):
+        raise RuntimeError("agregados indisponíveis")
+    monkeypatch.setattr(DatabaseRepository, "atualizar_estatisticas_agregadas", falhar)
+
+    resultado = banco._processar_lote_cadastros([_cadastro(1), _cadastro(2)], "teste.json")
+
+    # A falha nos agregados não desfaz a carga já confirmada
+    assert resultado["sucesso"] is False
+    assert banco.obter_estatisticas_completas("exato")["total_cadastros"] == 2
+
+
+def test_carga_incremental_atualiza_agregados(banco):
+    resultado = banco._processar_lote_cadastros([_cadastro(1), _cadastro(2)], "teste.json")
+
+    assert resultado["sucesso"] is True
+    assert banco.obter_estatisticas_completas("agregado")["total_cadastros"] == 2
+
+
+def test_migracao_converte_colunas_de_texto_legadas(banco, capsys):
+    from sqlalchemy import text
+
+    with banco.engine.begin() as conn:
+        conn.execute(text("ALTER TABLE public.cadastros_imobiliarios ALTER COLUMN data_cadastro TYPE VARCHAR(20)"))
+        conn.execute(text("ALTER TABLE public.enderecos ALTER COLUMN cep TYPE VARCHAR(10)"))
+        conn.execute(text(
+            "INSERT INTO public.cadastros_imobiliarios (id, codigo_cadastro, data_cadastro, ativo) VALUES "
+            "(1, '1', '2007-03-15T00:00:00', true), (2, '2', '15/03/2007', true), "
+            "(3, '3', 'sem data', true), (4, '4', '', true)"
+        ))
+        conn.execute(text(
+            "INSERT INTO public.enderecos (cadastro_id, cep) VALUES (1, '01310-100'), (2, '85530000'), (3, '-')"
+        ))
+    capsys.readouterr()
+
+    banco._aplicar_migracoes()
+
+    with banco.engine.connect() as conn:
+        datas = conn.execute(text(
+            "SELECT codigo_cadastro, data_cadastro::text FROM public.cadastros_imobiliarios ORDER BY id"
+        )).all()
+        ceps = conn.execute(text("SELECT cep FROM public.enderecos ORDER BY cadastro_id")).scalars().all()
+        tamanho = conn.execute(text(
+            "SELECT character_maximum_length FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name = 'enderecos' AND column_name = 'cep'"
+        )).scalar()
+    assert datas == [("1", "2007-03-15"), ("2", "2007-03-15"), ("3", None), ("4", None)]
+    assert ceps == ["01310100", "85530000", None]
+    assert tamanho == 8
+    # Só o texto não reconhecido conta como descartado (vazio já era ausência de data)
+    assert "data_cadastro: 1 registro(s)" in capsys.readouterr().out
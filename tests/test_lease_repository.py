@@ -0,0 +1,64 @@
+"""Tabela de leases da extração distribuída (SQLite)"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from repository.lease_repository import LeaseRepository, PENDENTE, EM_ANDAMENTO, CONCLUIDO, FALHOU
+
+
+@pytest.fixture
+def repositorio(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'leases.db'}")
+    repositorio = LeaseRepository(engine)
+    repositorio.criar_tabela()
+    repositorio.registrar_shards("e1", [(1, 100), (101, 200)])
+    yield repositorio
+    engine.dispose()
+
+
+def test_registro_idempotente(repositorio):
+    assert repositorio.registrar_shards("e1", [(1, 100), (201, 300)]) == 1
+    assert repositorio.registrar_shard("e1", 201, 300) is False
+    assert repositorio.maior_fim("e1") == 300
+    assert repositorio.resumo("e1") == {PENDENTE: 3}
+
+
+def test_reivindicacao_exclusiva_em_ordem(repositorio):
+    a = repositorio.reivindicar("e1", "a", ttl=60)
+    b = repositorio.reivindicar("e1", "b", ttl=60)
+
+    assert (a["inicio"], b["inicio"]) == (1, 101)
+    assert repositorio.reivindicar("e1", "c", ttl=60) is None
+    # Só o dono renova ou conclui
+    assert repositorio.renovar("e1", 1, "b", ttl=60) is False
+    assert repositorio.concluir("e1", 1, "b", 10) is False
+    assert repositorio.concluir("e1", 1, "a", 10, {"enderecos": 2}) is True
+    assert repositorio.resumo("e1") == {CONCLUIDO: 1, EM_ANDAMENTO: 1}
+
+
+def test_lease_vencido_volta_a_ser_reivindicavel(repositorio):
+    repositorio.reivindicar("e1", "morto", ttl=0.05)
+    time.sleep(0.1)
+
+    shard = repositorio.reivindicar("e1", "vivo", ttl=60)
+
+    assert (shard["inicio"], shard["tentativa"]) == (1, 2)
+    assert repositorio.renovar("e1", 1, "morto", ttl=60) is False
+    assert repositorio.concluir("e1", 1, "morto", 5) is False
+    assert repositorio.concluir("e1", 1, "vivo", 5) is True
+
+
+def test_liberar_e_limite_de_tentativas(repositorio):
+    for _ in range(2):
+        shard = repositorio.reivindicar("e1", "w", ttl=60, max_tentativas=2)
+        assert shard["inicio"] == 1
+        repositorio.liberar("e1", 1, "w")
+
+    # Terceira tentativa: shard 1 marcado como falho, segue para o próximo
+    shard = repositorio.reivindicar("e1", "w", ttl=60, max_tentativas=2)
+
+    assert shard["inicio"] == 101
+    situacao = {linha.inicio: linha.status for linha in repositorio.listar("e1")}
+    assert situacao == {1: FALHOU, 101: EM_ANDAMENTO}
@@ -0,0 +1,74 @@
+"""Relatório de tendência do histórico de execuções"""
+
+import json
+
+from benchmark.ledger_report import comparar_com_historico, main
+
+
+def _entrada(modo="pipeline", status="sucesso", cadastros_por_s=100.0, cadastros=1000,
+             taxa_falha=0.0, tipo="extracao"):
+    return {
+        "tipo": tipo, "modo": modo, "status": status,
+        "iniciado_em": "2026-01-01T00:00:00", "duracao_s": cadastros / cadastros_por_s,
+        "taxas": {"cadastros_por_s": cadastros_por_s},
+        "volume": {"cadastros": cadastros},
+        "erros": {"taxa_falha_requisicoes": taxa_falha, "requisicoes_com_falha": int(taxa_falha * 1000)},
+    }
+
+
+def _alertas(resultado):
+    return {linha["metrica"] for linha in resultado["linhas"] if linha["alerta"]}
+
+
+def test_execucao_dentro_da_tendencia():
+    historico = [_entrada(cadastros_por_s=v) for v in (95, 100, 105)] + [_entrada(cadastros_por_s=98)]
+
+    resultado = comparar_com_historico(historico)
+
+    assert resultado["alertas"] == 0
+    assert len(resultado["historico"]) == 3
+    assert {l["metrica"] for l in resultado["linhas"]} >= {"taxas.cadastros_por_s", "volume.cadastros"}
+
+
+def test_sinaliza_regressao_volume_e_erros():
+    historico = [_entrada(taxa_falha=0.002) for _ in range(3)]
+    historico.append(_entrada(cadastros_por_s=70, cadastros=1600, taxa_falha=0.05))
+
+    resultado = comparar_com_historico(historico, limite_vazao=0.2, limite_volume=0.5)
+
+    assert _alertas(resultado) == {"taxas.cadastros_por_s", "volume.cadastros", "erros.taxa_falha_requisicoes"}
+    # Contagens absolutas de erro acompanham o volume e não alertam sozinhas
+    linha = next(l for l in resultado["linhas"] if l["metrica"] == "erros.requisicoes_com_falha")
+    assert linha["alerta"] is False
+
+
+def test_taxa_de_erro_abaixo_do_piso_nao_alerta():
+    historico = [_entrada(taxa_falha=0.0) for _ in range(3)] + [_entrada(taxa_falha=0.005)]
+
+    assert comparar_com_historico(historico)["alertas"] == 0
+
+
+def test_mediana_usa_so_execucoes_bem_sucedidas_do_mesmo_modo_na_janela():
+    historico = [_entrada(cadastros_por_s=10) for _ in range(5)]
+    historico += [_entrada(cadastros_por_s=100) for _ in range(3)]
+    historico += [_entrada(cadastros_por_s=1, status="erro"), _entrada(modo="serial", cadastros_por_s=5)]
+    historico.append(_entrada(cadastros_por_s=100))
+
+    resultado = comparar_com_historico(historico, janela=3)
+
+    assert len(resultado["historico"]) == 3
+    linha = next(l for l in resultado["linhas"] if l["metrica"] == "taxas.cadastros_por_s")
+    assert (linha["mediana"], linha["amostras"], linha["alerta"]) == (100, 3, False)
+
+
+def test_modo_sem_execucoes_retorna_vazio(capsys, tmp_path):
+    historico = [_entrada(modo="pipeline"), _entrada(modo="pipeline")]
+    vazio = {"atual": None, "historico": [], "linhas": [], "alertas": 0}
+
+    assert comparar_com_historico(historico, modo="distribuida") == vazio
+    assert comparar_com_historico(historico, tipo="carga") == vazio
+
+    caminho = tmp_path / "historico.jsonl"
+    caminho.write_text("\n".join(json.dumps(e) for e in historico), encoding="utf-8")
+    assert main([str(caminho), "--modo", "distribuida"]) == 0
+    assert "modo distribuida" in capsys.readouterr().out
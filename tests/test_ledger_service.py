@@ -0,0 +1,36 @@
+"""Histórico de execuções: status e medidas das entradas"""
+
+import json
+
+from config.settings import settings
+from service.ledger_service import livro, sessao_livro
+
+
+def _ultima_entrada():
+    with open(settings.app.ledger_file, encoding="utf-8") as f:
+        return json.loads(f.readlines()[-1])
+
+
+def test_carga_sem_sucesso_marca_a_extracao_com_erro(sem_historico):
+    with sessao_livro("extracao", "pipeline"):
+        livro.registrar_carga({"sucesso": False, "total_registros": 10, "erros": 10})
+
+    entrada = _ultima_entrada()
+    assert entrada["status"] == "erro"
+    assert entrada["carga"]["sucesso"] is False
+
+
+def test_extracao_com_contagens_informadas(sem_historico):
+    with sessao_livro("extracao", "distribuida"):
+        livro.registrar(contagens={
+            "cadastros": 4,
+            "registros_por_modulo": {"enderecos": 4, "proprietarios": 6},
+            "falhas_por_modulo": {"zoneamento": 1},
+        })
+
+    entrada = _ultima_entrada()
+    assert entrada["status"] == "sucesso"
+    assert "contagens" not in entrada and "requisicoes" not in entrada
+    assert entrada["volume"]["cadastros"] == 4
+    assert entrada["volume"]["registros"] == 10
+    assert entrada["erros"]["modulos_com_falha"] == 1
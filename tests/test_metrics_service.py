@@ -0,0 +1,79 @@
+"""Registro de métricas SOAP: contagens, snapshot e formato do Prometheus"""
+
+import re
+
+from service.metrics_service import RegistroMetricas
+
+
+def _linhas(texto, familia):
+    return [linha for linha in texto.splitlines() if linha.startswith(familia) and not linha.startswith("#")]
+
+
+def test_contagens_de_requisicoes_chamadas_e_parse():
+    registro = RegistroMetricas()
+    for _ in range(2):
+        registro.iniciar_requisicao("consultar")
+    registro.registrar_requisicao("consultar", 0.2, bytes_requisicao=100, bytes_resposta=5000, status=200)
+    registro.registrar_requisicao("consultar", 0.4, bytes_requisicao=100, status=500, falha="HTTPError")
+    registro.registrar_parse("consultar", 0.05)
+    registro.registrar_parse("consultar", 0.01, falha="XMLSyntaxError")
+    registro.registrar_chamada("consultar", 1.0, sucesso=True, retentativas=1, fallbacks=1)
+    registro.registrar_chamada("consultar", 0.5, sucesso=False)
+
+    dados = registro.exportar()["operacoes"]["consultar"]
+
+    assert (dados["chamadas"], dados["chamadas_com_erro"]) == (2, 1)
+    assert (dados["requisicoes"], dados["requisicoes_com_falha"]) == (2, 1)
+    assert (dados["retentativas"], dados["fallbacks"]) == (1, 1)
+    assert dados["falhas"] == {"HTTPError": 1, "XMLSyntaxError": 1}
+    assert dados["status_http"] == {"200": 1, "500": 1}
+    # Resposta com falha não entra nos bytes recebidos
+    assert (dados["bytes_requisicao"], dados["bytes_resposta"], dados["maior_resposta"]) == (200, 5000, 5000)
+    assert (dados["tempo_total_s"], dados["tempo_rede_s"], dados["tempo_parse_s"]) == (1.5, 0.6, 0.06)
+    assert registro.totais() == {"requisicoes": 2, "bytes": 5000, "falhas": 1}
+    # Requisições em andamento voltam a zero, com ou sem falha
+    assert _linhas(registro.formatar_prometheus(), "cadastro_soap_requisicoes_em_andamento") == [
+        'cadastro_soap_requisicoes_em_andamento{operacao="consultar"} 0'
+    ]
+
+
+def test_exportar_ordena_pelo_tempo_consumido():
+    registro = RegistroMetricas()
+    registro.registrar_chamada("rapida", 0.1, sucesso=True)
+    registro.registrar_chamada("lenta", 2.0, sucesso=True)
+    # Sem chamadas registradas, vale rede + parse
+    registro.registrar_requisicao("media", 0.5)
+    registro.registrar_parse("media", 0.2)
+
+    snapshot = registro.exportar()
+
+    assert list(snapshot["operacoes"]) == ["lenta", "media", "rapida"]
+    assert snapshot["tempo_total_s"] == 2.8
+    assert snapshot["operacoes"]["lenta"]["participacao"] == round(2.0 / 2.8, 4)
+    assert [o["operacao"] for o in registro.resumo(limite=2)] == ["lenta", "media"]
+
+
+def test_formato_prometheus():
+    registro = RegistroMetricas()
+    registro.registrar_chamada("consultar", 0.3, sucesso=True)
+    registro.registrar_chamada("consultar", 0.1, sucesso=True)
+    registro.registrar_chamada("listar", 0.2, sucesso=True)
+    registro.contar("extracao_registros_total", 3, modulo='anexos "v2"\\x\nnovo')
+
+    texto = registro.formatar_prometheus()
+
+    tipos = re.findall(r"^# TYPE (\S+) (\S+)$", texto, re.MULTILINE)
+    assert len(tipos) == len({nome for nome, _ in tipos})
+    assert ("cadastro_soap_latencia_segundos", "summary") in tipos
+    # Todas as séries de uma família ficam logo abaixo do seu # TYPE
+    familia = None
+    for linha in texto.splitlines():
+        if linha.startswith("# TYPE"):
+            familia = linha.split()[2]
+        else:
+            assert linha.startswith(familia)
+    assert 'cadastro_soap_latencia_segundos_sum{operacao="consultar"} 0.4' in texto
+    assert 'cadastro_soap_latencia_segundos_count{operacao="consultar"} 2' in texto
+    assert 'cadastro_soap_latencia_segundos_count{operacao="listar"} 1' in texto
+    assert len(_linhas(texto, 'cadastro_soap_latencia_segundos{operacao="consultar",quantile=')) == 3
+    assert 'cadastro_extracao_registros_total{modulo="anexos \\"v2\\"\\\\x\\nnovo"} 3' in texto
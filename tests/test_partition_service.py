@@ -0,0 +1,44 @@
+"""Listagem particionada por faixas de código contra o servidor mock"""
+
+import pytest
+
+from service.partition_service import ListagemParticionada, ParticionamentoNaoSuportado
+from tests.conftest import servidor_mock
+
+
+def _codigos(cadastros):
+    return [int(c["codigo_cadastro"]) for c in cadastros]
+
+
+def test_listagem_intercala_faixas_em_ordem(mock_soap):
+    listagem = ListagemParticionada(tamanho_inicial=25, codigo_maximo=300, trabalhadores=3)
+
+    cadastros = listagem.listar()
+
+    assert _codigos(cadastros) == list(mock_soap.httpd.gerador.codigos())
+    assert listagem.falhas == []
+
+
+def test_listagem_divide_faixas_no_limite_de_registros(mock_soap):
+    listagem = ListagemParticionada(tamanho_inicial=200, limite_registros=40, codigo_maximo=300)
+
+    cadastros = listagem.listar()
+
+    assert _codigos(cadastros) == list(mock_soap.httpd.gerador.codigos())
+
+
+def test_listagem_faixa_fechada(mock_soap):
+    cadastros = ListagemParticionada(tamanho_inicial=10).listar(inicio=50, fim=120)
+
+    assert _codigos(cadastros) == list(mock_soap.httpd.gerador.codigos(50, 120))
+
+
+def test_servidor_que_ignora_faixa_nao_e_particionado():
+    with servidor_mock(ignorar_faixa=True) as mock:
+        listagem = ListagemParticionada(tamanho_inicial=25, codigo_maximo=300, trabalhadores=2)
+
+        with pytest.raises(ParticionamentoNaoSuportado):
+            listagem.listar()
+
+        # Detectado na primeira leva de faixas, sem varrer o resto da lista
+        assert mock.contadores["op:buscaCadastroImobiliarioGeral"] <= 2
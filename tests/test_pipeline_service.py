@@ -0,0 +1,130 @@
+"""Pipeline de extração: ordem de entrega, destino banco e configuração de processos"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from config.database import DatabaseConfig
+from config.settings import settings
+from service.cadastro_service import CadastroService
+from service.pipeline_service import PipelineExtracao, DestinoBanco, FalhaCargaBanco
+from service.storage_service import FileStorageService
+
+
+class DestinoMemoria:
+    """Destino que só guarda a ordem e os módulos entregues"""
+
+    def __init__(self):
+        self.entregues = []
+
+    def escrever(self, cadastro, modulos):
+        self.entregues.append((cadastro["codigo_cadastro"], {m: len(i) for m, i in modulos.items()}))
+
+
+def _listagem(mock, limite=120):
+    codigos = list(mock.httpd.gerador.codigos())[:limite]
+    return [{"codigo_cadastro": str(codigo)} for codigo in codigos]
+
+
+@pytest.mark.parametrize("processos", [0, 2])
+def test_pipeline_entrega_na_ordem_da_listagem(mock_soap, processos):
+    cadastros = _listagem(mock_soap)
+    destino = DestinoMemoria()
+    # Janela e filas pequenas: muitas respostas chegam fora de ordem
+    pipeline = PipelineExtracao(
+        CadastroService.MODULOS, trabalhadores_io=6, processos=processos,
+        tamanho_fila=8, janela=16, lote_parse=4,
+    )
+    posicoes = []
+
+    entregues = pipeline.executar(cadastros, destino, ao_entregar=lambda idx, cad: posicoes.append(idx))
+
+    assert entregues == len(cadastros)
+    assert [codigo for codigo, _ in destino.entregues] == [c["codigo_cadastro"] for c in cadastros]
+    assert posicoes == list(range(1, len(cadastros) + 1))
+    assert all(set(modulos) == set(CadastroService.MODULOS) for _, modulos in destino.entregues)
+
+
+def test_processos_zero_desliga_o_pool(mock_soap, sem_historico, monkeypatch):
+    monkeypatch.setattr(settings.app, "pipeline_processes", 0)
+    monkeypatch.setattr(settings.app, "listing_max_code", 300)
+    monkeypatch.setattr(settings.app, "request_delay", 0.0)
+    capturado = {}
+    original = PipelineExtracao.__init__
+
+    def init(self, *args, **kwargs):
+        original(self, *args, **kwargs)
+        capturado["processos"] = self.processos
+    monkeypatch.setattr(PipelineExtracao, "__init__", init)
+
+    servico = CadastroService()
+    servico.file_storage_service = FileStorageService(str(sem_historico))
+    servico.extrair_pipeline(destino="arquivos")
+
+    assert capturado["processos"] == 0
+    with open(settings.app.ledger_file, encoding="utf-8") as f:
+        entrada = json.loads(f.readlines()[-1])
+    assert entrada["processos"] == 0
+
+
+def _destino_inacessivel(tamanho_fila: int) -> DestinoBanco:
+    from service.database_service import DatabaseService
+
+    servico = DatabaseService()
+    servico.config = DatabaseConfig("127.0.0.1", 1, "inexistente", "u", "p")
+    return DestinoBanco(servico, tamanho_fila=tamanho_fila, conexoes=1)
+
+
+def test_destino_banco_propaga_falha_da_carga(sem_historico):
+    destino = _destino_inacessivel(tamanho_fila=5)
+    erro = []
+
+    def escrever_tudo():
+        try:
+            for codigo in range(1, 101):
+                destino.escrever({"codigo_cadastro": str(codigo)}, {})
+            destino.fechar()
+        except FalhaCargaBanco as e:
+            erro.append(e)
+
+    produtor = threading.Thread(target=escrever_tudo, daemon=True)
+    produtor.start()
+    produtor.join(timeout=30)
+
+    # Fila cheia e carga morta: erro em vez de travar no put
+    assert not produtor.is_alive()
+    assert erro and "interrompida" in str(erro[0])
+    assert destino.resultado["sucesso"] is False
+
+
+def test_destino_banco_descartar_desfaz_a_carga(banco):
+    destino = DestinoBanco(banco, tamanho_lote=3, conexoes=2)
+    for codigo in range(1, 11):
+        destino.escrever({"codigo_cadastro": str(codigo), "situacao": "1"}, {})
+    # Lotes já enviados aos gravadores antes do descarte
+    prazo = time.monotonic() + 10
+    while destino._fila.qsize() and time.monotonic() < prazo:
+        time.sleep(0.05)
+    time.sleep(0.3)
+
+    destino.descartar()
+
+    assert destino.resultado["sucesso"] is False
+    assert banco.obter_estatisticas_completas("exato")["total_cadastros"] == 0
+
+
+def test_destino_banco_fechar_confirma_a_carga(banco):
+    destino = DestinoBanco(banco, tamanho_lote=3, conexoes=2)
+    for codigo in range(1, 11):
+        destino.escrever({"codigo_cadastro": str(codigo), "situacao": "1",
+                          "enderecos": [{"cep": "85530-000"}]}, {})
+
+    resultado = destino.fechar()
+
+    assert resultado["sucesso"] is True
+    assert resultado["inseridos"] == 10
+    estatisticas = banco.obter_estatisticas_completas("exato")
+    assert estatisticas["total_cadastros"] == 10
+    assert estatisticas["total_enderecos"] == 10
@@ -0,0 +1,69 @@
+"""Profiling por fase: fases aninhadas e sessão que grava o relatório"""
+
+import time
+
+from config.settings import settings
+from service.profiling_service import PerfilExecucao, perfil, sessao_perfil
+from service.storage_service import FileStorageService
+
+
+def _trabalho_externo():
+    time.sleep(0.05)
+
+
+def _trabalho_interno():
+    time.sleep(0.1)
+    return [bytearray(1024) for _ in range(200)]
+
+
+def _funcoes(relatorio, fase):
+    return {f["funcao"] for f in relatorio["fases"][fase]["top_funcoes"]}
+
+
+def test_fases_aninhadas():
+    execucao = PerfilExecucao()
+    execucao.iniciar()
+    with execucao.fase("externa"):
+        _trabalho_externo()
+        for _ in range(2):
+            with execucao.fase("interna"):
+                _trabalho_interno()
+    relatorio = execucao.encerrar()
+
+    externa, interna = relatorio["fases"]["externa"], relatorio["fases"]["interna"]
+    assert (externa["entradas"], interna["entradas"]) == (1, 2)
+    # O tempo da mãe inclui o das filhas
+    assert interna["tempo_s"] >= 0.2
+    assert externa["tempo_s"] >= interna["tempo_s"] + 0.05
+    # Funções e alocações ficam com a fase mais interna
+    assert "_trabalho_interno" in _funcoes(relatorio, "interna")
+    assert "_trabalho_interno" not in _funcoes(relatorio, "externa")
+    assert "_trabalho_externo" in _funcoes(relatorio, "externa")
+    assert interna["pico_memoria_bytes"] >= 200 * 1024
+    assert list(relatorio["fases"]) == ["externa", "interna"]
+
+
+def test_sessao_grava_so_o_relatorio_da_mais_externa(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(settings.app, "profile", True)
+    armazenamento = FileStorageService(str(tmp_path))
+
+    with sessao_perfil("perfil_externo", armazenamento):
+        with perfil.fase("extracao"):
+            with sessao_perfil("perfil_interno", armazenamento):
+                with perfil.fase("pipeline"):
+                    _trabalho_externo()
+
+    assert not perfil.ativo
+    assert sorted(p.name for p in (tmp_path / "json").glob("perfil_*.json")) == ["perfil_externo.json"]
+    assert "perfil_externo.json" in capsys.readouterr().out
+
+
+def test_sessao_sem_app_profile_nao_grava(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings.app, "profile", False)
+
+    with sessao_perfil("perfil_desligado", FileStorageService(str(tmp_path))):
+        with perfil.fase("extracao"):
+            pass
+
+    assert not perfil.ativo
+    assert not list((tmp_path / "json").glob("perfil_*.json"))
@@ -0,0 +1,88 @@
+"""Extração distribuída em shards: leases, rastreamento e mesclagem contra o mock"""
+
+import json
+
+import pytest
+
+from benchmark.trace_analyzer import carregar_spans
+from config.settings import settings
+from service.shard_service import ExtracaoDistribuida
+from tests.conftest import servidor_mock
+
+
+@pytest.fixture(scope="module")
+def mock_pequeno():
+    with servidor_mock(60) as mock:
+        yield mock
+
+
+@pytest.fixture
+def distribuida(mock_pequeno, sem_historico, monkeypatch):
+    """Execução com leases em SQLite e data/ no diretório temporário"""
+    monkeypatch.chdir(sem_historico)
+    monkeypatch.setattr(settings.app, "request_delay", 0.0)
+    monkeypatch.setattr(settings.app, "trace_file", str(sem_historico / "rastreamento.jsonl"))
+
+    def criar(**kwargs):
+        kwargs.setdefault("tamanho_shard", 20)
+        kwargs.setdefault("codigo_maximo", 60)
+        kwargs.setdefault("ttl", 4)
+        return ExtracaoDistribuida("teste", f"sqlite:///{sem_historico / 'leases.db'}", **kwargs)
+    return criar
+
+
+def _spans(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f]
+
+
+def test_worker_grava_spans_dos_shards(distribuida, mock_pequeno):
+    extracao = distribuida()
+    extracao.preparar()
+
+    resultado = extracao.executar_worker("w1")
+
+    codigos = list(mock_pequeno.httpd.gerador.codigos())
+    assert resultado["cadastros"] == len(codigos)
+    spans = _spans(settings.app.trace_file)
+    raiz = next(s for s in spans if s["tipo"] == "execucao")
+    assert (raiz["modo"], raiz["execucao_distribuida"], raiz["worker"]) == ("distribuida", "teste", "w1")
+    shards = [s for s in spans if s["tipo"] == "shard"]
+    assert {(s["inicio"], s["fim"]) for s in shards} >= {(1, 20), (21, 40), (41, 60)}
+    assert all(s["pai"] == raiz["id"] for s in shards)
+    cadastros = [s for s in spans if s["tipo"] == "cadastro"]
+    assert sorted(int(s["codigo_cadastro"]) for s in cadastros) == codigos
+    assert {s["pai"] for s in spans if s["tipo"] == "modulo"} <= {s["id"] for s in cadastros}
+
+
+def test_processos_locais_compartilham_o_rastreamento(distribuida, mock_pequeno):
+    extracao = distribuida()
+
+    arquivos = extracao.executar_local(processos=2, formato="jsonl")
+
+    with open(arquivos["cadastros"], encoding="utf-8") as f:
+        assert sum(1 for _ in f) == len(list(mock_pequeno.httpd.gerador.codigos()))
+    # Linhas inteiras de cada processo, sem intercalação no arquivo comum
+    spans = _spans(settings.app.trace_file)
+    raizes = [s for s in spans if s["tipo"] == "execucao"]
+    assert len(raizes) == 2
+    assert {r["execucao_distribuida"] for r in raizes} == {"teste"}
+    assert {s["execucao"] for s in spans} == {r["execucao"] for r in raizes}
+    mesclados = carregar_spans(settings.app.trace_file, execucao_distribuida="teste")
+    assert len(mesclados) == len(spans) + 1
+    assert sum(1 for s in mesclados if s["tipo"] == "cadastro") == len(list(mock_pequeno.httpd.gerador.codigos()))
+
+
+def test_execucao_local_registra_no_historico(distribuida, mock_pequeno, monkeypatch):
+    monkeypatch.setattr(settings.app, "trace_file", "")
+
+    distribuida().executar_local(processos=2, formato="jsonl")
+
+    with open(settings.app.ledger_file, encoding="utf-8") as f:
+        entradas = [json.loads(linha) for linha in f]
+    assert len(entradas) == 1
+    entrada = entradas[0]
+    assert (entrada["tipo"], entrada["modo"], entrada["status"]) == ("extracao", "distribuida", "sucesso")
+    assert entrada["execucao_distribuida"] == "teste"
+    assert entrada["volume"]["cadastros"] == len(list(mock_pequeno.httpd.gerador.codigos()))
+    assert set(entrada["fases"]) == {"preparacao", "workers", "mesclagem"}
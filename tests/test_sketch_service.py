@@ -0,0 +1,106 @@
+"""Sketches KLL e HyperLogLog: limites de erro e combinação"""
+
+import random
+
+import pytest
+
+from service.sketch_service import KLLSketch, HyperLogLog, EstatisticasStreaming
+
+
+def _erro_rank(valores_ordenados, valor, fracao):
+    """Distância entre o rank do valor estimado e o rank pedido (em fração)"""
+    n = len(valores_ordenados)
+    abaixo = sum(1 for v in valores_ordenados if v <= valor)
+    return abs(abaixo / n - fracao)
+
+
+def test_kll_quantis_dentro_do_erro_de_rank():
+    rng = random.Random(1)
+    valores = [rng.lognormvariate(5, 1) for _ in range(50_000)]
+    sketch = KLLSketch(k=200, semente=1)
+    for valor in valores:
+        sketch.update(valor)
+
+    ordenados = sorted(valores)
+    for fracao in (0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+        assert _erro_rank(ordenados, sketch.quantil(fracao), fracao) < 0.02
+    assert sketch.itens_retidos < 1000
+    assert (sketch.minimo, sketch.maximo) == (ordenados[0], ordenados[-1])
+
+
+def test_kll_merge_equivale_ao_fluxo_unico():
+    rng = random.Random(2)
+    valores = [rng.uniform(0, 1000) for _ in range(30_000)]
+    partes = [KLLSketch(k=200, semente=i) for i in range(3)]
+    for i, valor in enumerate(valores):
+        partes[i % 3].update(valor)
+
+    combinado = partes[0].merge(partes[1]).merge(partes[2])
+
+    assert combinado.n == len(valores)
+    ordenados = sorted(valores)
+    for fracao in (0.1, 0.5, 0.9):
+        assert _erro_rank(ordenados, combinado.quantil(fracao), fracao) < 0.02
+
+
+@pytest.mark.parametrize("precisao", [4, 5, 6, 7, 10])
+def test_hll_erro_medio_por_precisao(precisao):
+    m = 1 << precisao
+    # Acima de 2.5*m a estimativa bruta (com alfa) é usada, não o linear counting
+    distintos = 20 * m
+    erros = []
+    for rodada in range(20):
+        contador = HyperLogLog(precisao)
+        for i in range(distintos):
+            contador.update(f"{rodada}:{i}")
+        erros.append((contador.estimativa() - distintos) / distintos)
+
+    vies = sum(erros) / len(erros)
+    erro_padrao = 1.04 / m ** 0.5
+    # Média de 20 rodadas: viés bem abaixo do erro padrão de uma rodada
+    assert abs(vies) < erro_padrao
+    assert max(abs(e) for e in erros) < 4 * erro_padrao
+
+
+def test_hll_cardinalidade_pequena_e_repeticoes():
+    contador = HyperLogLog(12)
+    for _ in range(5):
+        for i in range(100):
+            contador.update(i)
+
+    assert abs(contador.estimativa() - 100) <= 2
+
+
+def test_hll_merge_e_uniao():
+    a, b = HyperLogLog(12), HyperLogLog(12)
+    for i in range(0, 6000):
+        a.update(i)
+    for i in range(4000, 10000):
+        b.update(i)
+
+    assert abs(a.merge(b).estimativa() - 10000) / 10000 < 0.05
+
+
+def test_hll_rejeita_precisoes_diferentes():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+    with pytest.raises(ValueError):
+        HyperLogLog(3)
+
+
+def test_estatisticas_streaming_merge():
+    cadastros = [
+        {"codigo_cadastro": str(i), "area_terreno": str(100 + i),
+         "proprietariosbci": [{"codigo_pessoa": str(i % 50)}]}
+        for i in range(1000)
+    ]
+    unico = EstatisticasStreaming().update_many(cadastros)
+    metades = EstatisticasStreaming().update_many(cadastros[:500]).merge(
+        EstatisticasStreaming().update_many(cadastros[500:])
+    )
+
+    resultado = metades.resultado()
+    assert metades.total == unico.total == 1000
+    assert resultado["distintos"]["proprietarios"] == unico.resultado()["distintos"]["proprietarios"] == 50
+    assert resultado["distribuicao_areas"]["terreno"]["media"] == pytest.approx(599.5)
+    assert resultado["distribuicao_areas"]["terreno"]["count"] == 1000
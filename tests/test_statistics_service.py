@@ -0,0 +1,73 @@
+"""Estatísticas em passada única: acumulador combinável e estatísticas da extração"""
+
+import random
+
+import pytest
+
+from service.statistics_service import AcumuladorEstatisticas, StatisticsService
+
+
+def _cadastros(quantidade, semente=1):
+    rng = random.Random(semente)
+    cadastros = []
+    for i in range(1, quantidade + 1):
+        cadastro = {
+            "codigo_cadastro": str(i),
+            "tipo_cadastro": rng.choice([1, 2, None]),
+            "situacao": rng.choice(["1", "2"]),
+            "categoria": rng.choice(["terreno", "predial"]),
+            "area_terreno": rng.choice(["", "0", f"{rng.uniform(100, 900):.2f}".replace(".", ",")]),
+            "area_construida": rng.choice([None, rng.uniform(50, 300)]),
+            "zoneamentos": [{"zona": rng.choice(["ZR1", "ZC"])} for _ in range(rng.randrange(3))],
+        }
+        if rng.random() < 0.7:
+            cadastro["proprietariosbci"] = [{"codigo_pessoa": str(i)}]
+        if rng.random() < 0.8:
+            cadastro["enderecos"] = [{"cep": "85530000"}]
+        cadastros.append(cadastro)
+    # Entradas inválidas só contam no total
+    return cadastros + [None, "x"]
+
+
+def test_merge_equivale_a_passada_unica():
+    cadastros = _cadastros(500)
+    unico = AcumuladorEstatisticas().update_many(cadastros).resultado()
+
+    partes = [AcumuladorEstatisticas().update_many(cadastros[inicio:inicio + 150])
+              for inicio in range(0, len(cadastros), 150)]
+    combinado = partes[0]
+    for parte in partes[1:]:
+        combinado.merge(parte)
+    resultado = combinado.resultado()
+
+    assert resultado["total"] == 502
+    for chave in ("com_proprietarios", "com_enderecos", "com_area_terreno", "com_area_construida",
+                  "tipos_situacao", "tipos_categoria", "zonas", "qualidade_dados", "distribuicao_areas"):
+        assert resultado[chave] == unico[chave], chave
+    assert resultado["area_total_terrenos"] == pytest.approx(unico["area_total_terrenos"])
+    assert resultado["area_media_construida"] == pytest.approx(unico["area_media_construida"])
+
+
+def test_merge_com_acumulador_vazio():
+    cadastros = _cadastros(50)
+    acumulador = AcumuladorEstatisticas().update_many(cadastros)
+
+    assert AcumuladorEstatisticas().merge(acumulador).resultado() == acumulador.resultado()
+    assert AcumuladorEstatisticas().resultado()["total"] == 0
+
+
+def test_estatisticas_extracao_usam_os_modulos_do_cadastro():
+    estatisticas = StatisticsService().criar_estatisticas_extracao(2)
+    estatisticas.registrar_modulo("enderecos", [{"cep": "1"}])
+    estatisticas.registrar_falha("proprietarios")
+
+    estatisticas.registrar_cadastro({"codigo_cadastro": "7", "situacao": "1"},
+                                    {"enderecos": [{"cep": "1"}], "zoneamento": [{"zona": "ZC"}]})
+    estatisticas.registrar_cadastro({"codigo_cadastro": "abc"})
+
+    resultado = estatisticas.resultado()
+    assert resultado["estatisticas"]["com_enderecos"] == 1
+    assert resultado["estatisticas"]["zonas"] == {"ZC": 1}
+    assert resultado["execucao"]["registros_por_modulo"] == {"enderecos": 1}
+    assert resultado["execucao"]["falhas_por_modulo"] == {"proprietarios": 1}
+    assert 7 in estatisticas.cobertura and estatisticas.codigos_invalidos == 1
@@ -0,0 +1,99 @@
+"""Análise offline do rastreamento: caminho crítico, cauda e trabalhadores"""
+
+import json
+
+from benchmark.trace_analyzer import (
+    analisar, carregar_spans, caminho_critico, cauda_latencia, utilizacao_trabalhadores
+)
+
+
+def _span(id, pai, tipo, inicio, fim, execucao="e1", **campos):
+    return {"execucao": execucao, "id": id, "pai": pai, "tipo": tipo, "inicio": inicio, "fim": fim,
+            "duracao_ms": round((fim - inicio) * 1000, 3), "resultado": "ok", **campos}
+
+
+def _execucao():
+    # Dois cadastros em série, cada um com dois módulos em threads diferentes
+    return [
+        _span(3, 2, "modulo", 0.0, 1.0, modulo="a", trabalhador="1:t1"),
+        _span(4, 2, "modulo", 0.0, 3.0, modulo="b", trabalhador="1:t2"),
+        _span(2, 1, "cadastro", 0.0, 3.0, codigo_cadastro="1"),
+        _span(6, 5, "modulo", 4.0, 5.0, modulo="a", trabalhador="1:t1"),
+        _span(7, 5, "modulo", 4.0, 5.5, modulo="b", trabalhador="1:t2"),
+        _span(5, 1, "cadastro", 4.0, 6.0, codigo_cadastro="2"),
+        _span(1, None, "execucao", 0.0, 6.0, nome="extracao"),
+    ]
+
+
+def test_caminho_critico_atribui_o_tempo_de_parede():
+    resultado = caminho_critico(_execucao())
+
+    por_rotulo = {rotulo: v["segundos"] for rotulo, v in resultado["por_rotulo"].items()}
+    assert resultado["duracao_s"] == 6.0
+    # O módulo a (mais curto) nunca está no caminho; o intervalo entre cadastros é da execução
+    assert por_rotulo == {"modulo:b": 4.5, "execucao (próprio)": 1.0, "cadastro (próprio)": 0.5}
+    assert sum(por_rotulo.values()) == resultado["duracao_s"]
+
+
+def test_cauda_lista_spans_acima_do_p95():
+    spans = [_span(1, None, "execucao", 0.0, 100.0)]
+    spans += [_span(i, 1, "modulo", 0.0, 0.01, modulo="a") for i in range(2, 40)]
+    spans.append(_span(40, 1, "modulo", 0.0, 2.0, modulo="a", codigo_cadastro="99", tentativas=3))
+
+    resultado = cauda_latencia(spans)
+
+    assert resultado["modulos"]["a"]["spans"] == 39
+    assert resultado["modulos"]["a"]["com_retentativa"] == 1
+    assert [s["codigo_cadastro"] for s in resultado["outliers"]] == ["99"]
+
+
+def test_utilizacao_e_intervalos_ociosos():
+    resultado = utilizacao_trabalhadores(_execucao())
+
+    t1 = resultado["trabalhadores"]["1:t1"]
+    assert t1["ocupado_s"] == 2.0
+    assert t1["utilizacao"] == round(2 / 6, 4)
+    # 1.0-4.0 e 5.0-6.0 ociosos
+    assert t1["ocioso_s"] == 4.0
+    assert resultado["maiores_intervalos"][0] == {"trabalhador": "1:t1", "desde_inicio_s": 1.0, "ms": 3000.0}
+
+
+def test_carregar_spans_escolhe_a_ultima_execucao_finalizada(tmp_path):
+    caminho = tmp_path / "rastreamento.jsonl"
+    linhas = [json.dumps(s) for s in _execucao()]
+    linhas += [json.dumps(_span(1, None, "execucao", 10.0, 11.0, execucao="e2"))]
+    # Execução interrompida: sem span raiz e com a última linha truncada
+    linhas += [json.dumps(_span(2, 1, "cadastro", 20.0, 21.0, execucao="e3")), '{"execucao": "e3", "id"']
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+
+    assert [s["execucao"] for s in carregar_spans(str(caminho))] == ["e2"]
+    assert len(carregar_spans(str(caminho), "e1")) == 7
+    assert len(carregar_spans(str(caminho), "e3")) == 1
+
+
+def _worker(execucao, worker, inicio, fim):
+    # Mesmos ids e mesmo trabalhador nas duas execuções (processos independentes)
+    return [
+        _span(3, 2, "modulo", inicio, fim, execucao=execucao, modulo="a", trabalhador="1:t1"),
+        _span(2, 1, "shard", inicio, fim, execucao=execucao),
+        _span(1, None, "execucao", inicio, fim, execucao=execucao, modo="distribuida",
+              execucao_distribuida="noite", worker=worker),
+    ]
+
+
+def test_execucao_distribuida_junta_os_workers(tmp_path):
+    caminho = tmp_path / "rastreamento.jsonl"
+    spans = _worker("w1", "a", 0.0, 4.0) + _worker("w2", "b", 5.0, 6.0) + _execucao()
+    caminho.write_text("\n".join(json.dumps(s) for s in spans) + "\n", encoding="utf-8")
+
+    mesclados = carregar_spans(str(caminho), execucao_distribuida="noite")
+    relatorio = analisar(mesclados)
+
+    assert len(mesclados) == 7
+    assert len({s["id"] for s in mesclados}) == 7
+    assert relatorio["caminho_critico"]["duracao_s"] == 6.0
+    # Entre o fim de w1 (4.0) e o início de w2 (5.0) só a raiz sintética
+    assert {r: v["segundos"] for r, v in relatorio["caminho_critico"]["por_rotulo"].items()} == {
+        "modulo:a": 5.0, "execucao (próprio)": 1.0}
+    assert set(relatorio["trabalhadores"]["trabalhadores"]) == {"a/1:t1", "b/1:t1"}
+    assert relatorio["cauda"]["modulos"]["a"]["spans"] == 2